@@ -436,27 +436,26 @@ class User(AbstractBaseUser, PermissionsMixin, GuardianUserMixin):
         if self.platform_role == 'SUPER_ADMIN' or self.is_superuser:
             return True
         
-        # Check through assigned roles
-        roles = self.get_roles(business, storefront)
-        for user_role in roles:
-            if user_role.role.has_permission(permission_codename):
-                return True
-        
-        return False
+        # Check through assigned roles (one grants load per request)
+        return self.permission_resolver.has(permission_codename, business, storefront)
     
     def has_any_permission(self, permission_codenames, business=None, storefront=None):
         """Check if user has any of the specified permissions"""
-        for codename in permission_codenames:
-            if self.has_permission(codename, business, storefront):
-                return True
-        return False
+        if self.platform_role == 'SUPER_ADMIN' or self.is_superuser:
+            return any(True for _ in permission_codenames)
+        return self.permission_resolver.has_any(permission_codenames, business, storefront)
     
     def has_all_permissions(self, permission_codenames, business=None, storefront=None):
         """Check if user has all of the specified permissions"""
-        for codename in permission_codenames:
-            if not self.has_permission(codename, business, storefront):
-                return False
-        return True
+        if self.platform_role == 'SUPER_ADMIN' or self.is_superuser:
+            return True
+        return self.permission_resolver.has_all(permission_codenames, business, storefront)
+    
+    @property
+    def permission_resolver(self):
+        """Memoized RBAC grants for this user (see accounts.permission_resolver)"""
+        from accounts.permission_resolver import get_permission_resolver
+        return get_permission_resolver(self)
     
     def assign_role(self, role, scope='BUSINESS', business=None, storefront=None, 
                    assigned_by=None, expires_at=None):
@@ -516,15 +515,8 @@ class User(AbstractBaseUser, PermissionsMixin, GuardianUserMixin):
     
     def get_all_permissions(self, business=None, storefront=None):
         """Get all permissions user has through their roles"""
-        roles = self.get_roles(business, storefront)
-        permission_ids = set()
-        
-        for user_role in roles:
-            permission_ids.update(
-                user_role.role.permissions.filter(is_active=True).values_list('id', flat=True)
-            )
-        
-        return Permission.objects.filter(id__in=permission_ids)
+        codenames = self.permission_resolver.codenames(business, storefront)
+        return Permission.objects.filter(codename__in=codenames, is_active=True)
 
 
 class EmailVerificationToken(models.Model):
@@ -0,0 +1,168 @@
+"""
+RBAC permission resolution.
+
+A user's role assignments are flattened into grants of
+``(scope, business_id, storefront_id, codename, expires_at)`` with a single
+query. Grants are memoized on the user instance (``request.user`` lives for
+one request, the same way Django's ModelBackend keeps ``_perm_cache``) and
+stored in Django's cache under versioned keys:
+
+- ``rbac:user:<id>:version`` is bumped when the user's UserRole rows change
+  (``User.assign_role``/``remove_role``, admin, RBAC views).
+- ``rbac:roles:version`` is bumped when any role's permission set changes
+  (``Role.add_permission``/``remove_permission``) or a Permission is
+  (de)activated, since that affects every holder of the role.
+
+The signal receivers in ``accounts/signals.py`` do the bumping. Expiry is
+evaluated at check time, so a cached grant stops applying as soon as its
+``expires_at`` passes.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import FrozenSet, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+Grant = Tuple[str, Optional[str], Optional[str], str, Optional[object]]
+
+ROLES_VERSION_KEY = 'rbac:roles:version'
+
+# Bumped on every local invalidation so instance memos created earlier in
+# the same process (e.g. within the request that assigned a role) are dropped
+_local_generation = 0
+
+
+def _user_version_key(user_id) -> str:
+    return f'rbac:user:{user_id}:version'
+
+
+def _new_version() -> int:
+    # Time-based so a version key evicted from the cache never restarts at a
+    # value that an older grants entry was stored under
+    return time.time_ns()
+
+
+def _bump(key: str) -> None:
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _new_version(), None)
+
+
+def _mark_local_change() -> None:
+    global _local_generation
+    _local_generation += 1
+
+
+def invalidate_user_permissions(user_id) -> None:
+    """Drop cached grants for one user after their role assignments change."""
+    _bump(_user_version_key(user_id))
+    _mark_local_change()
+
+
+def invalidate_role_permissions() -> None:
+    """Drop cached grants for every user after a role's permissions change."""
+    _bump(ROLES_VERSION_KEY)
+    _mark_local_change()
+
+
+def _pk(value) -> Optional[str]:
+    """Normalise a model instance, UUID or string id for comparison."""
+    if not value:
+        return None
+    return str(getattr(value, 'pk', value))
+
+
+class PermissionResolver:
+    """Answers ``has_permission``-style questions for one user from a single grants load."""
+
+    def __init__(self, user):
+        self.user = user
+        self._grants: Optional[List[Grant]] = None
+        # Results of UnifiedPermissionService.check for this user, shared by
+        # every service instance created while this resolver is current
+        self.check_results = {}
+
+    @property
+    def grants(self) -> List[Grant]:
+        if self._grants is None:
+            self._grants = self._load_grants()
+        return self._grants
+
+    def _cache_key(self) -> str:
+        user_key = _user_version_key(self.user.pk)
+        versions = cache.get_many([user_key, ROLES_VERSION_KEY])
+        for key in (user_key, ROLES_VERSION_KEY):
+            if key not in versions:
+                cache.add(key, _new_version(), None)
+                versions[key] = cache.get(key)
+        return f'rbac:grants:{self.user.pk}:{versions[user_key]}:{versions[ROLES_VERSION_KEY]}'
+
+    def _load_grants(self) -> List[Grant]:
+        from accounts.models import UserRole
+
+        cache_key = self._cache_key()
+        grants = cache.get(cache_key)
+        if grants is not None:
+            return grants
+
+        rows = UserRole.objects.filter(
+            user_id=self.user.pk,
+            is_active=True,
+            role__permissions__is_active=True,
+        ).values_list(
+            'scope', 'business_id', 'storefront_id', 'role__permissions__codename', 'expires_at',
+        )
+        grants = [
+            (scope, _pk(business_id), _pk(storefront_id), codename, expires_at)
+            for scope, business_id, storefront_id, codename, expires_at in rows
+        ]
+        cache.set(cache_key, grants, getattr(settings, 'RBAC_PERMISSION_CACHE_TIMEOUT', 3600))
+        return grants
+
+    def codenames(self, business=None, storefront=None) -> FrozenSet[str]:
+        """
+        Permission codenames granted in the given scope.
+
+        Matches ``User.get_roles``: a business or storefront filter keeps
+        assignments for that object plus PLATFORM-scoped ones.
+        """
+        business_id = _pk(business)
+        storefront_id = _pk(storefront)
+        now = timezone.now()
+
+        granted = set()
+        for scope, grant_business, grant_storefront, codename, expires_at in self.grants:
+            if expires_at is not None and expires_at <= now:
+                continue
+            if scope != 'PLATFORM':
+                if business_id is not None and grant_business != business_id:
+                    continue
+                if storefront_id is not None and grant_storefront != storefront_id:
+                    continue
+            granted.add(codename)
+        return frozenset(granted)
+
+    def has(self, codename: str, business=None, storefront=None) -> bool:
+        return codename in self.codenames(business, storefront)
+
+    def has_any(self, codenames: Iterable[str], business=None, storefront=None) -> bool:
+        granted = self.codenames(business, storefront)
+        return any(codename in granted for codename in codenames)
+
+    def has_all(self, codenames: Iterable[str], business=None, storefront=None) -> bool:
+        granted = self.codenames(business, storefront)
+        return all(codename in granted for codename in codenames)
+
+
+def get_permission_resolver(user) -> PermissionResolver:
+    """Resolver memoized on ``user`` until the next local invalidation."""
+    memo = getattr(user, '_rbac_resolver', None)
+    if memo is None or memo[0] != _local_generation:
+        memo = (_local_generation, PermissionResolver(user))
+        user._rbac_resolver = memo
+    return memo[1]
@@ -29,7 +29,7 @@ Usage Examples:
     )
 """
 
-from typing import Optional, Any, List, Union
+from typing import Optional, Any, FrozenSet, List, Union
 from django.db import models
 from django.contrib.auth.models import AnonymousUser
 from guardian.shortcuts import get_objects_for_user
@@ -60,7 +60,41 @@ class UnifiedPermissionService:
             user: User instance or AnonymousUser
         """
         self.user = user
-        self._cache = {}  # Cache permission checks for performance
+    
+    @property
+    def _cache(self) -> dict:
+        """
+        Check results memoized on the user's permission resolver.
+        
+        Shared by every service created for the same ``request.user`` and
+        dropped whenever roles or role permissions change.
+        """
+        return self.resolver.check_results
+    
+    @property
+    def resolver(self):
+        """The user's request-scoped RBAC resolver (accounts.permission_resolver)"""
+        from accounts.permission_resolver import get_permission_resolver
+        return get_permission_resolver(self.user)
+    
+    def get_rbac_permissions(self, business: Optional[Any] = None, storefront: Optional[Any] = None) -> FrozenSet[str]:
+        """
+        RBAC permission codenames the user holds in the given scope.
+        
+        Platform roles are not expanded here; use check() for a full decision.
+        """
+        if not self.user or not self.user.is_authenticated:
+            return frozenset()
+        return self.resolver.codenames(business, storefront)
+    
+    @staticmethod
+    def _cache_key_part(value: Optional[Any]):
+        """Stable identity for a context object (model label + pk rather than id())"""
+        if value is None:
+            return None
+        if isinstance(value, models.Model):
+            return (value._meta.label, value.pk if value.pk is not None else id(value))
+        return str(value)
     
     def check(
         self, 
@@ -100,7 +134,12 @@ class UnifiedPermissionService:
             return False
         
         # Cache key for performance
-        cache_key = f"{permission}:{id(obj)}:{id(business)}:{id(storefront)}"
+        cache_key = (
+            permission,
+            self._cache_key_part(obj),
+            self._cache_key_part(business),
+            self._cache_key_part(storefront),
+        )
         if cache_key in self._cache:
             return self._cache[cache_key]
         
@@ -216,7 +255,7 @@ class UnifiedPermissionService:
         else:
             codename = permission
         
-        return self.user.has_permission(codename, business, storefront)
+        return self.resolver.has(codename, business, storefront)
     
     def _check_rules_permission(self, permission: str, obj: Optional[Any]) -> bool:
         """
@@ -379,8 +418,8 @@ class UnifiedPermissionService:
         return membership.role if membership else None
     
     def clear_cache(self):
-        """Clear permission cache (call after role changes)"""
-        self._cache.clear()
+        """Clear permission cache (role changes already do this via signals)"""
+        self.user.__dict__.pop('_rbac_resolver', None)
 
 
 # Convenience functions for common operations
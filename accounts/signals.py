@@ -3,7 +3,7 @@ from typing import Sequence, Tuple
 
 from django.apps import apps
 from django.conf import settings
-from django.db.models.signals import post_migrate, post_save
+from django.db.models.signals import m2m_changed, post_delete, post_migrate, post_save
 from django.dispatch import receiver
 
 logger = logging.getLogger(__name__)
@@ -108,3 +108,32 @@ def create_walk_in_customer(sender, instance, created, **kwargs):
         logger.info(f'Created walk-in customer for business: {instance.name}')
     except Exception as e:
         logger.error(f'Failed to create walk-in customer for business {instance.name}: {e}')
+
+
+@receiver(post_save, sender='accounts.UserRole')
+@receiver(post_delete, sender='accounts.UserRole')
+def invalidate_user_role_permissions(sender, instance, **kwargs):
+    """Role assigned, changed or removed: the user's cached RBAC grants are stale."""
+    from accounts.permission_resolver import invalidate_user_permissions
+
+    invalidate_user_permissions(instance.user_id)
+
+
+@receiver(m2m_changed, sender='accounts.Role_permissions')
+def invalidate_role_permission_grants(sender, action, **kwargs):
+    """A role gained or lost permissions: every holder's cached grants are stale."""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    from accounts.permission_resolver import invalidate_role_permissions
+
+    invalidate_role_permissions()
+
+
+@receiver(post_save, sender='accounts.Permission')
+@receiver(post_delete, sender='accounts.Permission')
+def invalidate_permission_grants(sender, instance, **kwargs):
+    """Permission edited, (de)activated or deleted."""
+    from accounts.permission_resolver import invalidate_role_permissions
+
+    invalidate_role_permissions()
@@ -0,0 +1,113 @@
+"""
+Tests for the request-scoped RBAC permission resolver
+
+Run with: python manage.py test accounts.tests.test_permission_resolver
+"""
+
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from accounts.models import Business, Permission, Role
+from accounts.permissions import UnifiedPermissionService
+
+User = get_user_model()
+
+
+class PermissionResolverTests(TestCase):
+    """User.has_permission and friends answered from one grants load"""
+
+    def setUp(self):
+        self.user = User.objects.create(email='cashier@test.com', name='Cashier')
+        self.business = Business.objects.create(name='Resolver Business', email='resolver@test.com')
+        self.other_business = Business.objects.create(name='Other Business', email='other@test.com')
+
+        for codename in ('can_create_sale', 'can_refund_sale', 'can_view_reports'):
+            Permission.objects.create(
+                name=codename.replace('_', ' ').title(),
+                codename=codename,
+                category='SALES',
+                action='CREATE',
+                resource='sale',
+            )
+        self.role = Role.objects.create(name='Resolver Cashier')
+        self.role.add_permission('can_create_sale')
+        self.role.add_permission('can_refund_sale')
+        self.user.assign_role(self.role, business=self.business)
+
+    def _fresh_user(self):
+        """A new instance, as the next request would load it"""
+        return User.objects.get(pk=self.user.pk)
+
+    def test_checks_share_one_query_per_request(self):
+        cache.clear()
+        user = self._fresh_user()
+
+        with self.assertNumQueries(1):
+            self.assertTrue(user.has_permission('can_create_sale', business=self.business))
+            self.assertFalse(user.has_permission('can_view_reports', business=self.business))
+            self.assertTrue(user.has_any_permission(['can_view_reports', 'can_refund_sale'], business=self.business))
+            self.assertFalse(user.has_all_permissions(['can_create_sale', 'can_view_reports'], business=self.business))
+
+        # The next request reads the grants from Django's cache
+        with self.assertNumQueries(0):
+            self.assertTrue(self._fresh_user().has_permission('can_refund_sale', business=self.business))
+
+    def test_scope_filters_match_get_roles(self):
+        platform_role = Role.objects.create(name='Resolver Auditor', level='PLATFORM')
+        platform_role.add_permission('can_view_reports')
+        self.user.assign_role(platform_role, scope='PLATFORM')
+
+        user = self._fresh_user()
+        self.assertTrue(user.has_permission('can_create_sale'))
+        self.assertFalse(user.has_permission('can_create_sale', business=self.other_business))
+        self.assertTrue(user.has_permission('can_view_reports', business=self.other_business))
+        self.assertEqual(
+            set(user.get_all_permissions(business=self.other_business).values_list('codename', flat=True)),
+            {'can_view_reports'},
+        )
+
+    def test_role_and_permission_changes_invalidate_cached_grants(self):
+        user = self._fresh_user()
+        self.assertFalse(user.has_permission('can_view_reports', business=self.business))
+
+        self.role.add_permission('can_view_reports')
+        self.assertTrue(user.has_permission('can_view_reports', business=self.business))
+        self.assertTrue(self._fresh_user().has_permission('can_view_reports', business=self.business))
+
+        self.role.remove_permission('can_create_sale')
+        self.assertFalse(self._fresh_user().has_permission('can_create_sale', business=self.business))
+
+        user.remove_role(self.role, business=self.business)
+        self.assertFalse(user.has_permission('can_refund_sale', business=self.business))
+        self.assertFalse(self._fresh_user().has_permission('can_refund_sale', business=self.business))
+
+    def test_expiry_is_checked_against_cached_grants(self):
+        user_role = self.user.user_roles.get(role=self.role)
+        user_role.expires_at = timezone.now() + timedelta(minutes=5)
+        user_role.save()
+
+        user = self._fresh_user()
+        self.assertTrue(user.has_permission('can_create_sale', business=self.business))
+
+        later = timezone.now() + timedelta(minutes=10)
+        with mock.patch('accounts.permission_resolver.timezone.now', return_value=later):
+            self.assertFalse(user.has_permission('can_create_sale', business=self.business))
+
+    def test_unified_service_exposes_resolver(self):
+        service = UnifiedPermissionService(self._fresh_user())
+
+        self.assertEqual(
+            service.get_rbac_permissions(business=self.business),
+            frozenset({'can_create_sale', 'can_refund_sale'}),
+        )
+        self.assertTrue(service.check('sales.can_create_sale', business=self.business))
+        # Results are keyed by primary key, so another instance of the same
+        # business hits the cached entry
+        same_business = Business.objects.get(pk=self.business.pk)
+        with self.assertNumQueries(0):
+            self.assertTrue(service.check('sales.can_create_sale', business=same_business))
@@ -13,8 +13,8 @@ class BusinessAICreditsAdmin(admin.ModelAdmin):
 
 @admin.register(AITransaction)
 class AITransactionAdmin(admin.ModelAdmin):
-    list_display = ['business', 'feature', 'credits_used', 'success', 'timestamp']
-    list_filter = ['feature', 'success', 'timestamp']
+    list_display = ['business', 'feature', 'credits_used', 'success', 'cache_hit', 'timestamp']
+    list_filter = ['feature', 'success', 'cache_hit', 'timestamp']
     search_fields = ['business__name', 'feature']
     readonly_fields = ['id', 'timestamp']
     ordering = ['-timestamp']
@@ -0,0 +1,82 @@
+"""
+Load-test chat completions against the local OpenAI stub server
+
+Usage:
+    python manage.py benchmark_openai_async
+    python manage.py benchmark_openai_async --requests 500 --threads 100 --businesses 5 --latency 0.2
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ai_features.services.async_openai import ASYNC_OPENAI_AVAILABLE, AsyncCompletionRunner
+from ai_features.stub_openai import StubOpenAIServer
+
+
+class Command(BaseCommand):
+    """Compare the blocking client with the pooled async runner, without network."""
+
+    help = (
+        "Send the same burst of chat completions through the blocking OpenAI client "
+        "and through the async runner, against an in-process stub server, and report "
+        "throughput, peak provider concurrency and connections opened."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200, help="Completions per mode.")
+        parser.add_argument("--threads", type=int, default=50, help="Concurrent callers (e.g. web workers).")
+        parser.add_argument("--businesses", type=int, default=5, help="Businesses the requests are spread over.")
+        parser.add_argument("--latency", type=float, default=0.2, help="Stub seconds per completion.")
+        parser.add_argument(
+            "--max-concurrency",
+            type=int,
+            default=4,
+            help="Async mode: requests in flight per business.",
+        )
+
+    def handle(self, *args, **options):
+        if not ASYNC_OPENAI_AVAILABLE:
+            raise CommandError("OpenAI package not installed. Run: pip install openai httpx")
+
+        from openai import OpenAI
+
+        request_kwargs = {
+            "model": "gpt-4o-mini",
+            "messages": [{"role": "user", "content": "Summarise today's sales."}],
+            "temperature": 0.3,
+        }
+        businesses = [f"business-{index}" for index in range(max(1, options["businesses"]))]
+
+        self.stdout.write(
+            f"{'mode':>6} {'requests':>9} {'seconds':>8} {'req/s':>8} {'peak':>6} {'conns':>6}"
+        )
+
+        with StubOpenAIServer(latency=options["latency"]) as stub:
+            client = OpenAI(api_key="stub", base_url=stub.base_url, max_retries=0)
+            self._run("sync", stub, options, lambda _: client.chat.completions.create(**request_kwargs))
+
+        with StubOpenAIServer(latency=options["latency"]) as stub:
+            runner = AsyncCompletionRunner(
+                api_key="stub",
+                base_url=stub.base_url,
+                max_concurrency=options["max_concurrency"],
+            )
+            self._run(
+                "async",
+                stub,
+                options,
+                lambda index: runner.run(request_kwargs, businesses[index % len(businesses)]),
+            )
+
+    def _run(self, mode, stub, options, call):
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, options["threads"])) as pool:
+            list(pool.map(call, range(options["requests"])))
+        elapsed = time.perf_counter() - start
+
+        self.stdout.write(
+            f"{mode:>6} {options['requests']:>9} {elapsed:>8.2f} "
+            f"{options['requests'] / elapsed:>8.1f} {stub.peak_concurrency:>6} {stub.connections:>6}"
+        )
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-17 00:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_features', '0002_aicreditpurchase_gateway_response'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aitransaction',
+            name='cache_hit',
+            field=models.BooleanField(default=False, help_text='Served from the AI response cache instead of the provider'),
+        ),
+        migrations.AddField(
+            model_name='aitransaction',
+            name='latency_saved_ms',
+            field=models.IntegerField(default=0, help_text='Provider time avoided by serving from the cache, in milliseconds'),
+        ),
+    ]
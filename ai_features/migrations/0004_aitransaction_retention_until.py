@@ -0,0 +1,35 @@
+# Generated by Django 5.2.6 on 2026-10-16 23:24
+
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_retention_until(apps, schema_editor):
+    # Same 90-day window AITransaction.save() applies to new rows
+    AITransaction = apps.get_model('ai_features', 'AITransaction')
+    AITransaction.objects.filter(retention_until__isnull=True).update(
+        retention_until=F('timestamp') + timedelta(days=90)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_features', '0003_aitransaction_cache_hit'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aitransaction',
+            name='retention_until',
+            field=models.DateTimeField(db_index=True, null=True, help_text='GDPR retention date - auto-delete after this date'),
+        ),
+        migrations.RunPython(backfill_retention_until, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='aitransaction',
+            name='retention_until',
+            field=models.DateTimeField(db_index=True, help_text='GDPR retention date - auto-delete after this date'),
+        ),
+    ]
@@ -136,6 +136,14 @@ class AITransaction(models.Model):
         default=0,
         help_text="Time taken to process request in milliseconds"
     )
+    cache_hit = models.BooleanField(
+        default=False,
+        help_text="Served from the AI response cache instead of the provider"
+    )
+    latency_saved_ms = models.IntegerField(
+        default=0,
+        help_text="Provider time avoided by serving from the cache, in milliseconds"
+    )
     retention_until = models.DateTimeField(
         help_text="GDPR retention date - auto-delete after this date",
         db_index=True
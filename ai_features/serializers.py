@@ -189,6 +189,10 @@ class InventoryForecastRequestSerializer(serializers.Serializer):
     warehouse_id = serializers.UUIDField(required=False, allow_null=True)
     category_id = serializers.UUIDField(required=False, allow_null=True)
     forecast_days = serializers.IntegerField(default=30, min_value=15, max_value=90)
+    use_ai = serializers.BooleanField(
+        default=True,
+        help_text="False returns the deterministic reorder suggestions without an AI call (no credits charged)"
+    )
 
 
 class AIUsageStatsSerializer(serializers.Serializer):
@@ -202,4 +206,7 @@ class AIUsageStatsSerializer(serializers.Serializer):
     total_credits_used = serializers.DecimalField(max_digits=10, decimal_places=2)
     total_cost_ghs = serializers.DecimalField(max_digits=10, decimal_places=4)
     avg_processing_time_ms = serializers.IntegerField()
+    cache_hits = serializers.IntegerField()
+    cache_hit_rate = serializers.FloatField()
+    latency_saved_ms = serializers.IntegerField()
     feature_breakdown = serializers.ListField()
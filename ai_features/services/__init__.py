@@ -1,7 +1,9 @@
 # AI Services Package
 from .billing import AIBillingService, InsufficientCreditsException
-from .openai_service import OpenAIService, get_openai_service, OpenAIServiceError
+from .openai_service import OpenAIService, get_openai_service, OpenAIServiceError, AIResultPending
+from .async_openai import AsyncCompletionRunner, get_async_runner
 from .query_intelligence import QueryIntelligenceService
+from .inventory_forecast import InventoryForecastEngine
 from .paystack import PaystackService, PaystackException, generate_payment_reference
 
 __all__ = [
@@ -10,7 +12,11 @@ __all__ = [
     'OpenAIService',
     'get_openai_service',
     'OpenAIServiceError',
+    'AIResultPending',
+    'AsyncCompletionRunner',
+    'get_async_runner',
     'QueryIntelligenceService',
+    'InventoryForecastEngine',
     'PaystackService',
     'PaystackException',
     'generate_payment_reference',
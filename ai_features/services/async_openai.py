@@ -0,0 +1,187 @@
+"""
+Async OpenAI Runner
+Runs chat completions with ``AsyncOpenAI`` on one background event loop per
+process. All requests share a pooled ``httpx.AsyncClient``, so concurrent
+completions reuse keep-alive connections instead of each opening its own,
+and a blocked request no longer ties up anything but its caller.
+
+- at most ``max_concurrency`` requests are in flight per business
+- every attempt has a connect and a read timeout
+- timeouts, connection errors, 429 and 5xx responses are retried with
+  exponential backoff and jitter
+"""
+
+import asyncio
+import concurrent.futures
+import os
+import random
+import threading
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+
+try:
+    import httpx
+    from openai import APIConnectionError, AsyncOpenAI, InternalServerError, RateLimitError
+    ASYNC_OPENAI_AVAILABLE = True
+    # APITimeoutError is a subclass of APIConnectionError
+    RETRYABLE_ERRORS = (APIConnectionError, InternalServerError, RateLimitError)
+except ImportError:  # pragma: no cover - handled via sync/mock mode
+    ASYNC_OPENAI_AVAILABLE = False
+    httpx = None
+    AsyncOpenAI = None
+    RETRYABLE_ERRORS = ()
+
+
+class AsyncCompletionRunner:
+    """Pooled, per-business bounded chat completions on a shared event loop"""
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: Optional[str] = None,
+        organization: Optional[str] = None,
+        max_concurrency: int = 4,
+        max_connections: int = 50,
+        timeout: float = 60.0,
+        connect_timeout: float = 5.0,
+        max_retries: int = 2,
+        backoff_base: float = 0.5
+    ) -> None:
+        """
+        Initialize the runner (the loop and client are created on first use)
+
+        Args:
+            api_key: OpenAI API key
+            base_url: Optional OpenAI-compatible endpoint, e.g. the stub server
+            organization: Optional OpenAI organization
+            max_concurrency: Requests in flight per business
+            max_connections: Pooled connections per process
+            timeout: Read timeout of one attempt, in seconds
+            connect_timeout: Connect timeout of one attempt, in seconds
+            max_retries: Retries after the first attempt for transient errors
+            backoff_base: Delay before the first retry; doubles on each retry
+        """
+        if not ASYNC_OPENAI_AVAILABLE:
+            raise ImportError("OpenAI package not installed. Run: pip install openai httpx")
+
+        self.api_key = api_key
+        self.base_url = base_url or None
+        self.organization = organization or None
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_connections = max(1, max_connections)
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.max_retries = max(0, max_retries)
+        self.backoff_base = backoff_base
+
+        self._lock = threading.Lock()
+        self._pid = None
+        self._loop = None
+        self._client = None
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            # A forked worker cannot reuse its parent's loop thread or sockets
+            if self._loop is None or self._pid != os.getpid():
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name='openai-async', daemon=True).start()
+                self._loop = loop
+                self._pid = os.getpid()
+                self._client = None
+                self._semaphores = {}
+            return self._loop
+
+    def _get_client(self):
+        # Only touched from the loop thread, like the semaphores
+        if self._client is None:
+            timeout = httpx.Timeout(self.timeout, connect=self.connect_timeout)
+            http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                ),
+                timeout=timeout,
+            )
+            self._client = AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                organization=self.organization,
+                http_client=http_client,
+                timeout=timeout,
+                max_retries=0,  # Retried below, inside the business's slot
+            )
+        return self._client
+
+    def _semaphore(self, business_id: Optional[str]) -> asyncio.Semaphore:
+        key = str(business_id or '')
+        semaphore = self._semaphores.get(key)
+        if semaphore is None:
+            semaphore = self._semaphores[key] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+    def _backoff(self, attempt: int) -> float:
+        delay = self.backoff_base * (2 ** attempt)
+        return delay + random.uniform(0, delay)
+
+    async def create(self, request_kwargs: Dict[str, Any], business_id: Optional[str] = None):
+        """
+        Create a chat completion; must run on the runner's loop (see ``run``)
+
+        Args:
+            request_kwargs: Arguments for ``chat.completions.create``
+            business_id: Business whose concurrency slots the request uses
+
+        Returns:
+            The OpenAI ``ChatCompletion`` response
+        """
+        client = self._get_client()
+        async with self._semaphore(business_id):
+            attempt = 0
+            while True:
+                try:
+                    return await client.chat.completions.create(**request_kwargs)
+                except RETRYABLE_ERRORS:
+                    if attempt >= self.max_retries:
+                        raise
+                    await asyncio.sleep(self._backoff(attempt))
+                    attempt += 1
+
+    def run(self, request_kwargs: Dict[str, Any], business_id: Optional[str] = None):
+        """Blocking bridge for sync callers: run ``create`` on the shared loop"""
+        future = asyncio.run_coroutine_threadsafe(
+            self.create(request_kwargs, business_id),
+            self._ensure_loop()
+        )
+        # Every attempt at its full timeout; time queued for a slot counts too
+        wait = (self.timeout + self.connect_timeout) * (self.max_retries + 1)
+        try:
+            return future.result(timeout=wait)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise TimeoutError(f"No completion within {wait:.0f}s")
+
+
+# Process-wide instance
+_async_runner = None
+_async_runner_lock = threading.Lock()
+
+
+def get_async_runner() -> AsyncCompletionRunner:
+    """Get or create the process-wide async runner from settings"""
+    global _async_runner
+    with _async_runner_lock:
+        if _async_runner is None:
+            _async_runner = AsyncCompletionRunner(
+                api_key=getattr(settings, 'OPENAI_API_KEY', ''),
+                base_url=getattr(settings, 'OPENAI_BASE_URL', ''),
+                organization=getattr(settings, 'OPENAI_ORGANIZATION', ''),
+                max_concurrency=getattr(settings, 'OPENAI_ASYNC_MAX_CONCURRENCY_PER_BUSINESS', 4),
+                max_connections=getattr(settings, 'OPENAI_ASYNC_MAX_CONNECTIONS', 50),
+                timeout=getattr(settings, 'OPENAI_ASYNC_TIMEOUT', 60.0),
+                connect_timeout=getattr(settings, 'OPENAI_ASYNC_CONNECT_TIMEOUT', 5.0),
+                max_retries=getattr(settings, 'OPENAI_ASYNC_MAX_RETRIES', 2),
+                backoff_base=getattr(settings, 'OPENAI_ASYNC_BACKOFF_BASE', 0.5),
+            )
+        return _async_runner
@@ -6,6 +6,7 @@ Handles AI credit checking, charging, and validation for all AI features.
 from decimal import Decimal
 from typing import Optional, Dict, Any
 from datetime import timedelta
+from django.conf import settings
 from django.utils import timezone
 from django.db import transaction
 from django.db.models import Sum, Count, Avg, Q
@@ -106,12 +107,28 @@ class AIBillingService:
         user_id: Optional[str] = None,
         request_data: Optional[Dict] = None,
         response_summary: str = "",
-        processing_time_ms: int = 0
+        processing_time_ms: int = 0,
+        cache_hit: bool = False,
+        latency_saved_ms: int = 0
     ) -> Dict[str, Any]:
         """
         Deduct credits after successful AI call
         Returns dict with transaction details and updated balance
+        
+        Responses served from the AI response cache (``cache_hit``) are logged
+        but not charged unless AI_CHARGE_CACHED_RESPONSES is enabled.
         """
+        if cache_hit and not getattr(settings, 'AI_CHARGE_CACHED_RESPONSES', False):
+            return cls._log_cached_transaction(
+                business_id=business_id,
+                feature=feature,
+                user_id=user_id,
+                request_data=request_data,
+                response_summary=response_summary,
+                processing_time_ms=processing_time_ms,
+                latency_saved_ms=latency_saved_ms,
+            )
+        
         # Get active credits (lock for update)
         credits = BusinessAICredits.objects.select_for_update().filter(
             business_id=business_id,
@@ -149,7 +166,9 @@ class AIBillingService:
             success=True,
             request_data=request_data or {},
             response_summary=response_summary[:500],  # Limit to 500 chars
-            processing_time_ms=processing_time_ms
+            processing_time_ms=processing_time_ms,
+            cache_hit=cache_hit,
+            latency_saved_ms=latency_saved_ms
         )
         
         # Check if we need to send low credit alert
@@ -163,6 +182,41 @@ class AIBillingService:
             'actual_cost_ghs': float(actual_openai_cost)
         }
     
+    @classmethod
+    def _log_cached_transaction(
+        cls,
+        business_id: str,
+        feature: str,
+        user_id: Optional[str],
+        request_data: Optional[Dict],
+        response_summary: str,
+        processing_time_ms: int,
+        latency_saved_ms: int
+    ) -> Dict[str, Any]:
+        """Log a cache-served AI response without deducting credits"""
+        balance = cls.get_credit_balance(business_id)
+        transaction_record = AITransaction.objects.create(
+            business_id=business_id,
+            user_id=user_id,
+            feature=feature,
+            credits_used=Decimal('0.00'),
+            cost_to_us=Decimal('0.00'),
+            tokens_used=0,
+            success=True,
+            request_data=request_data or {},
+            response_summary=response_summary[:500],
+            processing_time_ms=processing_time_ms,
+            cache_hit=True,
+            latency_saved_ms=latency_saved_ms
+        )
+        return {
+            'transaction_id': str(transaction_record.id),
+            'old_balance': float(balance),
+            'new_balance': float(balance),
+            'credits_charged': 0.0,
+            'actual_cost_ghs': 0.0
+        }
+    
     @classmethod
     def log_failed_transaction(
         cls,
@@ -265,7 +319,9 @@ class AIBillingService:
             successful_requests=Count('id', filter=Q(success=True)),
             total_credits_used=Sum('credits_used'),
             total_cost_to_us=Sum('cost_to_us'),
-            avg_processing_time=Avg('processing_time_ms')
+            avg_processing_time=Avg('processing_time_ms'),
+            cache_hits=Count('id', filter=Q(success=True, cache_hit=True)),
+            latency_saved=Sum('latency_saved_ms')
         )
         
         # Feature breakdown
@@ -286,6 +342,9 @@ class AIBillingService:
             'total_credits_used': float(stats['total_credits_used'] or 0),
             'total_cost_ghs': float(stats['total_cost_to_us'] or 0),
             'avg_processing_time_ms': int(stats['avg_processing_time'] or 0),
+            'cache_hits': stats['cache_hits'] or 0,
+            'cache_hit_rate': round((stats['cache_hits'] or 0) / stats['successful_requests'], 4) if stats['successful_requests'] else 0.0,
+            'latency_saved_ms': int(stats['latency_saved'] or 0),
             'feature_breakdown': [
                 {
                     'feature': item['feature'],
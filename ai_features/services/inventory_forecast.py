@@ -0,0 +1,213 @@
+"""
+Inventory Forecast Engine
+Computes demand velocity, trend, days of cover and reorder suggestions for
+every product of a business from a fixed number of grouped queries:
+
+- products, with the latest unit cost as a correlated subquery
+- stock on hand per product (one GROUP BY)
+- weekly units sold per product over the analysis window (one GROUP BY)
+
+The figures are then derived column by column over all products at once.
+The results can be returned directly (deterministic reorder suggestions, no
+AI call) or used as the context for the AI forecast.
+"""
+
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from django.db.models import DecimalField, Exists, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, TruncWeek
+from django.utils import timezone
+
+from inventory.models import Product, StockProduct
+from sales.models import SaleItem
+
+
+class InventoryForecastEngine:
+    """Deterministic demand forecast for a business's products"""
+
+    ANALYSIS_DAYS = 90
+    LEAD_TIME_DAYS = 7  # Assumed supplier lead time
+    SAFETY_STOCK_WEEKS = 1  # Safety stock equals one week of demand
+    DEFAULT_REORDER_POINT = 10
+
+    # Second-half vs first-half weekly average that counts as a trend
+    TREND_UP_RATIO = 1.2
+    TREND_DOWN_RATIO = 0.8
+
+    RISK_ORDER = {'critical': 0, 'high': 1, 'medium': 2, 'low': 3}
+
+    def __init__(self, business_id: str, warehouse=None, category=None, forecast_days: int = 30):
+        """
+        Initialize the forecast engine
+
+        Args:
+            business_id: Business UUID
+            warehouse: Optional Warehouse to restrict stock and sales to
+            category: Optional Category to restrict products to
+            forecast_days: Horizon the reorder quantity must cover
+        """
+        self.business_id = business_id
+        self.warehouse = warehouse
+        self.category = category
+        self.forecast_days = forecast_days
+        self.today = timezone.now().date()
+        self.analysis_start = timezone.now() - timedelta(days=self.ANALYSIS_DAYS)
+        self.total_weeks = max(1, int(self.ANALYSIS_DAYS / 7))
+
+    # ------------------------------------------------------------------
+    # Data loading
+    # ------------------------------------------------------------------
+
+    def _products(self) -> List[Dict[str, Any]]:
+        stock_items = StockProduct.objects.filter(product_id=OuterRef('pk'))
+        if self.warehouse:
+            stock_items = stock_items.filter(warehouse=self.warehouse)
+        latest_cost = stock_items.order_by('-created_at', '-pk').values('unit_cost')[:1]
+
+        products = Product.objects.filter(business_id=self.business_id, is_active=True)
+        if self.category:
+            products = products.filter(category=self.category)
+        if self.warehouse:
+            products = products.filter(Exists(stock_items))
+
+        return list(
+            products.annotate(
+                latest_unit_cost=Coalesce(
+                    Subquery(latest_cost),
+                    Value(Decimal('0.00')),
+                    output_field=DecimalField(max_digits=12, decimal_places=2),
+                )
+            )
+            .order_by('name', 'pk')
+            .values('id', 'name', 'sku', 'latest_unit_cost')
+        )
+
+    def _stock_on_hand(self, product_ids: List) -> Dict[Any, float]:
+        stock = StockProduct.objects.filter(product_id__in=product_ids)
+        if self.warehouse:
+            stock = stock.filter(warehouse=self.warehouse)
+        rows = stock.order_by().values('product_id').annotate(total=Sum('calculated_quantity'))
+        return {row['product_id']: float(row['total'] or 0) for row in rows}
+
+    def _weekly_sales(self, product_ids: List) -> Dict[Any, List[Dict[str, Any]]]:
+        sales = SaleItem.objects.filter(product_id__in=product_ids, sale__created_at__gte=self.analysis_start)
+        if self.warehouse:
+            sales = sales.filter(stock_product__warehouse=self.warehouse)
+        rows = (
+            sales.annotate(week=TruncWeek('sale__created_at'))
+            .values('product_id', 'week')
+            .annotate(units_sold=Sum('quantity'))
+            .order_by('product_id', 'week')
+        )
+        weekly = defaultdict(list)
+        for row in rows:
+            weekly[row['product_id']].append({
+                'week_start': row['week'].date().isoformat() if row['week'] else None,
+                'units_sold': round(float(row['units_sold'] or 0), 2),
+            })
+        return weekly
+
+    # ------------------------------------------------------------------
+    # Forecast
+    # ------------------------------------------------------------------
+
+    def _trend(self, units: List[float]) -> str:
+        if len(units) < 4:
+            return 'stable'
+        midpoint = len(units) // 2
+        first_avg = sum(units[:midpoint]) / midpoint
+        second_avg = sum(units[midpoint:]) / (len(units) - midpoint)
+        if second_avg > first_avg * self.TREND_UP_RATIO:
+            return 'increasing'
+        if second_avg < first_avg * self.TREND_DOWN_RATIO:
+            return 'decreasing'
+        return 'stable'
+
+    def _risk_level(self, days_of_cover: Optional[float]) -> str:
+        if days_of_cover is None:
+            return 'low'
+        if days_of_cover <= self.LEAD_TIME_DAYS:
+            return 'critical'
+        if days_of_cover <= self.LEAD_TIME_DAYS + 7 * self.SAFETY_STOCK_WEEKS:
+            return 'high'
+        if days_of_cover <= self.forecast_days:
+            return 'medium'
+        return 'low'
+
+    def build(self) -> List[Dict[str, Any]]:
+        """
+        Forecast every product with sales in the analysis window.
+
+        Returns:
+            List of forecasts ordered by risk (most urgent first), then by
+            days of cover
+        """
+        products = self._products()
+        product_ids = [product['id'] for product in products]
+        if not product_ids:
+            return []
+
+        stock_by_product = self._stock_on_hand(product_ids)
+        weekly_by_product = self._weekly_sales(product_ids)
+
+        # Products that sold in the window, with their columns aligned by index
+        sold = [product for product in products if product['id'] in weekly_by_product]
+        history = [weekly_by_product[product['id']] for product in sold]
+        units = [[week['units_sold'] for week in weeks] for weeks in history]
+        stock = [max(stock_by_product.get(product['id'], 0.0), 0.0) for product in sold]
+
+        weekly_velocity = [round(sum(series) / self.total_weeks, 2) for series in units]
+        daily_demand = [velocity / 7 for velocity in weekly_velocity]
+        trend = [self._trend(series) for series in units]
+        days_of_cover = [
+            round(on_hand / demand, 1) if demand > 0 else None
+            for on_hand, demand in zip(stock, daily_demand)
+        ]
+        # Demand over the horizon plus lead time, plus safety stock, less stock on hand
+        target_stock = [
+            demand * (self.forecast_days + self.LEAD_TIME_DAYS) + velocity * self.SAFETY_STOCK_WEEKS
+            for demand, velocity in zip(daily_demand, weekly_velocity)
+        ]
+        reorder_quantity = [
+            float(max(0, round(target - on_hand)))
+            for target, on_hand in zip(target_stock, stock)
+        ]
+        # Share of analysed weeks with any sales: sparse history means a less reliable rate
+        confidence = [round(min(1.0, len(series) / self.total_weeks), 2) for series in units]
+        risk = [self._risk_level(cover) for cover in days_of_cover]
+
+        forecasts = []
+        for idx, product in enumerate(sold):
+            cover = days_of_cover[idx]
+            stockout_date = self.today + timedelta(days=int(cover)) if cover is not None else None
+            reorder_date = None
+            if reorder_quantity[idx] > 0:
+                reorder_date = max(self.today, stockout_date - timedelta(days=self.LEAD_TIME_DAYS)) if stockout_date else self.today
+
+            forecasts.append({
+                'product_id': str(product['id']),
+                'product_name': product['name'],
+                'sku': product['sku'],
+                'current_stock': round(stock[idx], 2),
+                'reorder_point': float(self.DEFAULT_REORDER_POINT),
+                'weekly_velocity': weekly_velocity[idx],
+                'trend': trend[idx],
+                'sales_history': history[idx],
+                'unit_cost': float(product['latest_unit_cost']),
+                'days_of_cover': cover,
+                'predicted_stockout_date': stockout_date.isoformat() if stockout_date else None,
+                'days_until_stockout': int(cover) if cover is not None else None,
+                'recommended_reorder_quantity': reorder_quantity[idx],
+                'recommended_reorder_date': reorder_date.isoformat() if reorder_date else None,
+                'confidence_score': confidence[idx],
+                'risk_level': risk[idx],
+            })
+
+        forecasts.sort(key=lambda item: (
+            self.RISK_ORDER[item['risk_level']],
+            item['days_of_cover'] if item['days_of_cover'] is not None else float('inf'),
+        ))
+        return forecasts
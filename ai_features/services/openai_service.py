@@ -3,12 +3,25 @@ OpenAI Service
 Centralized service for all OpenAI API interactions with error handling,
 cost calculation, and token counting. Includes a mock path for local
 development environments where the OpenAI SDK or API key may be absent.
+
+Completions are cached by content: the key is a hash of the model, messages,
+temperature, max_tokens and JSON mode, so repeating a prompt over the same
+business data returns the stored answer without calling the provider.
+Concurrent identical calls are collapsed into one provider request. Cache
+hits are marked ``cached`` with ``latency_saved_ms`` and cost nothing.
+
+With ``OPENAI_EXECUTION_MODE = 'async'`` provider calls go through the
+pooled, per-business bounded ``AsyncCompletionRunner``. Callers can also
+defer a completion to the ``ai_features`` Celery queue: the first call raises
+``AIResultPending`` and a later identical call collects the result.
 """
 
+import hashlib
 import json
 import time
 from decimal import Decimal
-from typing import Any, Dict, List, Optional
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional
 
 from django.conf import settings
 from django.core.cache import cache
@@ -26,6 +39,14 @@ class OpenAIServiceError(Exception):
     pass
 
 
+class AIResultPending(Exception):
+    """Raised when a deferred completion is still being generated"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"AI response pending, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
 class OpenAIService:
     """Centralized OpenAI API service"""
 
@@ -60,6 +81,9 @@ class OpenAIService:
     # USD to GHS exchange rate (update periodically)
     USD_TO_GHS = Decimal('16.00')  # Approximate rate
 
+    # Seconds between checks while an identical completion is in flight
+    CACHE_POLL_INTERVAL = 0.2
+
     def __init__(self) -> None:
         """Initialize OpenAI client or configure mock behaviour."""
 
@@ -79,17 +103,24 @@ class OpenAIService:
                     "OpenAI package not installed. Run: pip install openai or set OPENAI_USE_MOCK=true"
                 )
             self.client = None
+            self.async_runner = None
             self._mock_model = 'mock-local'
             return
 
         if not api_key:
             raise ValueError("OPENAI_API_KEY not configured in settings")
 
+        base_url = getattr(settings, 'OPENAI_BASE_URL', '') or None
         try:
-            self.client = OpenAI(api_key=api_key, timeout=60.0, max_retries=2)
+            self.client = OpenAI(api_key=api_key, base_url=base_url, timeout=60.0, max_retries=2)
         except TypeError:
             # Fallback for older SDK signatures
             self.client = OpenAI(api_key=api_key)
+
+        self.async_runner = None
+        if getattr(settings, 'OPENAI_EXECUTION_MODE', 'sync') == 'async':
+            from .async_openai import get_async_runner
+            self.async_runner = get_async_runner()
         self._mock_model = 'openai'
     
     def _get_model_for_feature(self, feature: str) -> str:
@@ -119,7 +150,10 @@ class OpenAIService:
         max_tokens: Optional[int] = None,
         json_mode: bool = False,
         cache_key: Optional[str] = None,
-        cache_ttl: int = 0
+        cache_ttl: int = 0,
+        use_cache: bool = True,
+        business_id: Optional[str] = None,
+        defer: bool = False
     ) -> Dict[str, Any]:
         """
         Make a chat completion request to OpenAI
@@ -132,13 +166,200 @@ class OpenAIService:
             json_mode: Force JSON output
             cache_key: Optional cache key for caching results
             cache_ttl: Cache time-to-live in seconds
+            use_cache: Serve identical requests from the content-hash cache
+            business_id: Business the request is cached and counted against
+            defer: Generate on the Celery queue; raises ``AIResultPending``
+                until an identical call finds the result
         
         Returns:
-            Dict with 'content', 'tokens', 'cost', 'processing_time_ms'
+            Dict with 'content', 'tokens', 'cost', 'processing_time_ms',
+            'cached' and 'latency_saved_ms'
         """
         if self.mock_mode:
-            return self._mock_chat_completion(messages, feature, cache_key, cache_ttl, json_mode)
+            model = self._mock_model
+            compute = partial(self._mock_chat_completion, messages, feature, cache_key, cache_ttl, json_mode)
+        else:
+            model = self._get_model_for_feature(feature)
+            compute = partial(
+                self._provider_chat_completion,
+                messages, model, temperature, max_tokens, json_mode, cache_key, cache_ttl, business_id
+            )
+
+        timeout = getattr(settings, 'OPENAI_RESPONSE_CACHE_TIMEOUT', 3600)
+        response_key = self._response_cache_key(model, messages, temperature, max_tokens, json_mode, business_id)
+        if defer:
+            return self._collect_deferred(
+                response_key,
+                bool(use_cache and timeout),
+                {
+                    'messages': messages,
+                    'feature': feature,
+                    'temperature': temperature,
+                    'max_tokens': max_tokens,
+                    'json_mode': json_mode,
+                    'use_cache': use_cache,
+                    'business_id': business_id,
+                }
+            )
+
+        if not use_cache or not timeout:
+            return self._as_fresh(compute())
+
+        return self._cached_completion(response_key, timeout, compute)
+
+    def _response_cache_key(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: Optional[int],
+        json_mode: bool,
+        business_id: Optional[str] = None
+    ) -> str:
+        """
+        Content hash of everything that determines a completion
+
+        The business is part of the key, so a completion (and the charge for
+        it) is only ever reused by the business that requested it.
+        """
+        payload = json.dumps(
+            {
+                'business_id': str(business_id) if business_id else None,
+                'model': model,
+                'messages': messages,
+                'temperature': temperature,
+                'max_tokens': max_tokens,
+                'json_mode': json_mode,
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return f"openai:completion:{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+    @staticmethod
+    def _as_fresh(result: Dict[str, Any]) -> Dict[str, Any]:
+        result['cached'] = False
+        result['latency_saved_ms'] = 0
+        return result
+
+    @staticmethod
+    def _as_cache_hit(cached: str, start_time: float) -> Dict[str, Any]:
+        result = json.loads(cached)
+        elapsed_ms = int((time.time() - start_time) * 1000)
+        result['cached'] = True
+        result['latency_saved_ms'] = max(0, int(result.get('processing_time_ms', 0)) - elapsed_ms)
+        result['processing_time_ms'] = elapsed_ms
+        # Nothing was paid to the provider for this response
+        result['cost_ghs'] = 0.0
+        return result
+
+    def _cached_completion(self, key: str, timeout: int, compute: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Return the cached completion for ``key``, calling the provider at most once at a time.
 
+        The first caller for a missing key takes ``<key>:lock`` and calls the
+        provider; identical calls arriving meanwhile poll for its result for
+        up to ``OPENAI_RESPONSE_CACHE_WAIT`` seconds and call the provider
+        themselves only if the holder fails or takes too long.
+        """
+        start_time = time.time()
+        cached = cache.get(key)
+        if cached:
+            return self._as_cache_hit(cached, start_time)
+
+        wait = getattr(settings, 'OPENAI_RESPONSE_CACHE_WAIT', 60)
+        lock_key = f"{key}:lock"
+        if not cache.add(lock_key, 1, max(1, int(wait))):
+            deadline = time.monotonic() + wait
+            while time.monotonic() < deadline:
+                time.sleep(self.CACHE_POLL_INTERVAL)
+                cached = cache.get(key)
+                if cached:
+                    return self._as_cache_hit(cached, start_time)
+                if cache.get(lock_key) is None:
+                    break
+            return self._as_fresh(compute())
+
+        try:
+            result = compute()
+            cache.set(key, json.dumps(result), timeout)
+            return self._as_fresh(result)
+        finally:
+            cache.delete(lock_key)
+
+    def _collect_deferred(self, key: str, check_cache: bool, task_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Return a finished deferred completion, or queue one and raise ``AIResultPending``.
+
+        The worker stores its result under ``<key>:deferred``; the first
+        identical call from the same business to find it takes it, so it is
+        billed as a fresh completion exactly once.
+        """
+        start_time = time.time()
+        deferred_key = f"{key}:deferred"
+        stored = cache.get(deferred_key)
+        if stored:
+            cache.delete(deferred_key)
+            result = json.loads(stored)
+            if 'error' in result:
+                raise OpenAIServiceError(result['error'])
+            return result
+
+        if check_cache:
+            cached = cache.get(key)
+            if cached:
+                return self._as_cache_hit(cached, start_time)
+
+        job_timeout = getattr(settings, 'AI_DEFERRED_JOB_TIMEOUT', 300)
+        if cache.add(f"{deferred_key}:pending", 1, job_timeout):
+            from ai_features.tasks import run_deferred_completion
+            run_deferred_completion.delay(**task_kwargs)
+        raise AIResultPending(getattr(settings, 'AI_DEFERRED_RETRY_AFTER', 2))
+
+    def run_deferred(
+        self,
+        messages: List[Dict[str, str]],
+        feature: str,
+        temperature: float,
+        max_tokens: Optional[int],
+        json_mode: bool,
+        use_cache: bool = True,
+        business_id: Optional[str] = None
+    ) -> None:
+        """Generate a deferred completion (Celery worker side) and store it for collection"""
+        model = self._mock_model if self.mock_mode else self._get_model_for_feature(feature)
+        response_key = self._response_cache_key(model, messages, temperature, max_tokens, json_mode, business_id)
+        deferred_key = f"{response_key}:deferred"
+        try:
+            try:
+                result = self.chat_completion(
+                    messages=messages,
+                    feature=feature,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    json_mode=json_mode,
+                    use_cache=use_cache,
+                    business_id=business_id
+                )
+            except OpenAIServiceError as exc:
+                result = {'error': str(exc)}
+            cache.set(deferred_key, json.dumps(result), getattr(settings, 'AI_DEFERRED_JOB_TIMEOUT', 300))
+        finally:
+            # Let the next identical call queue a new job if this one failed
+            cache.delete(f"{deferred_key}:pending")
+
+    def _provider_chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        model: str,
+        temperature: float,
+        max_tokens: Optional[int],
+        json_mode: bool,
+        cache_key: Optional[str],
+        cache_ttl: int,
+        business_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Call the OpenAI API (honouring an explicit caller ``cache_key``)"""
         start_time = time.time()
 
         if cache_key and cache_ttl > 0:
@@ -146,8 +367,6 @@ class OpenAIService:
             if cached:
                 return json.loads(cached)
 
-        model = self._get_model_for_feature(feature)
-
         request_kwargs = {
             'model': model,
             'messages': messages,
@@ -161,7 +380,10 @@ class OpenAIService:
             request_kwargs['response_format'] = {"type": "json_object"}
 
         try:
-            response = self.client.chat.completions.create(**request_kwargs)
+            if self.async_runner is not None:
+                response = self.async_runner.run(request_kwargs, business_id)
+            else:
+                response = self.client.chat.completions.create(**request_kwargs)
 
             content = response.choices[0].message.content
             prompt_tokens = response.usage.prompt_tokens
@@ -39,6 +39,22 @@ class QueryIntelligenceService:
         self.business_id = business_id
         self.storefront_id = storefront_id
         self.openai = get_openai_service()
+        # AI calls made for the current query and how many the response cache served
+        self.ai_calls = 0
+        self.ai_cache_hits = 0
+        self.latency_saved_ms = 0
+    
+    def _track_ai_call(self, result: Dict[str, Any]) -> None:
+        """Count an AI call towards this query's cache statistics"""
+        self.ai_calls += 1
+        if result.get('cached'):
+            self.ai_cache_hits += 1
+            self.latency_saved_ms += int(result.get('latency_saved_ms', 0))
+    
+    @property
+    def served_from_cache(self) -> bool:
+        """True when every AI call for the query was a cache hit"""
+        return self.ai_calls > 0 and self.ai_cache_hits == self.ai_calls
     
     def process_query(self, query: str) -> Dict[str, Any]:
         """
@@ -87,8 +103,10 @@ Respond with ONLY the query type, nothing else."""
                 system_prompt=system_prompt,
                 feature='natural_language_query',
                 temperature=0.3,
-                max_tokens=10
+                max_tokens=10,
+                business_id=self.business_id
             )
+            self._track_ai_call(result)
             
             query_type = result['content'].strip().lower()
             
@@ -125,8 +143,10 @@ Examples:
                 prompt=f"Query: {query}\nQuery type: {query_type}",
                 system_prompt=system_prompt,
                 feature='natural_language_query',
-                temperature=0.3
+                temperature=0.3,
+                business_id=self.business_id
             )
+            self._track_ai_call(result)
             
             parameters = result['data']
             
@@ -332,8 +352,10 @@ Please provide a comprehensive answer to the user's question based on this data.
                 system_prompt=system_prompt,
                 feature='natural_language_query',
                 temperature=0.7,
-                max_tokens=500
+                max_tokens=500,
+                business_id=self.business_id
             )
+            self._track_ai_call(result)
             
             return result['content']
             
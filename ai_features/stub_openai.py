@@ -0,0 +1,176 @@
+"""
+Local OpenAI-compatible stub server
+Answers ``POST /v1/chat/completions`` with a canned completion after a fixed
+latency, so the sync and async execution modes can be exercised and
+load-tested without network access or an API key. It records request
+count, peak concurrency and TCP connections opened (to observe pooling),
+and can fail the first N requests with 503 to exercise retries.
+
+Usage:
+    python -m ai_features.stub_openai --port 8765 --latency 0.2
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=stub OPENAI_EXECUTION_MODE=async ...
+
+In tests:
+    with StubOpenAIServer(latency=0.05) as stub:
+        ... point a client at stub.base_url ...
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency: float, fail_first: int):
+        super().__init__(address, _StubHandler)
+        self.latency = latency
+        self.fail_first = fail_first
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.active = 0
+        self.peak_concurrency = 0
+        self.connections = 0
+
+    def process_request(self, request, client_address):
+        with self.lock:
+            self.connections += 1
+        super().process_request(request, client_address)
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    # Keep-alive, so a pooled client can reuse connections
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b'{}')
+        except json.JSONDecodeError:
+            body = {}
+
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            self._send(404, {'error': {'message': f'Unknown path {self.path}', 'type': 'invalid_request_error'}})
+            return
+
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            request_number = server.requests
+            server.active += 1
+            server.peak_concurrency = max(server.peak_concurrency, server.active)
+        try:
+            time.sleep(server.latency)
+            if request_number <= server.fail_first:
+                self._send(503, {'error': {'message': 'Stub server overloaded', 'type': 'server_error'}})
+            else:
+                self._send(200, self._completion(body, request_number))
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def _completion(self, body, request_number):
+        json_mode = (body.get('response_format') or {}).get('type') == 'json_object'
+        content = json.dumps({'stub': True}) if json_mode else 'Stub completion.'
+        prompt_tokens = sum(len(str(message.get('content', '')).split()) for message in body.get('messages', []))
+        completion_tokens = len(content.split())
+        return {
+            'id': f'chatcmpl-stub-{request_number}',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': body.get('model', 'stub'),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': content},
+                'finish_reason': 'stop',
+            }],
+            'usage': {
+                'prompt_tokens': prompt_tokens,
+                'completion_tokens': completion_tokens,
+                'total_tokens': prompt_tokens + completion_tokens,
+            },
+        }
+
+    def _send(self, status_code, payload):
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status_code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubOpenAIServer:
+    """OpenAI-compatible stub running on a background thread"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0.05, fail_first: int = 0):
+        """
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free one)
+            latency: Seconds each completion takes
+            fail_first: Number of initial requests answered with 503
+        """
+        self._httpd = _StubHTTPServer((host, port), latency, fail_first)
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f'http://{host}:{port}/v1'
+
+    @property
+    def requests(self) -> int:
+        return self._httpd.requests
+
+    @property
+    def peak_concurrency(self) -> int:
+        return self._httpd.peak_concurrency
+
+    @property
+    def connections(self) -> int:
+        return self._httpd.connections
+
+    def start(self) -> 'StubOpenAIServer':
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='openai-stub', daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Serve on the calling thread until interrupted"""
+        self._httpd.serve_forever()
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> 'StubOpenAIServer':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run a local OpenAI-compatible stub server.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.2, help='Seconds each completion takes.')
+    parser.add_argument('--fail-first', type=int, default=0, help='Answer the first N requests with 503.')
+    args = parser.parse_args()
+
+    stub = StubOpenAIServer(args.host, args.port, args.latency, args.fail_first)
+    print(f'OpenAI stub listening on {stub.base_url}')
+    try:
+        stub.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub.stop()
+        print(f'{stub.requests} requests, peak concurrency {stub.peak_concurrency}, {stub.connections} connections')
@@ -218,3 +218,44 @@ POS Backend Team
     except Exception as e:
         logger.error(f"Error sending low credit alert: {str(e)}", exc_info=True)
         raise
+
+
+@shared_task(name='ai_features.run_deferred_completion')
+def run_deferred_completion(
+    messages: list,
+    feature: str,
+    temperature: float,
+    max_tokens: int = None,
+    json_mode: bool = False,
+    use_cache: bool = True,
+    business_id: str = None
+):
+    """
+    Generate a chat completion requested with ``defer=True``.
+    
+    The result is stored in the cache, where the client's next identical
+    request (sent after the 202 response's Retry-After) collects and is
+    billed for it.
+    
+    Args:
+        messages: Chat messages, as passed to chat_completion
+        feature: Feature name for model selection
+        temperature: Sampling temperature
+        max_tokens: Maximum tokens to generate
+        json_mode: Force JSON output
+        use_cache: Serve from / store in the content-hash cache
+        business_id: Business the request counts against in async mode
+    """
+    from ai_features.services import get_openai_service
+    
+    logger.info(f"Generating deferred {feature} completion for business {business_id}")
+    
+    get_openai_service().run_deferred(
+        messages=messages,
+        feature=feature,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        json_mode=json_mode,
+        use_cache=use_cache,
+        business_id=business_id
+    )
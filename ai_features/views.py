@@ -9,7 +9,6 @@ from datetime import date, datetime, timedelta
 from decimal import Decimal
 from typing import Dict, Any, Optional, List
 from django.db.models import Sum, Count, Q, Avg, F
-from django.db.models.functions import TruncWeek
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
@@ -23,9 +22,11 @@ from .models import BusinessAICredits, AITransaction, AICreditPurchase
 from .services import (
     AIBillingService,
     InsufficientCreditsException,
+    InventoryForecastEngine,
     QueryIntelligenceService,
     get_openai_service,
     OpenAIServiceError,
+    AIResultPending,
     PaystackService,
     PaystackException,
     generate_payment_reference
@@ -171,6 +172,29 @@ def _respond_with_standard_ai_provider_error(
     )
 
 
+def _wants_deferred(request) -> bool:
+    """Whether the client asked for queued generation with ``Prefer: respond-async`` (RFC 7240)."""
+    preferences = request.headers.get('Prefer', '')
+    return any(
+        token.split(';')[0].split('=')[0].strip().lower() == 'respond-async'
+        for token in preferences.split(',')
+    )
+
+
+def _respond_with_pending(pending: AIResultPending) -> Response:
+    """202 for a deferred completion still being generated; repeating the request collects it."""
+    response = Response(
+        {
+            'status': 'pending',
+            'message': 'The AI response is being generated. Repeat this request to collect it.',
+            'retry_after': pending.retry_after,
+        },
+        status=status.HTTP_202_ACCEPTED
+    )
+    response['Retry-After'] = str(pending.retry_after)
+    return response
+
+
 # ============================================================================
 # AI CREDIT MANAGEMENT
 # ============================================================================
@@ -359,8 +383,12 @@ Provide the assessment as JSON with the following structure:
             prompt=user_prompt,
             system_prompt=system_prompt,
             feature='credit_assessment',
-            temperature=0.3
+            temperature=0.3,
+            business_id=business_id,
+            defer=_wants_deferred(request)
         )
+    except AIResultPending as pending:
+        return _respond_with_pending(pending)
     except OpenAIServiceError as e:
         return _respond_with_standard_ai_provider_error(
             business_id=business_id,
@@ -412,7 +440,9 @@ Provide the assessment as JSON with the following structure:
                     'requested_credit_limit': _to_float(requested_limit),
                 },
                 response_summary=str(explanation)[:200],
-                processing_time_ms=int(result.get('processing_time_ms', 0))
+                processing_time_ms=int(result.get('processing_time_ms', 0)),
+                cache_hit=bool(result.get('cached', False)),
+                latency_saved_ms=int(result.get('latency_saved_ms', 0))
             )
         except InsufficientCreditsException as exc:
             return Response(
@@ -535,8 +565,12 @@ def generate_report_narrative(request):
             prompt=user_prompt,
             system_prompt=system_prompt,
             feature='report_narrative',
-            temperature=0.5
+            temperature=0.5,
+            business_id=business_id,
+            defer=_wants_deferred(request)
         )
+    except AIResultPending as pending:
+        return _respond_with_pending(pending)
     except OpenAIServiceError as e:
         return _respond_with_standard_ai_provider_error(
             business_id=business_id,
@@ -576,7 +610,9 @@ def generate_report_narrative(request):
                 user_id=str(request.user.id),
                 request_data={'report_type': report_type},
                 response_summary=str(executive_summary)[:200],
-                processing_time_ms=int(result.get('processing_time_ms', 0))
+                processing_time_ms=int(result.get('processing_time_ms', 0)),
+                cache_hit=bool(result.get('cached', False)),
+                latency_saved_ms=int(result.get('latency_saved_ms', 0))
             )
         except InsufficientCreditsException as exc:
             return Response(
@@ -615,10 +651,37 @@ def generate_report_narrative(request):
 # INVENTORY FORECASTING
 # ============================================================================
 
+# Most urgent products sent to the AI forecast (the engine itself covers all)
+AI_FORECAST_CONTEXT_LIMIT = 50
+
+
+def _forecast_summary(forecasts: List[Dict[str, Any]], context_map: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Risk counts and total reorder value for a list of product forecasts."""
+    total_reorder_value = Decimal('0.00')
+    for forecast in forecasts:
+        unit_cost = Decimal(str(context_map[forecast['product_id']].get('unit_cost', 0.0)))
+        total_reorder_value += unit_cost * Decimal(str(forecast['recommended_reorder_quantity']))
+
+    return {
+        'critical_items': len([f for f in forecasts if f['risk_level'] == 'critical']),
+        'high_risk_items': len([f for f in forecasts if f['risk_level'] == 'high']),
+        'medium_risk_items': len([f for f in forecasts if f['risk_level'] == 'medium']),
+        'low_risk_items': len([f for f in forecasts if f['risk_level'] == 'low']),
+        'total_recommended_reorder_value': float(total_reorder_value.quantize(Decimal('0.01')))
+    }
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated, RequiresActiveSubscription])
 def generate_inventory_forecast(request):
-    """Forecast inventory risks and reorder recommendations."""
+    """
+    Forecast inventory risks and reorder recommendations.
+
+    Velocity, trend, days of cover and reorder quantities come from
+    InventoryForecastEngine for every matching product. With ``use_ai=false``
+    those deterministic suggestions are returned directly and no credits are
+    charged; otherwise the most urgent products are sent to the AI forecast.
+    """
     serializer = InventoryForecastRequestSerializer(data=request.data)
     if not serializer.is_valid():
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -631,14 +694,16 @@ def generate_inventory_forecast(request):
     warehouse_id = serializer.validated_data.get('warehouse_id')
     category_id = serializer.validated_data.get('category_id')
     forecast_days = serializer.validated_data.get('forecast_days', 30)
+    use_ai = serializer.validated_data.get('use_ai', True)
 
-    credit_check = AIBillingService.check_credits(business_id, 'inventory_forecast')
-    if not credit_check['has_sufficient_credits']:
-        return Response({
-            'error': 'insufficient_credits',
-            'message': f'You need {credit_check["required_credits"]} credits.',
-            'current_balance': credit_check['current_balance']
-        }, status=status.HTTP_402_PAYMENT_REQUIRED)
+    if use_ai:
+        credit_check = AIBillingService.check_credits(business_id, 'inventory_forecast')
+        if not credit_check['has_sufficient_credits']:
+            return Response({
+                'error': 'insufficient_credits',
+                'message': f'You need {credit_check["required_credits"]} credits.',
+                'current_balance': credit_check['current_balance']
+            }, status=status.HTTP_402_PAYMENT_REQUIRED)
 
     warehouse = None
     if warehouse_id:
@@ -660,92 +725,14 @@ def generate_inventory_forecast(request):
                 status=status.HTTP_404_NOT_FOUND
             )
 
-    products_qs = Product.objects.filter(business_id=business_id, is_active=True)
-    if category:
-        products_qs = products_qs.filter(category=category)
-    if warehouse:
-        products_qs = products_qs.filter(stock_items__warehouse=warehouse)
-
-    products_qs = products_qs.distinct().order_by('name')
-
-    analysis_start = timezone.now() - timedelta(days=90)
-    forecasts_context: List[Dict[str, Any]] = []
-
-    for product in products_qs[:100]:
-        stock_items = product.stock_items
-        if warehouse:
-            stock_items = stock_items.filter(warehouse=warehouse)
-
-        stock_totals = stock_items.aggregate(total=Sum('calculated_quantity'))['total'] or 0
-        current_stock = float(stock_totals) if stock_totals is not None else 0.0
+    engine_forecasts = InventoryForecastEngine(
+        business_id,
+        warehouse=warehouse,
+        category=category,
+        forecast_days=forecast_days,
+    ).build()
 
-        reorder_point = getattr(product, 'reorder_point', None)
-        if reorder_point is None:
-            reorder_point = getattr(product, 'minimum_stock', None)
-        if reorder_point is None:
-            reorder_point = 10
-
-        sales_qs = SaleItem.objects.filter(product=product, sale__created_at__gte=analysis_start)
-        if warehouse:
-            sales_qs = sales_qs.filter(stock_product__warehouse=warehouse)
-
-        weekly_sales = list(
-            sales_qs.annotate(week=TruncWeek('sale__created_at'))
-            .values('week')
-            .annotate(units_sold=Sum('quantity'))
-            .order_by('week')
-        )
-
-        if not weekly_sales:
-            continue
-
-        total_weeks = max(1, int((timezone.now() - analysis_start).days / 7))
-        total_units = sum(float(item['units_sold']) for item in weekly_sales)
-        weekly_velocity = round(total_units / total_weeks, 2)
-
-        if len(weekly_sales) >= 4:
-            midpoint = len(weekly_sales) // 2
-            first_avg = sum(float(item['units_sold']) for item in weekly_sales[:midpoint]) / max(midpoint, 1)
-            second_avg = sum(float(item['units_sold']) for item in weekly_sales[midpoint:]) / max(len(weekly_sales) - midpoint, 1)
-            if second_avg > first_avg * 1.2:
-                trend = 'increasing'
-            elif second_avg < first_avg * 0.8:
-                trend = 'decreasing'
-            else:
-                trend = 'stable'
-        else:
-            trend = 'stable'
-
-        sales_history = [
-            {
-                'week_start': item['week'].date().isoformat() if item['week'] else None,
-                'units_sold': round(float(item['units_sold']), 2),
-            }
-            for item in weekly_sales
-        ]
-
-        unit_cost = 0.0
-        try:
-            unit_cost = _to_float(product.get_latest_cost(warehouse=warehouse))
-        except TypeError:
-            unit_cost = _to_float(product.get_latest_cost())
-
-        forecasts_context.append({
-            'product_id': str(product.id),
-            'product_name': product.name,
-            'sku': product.sku,
-            'current_stock': round(current_stock, 2),
-            'reorder_point': float(reorder_point),
-            'weekly_velocity': weekly_velocity,
-            'trend': trend,
-            'sales_history': sales_history,
-            'unit_cost': unit_cost,
-        })
-
-        if len(forecasts_context) >= 50:
-            break
-
-    if not forecasts_context:
+    if not engine_forecasts:
         return Response(
             {
                 'error': 'insufficient_data',
@@ -754,6 +741,51 @@ def generate_inventory_forecast(request):
             status=status.HTTP_400_BAD_REQUEST
         )
 
+    if not use_ai:
+        # Deterministic reorder suggestions: no AI call and no credits charged
+        final_forecasts = [
+            {
+                'product_id': item['product_id'],
+                'product_name': item['product_name'],
+                'sku': item['sku'],
+                'current_stock': item['current_stock'],
+                'reorder_point': item['reorder_point'],
+                'predicted_stockout_date': item['predicted_stockout_date'],
+                'days_until_stockout': item['days_until_stockout'],
+                'recommended_reorder_quantity': item['recommended_reorder_quantity'],
+                'recommended_reorder_date': item['recommended_reorder_date'],
+                'confidence_score': item['confidence_score'],
+                'weekly_sales_velocity': item['weekly_velocity'],
+                'trend': item['trend'],
+                'seasonality_factor': 1.0,
+                'risk_level': item['risk_level'],
+            }
+            for item in engine_forecasts
+        ]
+        summary = _forecast_summary(final_forecasts, {item['product_id']: item for item in engine_forecasts})
+        return Response({
+            'forecast_period_days': forecast_days,
+            'forecast_source': 'engine',
+            'total_products_analyzed': len(engine_forecasts),
+            'products_at_risk': len([f for f in final_forecasts if f['risk_level'] in ('critical', 'high')]),
+            'forecasts': final_forecasts,
+            'summary': summary,
+            'credits_used': 0.0,
+            'new_balance': float(AIBillingService.get_credit_balance(business_id)),
+        })
+
+    # The AI sees the most urgent products first, bounded to keep the prompt small
+    forecasts_context: List[Dict[str, Any]] = [
+        {
+            key: item[key]
+            for key in (
+                'product_id', 'product_name', 'sku', 'current_stock', 'reorder_point',
+                'weekly_velocity', 'trend', 'sales_history', 'unit_cost', 'days_of_cover',
+            )
+        }
+        for item in engine_forecasts[:AI_FORECAST_CONTEXT_LIMIT]
+    ]
+
     forecast_input = {
         'forecast_days': forecast_days,
         'products': forecasts_context,
@@ -778,8 +810,12 @@ def generate_inventory_forecast(request):
             prompt=user_prompt,
             system_prompt=system_prompt,
             feature='inventory_forecast',
-            temperature=0.3
+            temperature=0.3,
+            business_id=business_id,
+            defer=_wants_deferred(request)
         )
+    except AIResultPending as pending:
+        return _respond_with_pending(pending)
     except OpenAIServiceError as e:
         return _respond_with_standard_ai_provider_error(
             business_id=business_id,
@@ -801,7 +837,6 @@ def generate_inventory_forecast(request):
 
         context_map = {item['product_id']: item for item in forecasts_context}
         final_forecasts: List[Dict[str, Any]] = []
-        total_reorder_value = Decimal('0.00')
 
         def _as_float(value: Any) -> float:
             try:
@@ -828,9 +863,6 @@ def generate_inventory_forecast(request):
             seasonality_factor = round(_as_float(entry.get('seasonality_factor', 1.0)), 2)
             risk_level = (entry.get('risk_level') or 'low').lower()
 
-            unit_cost_decimal = Decimal(str(context_item.get('unit_cost', 0.0)))
-            total_reorder_value += unit_cost_decimal * Decimal(str(recommended_qty))
-
             final_forecasts.append({
                 'product_id': product_id,
                 'product_name': context_item['product_name'],
@@ -848,13 +880,7 @@ def generate_inventory_forecast(request):
                 'risk_level': risk_level,
             })
 
-        summary = {
-            'critical_items': len([f for f in final_forecasts if f['risk_level'] == 'critical']),
-            'high_risk_items': len([f for f in final_forecasts if f['risk_level'] == 'high']),
-            'medium_risk_items': len([f for f in final_forecasts if f['risk_level'] == 'medium']),
-            'low_risk_items': len([f for f in final_forecasts if f['risk_level'] == 'low']),
-            'total_recommended_reorder_value': float(total_reorder_value.quantize(Decimal('0.01')))
-        }
+        summary = _forecast_summary(final_forecasts, context_map)
 
         products_at_risk = len([f for f in final_forecasts if f['risk_level'] in ('critical', 'high')])
 
@@ -871,7 +897,9 @@ def generate_inventory_forecast(request):
                     'forecast_days': forecast_days,
                 },
                 response_summary=f"Forecasted {len(final_forecasts)} products",
-                processing_time_ms=int(result.get('processing_time_ms', 0))
+                processing_time_ms=int(result.get('processing_time_ms', 0)),
+                cache_hit=bool(result.get('cached', False)),
+                latency_saved_ms=int(result.get('latency_saved_ms', 0))
             )
         except InsufficientCreditsException as exc:
             return Response(
@@ -881,7 +909,8 @@ def generate_inventory_forecast(request):
 
         response_payload = {
             'forecast_period_days': forecast_days,
-            'total_products_analyzed': len(forecasts_context),
+            'forecast_source': 'ai',
+            'total_products_analyzed': len(engine_forecasts),
             'products_at_risk': products_at_risk,
             'forecasts': final_forecasts,
             'summary': summary,
@@ -1281,6 +1310,9 @@ def get_usage_stats(request):
         "total_credits_used": 75.20,
         "total_cost_ghs": 25.40,
         "avg_processing_time_ms": 850,
+        "cache_hits": 30,
+        "cache_hit_rate": 0.2027,
+        "latency_saved_ms": 25500,
         "feature_breakdown": [
             {"feature": "natural_language_query", "count": 80, "credits_used": 40.00},
             {"feature": "product_description", "count": 50, "credits_used": 5.00}
@@ -1413,7 +1445,9 @@ def natural_language_query(request):
             user_id=str(request.user.id),
             request_data={'query': query},
             response_summary=result['answer'][:200],
-            processing_time_ms=processing_time_ms
+            processing_time_ms=processing_time_ms,
+            cache_hit=query_service.served_from_cache,
+            latency_saved_ms=query_service.latency_saved_ms
         )
         
         # Add billing info to response
@@ -1590,8 +1624,12 @@ def generate_product_description(request):
             prompt=user_prompt,
             system_prompt=system_prompt,
             feature='product_description',
-            temperature=0.7
+            temperature=0.7,
+            business_id=business_id,
+            defer=_wants_deferred(request)
         )
+    except AIResultPending as pending:
+        return _respond_with_pending(pending)
     except OpenAIServiceError as e:
         return _respond_with_standard_ai_provider_error(
             business_id=business_id,
@@ -1635,7 +1673,9 @@ def generate_product_description(request):
                     'include_seo': include_seo,
                 },
                 response_summary=description[:200],
-                processing_time_ms=int(result.get('processing_time_ms', 0))
+                processing_time_ms=int(result.get('processing_time_ms', 0)),
+                cache_hit=bool(result.get('cached', False)),
+                latency_saved_ms=int(result.get('latency_saved_ms', 0))
             )
         except InsufficientCreditsException as exc:
             return Response(
@@ -1828,8 +1868,12 @@ def generate_collection_message(request):
             prompt=user_prompt,
             system_prompt=system_prompt,
             feature='collection_message',
-            temperature=0.6
+            temperature=0.6,
+            business_id=business_id,
+            defer=_wants_deferred(request)
         )
+    except AIResultPending as pending:
+        return _respond_with_pending(pending)
     except OpenAIServiceError as e:
         return _respond_with_standard_ai_provider_error(
             business_id=business_id,
@@ -1871,7 +1915,9 @@ def generate_collection_message(request):
                     'include_payment_plan': include_payment_plan,
                 },
                 response_summary=body[:200],
-                processing_time_ms=int(result.get('processing_time_ms', 0))
+                processing_time_ms=int(result.get('processing_time_ms', 0)),
+                cache_hit=bool(result.get('cached', False)),
+                latency_saved_ms=int(result.get('latency_saved_ms', 0))
             )
         except InsufficientCreditsException as exc:
             return Response(
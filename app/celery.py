@@ -1,5 +1,6 @@
 import os
 from celery import Celery
+from celery.schedules import crontab
 from django.conf import settings
 
 # Set the default Django settings module for the 'celery' program.
@@ -25,7 +26,8 @@ app.conf.update(
     timezone='UTC',
     enable_utc=True,
     
-    # Task routing
+    # Task routing (workers must consume every queue listed here, see
+    # deployment/celery.service and docker-compose.yml)
     task_routes={
         'accounts.tasks.*': {'queue': 'accounts'},
         'inventory.tasks.*': {'queue': 'inventory'},
@@ -57,6 +59,10 @@ app.conf.update(
             'task': 'sales.tasks.release_expired_reservations',
             'schedule': 900.0,  # Run every 15 minutes
         },
+        'rebuild-customer-metrics': {
+            'task': 'sales.tasks.rebuild_customer_metrics',
+            'schedule': crontab(hour=2, minute=0),  # Run nightly (02:00 UTC)
+        },
         # Security and GDPR compliance tasks
         'cleanup-expired-ai-transactions': {
             'task': 'app.tasks.cleanup_expired_ai_transactions',
@@ -70,10 +76,6 @@ app.conf.update(
             'task': 'app.tasks.cleanup_expired_subscriptions',
             'schedule': 86400.0,  # Run daily
         },
-        'cleanup-expired-stock-reservations': {
-            'task': 'app.tasks.cleanup_expired_stock_reservations',
-            'schedule': 900.0,  # Run every 15 minutes
-        },
         'check-payment-gateway-health': {
             'task': 'app.tasks.check_payment_gateway_health',
             'schedule': 300.0,  # Run every 5 minutes
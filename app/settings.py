@@ -374,6 +374,51 @@ else:
         }
     }
 
+# Receipt numbering ('auto' uses the PostgreSQL allocator when the database supports it)
+RECEIPT_SEQUENCE_BACKEND = config('RECEIPT_SEQUENCE_BACKEND', default='auto')
+
+# Stock reservation expiry sweep (rows per transaction, batches per run; 0 = no limit)
+RESERVATION_EXPIRY_BATCH_SIZE = config('RESERVATION_EXPIRY_BATCH_SIZE', default=500, cast=int)
+RESERVATION_EXPIRY_MAX_BATCHES = config('RESERVATION_EXPIRY_MAX_BATCHES', default=200, cast=int)
+
+# Seconds a user's resolved RBAC grants stay in the cache (keys are versioned,
+# so role changes take effect immediately regardless)
+RBAC_PERMISSION_CACHE_TIMEOUT = config('RBAC_PERMISSION_CACHE_TIMEOUT', default=3600, cast=int)
+
+# Seconds a business's resolved subscription status stays in the cache (keys
+# are versioned and bumped on every subscription or payment save, so
+# activations and suspensions take effect immediately regardless)
+SUBSCRIPTION_STATUS_CACHE_TIMEOUT = config('SUBSCRIPTION_STATUS_CACHE_TIMEOUT', default=300, cast=int)
+
+# Where movement reports read stock movements from: 'ledger' (stock_movements
+# table) or 'union' (legacy runtime UNION over adjustments, transfers and sales).
+# The ledger only holds movements completed since it was deployed, so stay on
+# 'union' until `manage.py backfill_stock_movements --verify` has been run
+STOCK_MOVEMENT_SOURCE = config('STOCK_MOVEMENT_SOURCE', default='union')
+
+# Seconds cached movement summaries and analytics are kept (0 disables). Keys
+# carry a per-business generation bumped on every ledger write, so completed
+# movements show up immediately regardless
+MOVEMENT_CACHE_TIMEOUT = config('MOVEMENT_CACHE_TIMEOUT', default=300, cast=int)
+
+# Seconds rendered report responses are cached (0 disables; views may override
+# with report_cache_timeout). Keys carry a per-business data version bumped on
+# every write reports read, so changes show up immediately regardless
+REPORT_CACHE_TIMEOUT = config('REPORT_CACHE_TIMEOUT', default=300, cast=int)
+# Seconds an identical concurrent report request waits for the first one's
+# result before computing it itself (keep short: the wait holds a worker)
+REPORT_CACHE_COMPUTE_WAIT = config('REPORT_CACHE_COMPUTE_WAIT', default=2, cast=float)
+# Seconds the computing request's lock lives at most
+REPORT_CACHE_LOCK_TIMEOUT = config('REPORT_CACHE_LOCK_TIMEOUT', default=30, cast=int)
+
+# Seconds rendered storefront catalog pages are cached (0 disables). Keys carry
+# per-storefront and per-business generations bumped on inventory and price
+# changes, so tills see new stock and prices immediately regardless
+STOREFRONT_CATALOG_CACHE_TIMEOUT = config('STOREFRONT_CATALOG_CACHE_TIMEOUT', default=300, cast=int)
+
+# Rows fetched per cursor round-trip by streaming sales/customer exports
+EXPORT_STREAM_CHUNK_SIZE = config('EXPORT_STREAM_CHUNK_SIZE', default=2000, cast=int)
+
 # Rate limiting and throttling
 ENABLE_API_THROTTLE = config('ENABLE_API_THROTTLE', default=not DEBUG, cast=bool)
 
@@ -400,6 +445,35 @@ OPENAI_API_KEY = config('OPENAI_API_KEY', default='')
 OPENAI_USE_MOCK = config('OPENAI_USE_MOCK', cast=bool, default=False)
 OPENAI_ORGANIZATION = config('OPENAI_ORGANIZATION', default='')
 
+# Seconds identical chat completions (same model, messages, temperature and
+# output mode) are served from the cache instead of the provider (0 disables)
+OPENAI_RESPONSE_CACHE_TIMEOUT = config('OPENAI_RESPONSE_CACHE_TIMEOUT', default=3600, cast=int)
+# Seconds an identical concurrent completion waits for the first one's result
+OPENAI_RESPONSE_CACHE_WAIT = config('OPENAI_RESPONSE_CACHE_WAIT', default=60, cast=int)
+# Whether cache-served AI responses still cost the feature's credits
+AI_CHARGE_CACHED_RESPONSES = config('AI_CHARGE_CACHED_RESPONSES', default=False, cast=bool)
+
+# How provider calls run: 'sync' blocks on the OpenAI client per call; 'async'
+# runs them on a per-process event loop with AsyncOpenAI over pooled connections
+OPENAI_EXECUTION_MODE = config('OPENAI_EXECUTION_MODE', default='sync')
+# OpenAI-compatible endpoint override, e.g. the local stub server
+# (python -m ai_features.stub_openai) for load tests without network
+OPENAI_BASE_URL = config('OPENAI_BASE_URL', default='')
+# Async mode: provider requests in flight per business, pooled connections per
+# process, per-attempt read/connect timeouts (seconds), retries of transient
+# errors, and the first backoff delay (doubled on each retry, plus jitter)
+OPENAI_ASYNC_MAX_CONCURRENCY_PER_BUSINESS = config('OPENAI_ASYNC_MAX_CONCURRENCY_PER_BUSINESS', default=4, cast=int)
+OPENAI_ASYNC_MAX_CONNECTIONS = config('OPENAI_ASYNC_MAX_CONNECTIONS', default=50, cast=int)
+OPENAI_ASYNC_TIMEOUT = config('OPENAI_ASYNC_TIMEOUT', default=60.0, cast=float)
+OPENAI_ASYNC_CONNECT_TIMEOUT = config('OPENAI_ASYNC_CONNECT_TIMEOUT', default=5.0, cast=float)
+OPENAI_ASYNC_MAX_RETRIES = config('OPENAI_ASYNC_MAX_RETRIES', default=2, cast=int)
+OPENAI_ASYNC_BACKOFF_BASE = config('OPENAI_ASYNC_BACKOFF_BASE', default=0.5, cast=float)
+# Requests sent with "Prefer: respond-async" get 202 + Retry-After while the
+# completion runs on the ai_features Celery queue; repeating the request
+# collects it. Job results are kept (and jobs presumed lost) after this long
+AI_DEFERRED_RETRY_AFTER = config('AI_DEFERRED_RETRY_AFTER', default=2, cast=int)
+AI_DEFERRED_JOB_TIMEOUT = config('AI_DEFERRED_JOB_TIMEOUT', default=300, cast=int)
+
 # Paystack Payment Configuration
 PAYSTACK_SECRET_KEY = config('PAYSTACK_SECRET_KEY', default='')
 PAYSTACK_PUBLIC_KEY = config('PAYSTACK_PUBLIC_KEY', default='')
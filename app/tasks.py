@@ -75,32 +75,6 @@ def cleanup_expired_subscriptions():
     return count
 
 
-@shared_task
-def cleanup_expired_stock_reservations():
-    """
-    Release expired stock reservations (older than 30 minutes)
-    Runs every 15 minutes
-    """
-    from sales.models import StockReservation
-    
-    cutoff = timezone.now() - timedelta(minutes=30)
-    expired = StockReservation.objects.filter(
-        reserved_until__lt=cutoff,
-        released=False
-    )
-    
-    count = 0
-    for reservation in expired:
-        try:
-            reservation.release()
-            count += 1
-        except Exception as e:
-            logger.error(f"Error releasing reservation {reservation.id}: {e}")
-    
-    logger.info(f"Released {count} expired stock reservations")
-    return count
-
-
 @shared_task
 def check_payment_gateway_health():
     """
@@ -191,10 +165,6 @@ app.conf.beat_schedule = {
         'task': 'app.tasks.cleanup_expired_subscriptions',
         'schedule': crontab(hour=3, minute=0),  # 3 AM daily
     },
-    'cleanup-expired-stock-reservations': {
-        'task': 'app.tasks.cleanup_expired_stock_reservations',
-        'schedule': crontab(minute='*/15'),  # Every 15 minutes
-    },
     'check-payment-gateway-health': {
         'task': 'app.tasks.check_payment_gateway_health',
         'schedule': crontab(minute='*/5'),  # Every 5 minutes
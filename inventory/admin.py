@@ -98,6 +98,13 @@ class StockProductAdmin(admin.ModelAdmin):
         }),
     )
 
+    def save_model(self, request, obj, form, change):
+        if change:
+            # Reservations may have moved reserved_quantity since the form was loaded
+            obj.save(update_fields=obj.update_fields_excluding_reserved())
+        else:
+            super().save_model(request, obj, form, change)
+
 
 @admin.register(StoreFrontInventory)
 class StoreFrontInventoryAdmin(admin.ModelAdmin):
@@ -0,0 +1,272 @@
+"""
+Storefront sale catalog.
+
+Builds the querysets behind ``StoreFrontViewSet.sale_catalog`` and
+``multi_storefront_catalog``. A product's prices come from its latest
+StockProduct (newest ``created_at``), selected in SQL by a correlated subquery
+that the ``(product, created_at)`` index answers with one probe per product.
+Price filters, name ordering and pagination therefore all run in the
+database and only the requested page is materialised.
+
+Rendered pages are cached under ``catalog:page:<hash>``, where the hash covers
+the request URL and the catalog generations of every storefront and business
+involved:
+
+- a storefront's generation is bumped whenever its StoreFrontInventory rows
+  change (receivers in ``inventory.signals``, plus explicit calls where sale
+  checkout and transfer completion write quantities in bulk)
+- a business's generation is bumped whenever one of its products or stock
+  products changes, which covers every price change
+
+so tills see new stock and prices immediately; the timeout only bounds how
+long unreachable pages linger.
+"""
+
+import hashlib
+import time
+from collections import defaultdict
+from decimal import Decimal, InvalidOperation
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from uuid import UUID
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import DecimalField, Exists, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Lower
+
+from .models import Product, StockProduct, StoreFrontInventory
+from .search import CATALOG_SEARCH_FIELDS, ProductSearch
+
+ZERO = Decimal('0.00')
+
+
+def parse_catalog_filters(query_params) -> Dict[str, Any]:
+    """
+    Read the catalog query parameters shared by both catalog endpoints.
+
+    Invalid category UUIDs and prices are ignored rather than rejected.
+    ``in_stock_only`` defaults to true; ``include_zero=true`` is the legacy
+    spelling of ``in_stock_only=false``.
+    """
+    category_id = None
+    raw_category = query_params.get('category')
+    if raw_category:
+        try:
+            category_id = UUID(raw_category)
+        except (TypeError, ValueError):
+            category_id = None
+
+    def _price(name: str) -> Optional[Decimal]:
+        raw = query_params.get(name)
+        if not raw:
+            return None
+        try:
+            value = Decimal(str(raw))
+        except (ValueError, TypeError, ArithmeticError, InvalidOperation):
+            return None
+        return value if value.is_finite() else None
+
+    include_zero = query_params.get('include_zero', '').lower() == 'true'
+    in_stock_only = query_params.get('in_stock_only', '').lower() != 'false' and not include_zero
+
+    return {
+        'search': query_params.get('search', '').strip(),
+        'category_id': category_id,
+        'min_price': _price('min_price'),
+        'max_price': _price('max_price'),
+        'in_stock_only': in_stock_only,
+    }
+
+
+def _latest_stock_product(field: str, product_ref: str) -> Subquery:
+    latest = (
+        StockProduct.objects.filter(product_id=OuterRef(product_ref))
+        .order_by('-created_at', '-pk')
+        .values(field)[:1]
+    )
+    return Subquery(latest)
+
+
+def annotate_latest_prices(queryset, product_ref: str = 'product_id'):
+    """
+    Add the latest StockProduct's prices and drop products that were never stocked.
+
+    Adds ``latest_retail_price`` (0.00 when unset), ``latest_wholesale_price``
+    and ``last_stocked_at``.
+    """
+    return queryset.annotate(
+        latest_stock_product_id=_latest_stock_product('pk', product_ref),
+        latest_retail_price=Coalesce(
+            _latest_stock_product('retail_price', product_ref),
+            Value(ZERO),
+            output_field=DecimalField(max_digits=12, decimal_places=2),
+        ),
+        latest_wholesale_price=_latest_stock_product('wholesale_price', product_ref),
+        last_stocked_at=_latest_stock_product('created_at', product_ref),
+    ).filter(latest_stock_product_id__isnull=False)
+
+
+def _filter_products(queryset, filters: Dict[str, Any], prefix: str = ''):
+    if filters['search']:
+        queryset = ProductSearch(filters['search'], fields=CATALOG_SEARCH_FIELDS, prefix=prefix).filter(queryset)
+    if filters['category_id']:
+        queryset = queryset.filter(**{f'{prefix}category_id': filters['category_id']})
+    if filters['min_price'] is not None:
+        queryset = queryset.filter(latest_retail_price__gte=filters['min_price'])
+    if filters['max_price'] is not None:
+        queryset = queryset.filter(latest_retail_price__lte=filters['max_price'])
+    return queryset
+
+
+def storefront_catalog_queryset(storefront, filters: Dict[str, Any]):
+    """StoreFrontInventory rows for one storefront's catalog, ordered by product name."""
+    queryset = StoreFrontInventory.objects.filter(storefront=storefront).select_related(
+        'product', 'product__category'
+    )
+    if filters['in_stock_only']:
+        queryset = queryset.filter(quantity__gt=0)
+    queryset = _filter_products(annotate_latest_prices(queryset, 'product_id'), filters, prefix='product__')
+    return queryset.order_by(Lower('product__name'), 'product_id')
+
+
+def multi_storefront_catalog_queryset(storefront_ids: Iterable, filters: Dict[str, Any]):
+    """Products stocked in any of the storefronts, ordered by name."""
+    stocked = StoreFrontInventory.objects.filter(product_id=OuterRef('pk'), storefront_id__in=list(storefront_ids))
+    if filters['in_stock_only']:
+        stocked = stocked.filter(quantity__gt=0)
+    queryset = Product.objects.filter(Exists(stocked)).select_related('category')
+    queryset = _filter_products(annotate_latest_prices(queryset, 'pk'), filters)
+    return queryset.order_by(Lower('name'), 'pk')
+
+
+def stock_product_ids_by_product(product_ids: Iterable) -> Dict[Any, List]:
+    """StockProduct ids per product, newest first, for one page of products."""
+    ids = defaultdict(list)
+    rows = (
+        StockProduct.objects.filter(product_id__in=list(product_ids))
+        .order_by('product_id', '-created_at', '-pk')
+        .values_list('product_id', 'id')
+    )
+    for product_id, stock_product_id in rows:
+        ids[product_id].append(stock_product_id)
+    return ids
+
+
+def wholesale_or_none(price: Optional[Decimal]) -> Optional[Decimal]:
+    """Wholesale prices of zero mean "not offered"."""
+    if price is None or price <= ZERO:
+        return None
+    return price
+
+
+def product_columns(product) -> Dict[str, Any]:
+    return {
+        'product_name': product.name,
+        'sku': product.sku or '',
+        'barcode': product.barcode or '',
+        'category_name': product.category.name if product.category else None,
+        'unit': product.unit if hasattr(product, 'unit') else None,
+        'product_image': product.image.url if hasattr(product, 'image') and product.image else None,
+    }
+
+
+# --- Page cache ---------------------------------------------------------------
+
+def _timeout() -> int:
+    return getattr(settings, 'STOREFRONT_CATALOG_CACHE_TIMEOUT', 300)
+
+
+def _storefront_generation_key(storefront_id) -> str:
+    return f'catalog:storefront:{storefront_id}:generation'
+
+
+def _business_generation_key(business_id) -> str:
+    return f'catalog:business:{business_id}:generation'
+
+
+def _generations(keys: List[str]) -> List[int]:
+    """Current value of each generation counter, initialising missing ones."""
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            # Time-based so an evicted counter never restarts at a value that
+            # older cached pages were stored under
+            cache.add(key, time.time_ns(), None)
+            found[key] = cache.get(key)
+    return [found[key] for key in keys]
+
+
+def _bump(key: str) -> None:
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def _bump_now_and_on_commit(keys: List[str]) -> None:
+    def bump():
+        for key in keys:
+            _bump(key)
+
+    # Bump now for this connection's readers and again after commit, so a
+    # page built by another request before the commit is not kept
+    bump()
+    transaction.on_commit(bump)
+
+
+def invalidate_storefront_catalogs(storefront_ids: Iterable) -> None:
+    """Invalidate cached catalog pages after storefront inventory changes."""
+    keys = [_storefront_generation_key(storefront_id) for storefront_id in set(storefront_ids) if storefront_id]
+    if keys:
+        _bump_now_and_on_commit(keys)
+
+
+def invalidate_business_catalogs(business_ids: Iterable) -> None:
+    """Invalidate cached catalog pages after product or price changes."""
+    keys = [_business_generation_key(business_id) for business_id in set(business_ids) if business_id]
+    if keys:
+        _bump_now_and_on_commit(keys)
+
+
+def storefront_business_ids(storefronts: Iterable) -> List:
+    business_ids = set()
+    for storefront in storefronts:
+        link = getattr(storefront, 'business_link', None)
+        if link is not None:
+            business_ids.add(link.business_id)
+    return sorted(business_ids, key=str)
+
+
+def get_or_build_page(
+    request,
+    storefront_ids: Iterable,
+    business_ids: Iterable,
+    build: Callable[[], Dict[str, Any]],
+) -> Dict[str, Any]:
+    """
+    Return the cached response body for this catalog request, building it on a miss.
+
+    The key includes the absolute request URL, so each page, page size and
+    filter combination (and the pagination links built from the host) is
+    cached separately.
+    """
+    timeout = _timeout()
+    if not timeout:
+        return build()
+
+    storefront_keys = sorted(_storefront_generation_key(storefront_id) for storefront_id in set(storefront_ids))
+    business_keys = sorted(_business_generation_key(business_id) for business_id in set(business_ids))
+    generations = _generations(storefront_keys + business_keys)
+
+    payload = '|'.join(
+        [request.build_absolute_uri()]
+        + [f'{key}={generation}' for key, generation in zip(storefront_keys + business_keys, generations)]
+    )
+    key = f'catalog:page:{hashlib.sha1(payload.encode("utf-8")).hexdigest()}'
+
+    body = cache.get(key)
+    if body is None:
+        body = build()
+        cache.set(key, body, timeout)
+    return body
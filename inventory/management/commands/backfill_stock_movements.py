@@ -0,0 +1,158 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Prefetch, Q
+
+from inventory.movement_ledger import (
+    CHECKED_OUT_SALE_STATUSES,
+    TRANSFER_ADJUSTMENT_TYPES,
+    adjustment_movements,
+    record_movements,
+    refund_movements,
+    sale_movements,
+    transfer_movements,
+)
+from inventory.models import StockMovement
+from inventory.stock_adjustments import StockAdjustment
+from inventory.transfer_models import Transfer, TransferItem
+from sales.models import Refund, RefundItem, Sale, SaleItem
+
+
+class Command(BaseCommand):
+    """Populate the StockMovement ledger from existing adjustments, transfers and sales."""
+
+    help = (
+        "Append ledger entries for every completed stock adjustment, completed transfer, "
+        "checked-out sale and processed refund. Sources already in the ledger are skipped, "
+        "so the command is safe to re-run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--business",
+            dest="business_id",
+            help="Limit to a specific business UUID.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Source records per transaction (default: 500).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Count the entries that would be built without writing.",
+        )
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help="After backfilling, compare ledger totals with the legacy union query per business.",
+        )
+
+    def handle(self, *args, **options):
+        business_id = options.get("business_id")
+        batch_size = max(1, options["batch_size"])
+        dry_run = options.get("dry_run")
+
+        sources = self._sources(business_id)
+        total = 0
+        for label, queryset, build in sources:
+            written = 0
+            for batch in self._batches(queryset, batch_size):
+                movements = build(batch)
+                if dry_run:
+                    written += len(movements)
+                    continue
+                with transaction.atomic():
+                    written += record_movements(movements)
+            self.stdout.write(f"{label}: {written} entries")
+            total += written
+
+        if dry_run:
+            self.stdout.write(self.style.SUCCESS(f"Dry run complete. {total} ledger entries would be written."))
+        else:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Backfill complete. Processed {total} ledger entries "
+                    f"({StockMovement.objects.count()} rows in the ledger)."
+                )
+            )
+
+        if options.get("verify"):
+            self._verify(business_id)
+
+    def _sources(self, business_id):
+        adjustments = StockAdjustment.objects.filter(status='COMPLETED').exclude(
+            adjustment_type__in=TRANSFER_ADJUSTMENT_TYPES
+        ).select_related(
+            'stock_product__product__category',
+            'stock_product__warehouse',
+            'created_by',
+        )
+        transfers = Transfer.objects.filter(status=Transfer.STATUS_COMPLETED).select_related(
+            'source_warehouse', 'destination_warehouse', 'destination_storefront', 'created_by',
+        ).prefetch_related(
+            Prefetch('items', queryset=TransferItem.objects.select_related('product__category')),
+        )
+        sales = Sale.objects.filter(
+            Q(status__in=CHECKED_OUT_SALE_STATUSES) | Q(status='CANCELLED', completed_at__isnull=False)
+        ).select_related('storefront', 'user').prefetch_related(
+            Prefetch(
+                'sale_items',
+                queryset=SaleItem.objects.select_related('product__category', 'stock_product__warehouse'),
+            ),
+        )
+        refunds = Refund.objects.filter(status='PROCESSED').select_related(
+            'sale__storefront', 'processed_by',
+        ).prefetch_related(
+            Prefetch(
+                'refund_items',
+                queryset=RefundItem.objects.select_related(
+                    'sale_item__product__category', 'sale_item__stock_product__warehouse',
+                ),
+            ),
+        )
+
+        if business_id:
+            adjustments = adjustments.filter(business_id=business_id)
+            transfers = transfers.filter(business_id=business_id)
+            sales = sales.filter(business_id=business_id)
+            refunds = refunds.filter(sale__business_id=business_id)
+
+        return [
+            ("Adjustments", adjustments, adjustment_movements),
+            ("Transfers", transfers, transfer_movements),
+            ("Sales", sales, sale_movements),
+            ("Refunds", refunds, refund_movements),
+        ]
+
+    def _batches(self, queryset, batch_size):
+        """Yield lists of records ordered by primary key, one keyset page at a time."""
+        queryset = queryset.order_by('pk')
+        last_pk = None
+        while True:
+            page = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            batch = list(page[:batch_size])
+            if not batch:
+                return
+            yield batch
+            last_pk = batch[-1].pk
+
+    def _verify(self, business_id):
+        from reports.services import MovementTracker
+
+        business_ids = (
+            [business_id]
+            if business_id
+            else StockMovement.objects.order_by().values_list('business_id', flat=True).distinct()
+        )
+        clean = True
+        for current_id in business_ids:
+            result = MovementTracker.verify_ledger(business_id=str(current_id))
+            for metric, (ledger_value, union_value) in result['mismatches'].items():
+                clean = False
+                self.stdout.write(
+                    self.style.WARNING(f"{current_id} {metric}: ledger={ledger_value} union={union_value}")
+                )
+        if clean:
+            self.stdout.write(self.style.SUCCESS("Ledger totals match the union query."))
@@ -0,0 +1,94 @@
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Sum
+
+from inventory.models import StockProduct
+from sales.models import StockReservation
+
+
+class Command(BaseCommand):
+    """Recalculate StockProduct.reserved_quantity from ACTIVE stock reservations."""
+
+    help = (
+        "Rebuild StockProduct.reserved_quantity so it matches the sum of ACTIVE "
+        "StockReservation rows for each stock product."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--product",
+            dest="product_id",
+            help="Limit to a specific product UUID.",
+        )
+        parser.add_argument(
+            "--warehouse",
+            dest="warehouse_id",
+            help="Limit to a specific warehouse UUID.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Show the expected changes without writing to the database.",
+        )
+
+    def handle(self, *args, **options):
+        product_id = options.get("product_id")
+        warehouse_id = options.get("warehouse_id")
+        dry_run = options.get("dry_run")
+
+        stock_products = StockProduct.objects.all()
+        if product_id:
+            stock_products = stock_products.filter(product_id=product_id)
+        if warehouse_id:
+            stock_products = stock_products.filter(warehouse_id=warehouse_id)
+
+        differences = 0
+        updated = 0
+
+        with transaction.atomic():
+            # Lock the counters first so reservations created meanwhile wait for the rebuild.
+            current = dict(
+                stock_products.select_for_update()
+                .order_by("id")
+                .values_list("id", "reserved_quantity")
+            )
+            if not current:
+                self.stdout.write(self.style.WARNING("No StockProduct rows match the provided filters."))
+                return
+
+            expected = {
+                row["stock_product"]: row["total"] or Decimal("0.00")
+                for row in (
+                    StockReservation.objects.filter(stock_product_id__in=current.keys(), status="ACTIVE")
+                    .values("stock_product")
+                    .annotate(total=Sum("quantity"))
+                )
+            }
+
+            for stock_product_id, recorded in current.items():
+                target = expected.get(stock_product_id, Decimal("0.00"))
+                if (recorded or Decimal("0.00")) == target:
+                    continue
+
+                differences += 1
+                if dry_run:
+                    self.stdout.write(
+                        f"StockProduct {stock_product_id}: current={recorded}, expected={target}"
+                    )
+                    continue
+
+                StockProduct.objects.filter(pk=stock_product_id).update(reserved_quantity=target)
+                updated += 1
+
+        if dry_run:
+            self.stdout.write(
+                self.style.SUCCESS(f"Dry run complete. {differences} stock products would change.")
+            )
+        else:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Rebuild complete. Updated {updated} stock products (differences found: {differences})."
+                )
+            )
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.6 on 2026-10-16 09:00
+
+from decimal import Decimal
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0025_transferrequest_linking_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='stockproduct',
+            name='reserved_quantity',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12),
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Trigram indexes backing inventory.search.ProductSearch
+
+import logging
+
+from django.db import DatabaseError, migrations, transaction
+
+logger = logging.getLogger(__name__)
+
+# Must match inventory.search.TRIGRAM_INDEXED_FIELDS. Each index is built on
+# the expression Django emits for ``icontains`` on PostgreSQL, so
+# ``UPPER("products"."name"::text) LIKE UPPER('%tv%')`` can use it.
+TRIGRAM_COLUMNS = ('name', 'sku', 'barcode', 'description')
+
+
+def _index_name(column):
+    return f'products_{column}_trgm_idx'
+
+
+def _enable_pg_trgm(schema_editor):
+    """Install pg_trgm if possible; False when it is unavailable or not permitted."""
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        if cursor.fetchone():
+            return True
+    try:
+        with transaction.atomic(using=schema_editor.connection.alias):
+            schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    except DatabaseError as exc:
+        logger.warning(
+            'Skipping product search trigram indexes: pg_trgm could not be enabled (%s). '
+            'Run "CREATE EXTENSION pg_trgm" as a superuser and re-run this migration '
+            '(migrate inventory 0026, then migrate) to add them.',
+            exc,
+        )
+        return False
+    return True
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    # Search works without the extension (sequential scans, icontains ranking)
+    if not _enable_pg_trgm(schema_editor):
+        return
+    for column in TRIGRAM_COLUMNS:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {_index_name(column)} '
+            f'ON products USING gin ((UPPER({column}::text)) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for column in TRIGRAM_COLUMNS:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {_index_name(column)}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0026_stockproduct_reserved_quantity'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.6 on 2026-10-16 17:05
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0011_one_user_one_business'),
+        ('inventory', '0027_product_search_trigram_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockMovement',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('source_type', models.CharField(choices=[('legacy_adjustment', 'Stock adjustment'), ('new_transfer', 'Transfer'), ('sale', 'Sale'), ('sale_refund', 'Sale refund')], max_length=20)),
+                ('source_key', models.CharField(help_text='Identifier of the source line (adjustment, transfer-item, sale item or refund item)', max_length=80)),
+                ('movement_type', models.CharField(choices=[('transfer', 'Transfer'), ('sale', 'Sale'), ('adjustment', 'Adjustment'), ('shrinkage', 'Shrinkage')], max_length=20)),
+                ('movement_date', models.DateTimeField()),
+                ('product_name', models.CharField(max_length=255)),
+                ('product_sku', models.CharField(blank=True, max_length=100, null=True)),
+                ('category_id', models.UUIDField(blank=True, null=True)),
+                ('category_name', models.CharField(blank=True, max_length=255, null=True)),
+                ('quantity', models.DecimalField(decimal_places=2, help_text='Absolute quantity moved', max_digits=14)),
+                ('direction', models.CharField(choices=[('in', 'In'), ('out', 'Out'), ('both', 'Both')], max_length=4)),
+                ('unit_cost', models.DecimalField(blank=True, decimal_places=2, max_digits=12, null=True)),
+                ('total_value', models.DecimalField(blank=True, decimal_places=2, max_digits=14, null=True)),
+                ('source_location_id', models.UUIDField(blank=True, null=True)),
+                ('source_location_name', models.CharField(blank=True, max_length=255, null=True)),
+                ('destination_location_id', models.UUIDField(blank=True, null=True)),
+                ('destination_location_name', models.CharField(blank=True, max_length=255, null=True)),
+                ('reference_number', models.CharField(blank=True, max_length=100, null=True)),
+                ('reference_id', models.UUIDField(blank=True, null=True)),
+                ('sale_id', models.UUIDField(blank=True, null=True)),
+                ('transfer_id', models.UUIDField(blank=True, null=True)),
+                ('adjustment_id', models.UUIDField(blank=True, null=True)),
+                ('adjustment_type', models.CharField(blank=True, max_length=50, null=True)),
+                ('sale_type', models.CharField(blank=True, max_length=20, null=True)),
+                ('transfer_type', models.CharField(blank=True, max_length=3, null=True)),
+                ('status', models.CharField(blank=True, help_text='Source status when recorded', max_length=20, null=True)),
+                ('notes', models.TextField(blank=True, null=True)),
+                ('performed_by_name', models.CharField(blank=True, max_length=255, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('business', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_movements', to='accounts.business')),
+                ('performed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='stock_movements', to=settings.AUTH_USER_MODEL)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='stock_movements', to='inventory.product')),
+            ],
+            options={
+                'db_table': 'stock_movements',
+                'ordering': ['-movement_date'],
+                'indexes': [models.Index(fields=['business', 'movement_date'], name='stock_movem_busines_0d4104_idx'), models.Index(fields=['product', 'movement_date'], name='stock_movem_product_363a5e_idx')],
+                'constraints': [models.UniqueConstraint(fields=('source_type', 'source_key'), name='stock_movement_unique_source')],
+            },
+        ),
+    ]
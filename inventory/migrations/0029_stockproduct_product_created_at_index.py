@@ -0,0 +1,17 @@
+# Generated by Django 5.2.6 on 2026-10-16 23:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0028_stockmovement'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='stockproduct',
+            index=models.Index(fields=['product', 'created_at'], name='stock_produ_product_22c15d_idx'),
+        ),
+    ]
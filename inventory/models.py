@@ -232,6 +232,10 @@ class StockProduct(models.Model):
     # after transfers and movements. quantity remains the original intake amount
     # for audit and accounting purposes.
     calculated_quantity = models.IntegerField(default=0)
+    # reserved_quantity is the running total of ACTIVE StockReservation rows for
+    # this stock product. It is maintained by StockReservation and can be rebuilt
+    # with the rebuild_reserved_quantities management command.
+    reserved_quantity = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0.00'))
     unit_cost = models.DecimalField(max_digits=12, decimal_places=2, validators=[MinValueValidator(Decimal('0.00'))], default=Decimal('0.00'))
     unit_tax_rate = models.DecimalField(max_digits=5, decimal_places=2, validators=[MinValueValidator(Decimal('0.00')), MaxValueValidator(Decimal('100.00'))], default=Decimal('0.00'), null=True, blank=True)
     unit_tax_amount = models.DecimalField(max_digits=12, decimal_places=2, validators=[MinValueValidator(Decimal('0.00'))], default=Decimal('0.00'), null=True, blank=True)
@@ -251,6 +255,8 @@ class StockProduct(models.Model):
             models.Index(fields=['product', 'expiry_date']),
             models.Index(fields=['supplier']),
             models.Index(fields=['stock', 'product', 'unit_cost']),
+            # Latest batch per product (catalog pricing)
+            models.Index(fields=['product', 'created_at'], name='stock_produ_product_22c15d_idx'),
         ]
         constraints = [
             models.UniqueConstraint(
@@ -276,6 +282,24 @@ class StockProduct(models.Model):
                 self.calculated_quantity = int(self.quantity or 0)
         super().save(*args, **kwargs)
 
+    def update_fields_excluding_reserved(self):
+        """
+        ``update_fields`` for saving an edited row without writing reserved_quantity.
+
+        reserved_quantity is maintained with atomic F() updates by
+        StockReservation, so edit paths that save an instance loaded before
+        the edit (the API serializer, the admin) pass this to ``save`` rather
+        than writing the possibly stale counter back. Plain ``save()`` still
+        writes every column.
+        """
+        deferred = self.get_deferred_fields()
+        return [
+            field.name for field in self._meta.concrete_fields
+            if not field.primary_key
+            and field.name != 'reserved_quantity'
+            and field.attname not in deferred
+        ]
+
     @property
     def effective_supplier(self):
         return self.supplier
@@ -380,14 +404,7 @@ class StockProduct(models.Model):
         Returns:
             Decimal: Quantity available for new reservations/sales
         """
-        from django.db.models import Sum
-        
-        # Get total reserved quantity
-        reserved = self.reservations.filter(
-            status='ACTIVE'
-        ).aggregate(
-            total=Sum('quantity')
-        )['total'] or Decimal('0.00')
+        reserved = self.reserved_quantity or Decimal('0.00')
         # Use calculated_quantity as the working/current quantity after transfers
         available = Decimal(str(self.calculated_quantity or 0)) - reserved
         return max(Decimal('0.00'), available)
@@ -855,10 +872,12 @@ class WarehouseEmployee(models.Model):
 
 # Import new Transfer models (Phase 2 - Week 2)
 from .transfer_models import Transfer, TransferItem
+from .movement_models import StockMovement
 
 __all__ = [
     'Category', 'Supplier', 'Product', 'Warehouse', 'BusinessWarehouse',
     'Stock', 'StockProduct', 'StoreFront', 'BusinessStoreFront',
     'StockAdjustment', 'StockAdjustmentDocument', 'StoreFrontEmployee',
     'Transfer', 'TransferItem',  # New models
+    'StockMovement',
 ]
@@ -0,0 +1,275 @@
+"""
+Maintenance of the StockMovement ledger.
+
+Each completed stock movement is appended to ``stock_movements`` in the same
+transaction as the change that caused it:
+
+- ``record_adjustment_movements``: a StockAdjustment reaches COMPLETED
+  (``inventory.signals`` calls it from ``post_save``, which covers adjustments
+  created already completed as well as ``StockAdjustment.complete``)
+- ``record_transfer_movements``: ``Transfer.complete_transfer``
+- ``record_sale_movements``: a Sale is checked out and its stock committed
+- ``record_refund_movements``: ``Sale.process_refund`` restocks items
+
+Entries are keyed by ``(source_type, source_key)`` and inserted with
+``ignore_conflicts``, so recording the same source twice (or backfilling over
+live data) is harmless. The ``*_movements`` builders return unsaved rows and
+are shared with the ``backfill_stock_movements`` command.
+
+Every write also bumps the business's movement generation
+(``movements:business:<id>:generation`` in Django's cache). Readers that cache
+movement aggregates include the generation in their keys, so a completed
+adjustment, transfer or sale makes earlier cached results unreachable.
+
+Columns follow the movement report conventions: quantities are absolute with a
+separate direction, and sale lines are valued at their selling price.
+"""
+
+import time
+from decimal import Decimal
+from typing import Iterable, List
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .movement_models import StockMovement
+
+# Adjustment types reported as shrinkage rather than plain adjustments
+SHRINKAGE_TYPES = ['THEFT', 'DAMAGE', 'EXPIRED', 'SPOILAGE', 'LOSS', 'WRITE_OFF']
+
+# Legacy paired transfer adjustments; transfers are recorded from Transfer instead
+TRANSFER_ADJUSTMENT_TYPES = ['TRANSFER_IN', 'TRANSFER_OUT']
+
+# Sale statuses whose stock has been committed
+CHECKED_OUT_SALE_STATUSES = ['PENDING', 'COMPLETED', 'PARTIAL', 'REFUNDED']
+
+
+def _product_columns(product):
+    category = product.category
+    return {
+        'product': product,
+        'product_name': product.name,
+        'product_sku': product.sku,
+        'category_id': category.id if category else None,
+        'category_name': category.name if category else None,
+    }
+
+
+def _performer_columns(user):
+    return {
+        'performed_by': user,
+        'performed_by_name': user.name if user else None,
+    }
+
+
+def adjustment_movements(adjustments: Iterable) -> List[StockMovement]:
+    """Build ledger rows for completed, non-transfer stock adjustments."""
+    movements = []
+    for adjustment in adjustments:
+        if adjustment.status != 'COMPLETED' or adjustment.adjustment_type in TRANSFER_ADJUSTMENT_TYPES:
+            continue
+
+        stock_product = adjustment.stock_product
+        warehouse = stock_product.warehouse
+        is_out = adjustment.quantity < 0
+        if adjustment.adjustment_type in SHRINKAGE_TYPES:
+            movement_type = StockMovement.TYPE_SHRINKAGE
+        else:
+            movement_type = StockMovement.TYPE_ADJUSTMENT
+
+        movements.append(StockMovement(
+            business_id=adjustment.business_id,
+            source_type=StockMovement.SOURCE_ADJUSTMENT,
+            source_key=str(adjustment.id),
+            movement_type=movement_type,
+            movement_date=adjustment.created_at,
+            quantity=Decimal(abs(adjustment.quantity)),
+            direction=StockMovement.DIRECTION_OUT if is_out else StockMovement.DIRECTION_IN,
+            unit_cost=adjustment.unit_cost,
+            total_value=abs(adjustment.total_cost) if adjustment.total_cost is not None else None,
+            source_location_id=warehouse.id if is_out else None,
+            source_location_name=warehouse.name if is_out else None,
+            destination_location_id=None if is_out else warehouse.id,
+            destination_location_name=None if is_out else warehouse.name,
+            reference_number=adjustment.reference_number,
+            reference_id=adjustment.id,
+            adjustment_id=adjustment.id,
+            adjustment_type=adjustment.adjustment_type,
+            status=adjustment.status,
+            notes=adjustment.reason,
+            **_product_columns(stock_product.product),
+            **_performer_columns(adjustment.created_by),
+        ))
+    return movements
+
+
+def transfer_movements(transfers: Iterable) -> List[StockMovement]:
+    """Build one ledger row per item of each completed transfer."""
+    from .transfer_models import Transfer
+
+    movements = []
+    for transfer in transfers:
+        if transfer.status != Transfer.STATUS_COMPLETED:
+            continue
+
+        source = transfer.source_warehouse
+        destination = transfer.destination_warehouse or transfer.destination_storefront
+        movement_date = transfer.received_at or transfer.completed_at or transfer.created_at
+        for item in transfer.items.all():
+            movements.append(StockMovement(
+                business_id=transfer.business_id,
+                source_type=StockMovement.SOURCE_TRANSFER,
+                source_key=f'{transfer.id}-{item.id}',
+                movement_type=StockMovement.TYPE_TRANSFER,
+                movement_date=movement_date,
+                quantity=Decimal(item.quantity),
+                direction=StockMovement.DIRECTION_BOTH,
+                unit_cost=item.unit_cost,
+                total_value=item.total_cost,
+                source_location_id=source.id if source else None,
+                source_location_name=source.name if source else None,
+                destination_location_id=destination.id if destination else None,
+                destination_location_name=destination.name if destination else None,
+                reference_number=transfer.reference_number,
+                reference_id=transfer.id,
+                transfer_id=transfer.id,
+                transfer_type=transfer.transfer_type,
+                status=transfer.status,
+                notes=transfer.notes,
+                **_product_columns(item.product),
+                **_performer_columns(transfer.created_by),
+            ))
+    return movements
+
+
+def _sale_location(sale, sale_item):
+    """Storefront the stock left from, or the batch's warehouse for warehouse sales."""
+    if sale.storefront_id:
+        return sale.storefront
+    stock_product = sale_item.stock_product
+    return stock_product.warehouse if stock_product else None
+
+
+def sale_movements(sales: Iterable) -> List[StockMovement]:
+    """Build one outbound ledger row per line of each checked-out sale."""
+    movements = []
+    for sale in sales:
+        for item in sale.sale_items.all():
+            location = _sale_location(sale, item)
+            movements.append(StockMovement(
+                business_id=sale.business_id,
+                source_type=StockMovement.SOURCE_SALE,
+                source_key=str(item.id),
+                movement_type=StockMovement.TYPE_SALE,
+                movement_date=sale.created_at,
+                quantity=item.quantity,
+                direction=StockMovement.DIRECTION_OUT,
+                unit_cost=item.unit_price,
+                total_value=item.total_price,
+                source_location_id=location.id if location else None,
+                source_location_name=location.name if location else None,
+                destination_location_name='Customer',
+                reference_number=sale.receipt_number,
+                reference_id=sale.id,
+                sale_id=sale.id,
+                sale_type=sale.type,
+                status=sale.status,
+                notes=f'Sale - {sale.type}',
+                **_product_columns(item.product),
+                **_performer_columns(sale.user),
+            ))
+    return movements
+
+
+def refund_movements(refunds: Iterable) -> List[StockMovement]:
+    """Build one inbound ledger row per restocked refund line."""
+    movements = []
+    for refund in refunds:
+        sale = refund.sale
+        for refund_item in refund.refund_items.all():
+            sale_item = refund_item.sale_item
+            location = _sale_location(sale, sale_item)
+            quantity = Decimal(refund_item.quantity)
+            movements.append(StockMovement(
+                business_id=sale.business_id,
+                source_type=StockMovement.SOURCE_REFUND,
+                source_key=str(refund_item.id),
+                movement_type=StockMovement.TYPE_SALE,
+                movement_date=refund.created_at,
+                quantity=quantity,
+                direction=StockMovement.DIRECTION_IN,
+                unit_cost=sale_item.unit_price,
+                total_value=refund_item.amount,
+                source_location_name='Customer',
+                destination_location_id=location.id if location else None,
+                destination_location_name=location.name if location else None,
+                reference_number=sale.receipt_number,
+                reference_id=sale.id,
+                sale_id=sale.id,
+                sale_type=sale.type,
+                status=refund.status,
+                notes=refund.reason,
+                **_product_columns(sale_item.product),
+                **_performer_columns(refund.processed_by),
+            ))
+    return movements
+
+
+def _generation_key(business_id) -> str:
+    return f'movements:business:{business_id}:generation'
+
+
+def movement_generation(business_id) -> int:
+    """Current movement generation for a business, initialised on first use."""
+    key = _generation_key(business_id)
+    generation = cache.get(key)
+    if generation is None:
+        # Time-based so an evicted counter never restarts at a value that
+        # older cached results were stored under
+        cache.add(key, time.time_ns(), None)
+        generation = cache.get(key)
+    return generation
+
+
+def bump_movement_generation(business_id) -> None:
+    """Invalidate cached movement aggregates for a business."""
+    key = _generation_key(business_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def _invalidate_businesses(business_ids) -> None:
+    for business_id in business_ids:
+        bump_movement_generation(business_id)
+
+
+def record_movements(movements: List[StockMovement]) -> int:
+    """Append ledger rows, skipping sources that are already recorded."""
+    if not movements:
+        return 0
+    StockMovement.objects.bulk_create(movements, ignore_conflicts=True)
+
+    business_ids = {movement.business_id for movement in movements}
+    # Bump now for this connection's readers and again after commit, so a
+    # result computed by another request before the commit is not kept
+    _invalidate_businesses(business_ids)
+    transaction.on_commit(lambda: _invalidate_businesses(business_ids))
+    return len(movements)
+
+
+def record_adjustment_movements(adjustment) -> int:
+    return record_movements(adjustment_movements([adjustment]))
+
+
+def record_transfer_movements(transfer) -> int:
+    return record_movements(transfer_movements([transfer]))
+
+
+def record_sale_movements(sale) -> int:
+    return record_movements(sale_movements([sale]))
+
+
+def record_refund_movements(refund) -> int:
+    return record_movements(refund_movements([refund]))
@@ -0,0 +1,126 @@
+"""
+Stock Movement Ledger - append-only record of every completed stock movement.
+
+One row is written per product line when a StockAdjustment completes, a
+Transfer completes, a Sale is checked out, or a Refund restocks items. Rows
+carry denormalized product, location and value columns so movement reports
+read a single indexed table instead of re-joining adjustments, transfers and
+sales on every request. See ``inventory.movement_ledger`` for the writers.
+"""
+import uuid
+
+from django.db import models
+
+from accounts.models import Business, User
+
+
+class StockMovement(models.Model):
+    """Immutable ledger entry for one product's movement in or out of a location"""
+
+    # Movement types (same vocabulary as reports.services.MovementTracker)
+    TYPE_TRANSFER = 'transfer'
+    TYPE_SALE = 'sale'
+    TYPE_ADJUSTMENT = 'adjustment'
+    TYPE_SHRINKAGE = 'shrinkage'
+
+    TYPE_CHOICES = [
+        (TYPE_TRANSFER, 'Transfer'),
+        (TYPE_SALE, 'Sale'),
+        (TYPE_ADJUSTMENT, 'Adjustment'),
+        (TYPE_SHRINKAGE, 'Shrinkage'),
+    ]
+
+    # Source records
+    SOURCE_ADJUSTMENT = 'legacy_adjustment'
+    SOURCE_TRANSFER = 'new_transfer'
+    SOURCE_SALE = 'sale'
+    SOURCE_REFUND = 'sale_refund'
+
+    SOURCE_CHOICES = [
+        (SOURCE_ADJUSTMENT, 'Stock adjustment'),
+        (SOURCE_TRANSFER, 'Transfer'),
+        (SOURCE_SALE, 'Sale'),
+        (SOURCE_REFUND, 'Sale refund'),
+    ]
+
+    DIRECTION_IN = 'in'
+    DIRECTION_OUT = 'out'
+    DIRECTION_BOTH = 'both'
+
+    DIRECTION_CHOICES = [
+        (DIRECTION_IN, 'In'),
+        (DIRECTION_OUT, 'Out'),
+        (DIRECTION_BOTH, 'Both'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    business = models.ForeignKey(Business, on_delete=models.CASCADE, related_name='stock_movements')
+
+    # Where the entry came from; (source_type, source_key) is unique so writers are idempotent
+    source_type = models.CharField(max_length=20, choices=SOURCE_CHOICES)
+    source_key = models.CharField(
+        max_length=80,
+        help_text='Identifier of the source line (adjustment, transfer-item, sale item or refund item)'
+    )
+    movement_type = models.CharField(max_length=20, choices=TYPE_CHOICES)
+    movement_date = models.DateTimeField()
+
+    # Product (denormalized)
+    product = models.ForeignKey('inventory.Product', on_delete=models.PROTECT, related_name='stock_movements')
+    product_name = models.CharField(max_length=255)
+    product_sku = models.CharField(max_length=100, blank=True, null=True)
+    category_id = models.UUIDField(null=True, blank=True)
+    category_name = models.CharField(max_length=255, blank=True, null=True)
+
+    # Quantity and value
+    quantity = models.DecimalField(max_digits=14, decimal_places=2, help_text='Absolute quantity moved')
+    direction = models.CharField(max_length=4, choices=DIRECTION_CHOICES)
+    unit_cost = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
+    total_value = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True)
+
+    # Locations (warehouse or storefront, denormalized)
+    source_location_id = models.UUIDField(null=True, blank=True)
+    source_location_name = models.CharField(max_length=255, blank=True, null=True)
+    destination_location_id = models.UUIDField(null=True, blank=True)
+    destination_location_name = models.CharField(max_length=255, blank=True, null=True)
+
+    # References back to the originating records
+    reference_number = models.CharField(max_length=100, blank=True, null=True)
+    reference_id = models.UUIDField(null=True, blank=True)
+    sale_id = models.UUIDField(null=True, blank=True)
+    transfer_id = models.UUIDField(null=True, blank=True)
+    adjustment_id = models.UUIDField(null=True, blank=True)
+    adjustment_type = models.CharField(max_length=50, blank=True, null=True)
+    sale_type = models.CharField(max_length=20, blank=True, null=True)
+    transfer_type = models.CharField(max_length=3, blank=True, null=True)
+    status = models.CharField(max_length=20, blank=True, null=True, help_text='Source status when recorded')
+    notes = models.TextField(blank=True, null=True)
+
+    # Who performed it
+    performed_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='stock_movements'
+    )
+    performed_by_name = models.CharField(max_length=255, blank=True, null=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'stock_movements'
+        ordering = ['-movement_date']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['source_type', 'source_key'],
+                name='stock_movement_unique_source'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['business', 'movement_date']),
+            models.Index(fields=['product', 'movement_date']),
+        ]
+
+    def __str__(self):
+        return f"{self.movement_type} {self.direction} {self.quantity} x {self.product_name}"
@@ -0,0 +1,130 @@
+"""
+Product search.
+
+Matches a query against product columns with case-insensitive substring
+predicates. Django renders ``icontains`` on PostgreSQL as
+``UPPER(column::text) LIKE UPPER(%s)``; migration 0027 adds pg_trgm GIN
+indexes on exactly those expressions, so the predicates are index scans
+instead of a sequential ``ILIKE`` over the catalog. Other backends (SQLite in
+tests), and PostgreSQL databases where the pg_trgm extension could not be
+enabled, run the same predicates as plain scans.
+
+Ranking happens in SQL: exact and prefix matches on name and SKU come first,
+and where pg_trgm is installed ``word_similarity`` against the name orders
+the rest.
+"""
+
+from typing import Iterable
+
+from django.db import connections
+from django.db.models import (
+    Case, IntegerField, OuterRef, Q, QuerySet, Subquery, Sum, Value, When,
+)
+from django.db.models.functions import Coalesce
+
+# Columns covered by the trigram indexes in inventory/migrations/0027
+TRIGRAM_INDEXED_FIELDS = ('name', 'sku', 'barcode', 'description')
+
+PRODUCT_SEARCH_FIELDS = ('name', 'sku', 'description')
+CATALOG_SEARCH_FIELDS = ('name', 'sku', 'barcode')
+
+# (lookup, field, score) terms summed into ``relevance``
+RELEVANCE_TERMS = (
+    ('iexact', 'name', 10),
+    ('istartswith', 'name', 7),
+    ('icontains', 'name', 3),
+    ('iexact', 'sku', 8),
+    ('istartswith', 'sku', 5),
+)
+
+
+# (alias, database name) -> whether pg_trgm is installed there
+_trigram_support = {}
+
+
+def supports_trigram(using: str = 'default') -> bool:
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return False
+    key = (using, connection.settings_dict['NAME'])
+    if key not in _trigram_support:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            _trigram_support[key] = cursor.fetchone() is not None
+    return _trigram_support[key]
+
+
+class ProductSearch:
+    """
+    Search predicates and ranking for one query string.
+
+    ``prefix`` lets the same search run against querysets that reach the
+    product through a relation, e.g. ``prefix='product__'`` on StockProduct.
+    """
+
+    def __init__(self, query: str, fields: Iterable[str] = PRODUCT_SEARCH_FIELDS, prefix: str = ''):
+        self.query = (query or '').strip()
+        self.fields = tuple(fields)
+        self.prefix = prefix
+
+    def _path(self, field: str) -> str:
+        return f'{self.prefix}{field}'
+
+    def condition(self) -> Q:
+        condition = Q()
+        for field in self.fields:
+            condition |= Q(**{f'{self._path(field)}__icontains': self.query})
+        return condition
+
+    def filter(self, queryset: QuerySet) -> QuerySet:
+        if not self.query:
+            return queryset
+        return queryset.filter(self.condition())
+
+    def relevance(self):
+        terms = [
+            Case(
+                When(**{f'{self._path(field)}__{lookup}': self.query}, then=Value(score)),
+                default=Value(0),
+                output_field=IntegerField(),
+            )
+            for lookup, field, score in RELEVANCE_TERMS
+        ]
+        expression = terms[0]
+        for term in terms[1:]:
+            expression = expression + term
+        return expression
+
+    def rank(self, queryset: QuerySet) -> QuerySet:
+        """Filter ``queryset`` and order it by ``relevance`` (best first)."""
+        queryset = self.filter(queryset).annotate(relevance=self.relevance())
+        ordering = ['-relevance']
+        if self.query and supports_trigram(queryset.db):
+            # Local import: django.contrib.postgres pulls in psycopg
+            from django.contrib.postgres.search import TrigramWordSimilarity
+
+            queryset = queryset.annotate(similarity=TrigramWordSimilarity(self.query, self._path('name')))
+            ordering.append('-similarity')
+        ordering.append(self._path('name'))
+        return queryset.order_by(*ordering)
+
+
+def annotate_current_stock(queryset: QuerySet, product_ref: str = 'pk') -> QuerySet:
+    """
+    Add ``current_stock``: the product's summed ``StockProduct.calculated_quantity``.
+
+    Computed with a correlated subquery so the totals come back in the same
+    query as the products instead of one aggregate per row.
+    """
+    from inventory.models import StockProduct
+
+    totals = (
+        StockProduct.objects.filter(product_id=OuterRef(product_ref))
+        .order_by()
+        .values('product_id')
+        .annotate(total=Sum('calculated_quantity'))
+        .values('total')
+    )
+    return queryset.annotate(
+        current_stock=Coalesce(Subquery(totals, output_field=IntegerField()), Value(0)),
+    )
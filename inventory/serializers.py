@@ -136,6 +136,13 @@ class StockProductSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
 
+    def update(self, instance, validated_data):
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        # Reservations may have moved reserved_quantity since the instance was loaded
+        instance.save(update_fields=instance.update_fields_excluding_reserved())
+        return instance
+
     def get_landed_unit_cost(self, obj):
         return obj.landed_unit_cost
 
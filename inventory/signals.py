@@ -22,13 +22,14 @@ WHAT THESE SIGNALS DO:
 ✅ Prevent manual editing of StockProduct.quantity after movements
 ✅ Validate adjustments won't cause negative available stock
 ✅ Validate transfers have sufficient available stock
+✅ Append completed adjustments to the StockMovement ledger
 ❌ DO NOT modify StockProduct.quantity (except to prevent edits)
 ❌ DO NOT apply adjustments to StockProduct.quantity
 ❌ DO NOT reduce StockProduct.quantity on transfers
 """
 
 from django.db import transaction, models
-from django.db.models.signals import pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.core.exceptions import ValidationError
 
@@ -294,6 +295,53 @@ def validate_transfer_has_sufficient_stock(sender, instance, **kwargs):
             )
 
 
+@receiver(post_save, sender='inventory.StockAdjustment')
+def record_completed_adjustment_movement(sender, instance, **kwargs):
+    """
+    Append a completed adjustment to the StockMovement ledger.
+
+    Runs on every save of a COMPLETED adjustment; the ledger ignores sources it
+    already holds, so re-saves do not duplicate entries.
+    """
+    if instance.status != 'COMPLETED':
+        return
+
+    from inventory.movement_ledger import record_adjustment_movements
+    record_adjustment_movements(instance)
+
+
+@receiver(post_save, sender='inventory.StoreFrontInventory')
+@receiver(post_delete, sender='inventory.StoreFrontInventory')
+def invalidate_storefront_catalog(sender, instance, **kwargs):
+    """Storefront quantities changed: drop that storefront's cached catalog pages."""
+    from inventory.catalog import invalidate_storefront_catalogs
+    invalidate_storefront_catalogs([instance.storefront_id])
+
+
+@receiver(post_save, sender='inventory.Product')
+@receiver(post_delete, sender='inventory.Product')
+def invalidate_product_catalog(sender, instance, **kwargs):
+    """Product details changed: drop the business's cached catalog pages."""
+    from inventory.catalog import invalidate_business_catalogs
+    invalidate_business_catalogs([instance.business_id])
+
+
+@receiver(post_save, sender='inventory.StockProduct')
+@receiver(post_delete, sender='inventory.StockProduct')
+def invalidate_stock_product_catalog(sender, instance, **kwargs):
+    """
+    A batch was added, repriced or removed: drop the business's cached catalog pages.
+
+    Quantity-only writes (``calculated_quantity`` during checkout) go through
+    ``bulk_update`` and do not reach here; the catalog does not show them.
+    """
+    from inventory.catalog import invalidate_business_catalogs
+    from inventory.models import Product
+
+    business_id = Product.objects.filter(pk=instance.product_id).values_list('business_id', flat=True).first()
+    invalidate_business_catalogs([business_id])
+
+
 # Import models to ensure signals are registered
 def ready():
     """Called when Django app is ready."""
@@ -0,0 +1,236 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+
+from accounts.models import Business
+from inventory.models import (
+    BusinessStoreFront,
+    Category,
+    Product,
+    Stock,
+    StockMovement,
+    StockProduct,
+    StoreFront,
+    StoreFrontInventory,
+    Warehouse,
+)
+from inventory.stock_adjustments import StockAdjustment
+from inventory.transfer_models import Transfer, TransferItem
+from reports.services import MovementTracker
+from reports.services.movement_cache import cache_stats, reset_cache_stats
+from sales.models import Sale, SaleItem
+
+
+User = get_user_model()
+
+
+class StockMovementLedgerTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="ledger@example.com",
+            password="testpass123",
+            name="Ledger User",
+        )
+        self.business = Business.objects.create(owner=self.user, name="Ledger Biz")
+        self.category = Category.objects.create(name="Ledger Category")
+        self.product = Product.objects.create(
+            business=self.business,
+            name="Ledger Product",
+            sku="LEDGER-001",
+            category=self.category,
+        )
+        self.warehouse = Warehouse.objects.create(name="Ledger Warehouse", location="A")
+        self.other_warehouse = Warehouse.objects.create(name="Overflow Warehouse", location="B")
+        self.stock = Stock.objects.create(business=self.business)
+        self.stock_product = StockProduct.objects.create(
+            stock=self.stock,
+            warehouse=self.warehouse,
+            product=self.product,
+            quantity=100,
+            unit_cost=Decimal("4.00"),
+            retail_price=Decimal("10.00"),
+        )
+        self.storefront = StoreFront.objects.create(user=self.user, name="Ledger Store", location="C")
+        BusinessStoreFront.objects.create(business=self.business, storefront=self.storefront)
+        StoreFrontInventory.objects.create(storefront=self.storefront, product=self.product, quantity=20)
+
+    def _complete_adjustment(self, quantity=-5, adjustment_type="DAMAGE"):
+        adjustment = StockAdjustment.objects.create(
+            business=self.business,
+            stock_product=self.stock_product,
+            adjustment_type=adjustment_type,
+            quantity=quantity,
+            unit_cost=Decimal("4.00"),
+            reason="Ledger test",
+            created_by=self.user,
+        )
+        adjustment.approve(self.user)
+        adjustment.complete()
+        return adjustment
+
+    def _complete_transfer(self, quantity=10):
+        transfer = Transfer.objects.create(
+            business=self.business,
+            transfer_type=Transfer.TYPE_WAREHOUSE_TO_WAREHOUSE,
+            source_warehouse=self.warehouse,
+            destination_warehouse=self.other_warehouse,
+            created_by=self.user,
+        )
+        item = TransferItem.objects.create(
+            transfer=transfer,
+            product=self.product,
+            quantity=quantity,
+            unit_cost=Decimal("4.00"),
+        )
+        transfer.complete_transfer(completed_by=self.user)
+        return transfer, item
+
+    def _complete_sale(self, quantity=Decimal("3")):
+        sale = Sale.objects.create(
+            business=self.business,
+            storefront=self.storefront,
+            user=self.user,
+            status="DRAFT",
+            payment_type="CASH",
+            type=Sale.TYPE_RETAIL,
+        )
+        item = SaleItem.objects.create(
+            sale=sale,
+            product=self.product,
+            stock=self.stock,
+            stock_product=self.stock_product,
+            quantity=quantity,
+            unit_price=Decimal("10.00"),
+        )
+        sale.calculate_totals()
+        sale.amount_paid = sale.total_amount
+        sale.calculate_totals()
+        sale.save()
+        sale.complete_sale()
+        return sale, item
+
+    def test_adjustment_recorded_once_on_completion(self):
+        adjustment = StockAdjustment.objects.create(
+            business=self.business,
+            stock_product=self.stock_product,
+            adjustment_type="THEFT",
+            quantity=-2,
+            unit_cost=Decimal("4.00"),
+            reason="Pending",
+            created_by=self.user,
+        )
+        self.assertFalse(StockMovement.objects.exists())
+
+        adjustment.approve(self.user)
+        adjustment.complete()
+        adjustment.save()
+
+        movement = StockMovement.objects.get()
+        self.assertEqual(movement.source_key, str(adjustment.id))
+        self.assertEqual(movement.movement_type, StockMovement.TYPE_SHRINKAGE)
+        self.assertEqual(movement.direction, StockMovement.DIRECTION_OUT)
+        self.assertEqual(movement.quantity, Decimal("2"))
+        self.assertEqual(movement.total_value, Decimal("8.00"))
+        self.assertEqual(movement.source_location_id, self.warehouse.id)
+        self.assertEqual(movement.category_name, self.category.name)
+
+    def test_transfer_sale_and_refund_recorded(self):
+        transfer, transfer_item = self._complete_transfer()
+        sale, sale_item = self._complete_sale()
+        sale.process_refund(
+            user=self.user,
+            items=[{'sale_item': sale_item, 'quantity': 1}],
+            reason="Damaged box",
+        )
+
+        transfer_row = StockMovement.objects.get(source_type=StockMovement.SOURCE_TRANSFER)
+        self.assertEqual(transfer_row.source_key, f"{transfer.id}-{transfer_item.id}")
+        self.assertEqual(transfer_row.destination_location_id, self.other_warehouse.id)
+
+        sale_row = StockMovement.objects.get(source_type=StockMovement.SOURCE_SALE)
+        self.assertEqual(sale_row.direction, StockMovement.DIRECTION_OUT)
+        self.assertEqual(sale_row.quantity, Decimal("3"))
+        self.assertEqual(sale_row.source_location_id, self.storefront.id)
+
+        refund_row = StockMovement.objects.get(source_type=StockMovement.SOURCE_REFUND)
+        self.assertEqual(refund_row.direction, StockMovement.DIRECTION_IN)
+        self.assertEqual(refund_row.quantity, Decimal("1"))
+        self.assertEqual(refund_row.destination_location_id, self.storefront.id)
+
+    def test_tracker_reads_ledger_and_matches_union(self):
+        self._complete_adjustment()
+        self._complete_transfer()
+        self._complete_sale()
+
+        movements = MovementTracker.get_movements(
+            business_id=str(self.business.id),
+            warehouse_id=str(self.warehouse.id),
+        )
+        self.assertEqual(
+            sorted(m['source_type'] for m in movements),
+            ['legacy_adjustment', 'new_transfer'],
+        )
+
+        result = MovementTracker.verify_ledger(business_id=str(self.business.id))
+        self.assertEqual(result['mismatches'], {})
+        self.assertEqual(result['ledger']['total_movements'], 3)
+
+    def test_backfill_rebuilds_ledger(self):
+        self._complete_adjustment()
+        self._complete_transfer()
+        self._complete_sale()
+        expected = set(StockMovement.objects.values_list('source_type', 'source_key'))
+        StockMovement.objects.all().delete()
+
+        call_command('backfill_stock_movements', business_id=str(self.business.id), stdout=StringIO())
+        call_command('backfill_stock_movements', business_id=str(self.business.id), stdout=StringIO())
+
+        self.assertEqual(
+            set(StockMovement.objects.values_list('source_type', 'source_key')),
+            expected,
+        )
+        self.assertEqual(StockMovement.objects.count(), len(expected))
+
+    def test_summary_cache_invalidated_by_completed_movements(self):
+        cache.clear()
+        reset_cache_stats()
+        self._complete_adjustment()
+        business_id = str(self.business.id)
+
+        first = MovementTracker.get_summary(business_id=business_id)
+        with self.assertNumQueries(0):
+            again = MovementTracker.get_summary(business_id=business_id)
+            MovementTracker.get_summary(business_id=self.business.id, movement_types=[])
+        self.assertEqual(again, first)
+
+        self._complete_sale()
+        updated = MovementTracker.get_summary(business_id=business_id)
+        self.assertEqual(updated['total_movements'], first['total_movements'] + 1)
+        self.assertEqual(updated['sales_count'], 1)
+
+        self.assertEqual(cache_stats()['summary'], {'hits': 2, 'misses': 2, 'hit_ratio': 0.5})
+
+    def test_aggregates_cached_per_filters(self):
+        cache.clear()
+        self._complete_transfer()
+        business_id = str(self.business.id)
+
+        by_warehouse = MovementTracker.aggregate_by_warehouse(business_id=business_id)
+        self.assertIn(str(self.other_warehouse.id), by_warehouse)
+        with self.assertNumQueries(0):
+            MovementTracker.aggregate_by_warehouse(business_id=business_id)
+        with self.assertNumQueries(1):
+            MovementTracker.aggregate_by_warehouse(
+                business_id=business_id,
+                warehouse_id=str(self.warehouse.id),
+            )
+
+        by_category = MovementTracker.aggregate_by_category(business_id=business_id)
+        self._complete_transfer(quantity=2)
+        refreshed = MovementTracker.aggregate_by_category(business_id=business_id)
+        category_key = str(self.category.id)
+        self.assertEqual(refreshed[category_key]['movements'], by_category[category_key]['movements'] + 1)
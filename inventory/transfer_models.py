@@ -309,6 +309,7 @@ class Transfer(models.Model):
                 
                 elif self.transfer_type == self.TYPE_WAREHOUSE_TO_STOREFRONT:
                     # For storefront transfers, update storefront inventory records
+                    from inventory.catalog import invalidate_storefront_catalogs
                     from inventory.models import StoreFrontInventory
 
                     if not self.destination_storefront_id:
@@ -328,6 +329,7 @@ class Transfer(models.Model):
                         quantity=new_quantity,
                         updated_at=timezone.now()
                     )
+                    invalidate_storefront_catalogs([storefront_entry.storefront_id])
             
             except Exception as e:
                 errors.append(f"Product '{item.product.name}': {str(e)}")
@@ -349,6 +351,9 @@ class Transfer(models.Model):
             self.received_by = completed_by
         
         self.save()
+
+        from inventory.movement_ledger import record_transfer_movements
+        record_transfer_movements(self)
     
     @transaction.atomic
     def cancel_transfer(self):
@@ -58,6 +58,8 @@ except ImportError:
     SALES_APP_AVAILABLE = False
 
 
+from . import catalog
+from .search import ProductSearch
 from .stock_adjustments import StockAdjustment
 from .stock_adjustment_serializers import StockAdjustmentSerializer
 from inventory.transfer_models import Transfer
@@ -107,11 +109,7 @@ class ProductFilter(FilterSet):
 
     def filter_search(self, queryset, name, value):
         """Search in product name and SKU."""
-        if not value:
-            return queryset
-        return queryset.filter(
-            Q(name__icontains=value) | Q(sku__icontains=value)
-        )
+        return ProductSearch(value, fields=('name', 'sku')).filter(queryset)
 
 
 class StockProductFilter(FilterSet):
@@ -135,11 +133,7 @@ class StockProductFilter(FilterSet):
 
     def filter_search(self, queryset, name, value):
         """Search in product name and SKU."""
-        if not value:
-            return queryset
-        return queryset.filter(
-            Q(product__name__icontains=value) | Q(product__sku__icontains=value)
-        )
+        return ProductSearch(value, fields=('name', 'sku'), prefix='product__').filter(queryset)
 
 
 class StockFilter(FilterSet):
@@ -379,146 +373,44 @@ class StoreFrontViewSet(viewsets.ModelViewSet):
         - page: Page number for pagination (default: 1)
         - page_size: Items per page (default: 50, max: 200)
         - include_zero: Legacy parameter, opposite of in_stock_only
+
+        Latest prices, filters, ordering and pagination run in SQL (see
+        inventory.catalog); rendered pages are cached until the storefront's
+        inventory or the business's prices change.
         """
         storefront = self.get_object()
+        filters = catalog.parse_catalog_filters(request.query_params)
 
-        # Get query parameters with backward compatibility
-        search_query = request.query_params.get('search', '').strip()
-        category_id = request.query_params.get('category')
-        min_price = request.query_params.get('min_price')
-        max_price = request.query_params.get('max_price')
-        
-        # Handle in_stock_only with backward compatibility for include_zero
-        include_zero = request.query_params.get('include_zero', '').lower() == 'true'
-        in_stock_only_param = request.query_params.get('in_stock_only', '').lower()
-        
-        if in_stock_only_param == 'false':
-            in_stock_only = False
-        elif include_zero:
-            in_stock_only = False
-        else:
-            in_stock_only = True  # Default to in-stock only
-
-        # Build the base queryset with inventory aggregation
-        inventory_qs = StoreFrontInventory.objects.filter(
-            storefront=storefront
-        ).select_related('product', 'product__category')
-        
-        # Filter: In stock only
-        if in_stock_only:
-            inventory_qs = inventory_qs.filter(quantity__gt=0)
-        
-        # Get inventory totals
-        inventory_totals = {
-            row['product_id']: row['total_quantity']
-            for row in inventory_qs.values('product_id').annotate(total_quantity=Sum('quantity'))
-        }
-        
-        if not inventory_totals:
+        def build_page():
             paginator = CatalogPagination()
-            return paginator.get_paginated_response({'products': []})
-
-        # Get stock products for the filtered inventory
-        stock_products_qs = (
-            StockProduct.objects.filter(product_id__in=inventory_totals.keys())
-            .select_related('product', 'product__category')
-        )
-        
-        # Apply filters on the product level
-        if search_query:
-            stock_products_qs = stock_products_qs.filter(
-                Q(product__name__icontains=search_query) |
-                Q(product__sku__icontains=search_query) |
-                Q(product__barcode__icontains=search_query)
+            inventory_rows = paginator.paginate_queryset(
+                catalog.storefront_catalog_queryset(storefront, filters), request, view=self
             )
-        
-        if category_id:
-            try:
-                category_uuid = UUID(category_id)
-                stock_products_qs = stock_products_qs.filter(product__category_id=category_uuid)
-            except (TypeError, ValueError):
-                # Invalid UUID, ignore filter
-                pass
-        
-        # Note: Price filters will be applied after aggregation since prices are on StockProduct
-        stock_products_qs = stock_products_qs.order_by('product_id', '-created_at')
-        
-        # Build stock map with latest pricing
-        stock_map: dict = {}
-        for stock_product in stock_products_qs:
-            product_id = stock_product.product_id
-            entry = stock_map.setdefault(
-                product_id,
+            stock_product_ids = catalog.stock_product_ids_by_product(row.product_id for row in inventory_rows)
+
+            catalog_items = [
                 {
-                    'product': stock_product.product,
-                    'latest': None,
-                    'stock_product_ids': [],
+                    'product_id': row.product_id,
+                    **catalog.product_columns(row.product),
+                    'available_quantity': int(row.quantity),
+                    'retail_price': row.latest_retail_price,
+                    'wholesale_price': catalog.wholesale_or_none(row.latest_wholesale_price),
+                    'stock_product_ids': stock_product_ids[row.product_id],
+                    'last_stocked_at': row.last_stocked_at,
                 }
-            )
-
-            entry['stock_product_ids'].append(stock_product.id)
-
-            if entry['latest'] is None:
-                entry['latest'] = stock_product
-
-        # Build catalog items
-        catalog_items = []
-        for product_id, quantity in inventory_totals.items():
-            if product_id not in stock_map:
-                continue
-            
-            entry = stock_map[product_id]
-            latest = entry['latest']
-            product = entry['product']
-
-            retail_price = latest.retail_price if latest and latest.retail_price is not None else Decimal('0.00')
-            wholesale_price = latest.wholesale_price if latest and latest.wholesale_price is not None else None
-            if wholesale_price is not None and wholesale_price <= Decimal('0.00'):
-                wholesale_price = None
-            
-            # Apply price range filters
-            if min_price:
-                try:
-                    min_price_decimal = Decimal(str(min_price))
-                    if retail_price < min_price_decimal:
-                        continue
-                except (ValueError, TypeError, ArithmeticError):
-                    pass
-            
-            if max_price:
-                try:
-                    max_price_decimal = Decimal(str(max_price))
-                    if retail_price > max_price_decimal:
-                        continue
-                except (ValueError, TypeError, ArithmeticError):
-                    pass
-
-            catalog_items.append({
-                'product_id': product.id,
-                'product_name': product.name,
-                'sku': product.sku or '',
-                'barcode': product.barcode or '',
-                'category_name': product.category.name if product.category else None,
-                'unit': product.unit if hasattr(product, 'unit') else None,
-                'product_image': product.image.url if hasattr(product, 'image') and product.image else None,
-                'available_quantity': int(quantity),
-                'retail_price': retail_price,
-                'wholesale_price': wholesale_price,
-                'stock_product_ids': entry['stock_product_ids'],
-                'last_stocked_at': latest.created_at if latest else None,
-            })
+                for row in inventory_rows
+            ]
 
-        # Sort by product name for consistent ordering
-        catalog_items.sort(key=lambda item: item['product_name'].lower())
+            serializer = StorefrontSaleProductSerializer(catalog_items, many=True)
+            return paginator.get_paginated_response({'products': serializer.data}).data
 
-        # Apply pagination
-        paginator = CatalogPagination()
-        page = paginator.paginate_queryset(catalog_items, request)
-        
-        # Serialize paginated results
-        serializer = StorefrontSaleProductSerializer(page, many=True)
-        
-        return paginator.get_paginated_response({'products': serializer.data})
+        body = catalog.get_or_build_page(
+            request,
+            storefront_ids=[storefront.id],
+            business_ids=catalog.storefront_business_ids([storefront]),
+            build=build_page,
+        )
+        return Response(body)
 
     @action(detail=False, methods=['get'], url_path='multi-storefront-catalog')
     def multi_storefront_catalog(self, request):
@@ -540,24 +432,8 @@ class StoreFrontViewSet(viewsets.ModelViewSet):
         - include_zero: Legacy parameter, opposite of in_stock_only
         """
         user = request.user
-        
-        # Get query parameters
-        search_query = request.query_params.get('search', '').strip()
-        category_id = request.query_params.get('category')
         storefront_filter = request.query_params.getlist('storefront')
-        min_price = request.query_params.get('min_price')
-        max_price = request.query_params.get('max_price')
-        
-        # Handle in_stock_only with backward compatibility for include_zero
-        include_zero = request.query_params.get('include_zero', '').lower() == 'true'
-        in_stock_only_param = request.query_params.get('in_stock_only', '').lower()
-        
-        if in_stock_only_param == 'false':
-            in_stock_only = False
-        elif include_zero:
-            in_stock_only = False
-        else:
-            in_stock_only = True  # Default to in-stock only
+        filters = catalog.parse_catalog_filters(request.query_params)
         
         # Get accessible storefronts
         accessible_storefronts = []
@@ -589,165 +465,8 @@ class StoreFrontViewSet(viewsets.ModelViewSet):
             except (TypeError, ValueError):
                 # Invalid UUIDs, ignore filter
                 pass
-        
-        if not accessible_storefronts:
-            paginator = CatalogPagination()
-            return paginator.get_paginated_response({
-                'storefronts': [],
-                'products': []
-            })
-        
-        # Get all inventory items across storefronts
-        inventory_qs = StoreFrontInventory.objects.filter(
-            storefront__in=accessible_storefronts
-        ).select_related('product', 'product__category', 'storefront')
-        
-        # Apply in-stock filter
-        if in_stock_only:
-            inventory_qs = inventory_qs.filter(quantity__gt=0)
-        
-        # Get stock products for pricing and additional filtering
-        product_ids = set(inventory_qs.values_list('product_id', flat=True))
-        
-        if not product_ids:
-            paginator = CatalogPagination()
-            storefront_summary = [
-                {
-                    'id': str(sf.id),
-                    'name': sf.name,
-                }
-                for sf in accessible_storefronts
-            ]
-            return paginator.get_paginated_response({
-                'storefronts': storefront_summary,
-                'products': []
-            })
-        
-        stock_products_qs = (
-            StockProduct.objects.filter(product_id__in=product_ids)
-            .select_related('product', 'product__category')
-        )
-        
-        # Apply search filter
-        if search_query:
-            stock_products_qs = stock_products_qs.filter(
-                Q(product__name__icontains=search_query) |
-                Q(product__sku__icontains=search_query) |
-                Q(product__barcode__icontains=search_query)
-            )
-        
-        # Apply category filter
-        if category_id:
-            try:
-                category_uuid = UUID(category_id)
-                stock_products_qs = stock_products_qs.filter(product__category_id=category_uuid)
-            except (TypeError, ValueError):
-                pass
-        
-        stock_products_qs = stock_products_qs.order_by('product_id', '-created_at')
-        
-        # Build stock map with latest pricing
-        stock_map = {}
-        for stock_product in stock_products_qs:
-            product_id = stock_product.product_id
-            if product_id not in stock_map:
-                stock_map[product_id] = {
-                    'product': stock_product.product,
-                    'latest': stock_product,
-                    'stock_product_ids': []
-                }
-            stock_map[product_id]['stock_product_ids'].append(stock_product.id)
-        
-        # Filter inventory to only include products that passed filters
-        filtered_product_ids = set(stock_map.keys())
-        inventory_items = inventory_qs.filter(product_id__in=filtered_product_ids)
-        
-        # Aggregate by product
-        product_map = defaultdict(lambda: {
-            'locations': [],
-            'stock_product_ids': [],
-            'total_available': 0,
-        })
-        
-        for inv in inventory_items:
-            product_id = inv.product_id
-            product_key = str(product_id)
-            
-            if product_id not in stock_map:
-                continue
-            
-            entry = stock_map[product_id]
-            latest = entry['latest']
-            product = entry['product']
-            
-            # Initialize product data if not already set
-            if 'product_name' not in product_map[product_key]:
-                retail_price = latest.retail_price if latest and latest.retail_price is not None else Decimal('0.00')
-                wholesale_price = latest.wholesale_price if latest and latest.wholesale_price is not None else None
-                if wholesale_price is not None and wholesale_price <= Decimal('0.00'):
-                    wholesale_price = None
-                
-                # Apply price range filters
-                skip_product = False
-                if min_price:
-                    try:
-                        min_price_decimal = Decimal(str(min_price))
-                        if retail_price < min_price_decimal:
-                            skip_product = True
-                    except (ValueError, TypeError, ArithmeticError):
-                        pass
-                
-                if max_price:
-                    try:
-                        max_price_decimal = Decimal(str(max_price))
-                        if retail_price > max_price_decimal:
-                            skip_product = True
-                    except (ValueError, TypeError, ArithmeticError):
-                        pass
-                
-                if skip_product:
-                    # Remove from product_map to skip this product
-                    del product_map[product_key]
-                    continue
-                
-                product_map[product_key].update({
-                    'product_id': str(product.id),
-                    'product_name': product.name,
-                    'sku': product.sku or '',
-                    'barcode': product.barcode or '',
-                    'category_name': product.category.name if product.category else None,
-                    'unit': product.unit if hasattr(product, 'unit') else None,
-                    'product_image': product.image.url if hasattr(product, 'image') and product.image else None,
-                    'retail_price': str(retail_price) if retail_price is not None else None,
-                    'wholesale_price': str(wholesale_price) if wholesale_price is not None else None,
-                    'last_stocked_at': latest.created_at.isoformat() if latest and latest.created_at else None,
-                })
-            
-            # Add location data
-            product_map[product_key]['total_available'] += inv.quantity
-            product_map[product_key]['locations'].append({
-                'storefront_id': str(inv.storefront.id),
-                'storefront_name': inv.storefront.name,
-                'available_quantity': int(inv.quantity),
-            })
-            
-            # Add stock product IDs (unique)
-            if entry['stock_product_ids']:
-                existing_ids = set(product_map[product_key]['stock_product_ids'])
-                for sp_id in entry['stock_product_ids']:
-                    if sp_id not in existing_ids:
-                        product_map[product_key]['stock_product_ids'].append(sp_id)
-                        existing_ids.add(sp_id)
-        
-        # Convert to list and sort by product name
-        products_list = list(product_map.values())
-        products_list.sort(key=lambda x: x.get('product_name', '').lower())
-        
-        # Apply pagination
-        paginator = CatalogPagination()
-        page = paginator.paginate_queryset(products_list, request)
-        
-        # Prepare storefront summary
+
+        storefront_ids = [sf.id for sf in accessible_storefronts]
         storefront_summary = [
             {
                 'id': str(sf.id),
@@ -755,11 +474,58 @@ class StoreFrontViewSet(viewsets.ModelViewSet):
             }
             for sf in accessible_storefronts
         ]
-        
-        return paginator.get_paginated_response({
-            'storefronts': storefront_summary,
-            'products': page
-        })
+
+        def build_page():
+            paginator = CatalogPagination()
+            products = paginator.paginate_queryset(
+                catalog.multi_storefront_catalog_queryset(storefront_ids, filters), request, view=self
+            )
+            product_ids = [product.id for product in products]
+            stock_product_ids = catalog.stock_product_ids_by_product(product_ids)
+
+            # Storefront stock for this page only
+            inventory_items = StoreFrontInventory.objects.filter(
+                product_id__in=product_ids,
+                storefront_id__in=storefront_ids,
+            ).select_related('storefront').order_by('storefront__name', 'storefront_id')
+            if filters['in_stock_only']:
+                inventory_items = inventory_items.filter(quantity__gt=0)
+
+            locations = defaultdict(list)
+            for inv in inventory_items:
+                locations[inv.product_id].append({
+                    'storefront_id': str(inv.storefront.id),
+                    'storefront_name': inv.storefront.name,
+                    'available_quantity': int(inv.quantity),
+                })
+
+            products_list = []
+            for product in products:
+                wholesale_price = catalog.wholesale_or_none(product.latest_wholesale_price)
+                product_locations = locations[product.id]
+                products_list.append({
+                    'product_id': str(product.id),
+                    **catalog.product_columns(product),
+                    'retail_price': str(product.latest_retail_price),
+                    'wholesale_price': str(wholesale_price) if wholesale_price is not None else None,
+                    'last_stocked_at': product.last_stocked_at.isoformat() if product.last_stocked_at else None,
+                    'locations': product_locations,
+                    'stock_product_ids': stock_product_ids[product.id],
+                    'total_available': sum(location['available_quantity'] for location in product_locations),
+                })
+
+            return paginator.get_paginated_response({
+                'storefronts': storefront_summary,
+                'products': products_list
+            }).data
+
+        body = catalog.get_or_build_page(
+            request,
+            storefront_ids=storefront_ids,
+            business_ids=catalog.storefront_business_ids(accessible_storefronts),
+            build=build_page,
+        )
+        return Response(body)
 
 
 class ProductViewSet(viewsets.ModelViewSet):
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class ReportsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'reports'
+
+    def ready(self):
+        """Connect report cache invalidation to the models reports read"""
+        from reports.signals import connect_report_sources
+        connect_report_sources()
@@ -6,8 +6,9 @@ spreadsheet applications and other data processing tools.
 """
 
 import csv
+import itertools
 from io import StringIO
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
 from decimal import Decimal
 
 
@@ -34,30 +35,88 @@ class BaseCSVExporter:
         writer.writerow([])
         writer.writerow([title])
         writer.writerow([])
+    
+    @staticmethod
+    def _section_header_rows(title: str) -> List[List[str]]:
+        """Rows making up a section header"""
+        return [[], [title], []]
+    
+    def rows(self, data: Dict[str, Any]) -> Iterator[List[Any]]:
+        """Yield every CSV row for ``data`` - implement in streaming-capable subclasses"""
+        raise NotImplementedError
+    
+    def export(self, data: Dict[str, Any]) -> bytes:
+        """Render all rows to CSV bytes"""
+        output = StringIO()
+        writer = csv.writer(output)
+        writer.writerows(self.rows(data))
+        return output.getvalue().encode('utf-8')
+    
+    def stream(self, data: Dict[str, Any], flush_size: int = 64 * 1024) -> Iterator[bytes]:
+        """
+        Yield the CSV as UTF-8 chunks of roughly ``flush_size`` bytes.
+        
+        Rows are pulled from ``rows(data)`` one at a time, so ``data`` may hold
+        generators and the full file never exists in memory.
+        """
+        buffer = StringIO()
+        writer = csv.writer(buffer)
+        for row in self.rows(data):
+            writer.writerow(row)
+            if buffer.tell() >= flush_size:
+                yield buffer.getvalue().encode('utf-8')
+                buffer.seek(0)
+                buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode('utf-8')
 
 
 class SalesCSVExporter(BaseCSVExporter):
     """CSV exporter for sales data - exports all sales and line items"""
     
-    def export(self, data: Dict[str, Any]) -> bytes:
-        """Export sales data to CSV format"""
-        output = StringIO()
-        writer = csv.writer(output)
-        
+    SALES_HEADERS = [
+        'Receipt Number', 'Date', 'Time', 'Storefront', 'Cashier',
+        'Customer Name', 'Customer Type', 'Sale Type', 'Status',
+        'Subtotal', 'Discount', 'Tax', 'Total', 
+        'Amount Paid', 'Amount Refunded', 'Amount Due',
+        'Payment Type', 'Notes'
+    ]
+    
+    SALES_KEYS = [
+        'receipt_number', 'date', 'time', 'storefront', 'cashier',
+        'customer_name', 'customer_type', 'sale_type', 'status',
+        'subtotal', 'discount', 'tax', 'total',
+        'amount_paid', 'amount_refunded', 'amount_due',
+        'payment_type', 'notes',
+    ]
+    
+    ITEM_HEADERS = [
+        'Receipt Number', 'Product Name', 'SKU', 'Category',
+        'Quantity', 'Unit Price', 'Total Price', 'COGS', 'Profit', 'Margin %'
+    ]
+    
+    ITEM_KEYS = [
+        'product_name', 'sku', 'category', 'quantity',
+        'unit_price', 'total_price', 'cogs', 'profit', 'margin_percent',
+    ]
+    
+    def rows(self, data: Dict[str, Any]) -> Iterator[List[Any]]:
+        """Yield sales export rows: summary, sales details, then line items"""
         # Header
-        writer.writerow(['Sales Export Report'])
-        writer.writerow(['Generated At', data.get('generated_at', '')])
-        writer.writerow([])
+        yield ['Sales Export Report']
+        yield ['Generated At', data.get('generated_at', '')]
+        yield []
         
         # Summary section
-        writer.writerow(['Summary Metrics'])
-        writer.writerow(['Metric', 'Value'])
+        yield ['Summary Metrics']
+        yield ['Metric', 'Value']
         
         summary_metrics = [
             ('Total Sales Count', 'total_sales'),
             ('Total Revenue', 'total_revenue'),
             ('Net Sales (excl. tax & discounts)', 'net_sales'),
             ('Total Tax Collected', 'total_tax'),
+            ('Total Tax Collected', 'total_tax'),
             ('Total Discounts Given', 'total_discounts'),
             ('Total Cost of Goods Sold', 'total_cogs'),
             ('Total Gross Profit', 'total_profit'),
@@ -69,86 +128,96 @@ class SalesCSVExporter(BaseCSVExporter):
         
         for label, key in summary_metrics:
             value = data['summary'].get(key, '')
-            writer.writerow([label, self._format_value(value)])
+            yield [label, self._format_value(value)]
         
         # Sales detail section
-        self._write_section_header(writer, 'Sales Details')
-        
-        sales_headers = [
-            'Receipt Number', 'Date', 'Time', 'Storefront', 'Cashier',
-            'Customer Name', 'Customer Type', 'Sale Type', 'Status',
-            'Subtotal', 'Discount', 'Tax', 'Total', 
-            'Amount Paid', 'Amount Refunded', 'Amount Due',
-            'Payment Type', 'Notes'
-        ]
-        writer.writerow(sales_headers)
+        yield from self._section_header_rows('Sales Details')
+        yield self.SALES_HEADERS
         
         for sale in data.get('sales', []):
-            writer.writerow([
-                self._format_value(sale.get('receipt_number', '')),
-                self._format_value(sale.get('date', '')),
-                self._format_value(sale.get('time', '')),
-                self._format_value(sale.get('storefront', '')),
-                self._format_value(sale.get('cashier', '')),
-                self._format_value(sale.get('customer_name', '')),
-                self._format_value(sale.get('customer_type', '')),
-                self._format_value(sale.get('sale_type', '')),
-                self._format_value(sale.get('status', '')),
-                self._format_value(sale.get('subtotal', '')),
-                self._format_value(sale.get('discount', '')),
-                self._format_value(sale.get('tax', '')),
-                self._format_value(sale.get('total', '')),
-                self._format_value(sale.get('amount_paid', '')),
-                self._format_value(sale.get('amount_refunded', '')),
-                self._format_value(sale.get('amount_due', '')),
-                self._format_value(sale.get('payment_type', '')),
-                self._format_value(sale.get('notes', '')),
-            ])
+            yield [self._format_value(sale.get(key, '')) for key in self.SALES_KEYS]
         
         # Line items section
-        self._write_section_header(writer, 'Line Items')
+        yield from self._section_header_rows('Line Items')
+        yield self.ITEM_HEADERS
         
-        item_headers = [
-            'Receipt Number', 'Product Name', 'SKU', 'Category',
-            'Quantity', 'Unit Price', 'Total Price', 'COGS', 'Profit', 'Margin %'
-        ]
-        writer.writerow(item_headers)
-        
-        for sale in data.get('sales', []):
-            for item in sale.get('items', []):
-                writer.writerow([
-                    self._format_value(sale.get('receipt_number', '')),
-                    self._format_value(item.get('product_name', '')),
-                    self._format_value(item.get('sku', '')),
-                    self._format_value(item.get('category', '')),
-                    self._format_value(item.get('quantity', '')),
-                    self._format_value(item.get('unit_price', '')),
-                    self._format_value(item.get('total_price', '')),
-                    self._format_value(item.get('cogs', '')),
-                    self._format_value(item.get('profit', '')),
-                    self._format_value(item.get('margin_percent', '')),
-                ])
-        
-        # Return as bytes
-        return output.getvalue().encode('utf-8')
+        for receipt_number, item in self.line_items(data):
+            yield [self._format_value(receipt_number)] + [
+                self._format_value(item.get(key, '')) for key in self.ITEM_KEYS
+            ]
+    
+    @staticmethod
+    def line_items(data: Dict[str, Any]) -> Iterable[Tuple[str, Dict[str, Any]]]:
+        """
+        ``(receipt_number, item)`` pairs for the line items section.
+        
+        Streaming payloads carry a flat ``line_items`` iterable; in-memory
+        payloads nest items under each sale.
+        """
+        if 'line_items' in data:
+            return data['line_items']
+        return (
+            (sale.get('receipt_number', ''), item)
+            for sale in data.get('sales', [])
+            for item in sale.get('items', [])
+        )
 
 
 class CustomerCSVExporter(BaseCSVExporter):
     """CSV exporter for customer data with credit aging"""
     
-    def export(self, data: Dict[str, Any]) -> bytes:
-        """Export customer data to CSV format"""
-        output = StringIO()
-        writer = csv.writer(output)
-        
+    CUSTOMER_HEADERS = [
+        'Customer ID', 'Name', 'Email', 'Phone', 'Address',
+        'Customer Type', 'Contact Person',
+        'Credit Limit', 'Outstanding Balance', 'Available Credit',
+        'Credit Terms (days)', 'Credit Blocked',
+        'Total Sales Count', 'Total Sales Amount', 'Average Sale',
+        'Last Sale Date', 'First Sale Date',
+        'Active', 'Created Date', 'Created By'
+    ]
+    
+    CUSTOMER_KEYS = [
+        'customer_id', 'name', 'email', 'phone', 'address',
+        'customer_type', 'contact_person',
+        'credit_limit', 'outstanding_balance', 'available_credit',
+        'credit_terms_days', 'credit_blocked',
+        'total_sales_count', 'total_sales_amount', 'average_sale_amount',
+        'last_sale_date', 'first_sale_date',
+        'is_active', 'created_at', 'created_by',
+    ]
+    
+    AGING_HEADERS = [
+        'Customer Name', 'Customer Type', 'Credit Limit', 'Outstanding Balance',
+        'Current (0-30)', '31-60 Days', '61-90 Days', 'Over 90 Days',
+        'Total Overdue', 'Oldest Invoice (days)', 'Credit Blocked'
+    ]
+    
+    AGING_KEYS = [
+        'name', 'customer_type', 'credit_limit', 'outstanding_balance',
+        'aging_current', 'aging_31_60', 'aging_61_90', 'aging_over_90',
+        'total_overdue', 'oldest_invoice_days', 'credit_blocked',
+    ]
+    
+    TRANSACTION_HEADERS = [
+        'Customer Name', 'Date', 'Transaction Type',
+        'Amount', 'Balance Before', 'Balance After', 'Reference'
+    ]
+    
+    TRANSACTION_KEYS = [
+        'customer_name', 'date', 'transaction_type',
+        'amount', 'balance_before', 'balance_after', 'reference',
+    ]
+    
+    def rows(self, data: Dict[str, Any]) -> Iterator[List[Any]]:
+        """Yield customer export rows: statistics, details, aging and transactions"""
         # Header
-        writer.writerow(['Customer Export Report'])
-        writer.writerow(['Generated At', data.get('generated_at', '')])
-        writer.writerow([])
+        yield ['Customer Export Report']
+        yield ['Generated At', data.get('generated_at', '')]
+        yield []
         
         # Summary section
-        writer.writerow(['Customer Statistics'])
-        writer.writerow(['Metric', 'Value'])
+        yield ['Customer Statistics']
+        yield ['Metric', 'Value']
         
         summary_metrics = [
             ('Total Customers', 'total_customers'),
@@ -163,11 +232,11 @@ class CustomerCSVExporter(BaseCSVExporter):
         
         for label, key in summary_metrics:
             value = data['summary'].get(key, '')
-            writer.writerow([label, self._format_value(value)])
+            yield [label, self._format_value(value)]
         
-        writer.writerow([])
-        writer.writerow(['Aging Analysis Summary'])
-        writer.writerow(['Category', 'Amount'])
+        yield []
+        yield ['Aging Analysis Summary']
+        yield ['Category', 'Amount']
         
         aging_metrics = [
             ('Current (0-30 days)', 'aging_current'),
@@ -179,94 +248,43 @@ class CustomerCSVExporter(BaseCSVExporter):
         
         for label, key in aging_metrics:
             value = data['summary'].get(key, '')
-            writer.writerow([label, self._format_value(value)])
+            yield [label, self._format_value(value)]
         
         # Customer detail section
-        self._write_section_header(writer, 'Customer Details')
-        
-        customer_headers = [
-            'Customer ID', 'Name', 'Email', 'Phone', 'Address',
-            'Customer Type', 'Contact Person',
-            'Credit Limit', 'Outstanding Balance', 'Available Credit',
-            'Credit Terms (days)', 'Credit Blocked',
-            'Total Sales Count', 'Total Sales Amount', 'Average Sale',
-            'Last Sale Date', 'First Sale Date',
-            'Active', 'Created Date', 'Created By'
-        ]
-        writer.writerow(customer_headers)
+        yield from self._section_header_rows('Customer Details')
+        yield self.CUSTOMER_HEADERS
         
         for customer in data.get('customers', []):
-            writer.writerow([
-                self._format_value(customer.get('customer_id', '')),
-                self._format_value(customer.get('name', '')),
-                self._format_value(customer.get('email', '')),
-                self._format_value(customer.get('phone', '')),
-                self._format_value(customer.get('address', '')),
-                self._format_value(customer.get('customer_type', '')),
-                self._format_value(customer.get('contact_person', '')),
-                self._format_value(customer.get('credit_limit', '')),
-                self._format_value(customer.get('outstanding_balance', '')),
-                self._format_value(customer.get('available_credit', '')),
-                self._format_value(customer.get('credit_terms_days', '')),
-                self._format_value(customer.get('credit_blocked', '')),
-                self._format_value(customer.get('total_sales_count', '')),
-                self._format_value(customer.get('total_sales_amount', '')),
-                self._format_value(customer.get('average_sale_amount', '')),
-                self._format_value(customer.get('last_sale_date', '')),
-                self._format_value(customer.get('first_sale_date', '')),
-                self._format_value(customer.get('is_active', '')),
-                self._format_value(customer.get('created_at', '')),
-                self._format_value(customer.get('created_by', '')),
-            ])
+            yield [self._format_value(customer.get(key, '')) for key in self.CUSTOMER_KEYS]
         
         # Credit aging section
-        self._write_section_header(writer, 'Credit Aging Analysis')
+        yield from self._section_header_rows('Credit Aging Analysis')
+        yield self.AGING_HEADERS
         
-        aging_headers = [
-            'Customer Name', 'Customer Type', 'Credit Limit', 'Outstanding Balance',
-            'Current (0-30)', '31-60 Days', '61-90 Days', 'Over 90 Days',
-            'Total Overdue', 'Oldest Invoice (days)', 'Credit Blocked'
-        ]
-        writer.writerow(aging_headers)
-        
-        for customer in data.get('customers', []):
-            writer.writerow([
-                self._format_value(customer.get('name', '')),
-                self._format_value(customer.get('customer_type', '')),
-                self._format_value(customer.get('credit_limit', '')),
-                self._format_value(customer.get('outstanding_balance', '')),
-                self._format_value(customer.get('aging_current', '')),
-                self._format_value(customer.get('aging_31_60', '')),
-                self._format_value(customer.get('aging_61_90', '')),
-                self._format_value(customer.get('aging_over_90', '')),
-                self._format_value(customer.get('total_overdue', '')),
-                self._format_value(customer.get('oldest_invoice_days', '')),
-                self._format_value(customer.get('credit_blocked', '')),
-            ])
+        for customer in self.aging_rows(data):
+            yield [self._format_value(customer.get(key, '')) for key in self.AGING_KEYS]
         
         # Credit transactions section (if available)
-        if data.get('credit_transactions'):
-            self._write_section_header(writer, 'Credit Transactions')
+        transactions = iter(data.get('credit_transactions') or [])
+        first_txn = next(transactions, None)
+        if first_txn is not None:
+            yield from self._section_header_rows('Credit Transactions')
+            yield self.TRANSACTION_HEADERS
             
-            txn_headers = [
-                'Customer Name', 'Date', 'Transaction Type',
-                'Amount', 'Balance Before', 'Balance After', 'Reference'
-            ]
-            writer.writerow(txn_headers)
-            
-            for txn in data['credit_transactions']:
-                writer.writerow([
-                    self._format_value(txn.get('customer_name', '')),
-                    self._format_value(txn.get('date', '')),
-                    self._format_value(txn.get('transaction_type', '')),
-                    self._format_value(txn.get('amount', '')),
-                    self._format_value(txn.get('balance_before', '')),
-                    self._format_value(txn.get('balance_after', '')),
-                    self._format_value(txn.get('reference', '')),
-                ])
-        
-        # Return as bytes
-        return output.getvalue().encode('utf-8')
+            for txn in itertools.chain([first_txn], transactions):
+                yield [self._format_value(txn.get(key, '')) for key in self.TRANSACTION_KEYS]
+    
+    @staticmethod
+    def aging_rows(data: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
+        """
+        Rows for the credit aging section.
+        
+        Streaming payloads supply a separate ``customer_aging`` generator
+        because ``customers`` can only be read once.
+        """
+        if 'customer_aging' in data:
+            return data['customer_aging']
+        return data.get('customers', [])
 
 
 class InventoryCSVExporter(BaseCSVExporter):
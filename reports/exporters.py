@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import tempfile
 from abc import ABC, abstractmethod
 from io import BytesIO
-from typing import Any, Dict, Iterable, List, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
 
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.utils import get_column_letter
 from openpyxl.styles import Font, PatternFill
 from docx import Document
@@ -29,6 +31,66 @@ from .pdf_exporters import (
 )
 
 
+STREAM_READ_SIZE = 64 * 1024
+
+
+def _write_only_row(sheet, values: Iterable[Any], font: Font = None, fill: PatternFill = None) -> None:
+    """Append a row to a write-only worksheet, styling every cell alike"""
+    cells = []
+    for value in values:
+        cell = WriteOnlyCell(sheet, value=value)
+        if font is not None:
+            cell.font = font
+        if fill is not None:
+            cell.fill = fill
+        cells.append(cell)
+    sheet.append(cells)
+
+
+def _write_only_summary(sheet, title: str, generated_at, sections: List[Tuple[str, Dict[str, str], Dict[str, Any]]]) -> None:
+    """Write the title block and ``(heading, {key: label}, values)`` metric sections"""
+    sheet.column_dimensions['A'].width = 40
+    sheet.column_dimensions['B'].width = 30
+    _write_only_row(sheet, [title], font=Font(size=16, bold=True))
+    sheet.append(['Generated At', generated_at.strftime('%Y-%m-%d %H:%M:%S')])
+    for heading, mapping, values in sections:
+        sheet.append([])
+        _write_only_row(sheet, [heading], font=Font(bold=True, size=12))
+        for key, label in mapping.items():
+            label_cell = WriteOnlyCell(sheet, value=label)
+            label_cell.font = Font(bold=True)
+            sheet.append([label_cell, str(values.get(key, ''))])
+
+
+def _write_only_table(sheet, headers: List[str], fill_color: str) -> None:
+    """
+    Fix column widths from the headers and write the header row.
+
+    Write-only sheets cannot be measured once rows are flushed, so they are
+    not auto-sized like the in-memory workbooks.
+    """
+    for col_num, header in enumerate(headers, 1):
+        sheet.column_dimensions[get_column_letter(col_num)].width = min(max(len(header) + 2, 14), 50)
+    _write_only_row(
+        sheet,
+        headers,
+        font=Font(bold=True),
+        fill=PatternFill(start_color=fill_color, end_color=fill_color, fill_type='solid'),
+    )
+
+
+def _stream_workbook(workbook: Workbook) -> Iterator[bytes]:
+    """Save ``workbook`` to a temporary file and yield it in chunks"""
+    with tempfile.TemporaryFile() as output:
+        workbook.save(output)
+        output.seek(0)
+        while True:
+            chunk = output.read(STREAM_READ_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+
 class BaseReportExporter(ABC):
     content_type: str
     file_extension: str
@@ -198,6 +260,20 @@ class SalesExcelExporter(BaseReportExporter):
     content_type = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
     file_extension = 'xlsx'
     
+    SUMMARY_METRICS = {
+        'total_sales': 'Total Sales Count',
+        'total_revenue': 'Total Revenue',
+        'net_sales': 'Net Sales (excl. tax & discounts)',
+        'total_tax': 'Total Tax Collected',
+        'total_discounts': 'Total Discounts Given',
+        'total_cogs': 'Total Cost of Goods Sold',
+        'total_profit': 'Total Gross Profit',
+        'profit_margin_percent': 'Profit Margin %',
+        'amount_paid': 'Total Amount Paid',
+        'amount_refunded': 'Total Amount Refunded',
+        'outstanding_balance': 'Outstanding Balance',
+    }
+    
     def export(self, report_data: Dict[str, Any]) -> bytes:
         workbook = Workbook()
         
@@ -219,19 +295,7 @@ class SalesExcelExporter(BaseReportExporter):
         row += 1
         
         # Summary metrics
-        summary_mapping = {
-            'total_sales': 'Total Sales Count',
-            'total_revenue': 'Total Revenue',
-            'net_sales': 'Net Sales (excl. tax & discounts)',
-            'total_tax': 'Total Tax Collected',
-            'total_discounts': 'Total Discounts Given',
-            'total_cogs': 'Total Cost of Goods Sold',
-            'total_profit': 'Total Gross Profit',
-            'profit_margin_percent': 'Profit Margin %',
-            'amount_paid': 'Total Amount Paid',
-            'amount_refunded': 'Total Amount Refunded',
-            'outstanding_balance': 'Outstanding Balance',
-        }
+        summary_mapping = self.SUMMARY_METRICS
         
         for key, label in summary_mapping.items():
             value = report_data['summary'].get(key, '')
@@ -327,13 +391,58 @@ class SalesExcelExporter(BaseReportExporter):
         with BytesIO() as output:
             workbook.save(output)
             return output.getvalue()
-
+    
+    def stream(self, report_data: Dict[str, Any]) -> Iterator[bytes]:
+        """
+        Yield the workbook for a streaming payload (see SalesExporter.stream_data).
+        
+        Rows go through an openpyxl write-only workbook, which spools each
+        sheet to disk as it is appended, so ``sales`` and ``line_items`` can be
+        generators of any length.
+        """
+        workbook = Workbook(write_only=True)
+        
+        summary_sheet = workbook.create_sheet(title='Summary')
+        _write_only_summary(summary_sheet, 'Sales Export Report', report_data['generated_at'], [
+            ('Summary Metrics', self.SUMMARY_METRICS, report_data['summary']),
+        ])
+        
+        detail_sheet = workbook.create_sheet(title='Sales Detail')
+        _write_only_table(detail_sheet, SalesCSVExporter.SALES_HEADERS, 'CCCCCC')
+        for sale in report_data['sales']:
+            detail_sheet.append([sale.get(key, '') for key in SalesCSVExporter.SALES_KEYS])
+        
+        items_sheet = workbook.create_sheet(title='Line Items')
+        _write_only_table(items_sheet, SalesCSVExporter.ITEM_HEADERS, 'CCCCCC')
+        for receipt_number, item in SalesCSVExporter.line_items(report_data):
+            items_sheet.append([receipt_number] + [item.get(key, '') for key in SalesCSVExporter.ITEM_KEYS])
+        
+        yield from _stream_workbook(workbook)
 
 class CustomerExcelExporter(BaseReportExporter):
     """Excel exporter for customer data with credit aging"""
     content_type = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
     file_extension = 'xlsx'
     
+    SUMMARY_METRICS = {
+        'total_customers': 'Total Customers',
+        'retail_customers': 'Retail Customers',
+        'wholesale_customers': 'Wholesale Customers',
+        'active_customers': 'Active Customers',
+        'blocked_customers': 'Blocked Customers',
+        'total_credit_limit': 'Total Credit Limit',
+        'total_outstanding_balance': 'Total Outstanding Balance',
+        'total_available_credit': 'Total Available Credit',
+    }
+    
+    AGING_METRICS = {
+        'aging_current': 'Current (0-30 days)',
+        'aging_31_60': '31-60 days',
+        'aging_61_90': '61-90 days',
+        'aging_over_90': 'Over 90 days',
+        'total_overdue': 'Total Overdue',
+    }
+    
     def export(self, report_data: Dict[str, Any]) -> bytes:
         workbook = Workbook()
         
@@ -355,16 +464,7 @@ class CustomerExcelExporter(BaseReportExporter):
         row += 1
         
         # Summary metrics
-        summary_mapping = {
-            'total_customers': 'Total Customers',
-            'retail_customers': 'Retail Customers',
-            'wholesale_customers': 'Wholesale Customers',
-            'active_customers': 'Active Customers',
-            'blocked_customers': 'Blocked Customers',
-            'total_credit_limit': 'Total Credit Limit',
-            'total_outstanding_balance': 'Total Outstanding Balance',
-            'total_available_credit': 'Total Available Credit',
-        }
+        summary_mapping = self.SUMMARY_METRICS
         
         for key, label in summary_mapping.items():
             value = report_data['summary'].get(key, '')
@@ -379,13 +479,7 @@ class CustomerExcelExporter(BaseReportExporter):
         summary_sheet[f'A{row}'].font = Font(bold=True, size=12)
         row += 1
         
-        aging_mapping = {
-            'aging_current': 'Current (0-30 days)',
-            'aging_31_60': '31-60 days',
-            'aging_61_90': '61-90 days',
-            'aging_over_90': 'Over 90 days',
-            'total_overdue': 'Total Overdue',
-        }
+        aging_mapping = self.AGING_METRICS
         
         for key, label in aging_mapping.items():
             value = report_data['summary'].get(key, '')
@@ -512,7 +606,36 @@ class CustomerExcelExporter(BaseReportExporter):
         with BytesIO() as output:
             workbook.save(output)
             return output.getvalue()
-
+    
+    def stream(self, report_data: Dict[str, Any]) -> Iterator[bytes]:
+        """Yield the workbook for a streaming payload (see CustomerExporter.stream_data)"""
+        workbook = Workbook(write_only=True)
+        
+        summary_sheet = workbook.create_sheet(title='Summary')
+        _write_only_summary(summary_sheet, 'Customer Export Report', report_data['generated_at'], [
+            ('Customer Statistics', self.SUMMARY_METRICS, report_data['summary']),
+            ('Aging Analysis Summary', self.AGING_METRICS, report_data['summary']),
+        ])
+        
+        detail_sheet = workbook.create_sheet(title='Customer Details')
+        _write_only_table(detail_sheet, CustomerCSVExporter.CUSTOMER_HEADERS, 'CCCCCC')
+        for customer in report_data['customers']:
+            detail_sheet.append([customer.get(key, '') for key in CustomerCSVExporter.CUSTOMER_KEYS])
+        
+        aging_sheet = workbook.create_sheet(title='Credit Aging')
+        _write_only_table(aging_sheet, CustomerCSVExporter.AGING_HEADERS, 'FFE6E6')
+        for customer in CustomerCSVExporter.aging_rows(report_data):
+            aging_sheet.append([customer.get(key, '') for key in CustomerCSVExporter.AGING_KEYS])
+        
+        # The sheet is only added once a transaction turns up, as in export()
+        txn_sheet = None
+        for txn in report_data.get('credit_transactions') or []:
+            if txn_sheet is None:
+                txn_sheet = workbook.create_sheet(title='Credit Transactions')
+                _write_only_table(txn_sheet, CustomerCSVExporter.TRANSACTION_HEADERS, 'E6F2FF')
+            txn_sheet.append([txn.get(key, '') for key in CustomerCSVExporter.TRANSACTION_KEYS])
+        
+        yield from _stream_workbook(workbook)
 
 class InventoryExcelExporter:
     """Excel exporter for inventory data"""
@@ -0,0 +1,90 @@
+import random
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+
+from reports.utils.rfm import assign_rfm_scores
+from reports.views.customer_reports import CustomerSegmentationReportView
+
+
+def _legacy_quintile_score(value, sorted_values, reverse=False):
+    """Linear position scan used by the segmentation report before rank-based scoring."""
+    n = len(sorted_values)
+    pos = sorted_values.index(value)
+    quintile = min(5, max(1, int(pos / (n / 5)) + 1))
+    return 6 - quintile if reverse else quintile
+
+
+class Command(BaseCommand):
+    """Time RFM scoring and segment assignment on synthetic customers."""
+
+    help = (
+        "Benchmark RFM quintile scoring for 10k, 100k and 1M synthetic customers. "
+        "Smaller sizes are also scored with the previous linear-scan method to "
+        "confirm segment assignments are unchanged."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--customers",
+            nargs="+",
+            type=int,
+            default=[10_000, 100_000, 1_000_000],
+            help="Population sizes to score. Defaults to 10000 100000 1000000.",
+        )
+        parser.add_argument(
+            "--legacy-limit",
+            type=int,
+            default=10_000,
+            help="Also run the previous O(n^2) scoring for sizes up to this many customers.",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=7,
+            help="Random seed for the synthetic population.",
+        )
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        classify = CustomerSegmentationReportView()._classify_rfm_segment
+
+        self.stdout.write(f"{'customers':>10} {'rank ms':>10} {'legacy ms':>12} {'identical':>10}")
+        for size in sorted(set(options["customers"])):
+            items = [
+                {
+                    "recency_days": rng.randint(0, 365),
+                    "frequency": rng.randint(1, 40),
+                    "monetary": Decimal(rng.randint(100, 5_000_000)) / 100,
+                }
+                for _ in range(size)
+            ]
+
+            started = time.perf_counter()
+            assign_rfm_scores(items)
+            segments = [classify(item["r_score"], item["f_score"], item["m_score"]) for item in items]
+            rank_ms = (time.perf_counter() - started) * 1000
+
+            legacy_ms = "-"
+            identical = "-"
+            if size <= options["legacy_limit"]:
+                recency_values = sorted(item["recency_days"] for item in items)
+                frequency_values = sorted((item["frequency"] for item in items), reverse=True)
+                monetary_values = sorted((float(item["monetary"]) for item in items), reverse=True)
+
+                started = time.perf_counter()
+                legacy_segments = [
+                    classify(
+                        _legacy_quintile_score(item["recency_days"], recency_values, reverse=True),
+                        _legacy_quintile_score(item["frequency"], frequency_values),
+                        _legacy_quintile_score(float(item["monetary"]), monetary_values),
+                    )
+                    for item in items
+                ]
+                legacy_ms = f"{(time.perf_counter() - started) * 1000:.1f}"
+                identical = "yes" if legacy_segments == segments else "NO"
+
+            self.stdout.write(f"{size:>10} {rank_ms:>10.1f} {legacy_ms:>12} {identical:>10}")
+
+        self.stdout.write(self.style.SUCCESS("Benchmark complete."))
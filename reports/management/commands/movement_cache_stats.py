@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from reports.services.movement_cache import cache_stats, reset_cache_stats
+
+
+class Command(BaseCommand):
+    """Report hit and miss counters for the movement summary and analytics cache."""
+
+    help = (
+        "Print cache hits, misses and hit ratio per movement cache namespace "
+        "(summary, by_warehouse, by_category, analytics, product_summary)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Zero the counters after printing them.",
+        )
+
+    def handle(self, *args, **options):
+        for namespace, counts in cache_stats().items():
+            ratio = counts["hit_ratio"]
+            ratio_display = f"{ratio:.1%}" if ratio is not None else "n/a"
+            self.stdout.write(
+                f"{namespace}: hits={counts['hits']} misses={counts['misses']} hit_ratio={ratio_display}"
+            )
+
+        if options.get("reset"):
+            reset_cache_stats()
+            self.stdout.write(self.style.SUCCESS("Counters reset."))
@@ -45,6 +45,7 @@ class SalesExportRequestSerializer(serializers.Serializer):
         required=False
     )
     include_items = serializers.BooleanField(default=True)
+    stream = serializers.BooleanField(default=False)
     
     def validate(self, data):
         if data['start_date'] > data['end_date']:
@@ -82,6 +83,7 @@ class CustomerExportRequestSerializer(serializers.Serializer):
         decimal_places=2,
         min_value=0
     )
+    stream = serializers.BooleanField(default=False)
 
 
 class InventoryExportRequestSerializer(serializers.Serializer):
@@ -13,7 +13,7 @@ from .automation import (
 )
 
 # Export movement tracking service (Phase 1 - Warehouse Transfer System)
-from .movement_tracker import MovementTracker
+from .movement_tracker import InvalidMovementCursor, MovementTracker
 
 __all__ = [
     'ScheduleCalculator',
@@ -21,4 +21,5 @@ __all__ = [
     'EmailDeliveryService',
     'ExportFileStorage',
     'MovementTracker',
+    'InvalidMovementCursor',
 ]
@@ -0,0 +1,70 @@
+"""
+Customer purchase metrics for report views.
+
+CustomerMetrics holds each customer's lifetime figures over COMPLETED and
+PARTIAL sales. For a date window those figures are exact for every customer
+whose first and last purchase both fall inside it, and irrelevant for
+customers whose purchases all fall outside it. Only customers with purchases
+on both sides of a window boundary need their sales aggregated live.
+"""
+
+from datetime import date
+from typing import List, Optional, Tuple
+
+from sales.models import CustomerMetrics
+from reports.utils.date_utils import datetime_range
+
+INSIDE = 'inside'
+OUTSIDE = 'outside'
+STRADDLING = 'straddling'
+
+
+class CustomerMetricsReader:
+    """Classifies one business's CustomerMetrics rows against a report window."""
+
+    def __init__(self, business_id, start_date: Optional[date] = None, end_date: Optional[date] = None):
+        self.business_id = business_id
+        self.start_at, self.end_before = datetime_range(start_date, end_date)
+
+    def rows(self, customer_queryset=None):
+        rows = CustomerMetrics.objects.filter(business_id=self.business_id)
+        if customer_queryset is not None:
+            rows = rows.filter(customer__in=customer_queryset)
+        return rows
+
+    def _overlapping(self, rows):
+        if self.start_at is not None:
+            rows = rows.filter(last_purchase_at__gte=self.start_at)
+        if self.end_before is not None:
+            rows = rows.filter(first_purchase_at__lt=self.end_before)
+        return rows
+
+    def split(self, customer_queryset=None) -> Tuple[List[CustomerMetrics], List]:
+        """
+        Rows usable as-is for the window, and ids of customers to aggregate live.
+
+        Customers without purchases in the window appear in neither list.
+        """
+        inside: List[CustomerMetrics] = []
+        straddling = []
+        rows = self._overlapping(self.rows(customer_queryset)).select_related('customer')
+        for row in rows:
+            if self.classify(row) == INSIDE:
+                inside.append(row)
+            else:
+                straddling.append(row.customer_id)
+        return inside, straddling
+
+    def classify(self, row: Optional[CustomerMetrics]) -> str:
+        """Whether all, none or only some of a customer's purchases fall in the window."""
+        if row is None:
+            return OUTSIDE
+        if self.start_at is not None and row.last_purchase_at < self.start_at:
+            return OUTSIDE
+        if self.end_before is not None and row.first_purchase_at >= self.end_before:
+            return OUTSIDE
+        if self.start_at is not None and row.first_purchase_at < self.start_at:
+            return STRADDLING
+        if self.end_before is not None and row.last_purchase_at >= self.end_before:
+            return STRADDLING
+        return INSIDE
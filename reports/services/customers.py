@@ -4,12 +4,13 @@ Customer data export service with credit aging analysis
 from __future__ import annotations
 
 from decimal import Decimal
-from typing import Dict, Any
+from typing import Dict, Any, Iterator
 from django.db.models import Sum, Q, QuerySet, Count
 from django.utils import timezone
 from datetime import timedelta
 
 from sales.models import Customer, Sale, CreditTransaction
+from reports.utils.date_utils import day_start
 from .base import BaseDataExporter
 
 
@@ -63,32 +64,7 @@ class CustomerExporter(BaseDataExporter):
         if filters is None:
             filters = {}
         
-        # Summary calculations
-        total_customers = queryset.count()
-        retail_count = queryset.filter(customer_type='RETAIL').count()
-        wholesale_count = queryset.filter(customer_type='WHOLESALE').count()
-        
-        # Credit statistics
-        total_credit_limit = queryset.aggregate(
-            total=Sum('credit_limit')
-        )['total'] or Decimal('0.00')
-        
-        total_outstanding = queryset.aggregate(
-            total=Sum('outstanding_balance')
-        )['total'] or Decimal('0.00')
-        
-        blocked_count = queryset.filter(credit_blocked=True).count()
-        
-        summary = {
-            'total_customers': total_customers,
-            'retail_customers': retail_count,
-            'wholesale_customers': wholesale_count,
-            'total_credit_limit': total_credit_limit,
-            'total_outstanding_balance': total_outstanding,
-            'total_available_credit': total_credit_limit - total_outstanding,
-            'blocked_customers': blocked_count,
-            'active_customers': queryset.filter(is_active=True).count(),
-        }
+        summary = self._base_summary(queryset)
         
         # Customer details with aging analysis
         customers_data = []
@@ -109,69 +85,175 @@ class CustomerExporter(BaseDataExporter):
             aging_buckets['61_90'] += aging['61_90']
             aging_buckets['over_90'] += aging['over_90']
             
-            # Get sales statistics
-            sales_stats = self._get_sales_statistics(customer)
-            
-            customer_row = {
-                'customer_id': str(customer.id),
+            customers_data.append(self._customer_row(customer, aging))
+        
+        # Add aging summary to overall summary
+        summary.update(self._aging_summary(aging_buckets))
+        
+        # Credit transactions (if requested)
+        credit_transactions = []
+        if filters.get('include_credit_history', True):
+            credit_transactions = self._get_credit_transactions(queryset)
+        
+        return {
+            'summary': summary,
+            'customers': customers_data,
+            'credit_transactions': credit_transactions,
+            'generated_at': timezone.now(),
+        }
+    
+    def stream_data(self, filters: Dict[str, Any], chunk_size: int = 2000) -> Dict[str, Any]:
+        """
+        Export payload whose customer and transaction rows are produced lazily.
+        
+        Aging totals for the summary are aggregated in SQL up front; the
+        ``customers``, ``customer_aging`` and ``credit_transactions`` generators
+        each read customers through ``iterator(chunk_size=...)`` as the file is
+        written.
+        """
+        queryset = self.build_queryset(filters)
+        summary = self._base_summary(queryset)
+        summary.update(self._aging_summary(self._aggregate_aging(queryset)))
+        
+        return {
+            'summary': summary,
+            'customers': self.iter_customer_rows(queryset, chunk_size=chunk_size),
+            'customer_aging': self.iter_aging_rows(queryset, chunk_size=chunk_size),
+            'credit_transactions': (
+                self._iter_credit_transactions(queryset, chunk_size=chunk_size)
+                if filters.get('include_credit_history', True) else []
+            ),
+            'generated_at': timezone.now(),
+        }
+    
+    def iter_customer_rows(self, queryset: QuerySet, chunk_size: int = 2000) -> Iterator[Dict[str, Any]]:
+        """Yield one detail row per customer"""
+        for customer in queryset.prefetch_related(None).iterator(chunk_size=chunk_size):
+            yield self._customer_row(customer, self._calculate_aging(customer))
+    
+    def iter_aging_rows(self, queryset: QuerySet, chunk_size: int = 2000) -> Iterator[Dict[str, Any]]:
+        """Yield the credit aging columns per customer, skipping sales statistics"""
+        for customer in queryset.prefetch_related(None).iterator(chunk_size=chunk_size):
+            aging = self._calculate_aging(customer)
+            yield {
                 'name': customer.name,
-                'email': customer.email or '',
-                'phone': customer.phone or '',
-                'address': customer.address or '',
                 'customer_type': customer.customer_type,
-                'contact_person': customer.contact_person or '',
-                
-                # Credit information
                 'credit_limit': str(customer.credit_limit),
                 'outstanding_balance': str(customer.outstanding_balance),
-                'available_credit': str(customer.available_credit),
-                'credit_terms_days': customer.credit_terms_days,
                 'credit_blocked': 'Yes' if customer.credit_blocked else 'No',
-                
-                # Aging buckets
                 'aging_current': str(aging['current']),
                 'aging_31_60': str(aging['31_60']),
                 'aging_61_90': str(aging['61_90']),
                 'aging_over_90': str(aging['over_90']),
                 'total_overdue': str(aging['total_overdue']),
                 'oldest_invoice_days': aging['oldest_days'],
-                
-                # Sales statistics
-                'total_sales_count': sales_stats['count'],
-                'total_sales_amount': str(sales_stats['total_amount']),
-                'average_sale_amount': str(sales_stats['average_amount']),
-                'last_sale_date': sales_stats['last_sale_date'],
-                'first_sale_date': sales_stats['first_sale_date'],
-                
-                # Status
-                'is_active': 'Yes' if customer.is_active else 'No',
-                'created_at': customer.created_at.strftime('%Y-%m-%d'),
-                'created_by': customer.created_by.name if (customer.created_by and hasattr(customer.created_by, 'name')) else '',
             }
-            
-            customers_data.append(customer_row)
-        
-        # Add aging summary to overall summary
-        summary['aging_current'] = aging_buckets['current']
-        summary['aging_31_60'] = aging_buckets['31_60']
-        summary['aging_61_90'] = aging_buckets['61_90']
-        summary['aging_over_90'] = aging_buckets['over_90']
-        summary['total_overdue'] = (
-            aging_buckets['31_60'] + 
-            aging_buckets['61_90'] + 
-            aging_buckets['over_90']
+    
+    def _base_summary(self, queryset: QuerySet) -> Dict[str, Any]:
+        """Customer counts and credit totals for ``queryset``"""
+        totals = queryset.aggregate(
+            total_customers=Count('id'),
+            retail_customers=Count('id', filter=Q(customer_type='RETAIL')),
+            wholesale_customers=Count('id', filter=Q(customer_type='WHOLESALE')),
+            blocked_customers=Count('id', filter=Q(credit_blocked=True)),
+            active_customers=Count('id', filter=Q(is_active=True)),
+            total_credit_limit=Sum('credit_limit'),
+            total_outstanding_balance=Sum('outstanding_balance'),
         )
+        total_credit_limit = totals['total_credit_limit'] or Decimal('0.00')
+        total_outstanding = totals['total_outstanding_balance'] or Decimal('0.00')
         
-        # Credit transactions (if requested)
-        credit_transactions = []
-        if filters.get('include_credit_history', True):
-            credit_transactions = self._get_credit_transactions(queryset)
+        return {
+            'total_customers': totals['total_customers'],
+            'retail_customers': totals['retail_customers'],
+            'wholesale_customers': totals['wholesale_customers'],
+            'total_credit_limit': total_credit_limit,
+            'total_outstanding_balance': total_outstanding,
+            'total_available_credit': total_credit_limit - total_outstanding,
+            'blocked_customers': totals['blocked_customers'],
+            'active_customers': totals['active_customers'],
+        }
+    
+    @staticmethod
+    def _aging_summary(aging_buckets: Dict[str, Decimal]) -> Dict[str, Decimal]:
+        return {
+            'aging_current': aging_buckets['current'],
+            'aging_31_60': aging_buckets['31_60'],
+            'aging_61_90': aging_buckets['61_90'],
+            'aging_over_90': aging_buckets['over_90'],
+            'total_overdue': (
+                aging_buckets['31_60'] + 
+                aging_buckets['61_90'] + 
+                aging_buckets['over_90']
+            ),
+        }
+    
+    def _aggregate_aging(self, customers: QuerySet) -> Dict[str, Decimal]:
+        """Aging buckets across all ``customers`` in one query (same bands as _calculate_aging)"""
+        today = timezone.now().date()
+        totals = Sale.objects.filter(
+            customer_id__in=customers.order_by().values('id'),
+            payment_type='CREDIT',
+            status__in=['PENDING', 'PARTIAL'],
+        ).aggregate(
+            current=Sum('amount_due', filter=Q(created_at__gte=day_start(today - timedelta(days=30)))),
+            between_31_60=Sum('amount_due', filter=Q(
+                created_at__lt=day_start(today - timedelta(days=30)),
+                created_at__gte=day_start(today - timedelta(days=60)),
+            )),
+            between_61_90=Sum('amount_due', filter=Q(
+                created_at__lt=day_start(today - timedelta(days=60)),
+                created_at__gte=day_start(today - timedelta(days=90)),
+            )),
+            over_90=Sum('amount_due', filter=Q(created_at__lt=day_start(today - timedelta(days=90)))),
+        )
+        cents = Decimal('0.01')
+        return {
+            'current': (totals['current'] or Decimal('0.00')).quantize(cents),
+            '31_60': (totals['between_31_60'] or Decimal('0.00')).quantize(cents),
+            '61_90': (totals['between_61_90'] or Decimal('0.00')).quantize(cents),
+            'over_90': (totals['over_90'] or Decimal('0.00')).quantize(cents),
+        }
+    
+    def _customer_row(self, customer: Customer, aging: Dict[str, Any]) -> Dict[str, Any]:
+        # Get sales statistics
+        sales_stats = self._get_sales_statistics(customer)
         
         return {
-            'summary': summary,
-            'customers': customers_data,
-            'credit_transactions': credit_transactions,
-            'generated_at': timezone.now(),
+            'customer_id': str(customer.id),
+            'name': customer.name,
+            'email': customer.email or '',
+            'phone': customer.phone or '',
+            'address': customer.address or '',
+            'customer_type': customer.customer_type,
+            'contact_person': customer.contact_person or '',
+            
+            # Credit information
+            'credit_limit': str(customer.credit_limit),
+            'outstanding_balance': str(customer.outstanding_balance),
+            'available_credit': str(customer.available_credit),
+            'credit_terms_days': customer.credit_terms_days,
+            'credit_blocked': 'Yes' if customer.credit_blocked else 'No',
+            
+            # Aging buckets
+            'aging_current': str(aging['current']),
+            'aging_31_60': str(aging['31_60']),
+            'aging_61_90': str(aging['61_90']),
+            'aging_over_90': str(aging['over_90']),
+            'total_overdue': str(aging['total_overdue']),
+            'oldest_invoice_days': aging['oldest_days'],
+            
+            # Sales statistics
+            'total_sales_count': sales_stats['count'],
+            'total_sales_amount': str(sales_stats['total_amount']),
+            'average_sale_amount': str(sales_stats['average_amount']),
+            'last_sale_date': sales_stats['last_sale_date'],
+            'first_sale_date': sales_stats['first_sale_date'],
+            
+            # Status
+            'is_active': 'Yes' if customer.is_active else 'No',
+            'created_at': customer.created_at.strftime('%Y-%m-%d'),
+            'created_by': customer.created_by.name if (customer.created_by and hasattr(customer.created_by, 'name')) else '',
         }
     
     def _calculate_aging(self, customer: Customer) -> Dict[str, Any]:
@@ -252,19 +334,29 @@ class CustomerExporter(BaseDataExporter):
         transactions = []
         
         for customer in customers:
-            customer_transactions = CreditTransaction.objects.filter(
-                customer=customer
-            ).order_by('-created_at')[:50]  # Last 50 transactions per customer
-            
-            for txn in customer_transactions:
-                transactions.append({
-                    'customer_name': customer.name,
-                    'date': txn.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-                    'transaction_type': txn.transaction_type,
-                    'amount': str(txn.amount),
-                    'balance_before': str(txn.balance_before),
-                    'balance_after': str(txn.balance_after),
-                    'reference': txn.reference_id or '',
-                })
+            transactions.extend(self._customer_credit_transactions(customer))
         
         return transactions
+    
+    def _iter_credit_transactions(self, customers: QuerySet, chunk_size: int = 2000) -> Iterator[Dict[str, Any]]:
+        for customer in customers.prefetch_related(None).iterator(chunk_size=chunk_size):
+            yield from self._customer_credit_transactions(customer)
+    
+    @staticmethod
+    def _customer_credit_transactions(customer: Customer) -> list:
+        customer_transactions = CreditTransaction.objects.filter(
+            customer=customer
+        ).order_by('-created_at')[:50]  # Last 50 transactions per customer
+        
+        return [
+            {
+                'customer_name': customer.name,
+                'date': txn.created_at.strftime('%Y-%m-%d %H:%M:%S'),
+                'transaction_type': txn.transaction_type,
+                'amount': str(txn.amount),
+                'balance_before': str(txn.balance_before),
+                'balance_after': str(txn.balance_after),
+                'reference': txn.reference_id or '',
+            }
+            for txn in customer_transactions
+        ]
@@ -0,0 +1,162 @@
+"""
+Result cache for stock movement aggregates.
+
+Summaries and groupings are stored in Django's cache under
+
+    movements:<namespace>:<business_id>:<generation>:<filters hash>
+
+where ``generation`` is the business's movement generation maintained by
+``inventory.movement_ledger``. Every ledger write (adjustment, transfer or sale
+completion, refund) bumps it, so cached results for that business stop being
+read immediately; the timeout only bounds how long unreachable entries linger.
+
+Hits and misses are counted per namespace in the cache as well, so the
+numbers from ``cache_stats()`` cover every worker sharing the backend.
+"""
+
+import hashlib
+import json
+from datetime import date, datetime
+from functools import wraps
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional
+from uuid import UUID
+
+from django.conf import settings
+from django.core.cache import cache
+
+from inventory.movement_ledger import movement_generation
+
+# Namespaces reported by cache_stats()
+NAMESPACES = (
+    'summary',
+    'by_warehouse',
+    'by_category',
+    'analytics',
+    'product_summary',
+)
+
+STATS_KEY = 'movements:stats:{namespace}:{outcome}'
+
+
+def _timeout() -> int:
+    return getattr(settings, 'MOVEMENT_CACHE_TIMEOUT', 300)
+
+
+def _normalize(value: Any) -> Any:
+    """Reduce a filter value to a JSON-stable form so equal filters hash equally."""
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sorted({str(_normalize(item)) for item in value if item not in (None, '')})
+    if isinstance(value, Mapping):
+        return {str(key): _normalize(item) for key, item in value.items()}
+    return value
+
+
+def filters_hash(filters: Mapping[str, Any]) -> str:
+    """Hash of the filters that affect a result; unset filters are ignored."""
+    normalized = {
+        key: _normalize(value)
+        for key, value in filters.items()
+        if value not in (None, '', [], (), set())
+    }
+    payload = json.dumps(normalized, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def cache_key(namespace: str, business_id, filters: Mapping[str, Any]) -> str:
+    generation = movement_generation(business_id)
+    return f'movements:{namespace}:{business_id}:{generation}:{filters_hash(filters)}'
+
+
+def _count(namespace: str, outcome: str) -> None:
+    key = STATS_KEY.format(namespace=namespace, outcome=outcome)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, None)
+        cache.incr(key)
+
+
+def get_or_compute(
+    namespace: str,
+    business_id,
+    filters: Mapping[str, Any],
+    compute: Callable[[], Any],
+    timeout: Optional[int] = None,
+) -> Any:
+    """Return the cached result for these filters, computing and storing it on a miss."""
+    if timeout is None:
+        timeout = _timeout()
+    if not timeout:
+        return compute()
+
+    key = cache_key(namespace, business_id, filters)
+    result = cache.get(key)
+    if result is not None:
+        _count(namespace, 'hits')
+        return result
+
+    _count(namespace, 'misses')
+    result = compute()
+    cache.set(key, result, timeout)
+    return result
+
+
+def cached_aggregate(namespace: str, key_filters: Optional[Callable[..., Dict[str, Any]]] = None):
+    """
+    Cache a keyword-only MovementTracker classmethod under ``namespace``.
+
+    ``key_filters(cls, filters)`` can adjust the filters used for the key (e.g.
+    to resolve defaults). Callers pass ``use_cache=False`` to read live.
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(cls, *, use_cache: bool = True, **filters):
+            if not use_cache:
+                return func(cls, **filters)
+            key = key_filters(cls, filters) if key_filters else filters
+            return get_or_compute(
+                namespace,
+                filters['business_id'],
+                key,
+                lambda: func(cls, **filters),
+            )
+
+        return wrapper
+
+    return decorator
+
+
+def cache_stats(namespaces: Iterable[str] = NAMESPACES) -> Dict[str, Dict[str, Any]]:
+    """Hit and miss counts per namespace, with the hit ratio where there was traffic."""
+    namespaces = list(namespaces)
+    keys = [
+        STATS_KEY.format(namespace=namespace, outcome=outcome)
+        for namespace in namespaces
+        for outcome in ('hits', 'misses')
+    ]
+    values = cache.get_many(keys)
+
+    stats = {}
+    for namespace in namespaces:
+        hits = int(values.get(STATS_KEY.format(namespace=namespace, outcome='hits'), 0))
+        misses = int(values.get(STATS_KEY.format(namespace=namespace, outcome='misses'), 0))
+        lookups = hits + misses
+        stats[namespace] = {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': round(hits / lookups, 4) if lookups else None,
+        }
+    return stats
+
+
+def reset_cache_stats(namespaces: Iterable[str] = NAMESPACES) -> None:
+    cache.delete_many([
+        STATS_KEY.format(namespace=namespace, outcome=outcome)
+        for namespace in namespaces
+        for outcome in ('hits', 'misses')
+    ])
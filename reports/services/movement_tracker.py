@@ -7,6 +7,11 @@ records and new Transfer records).
 
 Purpose:
 - Aggregate movements from multiple sources (StockAdjustment, Transfer, Sales)
+- Read them from the StockMovement ledger (``stock_movements``), which is written
+  as movements complete, once ``backfill_stock_movements`` has filled in history
+  and ``STOCK_MOVEMENT_SOURCE = 'ledger'``; until then (the default) they come
+  from the original runtime UNION over the source tables, which also backs
+  ``MovementTracker.verify_ledger``
 - Provide consistent movement data for reports and analytics
 - Support transition from old to new transfer system without breaking reports
 - Maintain historical data continuity
@@ -22,12 +27,29 @@ Usage:
     )
 """
 
+import base64
+import binascii
+import json
 from decimal import Decimal
 from typing import List, Dict, Optional, Any, Tuple, Iterator
 from datetime import datetime, date
 
+from django.conf import settings
 from django.db import connection
 
+from reports.utils.date_utils import datetime_range
+
+from .movement_cache import cached_aggregate
+
+
+class InvalidMovementCursor(ValueError):
+    """Raised when a movement page cursor is malformed or used with another sort."""
+
+
+def _resolved_source_filters(cls, filters: Dict[str, Any]) -> Dict[str, Any]:
+    """Cache key filters with the movement source resolved, so ledger and union results never mix."""
+    return {**filters, 'source': cls.resolve_source(filters.get('source'))}
+
 
 class MovementTracker:
     """
@@ -56,6 +78,16 @@ class MovementTracker:
 
     # Legacy transfer adjustment types (old system)
     TRANSFER_ADJUSTMENT_TYPES = ['TRANSFER_IN', 'TRANSFER_OUT']
+
+    # Where movements are read from
+    SOURCE_LEDGER = 'ledger'
+    SOURCE_UNION = 'union'
+
+    # Sorts that can be paged by (movement_date, movement_id) keyset cursors
+    KEYSET_SORTS = {
+        'date_desc': 'DESC',
+        'date_asc': 'ASC',
+    }
     
     @classmethod
     def get_movements(
@@ -138,10 +170,17 @@ class MovementTracker:
         search: Optional[str] = None,
         sort: str = 'date_desc',
         limit: int,
-        offset: int,
+        offset: int = 0,
+        cursor: Optional[str] = None,
         include_cancelled: bool = False
     ) -> List[Dict[str, Any]]:
-        """Return a single page of movements."""
+        """
+        Return a single page of movements.
+
+        Pass ``cursor`` (from ``encode_cursor``) instead of ``offset`` to page
+        by keyset; each page then costs the same however deep it is.
+        """
+        after = cls.decode_cursor(cursor, sort) if cursor else None
         rows = cls._execute_union_query(
             business_id=business_id,
             warehouse_id=warehouse_id,
@@ -155,13 +194,14 @@ class MovementTracker:
             search=search,
             sort=sort,
             limit=limit,
-            offset=offset,
+            offset=None if after else offset,
+            after=after,
             include_cancelled=include_cancelled
         )
         return [cls._normalize_row(row) for row in rows]
 
     @classmethod
-    def count_movements(
+    def get_movement_page(
         cls,
         *,
         business_id: str,
@@ -174,9 +214,122 @@ class MovementTracker:
         movement_types: Optional[List[str]] = None,
         adjustment_type: Optional[str] = None,
         search: Optional[str] = None,
+        sort: str = 'date_desc',
+        limit: int,
+        cursor: Optional[str] = None,
         include_cancelled: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Return one keyset page of movements with the cursor for the next one.
+
+        Fetches one extra row to tell whether another page exists, so no
+        COUNT(*) over the union is needed to scroll.
+
+        Raises:
+            InvalidMovementCursor: If ``sort`` cannot be keyset-paged or the
+                cursor is malformed
+        """
+        if sort not in cls.KEYSET_SORTS:
+            raise InvalidMovementCursor(f"Cursor pagination is not supported for sort '{sort}'")
+
+        movements = cls.get_paginated_movements(
+            business_id=business_id,
+            warehouse_id=warehouse_id,
+            product_id=product_id,
+            product_ids=product_ids,
+            category_id=category_id,
+            start_date=start_date,
+            end_date=end_date,
+            movement_types=movement_types,
+            adjustment_type=adjustment_type,
+            search=search,
+            sort=sort,
+            limit=limit + 1,
+            cursor=cursor,
+            include_cancelled=include_cancelled,
+        )
+        has_more = len(movements) > limit
+        movements = movements[:limit]
+        return {
+            'results': movements,
+            'has_more': has_more,
+            'next_cursor': cls.encode_cursor(movements[-1], sort) if has_more else None,
+        }
+
+    @classmethod
+    def encode_cursor(cls, movement: Dict[str, Any], sort: str = 'date_desc') -> str:
+        """Build an opaque cursor pointing just past ``movement`` in ``sort`` order."""
+        movement_date = movement['date']
+        if isinstance(movement_date, (datetime, date)):
+            movement_date = movement_date.isoformat()
+        payload = json.dumps(
+            {'d': movement_date, 'i': movement['id'], 's': sort},
+            separators=(',', ':')
+        )
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    @classmethod
+    def decode_cursor(cls, token: str, sort: str = 'date_desc') -> Tuple[datetime, str]:
+        """
+        Decode a cursor from ``encode_cursor`` into its (movement_date, movement_id) key.
+
+        Raises:
+            InvalidMovementCursor: If the token is malformed or was issued for
+                a different sort
+        """
+        if sort not in cls.KEYSET_SORTS:
+            raise InvalidMovementCursor(f"Cursor pagination is not supported for sort '{sort}'")
+        try:
+            padded = token + '=' * (-len(token) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            movement_date = datetime.fromisoformat(payload['d'])
+            movement_id = str(payload['i'])
+            token_sort = payload['s']
+        except (binascii.Error, ValueError, TypeError, KeyError, UnicodeDecodeError):
+            raise InvalidMovementCursor('Malformed movement cursor')
+        if token_sort != sort:
+            raise InvalidMovementCursor('Movement cursor was issued for a different sort order')
+        return movement_date, movement_id
+
+    @classmethod
+    def count_movements(
+        cls,
+        *,
+        business_id: str,
+        warehouse_id: Optional[str] = None,
+        product_id: Optional[str] = None,
+        product_ids: Optional[List[str]] = None,
+        category_id: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        movement_types: Optional[List[str]] = None,
+        adjustment_type: Optional[str] = None,
+        search: Optional[str] = None,
+        include_cancelled: bool = False,
+        estimate: bool = False,
+        source: Optional[str] = None
     ) -> int:
-        """Return total number of movements matching filters."""
+        """
+        Return total number of movements matching filters.
+
+        With ``estimate=True`` the planner's row estimate is returned instead
+        of running the union to completion.
+        """
+        if estimate:
+            return cls._estimate_movements(
+                business_id=business_id,
+                warehouse_id=warehouse_id,
+                product_id=product_id,
+                product_ids=product_ids,
+                category_id=category_id,
+                start_date=start_date,
+                end_date=end_date,
+                movement_types=movement_types,
+                adjustment_type=adjustment_type,
+                search=search,
+                include_cancelled=include_cancelled,
+                source=source,
+            )
         sql, params = cls._build_union_query(
             business_id=business_id,
             warehouse_id=warehouse_id,
@@ -193,14 +346,37 @@ class MovementTracker:
             offset=None,
             include_cancelled=include_cancelled,
             count=True,
-            skip_order=True
+            skip_order=True,
+            source=source
         )
         with connection.cursor() as cursor:
             cursor.execute(sql, params)
             result = cursor.fetchone()
         return int(result[0]) if result else 0
+
+    @classmethod
+    def _estimate_movements(cls, **filters: Any) -> int:
+        """Planner row estimate for the movement union (no rows are read)."""
+        sql, params = cls._build_union_query(
+            **filters,
+            sort=None,
+            limit=None,
+            offset=None,
+            count=False,
+            skip_order=True
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            result = cursor.fetchone()
+        if not result:
+            return 0
+        plan = result[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
     
     @classmethod
+    @cached_aggregate('summary', key_filters=_resolved_source_filters)
     def get_summary(
         cls,
         *,
@@ -214,7 +390,8 @@ class MovementTracker:
         movement_types: Optional[List[str]] = None,
         adjustment_type: Optional[str] = None,
         search: Optional[str] = None,
-        include_cancelled: bool = False
+        include_cancelled: bool = False,
+        source: Optional[str] = None
     ) -> Dict[str, Any]:
         """Return summary statistics for movements matching the filters."""
 
@@ -233,7 +410,8 @@ class MovementTracker:
             offset=None,
             include_cancelled=include_cancelled,
             count=False,
-            skip_order=True
+            skip_order=True,
+            source=source
         )
 
         summary_sql = f"""
@@ -337,6 +515,7 @@ class MovementTracker:
         }
 
     @classmethod
+    @cached_aggregate('by_warehouse', key_filters=_resolved_source_filters)
     def aggregate_by_warehouse(
         cls,
         *,
@@ -447,6 +626,7 @@ class MovementTracker:
         return results
 
     @classmethod
+    @cached_aggregate('by_category', key_filters=_resolved_source_filters)
     def aggregate_by_category(
         cls,
         *,
@@ -586,7 +766,8 @@ class MovementTracker:
         sort: str,
         limit: Optional[int],
         offset: Optional[int],
-        include_cancelled: bool
+        include_cancelled: bool,
+        after: Optional[Tuple[datetime, str]] = None
     ) -> List[Dict[str, Any]]:
         sql, params = cls._build_union_query(
             business_id=business_id,
@@ -602,6 +783,7 @@ class MovementTracker:
             sort=sort,
             limit=limit,
             offset=offset,
+            after=after,
             include_cancelled=include_cancelled,
             count=False
         )
@@ -625,7 +807,7 @@ class MovementTracker:
         # ✅ CRITICAL FIX: Determine correct detail endpoint based on source_type
         # This helps frontend route to the correct API for fetching details
         detail_endpoint_type = None
-        if row['source_type'] == 'sale':
+        if row['source_type'] in ('sale', 'sale_refund'):
             detail_endpoint_type = 'sale'
         elif row['source_type'] == 'new_transfer':
             detail_endpoint_type = 'transfer'
@@ -707,6 +889,8 @@ class MovementTracker:
         include_cancelled: bool,
         count: bool,
         skip_order: bool = False,
+        after: Optional[Tuple[datetime, str]] = None,
+        source: Optional[str] = None,
     ) -> Tuple[str, Dict[str, Any]]:
         movement_types_set = None
         if movement_types:
@@ -740,12 +924,27 @@ class MovementTracker:
 
         subqueries: List[str] = []
 
-        if include_adjustments:
-            subqueries.append(cls._adjustment_subquery())
-        if include_transfers:
-            subqueries.append(cls._transfer_subquery())
-        if include_sales:
-            subqueries.append(cls._sale_subquery())
+        if cls.resolve_source(source) == cls.SOURCE_LEDGER:
+            ledger_sources = []
+            if include_adjustments:
+                ledger_sources.append('legacy_adjustment')
+            if include_transfers:
+                ledger_sources.append('new_transfer')
+            if include_sales:
+                ledger_sources.extend(['sale', 'sale_refund'])
+            if ledger_sources:
+                params['ledger_sources'] = ledger_sources
+                params['start_at'], params['end_before'] = datetime_range(
+                    cls._as_date(start_date), cls._as_date(end_date)
+                )
+                subqueries.append(cls._ledger_subquery())
+        else:
+            if include_adjustments:
+                subqueries.append(cls._adjustment_subquery())
+            if include_transfers:
+                subqueries.append(cls._transfer_subquery())
+            if include_sales:
+                subqueries.append(cls._sale_subquery())
 
         if not subqueries:
             # No sources selected; return empty result
@@ -767,6 +966,15 @@ class MovementTracker:
                 "OR movements.product_sku ILIKE %(search_term)s)"
             )
 
+        if after is not None:
+            # Keyset predicate; rows tied on movement_date are split by movement_id
+            params['after_date'], params['after_id'] = after
+            comparison = '>' if cls.KEYSET_SORTS.get(sort) == 'ASC' else '<'
+            wrapped += (
+                f" AND (movements.movement_date, movements.movement_id) {comparison} "
+                "(%(after_date)s, %(after_id)s)"
+            )
+
         order_clause = cls._resolve_sort_clause(sort) if sort else None
 
         if count:
@@ -777,22 +985,80 @@ class MovementTracker:
 
         if limit is not None:
             params['limit'] = limit
-            params['offset'] = offset or 0
-            wrapped += " LIMIT %(limit)s OFFSET %(offset)s"
+            wrapped += " LIMIT %(limit)s"
+            if offset:
+                params['offset'] = offset
+                wrapped += " OFFSET %(offset)s"
 
         return wrapped, params
 
+    @staticmethod
+    def _as_date(value: Optional[Any]) -> Optional[date]:
+        """Accept dates or ISO strings (the union query let PostgreSQL cast strings)."""
+        if isinstance(value, str):
+            return date.fromisoformat(value)
+        return value
+
+    @classmethod
+    def resolve_source(cls, source: Optional[str] = None) -> str:
+        """Movement source to read: explicit ``source`` or the STOCK_MOVEMENT_SOURCE setting."""
+        resolved = source or getattr(settings, 'STOCK_MOVEMENT_SOURCE', cls.SOURCE_UNION)
+        if resolved not in (cls.SOURCE_LEDGER, cls.SOURCE_UNION):
+            raise ValueError(f"Unknown stock movement source '{resolved}'")
+        return resolved
+
+    @classmethod
+    def verify_ledger(
+        cls,
+        *,
+        business_id: str,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> Dict[str, Any]:
+        """
+        Compare ledger totals against the legacy union for a business.
+
+        The union also lists pending adjustments, non-cancelled transfers that
+        are not completed and draft sales, none of which are movements yet, so
+        differences are expected while such records exist.
+
+        Returns:
+            Dictionary with both summaries and ``mismatches`` mapping each
+            differing metric to ``(ledger_value, union_value)``
+        """
+        summaries = {
+            source: cls.get_summary(
+                business_id=business_id,
+                start_date=start_date,
+                end_date=end_date,
+                source=source,
+                use_cache=False,
+            )
+            for source in (cls.SOURCE_LEDGER, cls.SOURCE_UNION)
+        }
+        ledger, union = summaries[cls.SOURCE_LEDGER], summaries[cls.SOURCE_UNION]
+        return {
+            'ledger': ledger,
+            'union': union,
+            'mismatches': {
+                key: (ledger[key], union[key])
+                for key in ledger
+                if ledger[key] != union[key]
+            },
+        }
+
     @staticmethod
     def _resolve_sort_clause(sort: Optional[str]) -> str:
+        default = 'movements.movement_date DESC, movements.movement_id DESC'
         if not sort:
-            return 'movements.movement_date DESC'
+            return default
 
         mapping = {
-            'date_asc': 'movements.movement_date ASC',
+            'date_asc': 'movements.movement_date ASC, movements.movement_id ASC',
             'quantity': 'movements.quantity DESC',
             'product': 'movements.product_name ASC',
         }
-        return mapping.get(sort, 'movements.movement_date DESC')
+        return mapping.get(sort, default)
 
     @classmethod
     def _should_include_adjustments(cls, movement_types: Optional[set]) -> bool:
@@ -812,6 +1078,53 @@ class MovementTracker:
             return True
         return 'sale' in movement_types
 
+    @classmethod
+    def _ledger_subquery(cls) -> str:
+        return """
+            SELECT
+                sm.source_key AS movement_id,
+                sm.movement_type,
+                sm.source_type,
+                sm.movement_date,
+                sm.product_id::text AS product_id,
+                sm.product_name,
+                sm.product_sku,
+                sm.category_id::text AS category_id,
+                sm.category_name,
+                sm.quantity,
+                sm.direction,
+                sm.source_location_id::text AS source_location_id,
+                sm.source_location_name,
+                sm.destination_location_id::text AS destination_location_id,
+                sm.destination_location_name,
+                sm.reference_number,
+                sm.reference_id::text AS reference_id,
+                sm.sale_id::text AS sale_id,
+                sm.transfer_id::text AS transfer_id,
+                sm.adjustment_id::text AS adjustment_id,
+                sm.performed_by_name AS performed_by,
+                sm.notes,
+                sm.unit_cost,
+                sm.total_value,
+                sm.adjustment_type,
+                sm.sale_type,
+                sm.transfer_type,
+                sm.status,
+                sm.performed_by_id::text AS performed_by_id,
+                CASE WHEN sm.performed_by_id IS NULL THEN 'system' ELSE 'manual' END AS performed_via,
+                NULL::text AS performed_by_role
+            FROM stock_movements sm
+            WHERE sm.business_id = %(business_id)s
+              AND sm.source_type = ANY(%(ledger_sources)s)
+              AND (%(warehouse_id)s IS NULL
+                   OR sm.source_location_id = %(warehouse_id)s
+                   OR sm.destination_location_id = %(warehouse_id)s)
+              AND (%(product_ids)s IS NULL OR sm.product_id = ANY(%(product_ids)s::uuid[]))
+              AND (%(category_id)s IS NULL OR sm.category_id = %(category_id)s)
+              AND (%(start_at)s IS NULL OR sm.movement_date >= %(start_at)s)
+              AND (%(end_before)s IS NULL OR sm.movement_date < %(end_before)s)
+        """
+
     @classmethod
     def _adjustment_subquery(cls) -> str:
         return """
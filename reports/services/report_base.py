@@ -17,7 +17,8 @@ from rest_framework import status as http_status
 from subscriptions.permissions import RequiresSubscriptionForReports
 
 from reports.utils.response import ReportResponse, ReportError, ReportMetadata
-from reports.utils.date_utils import DateRangeValidator
+from reports.utils.date_utils import DateRangeValidator, date_range_lookup
+from reports.services.report_cache import cached_report
 
 
 class BusinessFilterMixin:
@@ -35,18 +36,20 @@ class BusinessFilterMixin:
         """
         from accounts.models import BusinessMembership
         
+        # Resolved once per request (the report cache needs it before the view does)
+        if hasattr(request, '_report_business_id'):
+            return request._report_business_id
+        
         user = request.user
         
         # Use the same approach as working ViewSets
-        membership = BusinessMembership.objects.filter(
+        business_id = BusinessMembership.objects.filter(
             user=user,
             is_active=True
-        ).first()
-        
-        if membership:
-            return membership.business.id
+        ).values_list('business_id', flat=True).first()
         
-        return None
+        request._report_business_id = business_id
+        return business_id
     
     def get_business_or_error(self, request) -> Tuple[Optional[int], Optional[Dict]]:
         """
@@ -126,6 +129,49 @@ class DateRangeFilterMixin:
             return None, None, error
         
         return start_date, end_date, None
+    
+    @staticmethod
+    def date_range_lookup(
+        date_field: str,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> Dict[str, Any]:
+        """
+        Build ``[start, end)`` filter kwargs for a datetime field
+        
+        Use instead of ``__date__gte``/``__date__lte``, which cast the column
+        and stop the database from using its index.
+        
+        Args:
+            date_field: Datetime field path (may span relations)
+            start_date: First day of the range, or None
+            end_date: Last day of the range (inclusive), or None
+            
+        Returns:
+            Dictionary of lookups for ``filter()`` or ``Q()``
+        """
+        return date_range_lookup(date_field, start_date, end_date)
+    
+    def filter_date_range(
+        self,
+        queryset: QuerySet,
+        date_field: str,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> QuerySet:
+        """
+        Filter queryset to rows whose datetime field falls on the given days
+        
+        Args:
+            queryset: Django queryset
+            date_field: Datetime field path
+            start_date: First day of the range, or None
+            end_date: Last day of the range (inclusive), or None
+            
+        Returns:
+            Filtered queryset
+        """
+        return queryset.filter(**date_range_lookup(date_field, start_date, end_date))
 
 
 class PaginationMixin:
@@ -199,9 +245,18 @@ class BaseReportView(APIView, BusinessFilterMixin, DateRangeFilterMixin, Paginat
     - Pagination
     - Standard response formatting
     - Subscription enforcement (requires active subscription with grace period for read-only)
+    - Rendered-report caching (see reports.services.report_cache); set
+      ``report_cache_timeout`` to override REPORT_CACHE_TIMEOUT, 0 disables
     """
     
     permission_classes = [IsAuthenticated, RequiresSubscriptionForReports]
+    report_cache_timeout: Optional[int] = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        handler = cls.__dict__.get('get')
+        if handler is not None and not getattr(handler, 'report_cached', False):
+            cls.get = cached_report(handler)
     
     def build_summary(self, queryset: QuerySet, **kwargs) -> Dict[str, Any]:
         """
@@ -483,12 +538,7 @@ class BaseReportBuilder:
         Returns:
             Filtered queryset
         """
-        return queryset.filter(
-            **{
-                f'{date_field}__date__gte': self.start_date,
-                f'{date_field}__date__lte': self.end_date,
-            }
-        )
+        return queryset.filter(**date_range_lookup(date_field, self.start_date, self.end_date))
     
     def filter_by_business(self, queryset: QuerySet) -> QuerySet:
         """
@@ -0,0 +1,228 @@
+"""
+Rendered-report cache for BaseReportView.
+
+Every ``BaseReportView`` subclass's ``get`` is wrapped by ``cached_report``
+(see ``BaseReportView.__init_subclass__``), so successful JSON responses are
+stored in Django's cache under
+
+    reports:<view>:<business_id>:<data version>:<movement generation>:<request hash>
+
+- The request hash covers the view's resolved ``parse_filters`` result
+  (business and date range, with defaults applied), today's date, and every
+  other query parameter, sorted, with empty values and cache-busters
+  dropped. Requests that name storefronts are also keyed by user, because
+  storefront access is checked per user.
+- The data version is bumped by the receivers in ``reports.signals`` whenever
+  a business's sales, payments, customers, products, stock or settings
+  change. The movement generation (``inventory.movement_ledger``) covers
+  StockMovement rows, which are bulk-inserted without signals.
+- Concurrent identical requests are collapsed: the first takes a short lock
+  in the cache and computes; the others wait briefly
+  (``REPORT_CACHE_COMPUTE_WAIT``) for its result instead of running the same
+  queries, then compute themselves, so a slow report never holds a pool of
+  request workers asleep.
+
+Exports (``export_format``) and error responses are never cached. Views set
+``report_cache_timeout`` to override ``REPORT_CACHE_TIMEOUT`` (0 disables).
+"""
+
+import hashlib
+import json
+import time
+import uuid
+from functools import wraps
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import status as http_status
+from rest_framework.response import Response
+
+from inventory.movement_ledger import movement_generation
+
+# Query parameters that never change the rendered result
+IGNORED_PARAMS = {'_', 'refresh'}
+
+# Query parameters that produce file downloads rather than cacheable JSON
+EXPORT_PARAMS = ('export_format', 'format')
+
+# Query parameters that are checked against the requesting user's storefront access
+STOREFRONT_PARAMS = ('storefront_id', 'storefront_ids', 'storefront')
+
+POLL_INTERVAL = 0.1
+
+_ACTIVE_ATTR = '_report_cache_active'
+
+
+def _timeout(view) -> int:
+    timeout = getattr(view, 'report_cache_timeout', None)
+    if timeout is None:
+        timeout = getattr(settings, 'REPORT_CACHE_TIMEOUT', 300)
+    return timeout
+
+
+def _compute_wait() -> float:
+    return getattr(settings, 'REPORT_CACHE_COMPUTE_WAIT', 2)
+
+
+def _lock_timeout() -> int:
+    return getattr(settings, 'REPORT_CACHE_LOCK_TIMEOUT', 30)
+
+
+def _release_lock(lock_key: str, token: str) -> None:
+    # After the lock expires another request may hold it; leave that one alone
+    if cache.get(lock_key) == token:
+        cache.delete(lock_key)
+
+
+def _version_key(business_id) -> str:
+    return f'reports:business:{business_id}:version'
+
+
+def report_data_version(business_id) -> int:
+    """Current report data version for a business, initialised on first use."""
+    key = _version_key(business_id)
+    version = cache.get(key)
+    if version is None:
+        # Time-based so an evicted counter never restarts at a value that
+        # older cached reports were stored under
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def _bump(business_ids) -> None:
+    for business_id in business_ids:
+        key = _version_key(business_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), None)
+
+
+def bump_report_data_version(business_ids: Iterable) -> None:
+    """Invalidate cached reports for the given businesses."""
+    business_ids = {business_id for business_id in business_ids if business_id}
+    if not business_ids:
+        return
+    # Bump now for this connection's readers and again after commit, so a
+    # report computed by another request before the commit is not kept
+    _bump(business_ids)
+    transaction.on_commit(lambda: _bump(business_ids))
+
+
+def _normalized_params(query_params) -> Dict[str, Any]:
+    params = {}
+    for name in query_params.keys():
+        if name in IGNORED_PARAMS:
+            continue
+        values = sorted(value.strip() for value in query_params.getlist(name) if value.strip())
+        if values:
+            params[name] = values if len(values) > 1 else values[0]
+    return params
+
+
+def report_cache_key(view, request, filters: Dict[str, Any]) -> str:
+    """Cache key for one report request, given the view's parsed filters."""
+    business_id = filters['business_id']
+    resolved = {
+        key: value for key, value in filters.items()
+        if key != 'error_response' and value is not None
+    }
+    # Dates parse_filters resolved are keyed by value, not by how they were spelled
+    params = {
+        name: value for name, value in _normalized_params(request.query_params).items()
+        if name not in resolved
+    }
+    identity = {
+        'filters': resolved,
+        'params': params,
+        # Views default their date range relative to today
+        'today': timezone.localdate(),
+    }
+    if any(name in params for name in STOREFRONT_PARAMS):
+        identity['user'] = request.user.pk
+
+    payload = json.dumps(identity, sort_keys=True, default=str)
+    digest = hashlib.sha1(payload.encode('utf-8')).hexdigest()
+    view_name = f'{type(view).__module__}.{type(view).__qualname__}'
+    return (
+        f'reports:{view_name}:{business_id}:'
+        f'{report_data_version(business_id)}:{movement_generation(business_id)}:{digest}'
+    )
+
+
+def _cacheable(response) -> bool:
+    return (
+        isinstance(response, Response)
+        and response.status_code == http_status.HTTP_200_OK
+        and isinstance(response.data, dict)
+    )
+
+
+def get_or_compute_response(key: str, timeout: int, compute: Callable[[], Any]):
+    """
+    Return the cached report for ``key``, computing it at most once at a time.
+
+    The first request for a missing key takes ``<key>:lock`` (held for at most
+    ``REPORT_CACHE_LOCK_TIMEOUT`` seconds) and computes; identical requests
+    arriving meanwhile poll for its result for up to
+    ``REPORT_CACHE_COMPUTE_WAIT`` seconds and then compute themselves, as they
+    do as soon as the holder gives up (error, uncacheable response).
+    """
+    data = cache.get(key)
+    if data is not None:
+        return Response(data)
+
+    lock_key = f'{key}:lock'
+    token = uuid.uuid4().hex
+    if not cache.add(lock_key, token, max(1, int(_lock_timeout()))):
+        deadline = time.monotonic() + _compute_wait()
+        while time.monotonic() < deadline:
+            time.sleep(POLL_INTERVAL)
+            data = cache.get(key)
+            if data is not None:
+                return Response(data)
+            if cache.get(lock_key) is None:
+                break
+        return compute()
+
+    try:
+        response = compute()
+        if _cacheable(response):
+            cache.set(key, response.data, timeout)
+        return response
+    finally:
+        _release_lock(lock_key, token)
+
+
+def cached_report(handler: Callable) -> Callable:
+    """Wrap a BaseReportView ``get`` so its JSON responses go through the report cache."""
+
+    @wraps(handler)
+    def wrapper(view, request, *args, **kwargs):
+        # Nested calls (a subclass ``get`` calling ``super().get``) run uncached
+        if getattr(request, _ACTIVE_ATTR, False):
+            return handler(view, request, *args, **kwargs)
+
+        timeout = _timeout(view)
+        if not timeout or any(request.query_params.get(name) for name in EXPORT_PARAMS):
+            return handler(view, request, *args, **kwargs)
+
+        filters: Optional[Dict[str, Any]] = view.parse_filters(request)
+        if 'error_response' in filters:
+            return handler(view, request, *args, **kwargs)
+
+        def compute():
+            setattr(request, _ACTIVE_ATTR, True)
+            try:
+                return handler(view, request, *args, **kwargs)
+            finally:
+                setattr(request, _ACTIVE_ATTR, False)
+
+        return get_or_compute_response(report_cache_key(view, request, filters), timeout, compute)
+
+    wrapper.report_cached = True
+    return wrapper
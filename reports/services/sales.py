@@ -4,11 +4,12 @@ Sales data export service
 from __future__ import annotations
 
 from decimal import Decimal
-from typing import Dict, Any
-from django.db.models import Sum, Q, QuerySet
+from typing import Dict, Any, Iterator, Tuple
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Sum, Q, QuerySet
 from django.utils import timezone
 
 from sales.models import Sale, SaleItem
+from reports.utils.profit_calculator import ProfitCalculator
 from .base import BaseDataExporter
 
 
@@ -75,43 +76,78 @@ class SalesExporter(BaseDataExporter):
         if filters is None:
             filters = {}
         
-        # Summary calculations
-        summary = {
-            'total_sales': queryset.count(),
-            'total_revenue': queryset.aggregate(
-                total=Sum('total_amount')
-            )['total'] or Decimal('0.00'),
-            'total_tax': queryset.aggregate(
-                total=Sum('tax_amount')
-            )['total'] or Decimal('0.00'),
-            'total_discounts': queryset.aggregate(
-                total=Sum('discount_amount')
-            )['total'] or Decimal('0.00'),
-            'amount_paid': queryset.aggregate(
-                total=Sum('amount_paid')
-            )['total'] or Decimal('0.00'),
-            'amount_refunded': queryset.aggregate(
-                total=Sum('amount_refunded')
-            )['total'] or Decimal('0.00'),
-            'outstanding_balance': queryset.aggregate(
-                total=Sum('amount_due')
-            )['total'] or Decimal('0.00'),
+        summary = self.build_summary(queryset)
+        
+        # Detail rows (sales with line items)
+        sales_data = []
+        for sale in queryset:
+            sale_row = self._sale_row(sale)
+            sale_row['items'] = [
+                self._item_row(item)
+                for item in sale.sale_items.select_related('product', 'product__category', 'stock_product').all()
+            ]
+            sales_data.append(sale_row)
+        
+        return {
+            'summary': summary,
+            'sales': sales_data,
+            'generated_at': timezone.now(),
+            'filters_applied': self._format_filters(filters_data=queryset.query.where if hasattr(queryset, 'query') else {}),
         }
+    
+    def stream_data(self, filters: Dict[str, Any], chunk_size: int = 2000) -> Dict[str, Any]:
+        """
+        Export payload whose detail rows are produced lazily.
         
-        # Calculate COGS and profit from line items
-        # Note: These are calculated properties, so we need to iterate
-        total_cogs = Decimal('0.00')
-        total_profit = Decimal('0.00')
+        ``sales`` and ``line_items`` are generators over ``iterator(chunk_size=...)``
+        querysets (server-side cursors on PostgreSQL), so exporters can write the
+        file while rows are fetched instead of holding every sale in memory.
+        Line items are yielded as ``(receipt_number, item_row)`` pairs.
+        """
+        queryset = self.build_queryset(filters)
+        return {
+            'summary': self.build_summary(queryset, chunk_size=chunk_size),
+            'sales': self.iter_sale_rows(queryset, chunk_size=chunk_size),
+            'line_items': self.iter_item_rows(queryset, chunk_size=chunk_size),
+            'generated_at': timezone.now(),
+        }
+    
+    def iter_sale_rows(self, queryset: QuerySet, chunk_size: int = 2000) -> Iterator[Dict[str, Any]]:
+        """Yield one detail row per sale without prefetching line items"""
+        for sale in queryset.prefetch_related(None).iterator(chunk_size=chunk_size):
+            yield self._sale_row(sale)
+    
+    def iter_item_rows(self, queryset: QuerySet, chunk_size: int = 2000) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield ``(receipt_number, item_row)`` for every line item, grouped by sale"""
+        for item in self._line_items(queryset).select_related(
+            'sale', 'product', 'product__category', 'stock_product'
+        ).iterator(chunk_size=chunk_size):
+            yield self._receipt_number(item.sale), self._item_row(item)
+    
+    def build_summary(self, queryset: QuerySet, chunk_size: int = 2000) -> Dict[str, Any]:
+        """Summary metrics for the sales in ``queryset``"""
+        totals = queryset.aggregate(
+            total_sales=Count('id'),
+            total_revenue=Sum('total_amount'),
+            total_tax=Sum('tax_amount'),
+            total_discounts=Sum('discount_amount'),
+            amount_paid=Sum('amount_paid'),
+            amount_refunded=Sum('amount_refunded'),
+            outstanding_balance=Sum('amount_due'),
+        )
+        summary = {
+            key: (value if value is not None else Decimal('0.00'))
+            for key, value in totals.items()
+        }
         
-        for sale in queryset:
-            for item in sale.sale_items.select_related('product', 'stock_product').all():
-                unit_cost = item.unit_cost
-                quantity = item.quantity
-                cogs = unit_cost * quantity
-                profit = item.total_profit_amount
-                
-                total_cogs += cogs
-                total_profit += profit
+        line_totals = self._line_items(queryset).order_by().aggregate(
+            total_cogs=Sum(ProfitCalculator.line_cost()),
+            line_revenue=Sum(
+                ExpressionWrapper(F('unit_price') * F('quantity'), output_field=DecimalField(max_digits=14, decimal_places=2))
+            ),
+        )
+        total_cogs = line_totals['total_cogs'] or Decimal('0.00')
+        total_profit = (line_totals['line_revenue'] or Decimal('0.00')) - total_cogs
         
         summary['total_cogs'] = total_cogs
         summary['total_profit'] = total_profit
@@ -130,61 +166,59 @@ class SalesExporter(BaseDataExporter):
             summary['total_tax'] - 
             summary['total_discounts']
         )
-        
-        # Detail rows (sales with line items)
-        sales_data = []
-        for sale in queryset:
-            sale_row = {
-                'receipt_number': sale.receipt_number or str(sale.id)[:8],
-                'date': sale.created_at.strftime('%Y-%m-%d'),
-                'time': sale.created_at.strftime('%H:%M:%S'),
-                'storefront': sale.storefront.name if sale.storefront else '',
-                'cashier': sale.user.name if (sale.user and hasattr(sale.user, 'name')) else (sale.user.email if sale.user else ''),
-                'customer_name': sale.customer.name if sale.customer else 'Walk-in',
-                'customer_type': sale.customer.customer_type if sale.customer else 'RETAIL',
-                'sale_type': sale.type,
-                'status': sale.status,
-                'subtotal': str(sale.subtotal),
-                'discount': str(sale.discount_amount),
-                'tax': str(sale.tax_amount),
-                'total': str(sale.total_amount),
-                'amount_paid': str(sale.amount_paid),
-                'amount_refunded': str(sale.amount_refunded),
-                'amount_due': str(sale.amount_due),
-                'payment_type': sale.payment_type,
-                'notes': sale.notes or '',
-            }
-            
-            # Line items for this sale
-            items = []
-            for item in sale.sale_items.select_related('product', 'product__category', 'stock_product').all():
-                unit_cost = item.unit_cost
-                total_cost = unit_cost * item.quantity
-                profit = item.total_profit_amount
-                margin_percent = 0.0
-                if item.total_price > 0:
-                    margin_percent = float((profit / item.total_price) * 100)
-                
-                items.append({
-                    'product_name': item.product.name,
-                    'sku': item.product.sku,
-                    'category': item.product.category.name if item.product.category else '',
-                    'quantity': str(item.quantity),
-                    'unit_price': str(item.unit_price),
-                    'total_price': str(item.total_price),
-                    'cogs': str(total_cost.quantize(Decimal('0.01'))),
-                    'profit': str(profit.quantize(Decimal('0.01'))),
-                    'margin_percent': f'{margin_percent:.2f}',
-                })
-            
-            sale_row['items'] = items
-            sales_data.append(sale_row)
+        return summary
+    
+    @staticmethod
+    def _line_items(queryset: QuerySet) -> QuerySet:
+        return SaleItem.objects.filter(
+            sale_id__in=queryset.order_by().values('id')
+        ).order_by('-sale__created_at', 'sale_id', 'created_at')
+    
+    @staticmethod
+    def _receipt_number(sale) -> str:
+        return sale.receipt_number or str(sale.id)[:8]
+    
+    def _sale_row(self, sale) -> Dict[str, Any]:
+        return {
+            'receipt_number': self._receipt_number(sale),
+            'date': sale.created_at.strftime('%Y-%m-%d'),
+            'time': sale.created_at.strftime('%H:%M:%S'),
+            'storefront': sale.storefront.name if sale.storefront else '',
+            'cashier': sale.user.name if (sale.user and hasattr(sale.user, 'name')) else (sale.user.email if sale.user else ''),
+            'customer_name': sale.customer.name if sale.customer else 'Walk-in',
+            'customer_type': sale.customer.customer_type if sale.customer else 'RETAIL',
+            'sale_type': sale.type,
+            'status': sale.status,
+            'subtotal': str(sale.subtotal),
+            'discount': str(sale.discount_amount),
+            'tax': str(sale.tax_amount),
+            'total': str(sale.total_amount),
+            'amount_paid': str(sale.amount_paid),
+            'amount_refunded': str(sale.amount_refunded),
+            'amount_due': str(sale.amount_due),
+            'payment_type': sale.payment_type,
+            'notes': sale.notes or '',
+        }
+    
+    @staticmethod
+    def _item_row(item) -> Dict[str, Any]:
+        unit_cost = item.effective_unit_cost
+        total_cost = item.total_cost if item.total_cost is not None else unit_cost * item.quantity
+        profit = item.total_profit_amount
+        margin_percent = 0.0
+        if item.total_price > 0:
+            margin_percent = float((profit / item.total_price) * 100)
         
         return {
-            'summary': summary,
-            'sales': sales_data,
-            'generated_at': timezone.now(),
-            'filters_applied': self._format_filters(filters_data=queryset.query.where if hasattr(queryset, 'query') else {}),
+            'product_name': item.product.name,
+            'sku': item.product.sku,
+            'category': item.product.category.name if item.product.category else '',
+            'quantity': str(item.quantity),
+            'unit_price': str(item.unit_price),
+            'total_price': str(item.total_price),
+            'cogs': str(total_cost.quantize(Decimal('0.01'))),
+            'profit': str(profit.quantize(Decimal('0.01'))),
+            'margin_percent': f'{margin_percent:.2f}',
         }
     
     def _format_filters(self, filters_data) -> Dict[str, str]:
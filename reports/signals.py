@@ -0,0 +1,69 @@
+"""
+Signal handlers for the reports app.
+
+Bump a business's report data version (``reports.services.report_cache``)
+whenever data its reports read is saved or deleted, so cached reports for
+that business stop being served.
+"""
+
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models.signals import post_delete, post_save
+
+from reports.services.report_cache import bump_report_data_version
+
+# Models reports read from, with the attribute path from an instance to its business id
+REPORT_SOURCES = {
+    'sales.Sale': 'business_id',
+    'sales.SaleItem': 'sale.business_id',
+    'sales.Payment': 'customer.business_id',
+    'sales.Refund': 'sale.business_id',
+    'sales.Customer': 'business_id',
+    'sales.CreditTransaction': 'customer.business_id',
+    'sales.AccountsReceivable': 'customer.business_id',
+    'sales.ARPayment': 'accounts_receivable.customer.business_id',
+    'inventory.Product': 'business_id',
+    'inventory.StockProduct': 'product.business_id',
+    'inventory.StoreFrontInventory': 'storefront.business_link.business_id',
+    'inventory.StockAdjustment': 'business_id',
+    'inventory.Transfer': 'business_id',
+    'inventory.TransferRequest': 'business_id',
+    'settings.BusinessSettings': 'business_id',
+}
+
+
+def _business_id(instance, path: str):
+    value = instance
+    for attr in path.split('.'):
+        try:
+            value = getattr(value, attr)
+        except ObjectDoesNotExist:
+            return None
+        if value is None:
+            return None
+    return value
+
+
+def _is_cart(instance) -> bool:
+    """Carts change on every scan and never appear in reports."""
+    opts = instance._meta
+    if opts.label == 'sales.Sale':
+        return instance.status == 'DRAFT'
+    if opts.label == 'sales.SaleItem':
+        sale = instance.sale
+        return sale is not None and sale.status == 'DRAFT'
+    return False
+
+
+def bump_report_version_on_change(sender, instance, **kwargs):
+    if kwargs.get('raw') or _is_cart(instance):
+        return
+    bump_report_data_version([_business_id(instance, REPORT_SOURCES[sender._meta.label])])
+
+
+def connect_report_sources():
+    # Lazy "app_label.Model" senders, like the @receiver declarations elsewhere,
+    # so models defined in modules loaded after this app are covered too
+    for label in REPORT_SOURCES:
+        uid = f'reports.data_version.{label}'
+        post_save.connect(bump_report_version_on_change, sender=label, dispatch_uid=f'{uid}.save')
+        post_delete.connect(bump_report_version_on_change, sender=label, dispatch_uid=f'{uid}.delete')
@@ -0,0 +1,144 @@
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import SimpleTestCase
+from django.utils import timezone
+
+from accounts.models import Business
+from reports.services.report_base import DateRangeFilterMixin
+from reports.tests.test_sales_storefront_filters import StorefrontSalesReportBaseCase
+from reports.utils.date_utils import date_range_lookup, datetime_range
+from sales.models import Sale
+
+
+User = get_user_model()
+
+
+class DateRangeLookupTests(SimpleTestCase):
+    def test_half_open_bounds_cover_whole_days(self):
+        start, end = datetime_range(date(2025, 3, 1), date(2025, 3, 31))
+
+        self.assertTrue(timezone.is_aware(start))
+        self.assertEqual(timezone.localtime(start).replace(tzinfo=None), datetime(2025, 3, 1))
+        self.assertEqual(timezone.localtime(end).replace(tzinfo=None), datetime(2025, 4, 1))
+
+    def test_lookup_uses_raw_column(self):
+        lookup = date_range_lookup('sale__created_at', date(2025, 3, 1), date(2025, 3, 1))
+
+        self.assertEqual(set(lookup), {'sale__created_at__gte', 'sale__created_at__lt'})
+        self.assertEqual(lookup['sale__created_at__lt'] - lookup['sale__created_at__gte'], timedelta(days=1))
+
+    def test_open_ended_ranges(self):
+        self.assertEqual(list(date_range_lookup('created_at', start_date=date(2025, 3, 1))), ['created_at__gte'])
+        self.assertEqual(list(date_range_lookup('created_at', end_date=date(2025, 3, 1))), ['created_at__lt'])
+        self.assertEqual(date_range_lookup('created_at'), {})
+
+
+class DateRangeFilterTests(StorefrontSalesReportBaseCase):
+    def setUp(self):
+        super().setUp()
+        self.sale = self._create_completed_sale(
+            storefront=self.primary_storefront,
+            product=self.product_alpha,
+            quantity=Decimal("1"),
+            unit_price=Decimal("100.00"),
+        )
+        self.day = date(2025, 3, 10)
+
+    def _move_sale_to(self, moment):
+        Sale.objects.filter(pk=self.sale.pk).update(created_at=moment)
+
+    def _matches(self, start_date, end_date):
+        queryset = DateRangeFilterMixin().filter_date_range(
+            Sale.objects.filter(pk=self.sale.pk), 'created_at', start_date, end_date
+        )
+        return queryset.exists()
+
+    def test_matches_date_lookup_at_day_edges(self):
+        tz = timezone.get_current_timezone()
+        first_moment = timezone.make_aware(datetime.combine(self.day, time.min), tz)
+        last_moment = timezone.make_aware(datetime.combine(self.day, time.max), tz)
+
+        for moment in (first_moment, last_moment):
+            self._move_sale_to(moment)
+            self.assertTrue(self._matches(self.day, self.day))
+            self.assertEqual(
+                self._matches(self.day, self.day),
+                Sale.objects.filter(pk=self.sale.pk, created_at__date=self.day).exists(),
+            )
+
+        self._move_sale_to(last_moment + timedelta(microseconds=1))
+        self.assertFalse(self._matches(self.day, self.day))
+        self.assertTrue(self._matches(self.day, self.day + timedelta(days=1)))
+
+
+@skipUnless(connection.vendor == 'postgresql', 'EXPLAIN plans are PostgreSQL specific')
+class DateRangeIndexUsageTests(StorefrontSalesReportBaseCase):
+    INDEX_NAME = 'sales_busines_cfe85d_idx'  # (business, status, created_at)
+    STATUSES = ['COMPLETED', 'PENDING', 'CANCELLED', 'REFUNDED', 'DRAFT']
+
+    def _seed_sales(self, per_business=2000):
+        """Spread sales over five businesses, five statuses and three years, then ANALYZE."""
+        businesses = [self.business] + [
+            Business.objects.create(
+                owner=User.objects.create_user(
+                    email=f'index-owner-{index}@example.com',
+                    password='strongpass123',
+                    name=f'Index Owner {index}',
+                ),
+                name=f'Index Usage Biz {index}',
+                tin=f'TIN-INDEX-{index}',
+                email=f'index-usage-{index}@example.com',
+                address='1 Planner Road',
+            )
+            for index in range(4)
+        ]
+        Sale.objects.bulk_create(
+            [
+                Sale(
+                    business=business,
+                    storefront=self.primary_storefront,
+                    user=self.user,
+                    status=self.STATUSES[index % len(self.STATUSES)],
+                )
+                for business in businesses
+                for index in range(per_business)
+            ],
+            batch_size=1000,
+        )
+        with connection.cursor() as cursor:
+            # created_at is auto_now_add, so spread it after the insert
+            cursor.execute(
+                "UPDATE sales SET created_at = TIMESTAMPTZ '2023-01-01 00:00:00+00' "
+                "+ (abs(hashtext(id::text)) % 1095) * INTERVAL '1 day'"
+            )
+            cursor.execute('ANALYZE sales')
+
+    def test_report_range_query_uses_business_created_at_index(self):
+        self._seed_sales()
+        # The base queryset of the financial revenue/profit report
+        queryset = Sale.objects.filter(
+            business_id=self.business.id,
+            status='COMPLETED',
+            **DateRangeFilterMixin.date_range_lookup('created_at', date(2025, 3, 1), date(2025, 3, 31)),
+        )
+
+        plan = queryset.explain()
+
+        self.assertIn(self.INDEX_NAME, plan)
+        index_conditions = ' '.join(line for line in plan.splitlines() if 'Index Cond:' in line)
+        self.assertIn('created_at', index_conditions)
+
+    def test_business_status_range_compares_raw_created_at(self):
+        sql, _ = Sale.objects.filter(
+            business_id=self.business.id,
+            status=Sale.STATUS_COMPLETED,
+            **date_range_lookup('created_at', date(2025, 3, 1), date(2025, 3, 31)),
+        ).query.sql_with_params()
+
+        self.assertIn('"sales"."created_at" >= %s', sql)
+        self.assertIn('"sales"."created_at" < %s', sql)
+        self.assertNotIn('::date', sql)
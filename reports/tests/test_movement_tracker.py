@@ -9,7 +9,9 @@ Note: Legacy TRANSFER_IN/TRANSFER_OUT StockAdjustment tests are deprecated.
 
 from decimal import Decimal
 from datetime import datetime, timedelta
-from django.test import TestCase
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase, override_settings
 from unittest import skip
 from django.contrib.auth import get_user_model
 from django.utils import timezone
@@ -27,14 +29,21 @@ from inventory.models import (
 from inventory.stock_adjustments import StockAdjustment
 from inventory.transfer_models import Transfer, TransferItem
 from sales.models import Sale, SaleItem
-from reports.services import MovementTracker
+from reports.services import InvalidMovementCursor, MovementTracker
 
 
 User = get_user_model()
 
 
+@override_settings(STOCK_MOVEMENT_SOURCE=MovementTracker.SOURCE_LEDGER)
 class MovementTrackerTestCase(TestCase):
-    """Test cases for MovementTracker service."""
+    """
+    Test cases for MovementTracker service, reading from the ledger.
+
+    These build source rows directly (backdated adjustments, sales saved
+    without checkout), so ``_sync_ledger`` records them the way the deploy
+    backfill does. MovementTrackerUnionTestCase reruns them in union mode.
+    """
     
     def setUp(self):
         """Set up test data."""
@@ -104,6 +113,11 @@ class MovementTrackerTestCase(TestCase):
             unit_cost=Decimal('10.00')
         )
     
+    def _sync_ledger(self):
+        """Record source rows written directly in the ledger, as backfill_stock_movements does on deploy."""
+        if MovementTracker.resolve_source() == MovementTracker.SOURCE_LEDGER:
+            call_command('backfill_stock_movements', stdout=StringIO())
+
     @skip("DEPRECATED: Legacy TRANSFER_IN/TRANSFER_OUT excluded from MovementTracker after migration")
     def test_get_movements_with_legacy_adjustments(self):
         """
@@ -339,6 +353,9 @@ class MovementTrackerTestCase(TestCase):
         )
         adj2.created_at = now - timedelta(hours=1)
         adj2.save()
+        # Complete them once backdated, without re-saving
+        StockAdjustment.objects.filter(pk__in=[adj1.pk, adj2.pk]).update(status='COMPLETED')
+        self._sync_ledger()
         
         # Get movements
         movements = MovementTracker.get_movements(
@@ -390,6 +407,51 @@ class MovementTrackerTestCase(TestCase):
         self.assertEqual(movement['warehouse_id'], str(self.warehouse_a.id))
         self.assertEqual(movement['warehouse_name'], self.warehouse_a.name)
 
+    def test_cursor_pages_walk_all_movements_once(self):
+        """Keyset pages cover every movement once, including same-timestamp ties."""
+        shared_time = timezone.now() - timedelta(hours=2)
+        for quantity in (-1, -2, -3, -4):
+            adjustment = StockAdjustment.objects.create(
+                stock_product=self.stock_product_a,
+                adjustment_type='DAMAGE',
+                quantity=quantity,
+                unit_cost=Decimal('10.00'),
+                created_by=self.user,
+                business=self.business,
+            )
+            StockAdjustment.objects.filter(pk=adjustment.pk).update(created_at=shared_time, status='COMPLETED')
+        self._sync_ledger()
+
+        expected = [m['id'] for m in MovementTracker.get_movements(business_id=str(self.business.id))]
+
+        seen = []
+        cursor = None
+        while True:
+            page = MovementTracker.get_movement_page(
+                business_id=str(self.business.id),
+                limit=3,
+                cursor=cursor,
+            )
+            seen.extend(m['id'] for m in page['results'])
+            if not page['has_more']:
+                break
+            cursor = page['next_cursor']
+
+        self.assertEqual(len(expected), 4)
+        self.assertEqual(seen, expected)
+        self.assertEqual(len(seen), len(set(seen)))
+
+    def test_cursor_rejects_tampering_and_other_sorts(self):
+        """Cursors are bound to their sort order and reject malformed tokens."""
+        cursor = MovementTracker.encode_cursor({'id': 'abc', 'date': timezone.now()}, 'date_desc')
+
+        with self.assertRaises(InvalidMovementCursor):
+            MovementTracker.decode_cursor(cursor, 'date_asc')
+        with self.assertRaises(InvalidMovementCursor):
+            MovementTracker.decode_cursor('not-a-cursor', 'date_desc')
+        with self.assertRaises(InvalidMovementCursor):
+            MovementTracker.get_movement_page(business_id=str(self.business.id), sort='quantity', limit=10)
+
     def test_movements_include_new_transfer_identifiers(self):
         """Ensure new transfer records expose transfer IDs and warehouse UUIDs."""
         transfer = Transfer.objects.create(
@@ -410,6 +472,7 @@ class MovementTrackerTestCase(TestCase):
             quantity=5,
             unit_cost=Decimal('11.25'),
         )
+        self._sync_ledger()
 
         movements = MovementTracker.get_movements(
             business_id=str(self.business.id)
@@ -470,6 +533,7 @@ class MovementTrackerTestCase(TestCase):
             'completed_at',
             'updated_at',
         ])
+        self._sync_ledger()
 
         movements = MovementTracker.get_movements(
             business_id=str(self.business.id)
@@ -484,3 +548,8 @@ class MovementTrackerTestCase(TestCase):
         self.assertEqual(sale_row['source_location_id'], str(storefront.id))
         self.assertEqual(sale_row['warehouse_id'], str(storefront.id))
         self.assertEqual(sale_row['warehouse_name'], storefront.name)
+
+
+@override_settings(STOCK_MOVEMENT_SOURCE=MovementTracker.SOURCE_UNION)
+class MovementTrackerUnionTestCase(MovementTrackerTestCase):
+    """The same scenarios against the legacy runtime union (the default until backfilled)."""
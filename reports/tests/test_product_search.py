@@ -0,0 +1,63 @@
+from django.urls import reverse
+
+from inventory.models import Product, StockProduct
+from inventory.search import CATALOG_SEARCH_FIELDS, ProductSearch, annotate_current_stock, supports_trigram
+from reports.tests.test_sales_storefront_filters import StorefrontSalesReportBaseCase
+
+
+class ProductSearchTests(StorefrontSalesReportBaseCase):
+    def setUp(self):
+        super().setUp()
+        self.product_gamma = Product.objects.create(
+            business=self.business,
+            name="Receipt Printer",
+            sku="pos",
+            barcode="6001234500012",
+            description="Thermal printer for the POS counter",
+            category=self.category,
+        )
+
+    def test_ranked_search_returns_stock_in_one_query(self):
+        search = ProductSearch("pos")
+        supports_trigram()  # The pg_trgm check is once per process, not per search
+        with self.assertNumQueries(1):
+            products = list(
+                annotate_current_stock(search.rank(Product.objects.filter(business=self.business)))
+            )
+
+        # Name prefix (7+3) plus SKU prefix (5) outranks an exact SKU (8+5),
+        # which outranks a SKU-only prefix match
+        self.assertEqual(
+            [product.name for product in products],
+            ["POS Bundle", "Receipt Printer", "Barcode Suite"],
+        )
+        self.assertEqual([product.relevance for product in products], [15, 13, 5])
+        self.assertEqual([product.current_stock for product in products], [100, 0, 100])
+
+    def test_catalog_fields_and_related_prefix(self):
+        by_barcode = ProductSearch("0012345", fields=CATALOG_SEARCH_FIELDS)
+        self.assertEqual(list(by_barcode.filter(Product.objects.all())), [self.product_gamma])
+
+        by_sku = ProductSearch("pos-be", fields=CATALOG_SEARCH_FIELDS, prefix="product__")
+        self.assertEqual(
+            list(by_sku.filter(StockProduct.objects.all()).values_list("product__name", flat=True)),
+            ["Barcode Suite"],
+        )
+        self.assertEqual(ProductSearch("  ").filter(Product.objects.all()).count(), 3)
+
+    def test_search_endpoint_reports_current_stock(self):
+        response = self.client.get(reverse("product-search"), {"q": "barcode"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data["data"],
+            [
+                {
+                    "id": str(self.product_beta.id),
+                    "name": "Barcode Suite",
+                    "sku": "POS-BETA",
+                    "category": "Point of Sale",
+                    "current_stock": 100.0,
+                }
+            ],
+        )
@@ -0,0 +1,105 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework.response import Response
+
+from reports.services import report_cache
+from reports.tests.test_sales_storefront_filters import StorefrontSalesReportBaseCase
+from sales.models import Sale
+
+
+class ReportCacheViewTest(StorefrontSalesReportBaseCase):
+    def _params(self):
+        return {'start_date': self.today.isoformat(), 'end_date': self.today.isoformat()}
+
+    def test_identical_requests_are_served_from_cache_until_data_changes(self):
+        sale = self._create_completed_sale(
+            storefront=self.primary_storefront,
+            product=self.product_alpha,
+            quantity=Decimal("1"),
+            unit_price=Decimal("100.00"),
+        )
+        url = reverse('sales-summary-report')
+
+        first = self.client.get(url, self._params())
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.data['data']['summary']['total_transactions'], 1)
+
+        # A queryset update sends no signals, so the cached report is still served
+        Sale.objects.filter(pk=sale.pk).update(status='CANCELLED')
+        cached = self.client.get(url, self._params())
+        self.assertEqual(cached.data, first.data)
+
+        second = self._create_completed_sale(
+            storefront=self.primary_storefront,
+            product=self.product_beta,
+            quantity=Decimal("1"),
+            unit_price=Decimal("50.00"),
+        )
+        fresh = self.client.get(url, self._params())
+        self.assertEqual(fresh.data['data']['summary']['total_transactions'], 1)
+        self.assertAlmostEqual(fresh.data['data']['summary']['total_sales'], float(second.total_amount), places=2)
+
+    def test_equivalent_requests_share_an_entry(self):
+        url = reverse('sales-summary-report')
+        with mock.patch.object(report_cache, 'get_or_compute_response', wraps=report_cache.get_or_compute_response) as spy:
+            self.client.get(url, {'sale_type': 'RETAIL', 'period_type': 'daily'})
+            self.client.get(url, {'period_type': 'daily', 'sale_type': 'RETAIL', 'storefront_id': '', '_': '123'})
+
+        keys = [call.args[0] for call in spy.call_args_list]
+        self.assertEqual(len(keys), 2)
+        self.assertEqual(keys[0], keys[1])
+
+
+@override_settings(REPORT_CACHE_COMPUTE_WAIT=5)
+class SingleFlightTest(SimpleTestCase):
+    key = 'reports:test:single-flight'
+
+    def tearDown(self):
+        cache.delete_many([self.key, f'{self.key}:lock'])
+
+    def test_waiting_request_reuses_result_of_lock_holder(self):
+        cache.add(f'{self.key}:lock', 1, 5)
+
+        def finish_other_worker(_seconds):
+            cache.set(self.key, {'success': True, 'data': {'value': 1}}, 60)
+
+        compute = mock.Mock(return_value=Response({'success': True}))
+        with mock.patch.object(report_cache.time, 'sleep', side_effect=finish_other_worker):
+            response = report_cache.get_or_compute_response(self.key, 60, compute)
+
+        compute.assert_not_called()
+        self.assertEqual(response.data['data']['value'], 1)
+
+    def test_lock_holder_stores_result_and_releases_lock(self):
+        response = report_cache.get_or_compute_response(
+            self.key, 60, lambda: Response({'success': True, 'data': {}})
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(cache.get(self.key), {'success': True, 'data': {}})
+        self.assertIsNone(cache.get(f'{self.key}:lock'))
+
+    @override_settings(REPORT_CACHE_COMPUTE_WAIT=0)
+    def test_waiting_request_computes_itself_after_the_wait(self):
+        cache.add(f'{self.key}:lock', 'other-worker', 5)
+
+        compute = mock.Mock(return_value=Response({'success': True}))
+        response = report_cache.get_or_compute_response(self.key, 60, compute)
+
+        compute.assert_called_once()
+        self.assertEqual(response.data, {'success': True})
+        self.assertEqual(cache.get(f'{self.key}:lock'), 'other-worker')
+
+    def test_lock_holder_leaves_a_lock_taken_after_its_own_expired(self):
+        def slow_compute():
+            # The holder's lock expired mid-compute and another request took it
+            cache.set(f'{self.key}:lock', 'other-worker', 5)
+            return Response({'success': True, 'data': {}})
+
+        report_cache.get_or_compute_response(self.key, 60, slow_compute)
+
+        self.assertEqual(cache.get(f'{self.key}:lock'), 'other-worker')
@@ -0,0 +1,54 @@
+"""Tests for the rank-based RFM quintile scoring."""
+import random
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+
+from reports.utils.rfm import assign_rfm_scores, rank_quintiles
+
+
+def legacy_quintile_score(value, sorted_values, reverse=False):
+    """Position-scan scoring the segmentation report used before rank_quintiles."""
+    n = len(sorted_values)
+    pos = sorted_values.index(value)
+    quintile = min(5, max(1, int(pos / (n / 5)) + 1))
+    return 6 - quintile if reverse else quintile
+
+
+class RankQuintilesTest(SimpleTestCase):
+    def test_matches_legacy_scan_with_ties(self):
+        rng = random.Random(42)
+        for size in (1, 2, 3, 7, 10, 37, 250):
+            recency = [rng.randint(0, 30) for _ in range(size)]
+            frequency = [rng.randint(1, 6) for _ in range(size)]
+            monetary = [float(Decimal(rng.randint(0, 500)) / 4) for _ in range(size)]
+
+            recency_sorted = sorted(recency)
+            frequency_sorted = sorted(frequency, reverse=True)
+            monetary_sorted = sorted(monetary, reverse=True)
+
+            self.assertEqual(
+                rank_quintiles(recency, invert=True),
+                [legacy_quintile_score(v, recency_sorted, reverse=True) for v in recency],
+            )
+            self.assertEqual(
+                rank_quintiles(frequency, descending=True),
+                [legacy_quintile_score(v, frequency_sorted) for v in frequency],
+            )
+            self.assertEqual(
+                rank_quintiles(monetary, descending=True),
+                [legacy_quintile_score(v, monetary_sorted) for v in monetary],
+            )
+
+    def test_empty_population(self):
+        self.assertEqual(rank_quintiles([]), [])
+
+    def test_assign_rfm_scores_sets_all_three_scores(self):
+        items = [
+            {'recency_days': 1, 'frequency': 9, 'monetary': Decimal('900.00')},
+            {'recency_days': 60, 'frequency': 1, 'monetary': Decimal('10.00')},
+        ]
+
+        assign_rfm_scores(items)
+
+        self.assertEqual([(i['r_score'], i['f_score'], i['m_score']) for i in items], [(5, 1, 1), (3, 3, 3)])
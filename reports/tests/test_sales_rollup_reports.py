@@ -0,0 +1,59 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.urls import reverse
+from django.utils import timezone
+
+from reports.tests.test_sales_storefront_filters import StorefrontSalesReportBaseCase
+from sales.models import DailySalesRollup, Sale
+from sales.rollups import rebuild_rollup_day
+
+
+class SalesRollupReportTest(StorefrontSalesReportBaseCase):
+    def setUp(self):
+        super().setUp()
+        self.yesterday = self.today - timedelta(days=1)
+        closed_sale = self._create_completed_sale(
+            storefront=self.primary_storefront,
+            product=self.product_alpha,
+            quantity=Decimal("2"),
+            unit_price=Decimal("100.00"),
+        )
+        Sale.objects.filter(pk=closed_sale.pk).update(created_at=timezone.now() - timedelta(days=1))
+        rebuild_rollup_day(self.yesterday, business_id=self.business.id)
+        self.closed_sale = closed_sale
+        self.today_sale = self._create_completed_sale(
+            storefront=self.primary_storefront,
+            product=self.product_beta,
+            quantity=Decimal("1"),
+            unit_price=Decimal("150.00"),
+        )
+
+    def _params(self):
+        return {'start_date': self.yesterday.isoformat(), 'end_date': self.today.isoformat()}
+
+    def test_summary_reads_closed_days_from_rollup_and_today_live(self):
+        # A rollup-only adjustment proves the closed day is not recomputed from sales
+        DailySalesRollup.objects.filter(date=self.yesterday).update(revenue=Decimal("500.00"))
+
+        response = self.client.get(reverse('sales-summary-report'), self._params())
+
+        self.assertEqual(response.status_code, 200)
+        summary = response.data['data']['summary']
+        self.assertAlmostEqual(summary['total_sales'], 500.0 + float(self.today_sale.total_amount), places=2)
+        self.assertEqual(summary['total_transactions'], 2)
+        breakdown = {row['period']: row for row in response.data['data']['breakdown']}
+        self.assertAlmostEqual(breakdown[str(self.yesterday)]['sales'], 500.0, places=2)
+        self.assertEqual(breakdown[str(self.today)]['transactions'], 1)
+
+    def test_revenue_trends_combines_rollup_and_live_rows(self):
+        response = self.client.get(reverse('revenue-trends-report'), self._params())
+
+        self.assertEqual(response.status_code, 200)
+        summary = response.data['data']['summary']
+        expected = self.closed_sale.total_amount + self.today_sale.total_amount
+        self.assertAlmostEqual(summary['total_revenue'], float(expected), places=2)
+        self.assertEqual(summary['total_orders'], 2)
+        trends = response.data['data']['results']['trends']
+        self.assertEqual([point['period'] for point in trends], [str(self.yesterday), str(self.today)])
+        self.assertAlmostEqual(trends[0]['payment_methods']['cash'], float(self.closed_sale.total_amount), places=2)
@@ -21,6 +21,7 @@ from inventory.models import (
 )
 from reports.utils.response import ReportError
 from reports.utils.profit_calculator import ProfitCalculator
+from sales.customer_metrics import refresh_customer_metrics
 from sales.models import Customer, Sale, SaleItem, AccountsReceivable, Payment
 
 
@@ -162,6 +163,9 @@ class StorefrontSalesReportBaseCase(APITestCase):
         sale.receipt_number = f"RCPT-{sale.id}"
         sale.completed_at = timezone.now()
         sale.save()
+        if customer:
+            # Written directly rather than via complete_sale; rebuild as the nightly task would
+            refresh_customer_metrics([customer.id])
         return sale
 
     def _create_credit_sale_with_ar(
@@ -0,0 +1,120 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import BytesIO
+from unittest import mock
+
+from django.urls import reverse
+from django.utils import timezone
+from openpyxl import load_workbook
+
+from reports.csv_exporters import CustomerCSVExporter, SalesCSVExporter
+from reports.exporters import CustomerExcelExporter, SalesExcelExporter
+from reports.services.customers import CustomerExporter
+from reports.services.sales import SalesExporter
+from reports.tests.test_sales_storefront_filters import StorefrontSalesReportBaseCase
+from sales.models import Customer, Sale
+from subscriptions.permissions import RequiresSubscriptionForExports
+
+
+class StreamingExportTest(StorefrontSalesReportBaseCase):
+    def setUp(self):
+        super().setUp()
+        self.customer = Customer.objects.create(
+            business=self.business,
+            name="Streaming Customer",
+            email="stream@example.com",
+            credit_limit=Decimal("1000.00"),
+            credit_terms_days=30,
+            created_by=self.user,
+        )
+        for product, quantity in [(self.product_alpha, "2"), (self.product_beta, "1"), (self.product_alpha, "3")]:
+            self._create_completed_sale(
+                storefront=self.primary_storefront,
+                product=product,
+                quantity=Decimal(quantity),
+                unit_price=Decimal("100.00"),
+                customer=self.customer,
+            )
+        credit = self._create_credit_sale_with_ar(
+            storefront=self.secondary_storefront,
+            product=self.product_beta,
+            quantity=Decimal("1"),
+            unit_price=Decimal("150.00"),
+            customer=self.customer,
+        )
+        # Land the credit sale in the 31-60 day aging band
+        Sale.objects.filter(pk=credit.sale_id).update(created_at=timezone.now() - timedelta(days=45))
+        self.sales_filters = {
+            'start_date': self.today - timedelta(days=60),
+            'end_date': self.today,
+        }
+
+    @staticmethod
+    def _same_timestamp(*payloads):
+        generated_at = timezone.now()
+        for payload in payloads:
+            payload['generated_at'] = generated_at
+
+    def test_sales_csv_stream_matches_in_memory_export(self):
+        exporter = SalesExporter(user=self.user)
+        in_memory = exporter.export(self.sales_filters)
+        streamed = exporter.stream_data(self.sales_filters, chunk_size=1)
+        self._same_timestamp(in_memory, streamed)
+
+        self.assertEqual(streamed['summary'], in_memory['summary'])
+        chunks = list(SalesCSVExporter().stream(streamed, flush_size=1))
+
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(b''.join(chunks), SalesCSVExporter().export(in_memory))
+
+    def test_customer_csv_stream_matches_in_memory_export(self):
+        exporter = CustomerExporter(user=self.user)
+        in_memory = exporter.export({})
+        streamed = exporter.stream_data({}, chunk_size=1)
+        self._same_timestamp(in_memory, streamed)
+
+        self.assertEqual(streamed['summary'], in_memory['summary'])
+        self.assertEqual(streamed['summary']['aging_31_60'], Decimal('150.00'))
+        self.assertEqual(
+            b''.join(CustomerCSVExporter().stream(streamed)),
+            CustomerCSVExporter().export(in_memory),
+        )
+
+    def test_write_only_workbooks_hold_the_same_rows(self):
+        sales = SalesExporter(user=self.user)
+        customers = CustomerExporter(user=self.user)
+        cases = [
+            (SalesExcelExporter(), sales.export(self.sales_filters), sales.stream_data(self.sales_filters, chunk_size=2)),
+            (CustomerExcelExporter(), customers.export({}), customers.stream_data({}, chunk_size=2)),
+        ]
+        for file_exporter, in_memory, streamed in cases:
+            self._same_timestamp(in_memory, streamed)
+            expected = load_workbook(BytesIO(file_exporter.export(in_memory)))
+            actual = load_workbook(BytesIO(b''.join(file_exporter.stream(streamed))))
+
+            self.assertEqual(actual.sheetnames, expected.sheetnames)
+            for name in expected.sheetnames:
+                self.assertEqual(
+                    list(actual[name].iter_rows(values_only=True)),
+                    list(expected[name].iter_rows(values_only=True)),
+                    name,
+                )
+
+    @mock.patch.object(RequiresSubscriptionForExports, 'has_permission', return_value=True)
+    def test_stream_flag_returns_streaming_response(self, _permission):
+        response = self.client.post(
+            reverse('sales-export'),
+            {
+                'format': 'csv',
+                'start_date': str(self.sales_filters['start_date']),
+                'end_date': str(self.today),
+                'stream': True,
+            },
+            format='json',
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        body = b''.join(response.streaming_content).decode('utf-8')
+        self.assertIn('Line Items', body)
+        self.assertEqual(body.count('POS-ALPHA'), 2)
@@ -4,7 +4,7 @@ Date Range Utilities for Reports
 Handles date validation, parsing, and preset period calculations.
 """
 
-from datetime import datetime, timedelta, date
+from datetime import datetime, time, timedelta, date
 from typing import Tuple, Optional, Dict
 from django.utils import timezone
 
@@ -101,6 +101,72 @@ class DateRangeValidator:
         return start_date, end_date
 
 
+def day_start(day: date) -> datetime:
+    """
+    Get the aware datetime at midnight opening a day
+    
+    Uses the active time zone, the same one Django converts to for
+    ``__date`` lookups, so day boundaries do not shift.
+    
+    Args:
+        day: Calendar date (datetimes are truncated to their date)
+        
+    Returns:
+        Timezone-aware datetime
+    """
+    if isinstance(day, datetime):
+        day = day.date()
+    return timezone.make_aware(datetime.combine(day, time.min), timezone.get_current_timezone())
+
+
+def datetime_range(
+    start_date: Optional[date],
+    end_date: Optional[date]
+) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """
+    Convert an inclusive date range to half-open [start, end) datetimes
+    
+    Args:
+        start_date: First day of the range, or None for no lower bound
+        end_date: Last day of the range (inclusive), or None for no upper bound
+        
+    Returns:
+        Tuple of (start_datetime, end_datetime); end is midnight after end_date
+    """
+    start = day_start(start_date) if start_date else None
+    end = day_start(end_date + timedelta(days=1)) if end_date else None
+    return start, end
+
+
+def date_range_lookup(
+    field: str,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+) -> Dict[str, datetime]:
+    """
+    Build filter kwargs selecting rows whose datetime field falls on a day range
+    
+    Equivalent to ``field__date__gte``/``field__date__lte`` but compares the
+    raw column against ``[start, end)`` bounds, so indexes on the column (or
+    composite indexes ending in it) stay usable.
+    
+    Args:
+        field: Datetime field path, e.g. ``'created_at'`` or ``'sale__created_at'``
+        start_date: First day of the range, or None
+        end_date: Last day of the range (inclusive), or None
+        
+    Returns:
+        Dictionary usable as ``.filter(**lookup)`` or ``Q(**lookup)``
+    """
+    start, end = datetime_range(start_date, end_date)
+    lookup: Dict[str, datetime] = {}
+    if start is not None:
+        lookup[f'{field}__gte'] = start
+    if end is not None:
+        lookup[f'{field}__lt'] = end
+    return lookup
+
+
 def get_date_range_presets() -> Dict[str, Tuple[date, date]]:
     """
     Get predefined date range presets
@@ -6,12 +6,13 @@ to ensure consistency across all reports.
 """
 
 from decimal import Decimal, ROUND_HALF_UP
-from collections import defaultdict
 from typing import Dict
-from django.db.models import QuerySet
+from django.db.models import DecimalField, ExpressionWrapper, F, QuerySet, Sum, Value
+from django.db.models.functions import Coalesce
 
 from sales.models import SaleItem
-from inventory.models import StockProduct
+
+COST_FIELD = DecimalField(max_digits=14, decimal_places=2)
 
 
 class ProfitCalculator:
@@ -34,6 +35,30 @@ class ProfitCalculator:
         except (Exception,):
             return Decimal('0.00')
     
+    @staticmethod
+    def line_cost(prefix: str = ''):
+        """
+        SQL expression for a SaleItem's cost of goods sold.
+
+        Uses the ``total_cost`` snapshot; rows that have not been backfilled
+        yet fall back to quantity times the linked StockProduct's landed cost.
+
+        Args:
+            prefix: Lookup path to the SaleItem, e.g. ``'sale_items__'`` from Sale
+        """
+        zero = Value(Decimal('0.00'))
+        landed_unit_cost = (
+            Coalesce(F(f'{prefix}stock_product__unit_cost'), zero)
+            + Coalesce(F(f'{prefix}stock_product__unit_tax_amount'), zero)
+            + Coalesce(F(f'{prefix}stock_product__unit_additional_cost'), zero)
+        )
+        return Coalesce(
+            F(f'{prefix}total_cost'),
+            ExpressionWrapper(F(f'{prefix}quantity') * landed_unit_cost, output_field=COST_FIELD),
+            zero,
+            output_field=COST_FIELD,
+        )
+    
     @staticmethod
     def calculate_sale_costs(sale_queryset: QuerySet) -> Dict[str, Dict[str, Decimal]]:
         """
@@ -53,59 +78,26 @@ class ProfitCalculator:
                 }
             }
         """
-        sale_ids = list(sale_queryset.values_list('id', flat=True))
-        
-        # Get all sale items
-        sale_items = list(
-            SaleItem.objects.filter(sale_id__in=sale_ids)
-            .select_related('product', 'stock_product')
-        )
-        
-        # Prefetch fallback stock products for items without a stock_product reference
-        missing_product_ids = {
-            item.product_id
-            for item in sale_items
-            if item.stock_product_id is None
+        line_totals = {
+            row['sale_id']: row
+            for row in SaleItem.objects.filter(sale_id__in=sale_queryset.order_by().values('id'))
+            .order_by()
+            .values('sale_id')
+            .annotate(
+                cogs=Sum(ProfitCalculator.line_cost()),
+                tax=Sum('tax_amount'),
+                discount=Sum('discount_amount'),
+            )
         }
-        
-        fallback_stock = {}
-        if missing_product_ids:
-            for stock_product in (
-                StockProduct.objects
-                .filter(product_id__in=missing_product_ids)
-                .order_by('product_id', '-created_at')
-            ):
-                if stock_product.product_id not in fallback_stock:
-                    fallback_stock[stock_product.product_id] = stock_product
-        
-        # Calculate costs per sale
-        sale_costs = defaultdict(lambda: Decimal('0.00'))
-        sale_line_tax = defaultdict(lambda: Decimal('0.00'))
-        sale_line_discount = defaultdict(lambda: Decimal('0.00'))
-        
-        for item in sale_items:
-            quantity = ProfitCalculator.to_decimal(item.quantity)
-            stock_product = item.stock_product or fallback_stock.get(item.product_id)
-            
-            if stock_product:
-                unit_cost = (
-                    ProfitCalculator.to_decimal(stock_product.unit_cost)
-                    + ProfitCalculator.to_decimal(getattr(stock_product, 'unit_tax_amount', None))
-                    + ProfitCalculator.to_decimal(getattr(stock_product, 'unit_additional_cost', None))
-                )
-            else:
-                unit_cost = ProfitCalculator.to_decimal(item.product.get_latest_cost())
-            
-            sale_costs[item.sale_id] += (unit_cost * quantity)
-            sale_line_tax[item.sale_id] += ProfitCalculator.to_decimal(item.tax_amount)
-            sale_line_discount[item.sale_id] += ProfitCalculator.to_decimal(item.discount_amount)
+        empty = {'cogs': None, 'tax': None, 'discount': None}
         
         # Calculate profit for each sale
         results = {}
         for sale in sale_queryset:
-            sale_tax_total = sale_line_tax[sale.id] + ProfitCalculator.to_decimal(sale.tax_amount)
-            sale_discount_total = sale_line_discount[sale.id] + ProfitCalculator.to_decimal(sale.discount_amount)
-            cogs = sale_costs[sale.id]
+            lines = line_totals.get(sale.id, empty)
+            sale_tax_total = ProfitCalculator.to_decimal(lines['tax']) + ProfitCalculator.to_decimal(sale.tax_amount)
+            sale_discount_total = ProfitCalculator.to_decimal(lines['discount']) + ProfitCalculator.to_decimal(sale.discount_amount)
+            cogs = ProfitCalculator.to_decimal(lines['cogs'])
             total_amount = ProfitCalculator.to_decimal(sale.total_amount)
             net_revenue = total_amount - sale_tax_total
             profit = net_revenue - cogs
@@ -0,0 +1,66 @@
+"""
+RFM (Recency, Frequency, Monetary) quintile scoring.
+
+Scores every customer against the whole population in one pass: values are
+sorted once and each customer's rank is found with a binary search, so
+scoring n customers costs O(n log n) instead of a linear scan per customer.
+
+A customer's rank is the position of the first occurrence of its value in
+the sorted population (ties share the best rank), and the quintile is
+``rank * 5 // n + 1``, capped at 5.
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, List, Sequence
+
+
+def rank_quintiles(values: Sequence[float], *, descending: bool = False, invert: bool = False) -> List[int]:
+    """
+    Quintile (1-5) of each value by its rank in ``values``.
+
+    Args:
+        values: Population of comparable values, one per customer
+        descending: Rank from the largest value instead of the smallest
+        invert: Return ``6 - quintile`` (e.g. recency, where fewer days is better)
+
+    Returns:
+        Scores in the same order as ``values``
+    """
+    population = len(values)
+    if not population:
+        return []
+
+    ordered = sorted(values)
+    scores = []
+    for value in values:
+        if descending:
+            rank = population - bisect_right(ordered, value)
+        else:
+            rank = bisect_left(ordered, value)
+        quintile = min(5, rank * 5 // population + 1)
+        scores.append(6 - quintile if invert else quintile)
+    return scores
+
+
+def assign_rfm_scores(
+    items: List[Dict[str, Any]],
+    recency_key: str = 'recency_days',
+    frequency_key: str = 'frequency',
+    monetary_key: str = 'monetary',
+) -> List[Dict[str, Any]]:
+    """
+    Set ``r_score``, ``f_score`` and ``m_score`` on each item.
+
+    Recency ranks ascending and is inverted, so the most recent buyers score
+    5. Frequency and monetary rank from the largest value, matching the
+    segment rules in CustomerSegmentationReportView.
+    """
+    recency = rank_quintiles([item[recency_key] for item in items], invert=True)
+    frequency = rank_quintiles([item[frequency_key] for item in items], descending=True)
+    monetary = rank_quintiles([float(item[monetary_key]) for item in items], descending=True)
+
+    for item, r_score, f_score, m_score in zip(items, recency, frequency, monetary):
+        item['r_score'] = r_score
+        item['f_score'] = f_score
+        item['m_score'] = m_score
+    return items
@@ -26,13 +26,17 @@ from reportlab.lib.pagesizes import letter
 from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 
-from sales.models import Customer, Sale, SaleItem, Payment, AccountsReceivable, ARPayment
+from sales.models import Customer, CustomerMetrics, Sale, SaleItem, Payment, AccountsReceivable, ARPayment
 from inventory.models import Product
 from settings.models import BusinessSettings
+from reports.services.customer_metrics import CustomerMetricsReader, INSIDE, STRADDLING
 from reports.services.report_base import BaseReportView
+from reports.services.report_cache import report_data_version
 from reports.utils.response import ReportResponse, ReportError
 from reports.utils.aggregation import AggregationHelper
+from reports.utils.date_utils import day_start
 from reports.utils.profit_calculator import ProfitCalculator
+from reports.utils.rfm import assign_rfm_scores
 
 
 class TopCustomersReportView(BaseReportView):
@@ -186,17 +190,64 @@ class TopCustomersReportView(BaseReportView):
         start_date: date,
         end_date: date,
         storefront_ids: List[str]
+    ) -> List[Dict[str, Any]]:
+        if storefront_ids:
+            # CustomerMetrics spans all storefronts
+            return self._build_live_customer_metrics(business_id, start_date, end_date, storefront_ids)
+
+        inside, straddling_ids = CustomerMetricsReader(business_id, start_date, end_date).split()
+        metrics: List[Dict[str, Any]] = []
+        for row in inside:
+            if row.net_revenue <= Decimal('0.00'):
+                continue
+            first_purchase = self._normalize_date(row.first_purchase_at)
+            last_purchase = self._normalize_date(row.last_purchase_at)
+            # Consecutive gaps telescope, so their mean is (last - first) / (orders - 1)
+            average_gap = None
+            if row.order_count > 1:
+                average_gap = (last_purchase - first_purchase).days / (row.order_count - 1)
+            metrics.append(self._customer_metric(
+                row.customer,
+                net_revenue=row.net_revenue,
+                total_purchases=row.order_count,
+                first_purchase=first_purchase,
+                last_purchase=last_purchase,
+                purchase_frequency=self._frequency_from_average_gap(average_gap),
+                favorite_category=row.favorite_category,
+                start_date=start_date,
+                end_date=end_date
+            ))
+
+        if straddling_ids:
+            metrics.extend(self._build_live_customer_metrics(
+                business_id,
+                start_date,
+                end_date,
+                storefront_ids,
+                customer_ids=straddling_ids
+            ))
+        return metrics
+
+    def _build_live_customer_metrics(
+        self,
+        business_id: int,
+        start_date: date,
+        end_date: date,
+        storefront_ids: List[str],
+        customer_ids: Optional[List[Any]] = None
     ) -> List[Dict[str, Any]]:
         sale_filters = Q(
             sales__status__in=[Sale.STATUS_COMPLETED, Sale.STATUS_PARTIAL],
-            sales__created_at__date__gte=start_date,
-            sales__created_at__date__lte=end_date
+            **self.date_range_lookup('sales__created_at', start_date, end_date)
         )
         if storefront_ids:
             sale_filters &= Q(sales__storefront_id__in=storefront_ids)
 
+        customers_qs = Customer.objects.filter(business_id=business_id)
+        if customer_ids is not None:
+            customers_qs = customers_qs.filter(id__in=customer_ids)
         customers_qs = (
-            Customer.objects.filter(business_id=business_id)
+            customers_qs
             .annotate(
                 gross_revenue=Coalesce(Sum('sales__total_amount', filter=sale_filters), Decimal('0.00')),
                 refunded_amount=Coalesce(Sum('sales__amount_refunded', filter=sale_filters), Decimal('0.00')),
@@ -234,39 +285,57 @@ class TopCustomersReportView(BaseReportView):
             if net_revenue <= Decimal('0.00'):
                 continue
 
-            total_purchases = int(customer.total_purchases or 0)
-            first_purchase = self._normalize_date(customer.first_purchase)
-            last_purchase = self._normalize_date(customer.last_purchase)
-
-            average_order_value = Decimal('0.00')
-            if total_purchases > 0:
-                average_order_value = net_revenue / Decimal(total_purchases)
-
             order_dates = sales_dates.get(customer.id, [])
-            purchase_frequency = self._calculate_purchase_frequency(order_dates)
-            favorite_category = favorite_categories.get(customer.id, '')
-
-            metrics.append({
-                'customer_id': str(customer.id),
-                'customer_name': customer.name or '',
-                'email': customer.email or '',
-                'phone': customer.phone or '',
-                'total_revenue': net_revenue,
-                'total_purchases': total_purchases,
-                'average_order_value': average_order_value,
-                'first_purchase_date': first_purchase,
-                'last_purchase_date': last_purchase,
-                'customer_lifetime_days': self._calculate_lifetime_days(first_purchase, last_purchase, start_date, end_date),
-                'purchase_frequency': purchase_frequency,
-                'favorite_category': favorite_category or '',
-                'credit_limit': customer.credit_limit or Decimal('0.00'),
-                'credit_used': self._calculate_credit_used(customer),
-                'loyalty_tier': self._determine_loyalty_tier(net_revenue, total_purchases),
-                'status': self._determine_status(last_purchase, end_date)
-            })
+            metrics.append(self._customer_metric(
+                customer,
+                net_revenue=net_revenue,
+                total_purchases=int(customer.total_purchases or 0),
+                first_purchase=self._normalize_date(customer.first_purchase),
+                last_purchase=self._normalize_date(customer.last_purchase),
+                purchase_frequency=self._calculate_purchase_frequency(order_dates),
+                favorite_category=favorite_categories.get(customer.id, ''),
+                start_date=start_date,
+                end_date=end_date
+            ))
 
         return metrics
 
+    def _customer_metric(
+        self,
+        customer: Customer,
+        *,
+        net_revenue: Decimal,
+        total_purchases: int,
+        first_purchase: Optional[date],
+        last_purchase: Optional[date],
+        purchase_frequency: str,
+        favorite_category: str,
+        start_date: date,
+        end_date: date
+    ) -> Dict[str, Any]:
+        average_order_value = Decimal('0.00')
+        if total_purchases > 0:
+            average_order_value = net_revenue / Decimal(total_purchases)
+
+        return {
+            'customer_id': str(customer.id),
+            'customer_name': customer.name or '',
+            'email': customer.email or '',
+            'phone': customer.phone or '',
+            'total_revenue': net_revenue,
+            'total_purchases': total_purchases,
+            'average_order_value': average_order_value,
+            'first_purchase_date': first_purchase,
+            'last_purchase_date': last_purchase,
+            'customer_lifetime_days': self._calculate_lifetime_days(first_purchase, last_purchase, start_date, end_date),
+            'purchase_frequency': purchase_frequency,
+            'favorite_category': favorite_category or '',
+            'credit_limit': customer.credit_limit or Decimal('0.00'),
+            'credit_used': self._calculate_credit_used(customer),
+            'loyalty_tier': self._determine_loyalty_tier(net_revenue, total_purchases),
+            'status': self._determine_status(last_purchase, end_date)
+        }
+
     def _apply_segment_filter(self, metrics: List[Dict[str, Any]], segment: str) -> List[Dict[str, Any]]:
         if segment == 'all':
             return metrics
@@ -477,7 +546,11 @@ class TopCustomersReportView(BaseReportView):
             (sorted_dates[idx] - sorted_dates[idx - 1]).days
             for idx in range(1, len(sorted_dates))
         ]
-        average_gap = sum(gaps) / len(gaps) if gaps else 30
+        return self._frequency_from_average_gap(sum(gaps) / len(gaps) if gaps else 30)
+
+    def _frequency_from_average_gap(self, average_gap: Optional[float]) -> str:
+        if average_gap is None:
+            return 'monthly'
         if average_gap <= 10:
             return 'weekly'
         if average_gap <= 25:
@@ -549,8 +622,7 @@ class TopCustomersReportView(BaseReportView):
             business_id=business_id,
             customer_id__in=customer_ids,
             status__in=[Sale.STATUS_COMPLETED, Sale.STATUS_PARTIAL],
-            created_at__date__gte=start_date,
-            created_at__date__lte=end_date
+            **self.date_range_lookup('created_at', start_date, end_date)
         )
         if storefront_ids:
             sales_queryset = sales_queryset.filter(storefront_id__in=storefront_ids)
@@ -581,8 +653,7 @@ class TopCustomersReportView(BaseReportView):
             sale__business_id=business_id,
             sale__customer_id__in=customer_ids,
             sale__status__in=[Sale.STATUS_COMPLETED, Sale.STATUS_PARTIAL],
-            sale__created_at__date__gte=start_date,
-            sale__created_at__date__lte=end_date
+            **self.date_range_lookup('sale__created_at', start_date, end_date)
         )
         if storefront_ids:
             sale_items_queryset = sale_items_queryset.filter(sale__storefront_id__in=storefront_ids)
@@ -689,45 +760,15 @@ class CustomerLifetimeValueReportView(BaseReportView):
         
         if customer_type:
             queryset = queryset.filter(customer_type=customer_type)
-        if start_date:
-            queryset = queryset.filter(created_at__date__gte=start_date)
-        if end_date:
-            queryset = queryset.filter(created_at__date__lte=end_date)
+        queryset = self.filter_date_range(queryset, 'created_at', start_date, end_date)
 
-        sale_filters = Q(
-            sales__status__in=[
-                Sale.STATUS_COMPLETED,
-                Sale.STATUS_PARTIAL
-            ]
-        )
-        if start_date:
-            sale_filters &= Q(sales__created_at__date__gte=start_date)
-        if end_date:
-            sale_filters &= Q(sales__created_at__date__lte=end_date)
-        
-        # Annotate with lifetime metrics
-        queryset = queryset.annotate(
-            total_revenue=Coalesce(Sum('sales__total_amount', filter=sale_filters), Decimal('0.00')),
-            total_orders=Count('sales', filter=sale_filters),
-            first_purchase=Min('sales__created_at', filter=sale_filters),
-            last_purchase=Max('sales__created_at', filter=sale_filters)
-        )
-        
-        if min_revenue_value is not None:
-            queryset = queryset.filter(total_revenue__gte=min_revenue_value)
-
-        customers = list(queryset)
-        customer_ids = [customer.id for customer in customers]
-
-        profits_by_customer = self._calculate_customer_profits(
-            business_id=business_id,
-            customer_ids=customer_ids,
-            start_date=start_date,
-            end_date=end_date
-        )
+        customers = self._load_customer_metrics(queryset, business_id, start_date, end_date)
 
-        for customer in customers:
-            customer.total_profit = profits_by_customer.get(customer.id, Decimal('0.00'))
+        if min_revenue_value is not None:
+            customers = [
+                customer for customer in customers
+                if customer.total_revenue >= min_revenue_value
+            ]
 
         if min_profit_value is not None:
             customers = [
@@ -772,6 +813,69 @@ class CustomerLifetimeValueReportView(BaseReportView):
 
         return paginated, pagination_meta
 
+    def _load_customer_metrics(self, queryset, business_id: int, start_date: date, end_date: date) -> List[Customer]:
+        """
+        Customers with revenue, order, purchase-date and profit figures for the window.
+
+        Figures come from CustomerMetrics unless a customer's purchases straddle
+        the window, in which case only those customers' sales are aggregated.
+        """
+        reader = CustomerMetricsReader(business_id, start_date, end_date)
+        customers = list(queryset.select_related('metrics'))
+        straddling_ids = []
+
+        for customer in customers:
+            row = getattr(customer, 'metrics', None)
+            position = reader.classify(row)
+            if position == INSIDE:
+                customer.total_revenue = row.gross_revenue
+                customer.total_orders = row.order_count
+                customer.first_purchase = row.first_purchase_at
+                customer.last_purchase = row.last_purchase_at
+                customer.total_profit = row.profit
+            else:
+                customer.total_revenue = Decimal('0.00')
+                customer.total_orders = 0
+                customer.first_purchase = None
+                customer.last_purchase = None
+                customer.total_profit = Decimal('0.00')
+                if position == STRADDLING:
+                    straddling_ids.append(customer.id)
+
+        if straddling_ids:
+            sale_filters = Q(
+                sales__status__in=[
+                    Sale.STATUS_COMPLETED,
+                    Sale.STATUS_PARTIAL
+                ]
+            )
+            sale_filters &= Q(**self.date_range_lookup('sales__created_at', start_date, end_date))
+            live = {
+                row['id']: row
+                for row in Customer.objects.filter(id__in=straddling_ids).values('id').annotate(
+                    total_revenue=Coalesce(Sum('sales__total_amount', filter=sale_filters), Decimal('0.00')),
+                    total_orders=Count('sales', filter=sale_filters),
+                    first_purchase=Min('sales__created_at', filter=sale_filters),
+                    last_purchase=Max('sales__created_at', filter=sale_filters)
+                )
+            }
+            profits_by_customer = self._calculate_customer_profits(
+                business_id=business_id,
+                customer_ids=straddling_ids,
+                start_date=start_date,
+                end_date=end_date
+            )
+            for customer in customers:
+                if customer.id in live:
+                    figures = live[customer.id]
+                    customer.total_revenue = figures['total_revenue']
+                    customer.total_orders = figures['total_orders']
+                    customer.first_purchase = figures['first_purchase']
+                    customer.last_purchase = figures['last_purchase']
+                    customer.total_profit = profits_by_customer.get(customer.id, Decimal('0.00'))
+
+        return customers
+
     def _calculate_customer_profits(
         self,
         business_id: int,
@@ -789,10 +893,7 @@ class CustomerLifetimeValueReportView(BaseReportView):
             status__in=[Sale.STATUS_COMPLETED, Sale.STATUS_PARTIAL]
         )
 
-        if start_date:
-            sales_qs = sales_qs.filter(created_at__date__gte=start_date)
-        if end_date:
-            sales_qs = sales_qs.filter(created_at__date__lte=end_date)
+        sales_qs = self.filter_date_range(sales_qs, 'created_at', start_date, end_date)
 
         sale_costs = ProfitCalculator.calculate_sale_costs(sales_qs)
         profits = defaultdict(lambda: Decimal('0.00'))
@@ -1181,8 +1282,7 @@ class CustomerSegmentationReportView(BaseReportView):
         ).annotate(
             order_date=Coalesce('completed_at', 'created_at', output_field=DateTimeField())
         ).filter(
-            order_date__date__gte=start_date,
-            order_date__date__lte=end_date
+            **self.date_range_lookup('order_date', start_date, end_date)
         )
         
         if storefront_id:
@@ -1198,55 +1298,62 @@ class CustomerSegmentationReportView(BaseReportView):
                 'segments': []
             }
         
-        # Fetch all sales for these customers to calculate lifetime metrics
-        customer_sales_qs = Sale.objects.filter(
-            business_id=business_id,
-            customer_id__in=customer_ids,
-            status__in=[Sale.STATUS_COMPLETED, Sale.STATUS_PARTIAL]
-        ).select_related('customer')
-        
-        if storefront_id:
-            customer_sales_qs = customer_sales_qs.filter(storefront_id=storefront_id)
-        
-        # Aggregate customer metrics
+        # Lifetime metrics for these customers: stored CustomerMetrics rows
+        # (all storefronts), or their sales when scoped to one storefront
         customer_data = {}
-        for sale in customer_sales_qs:
-            cid = sale.customer_id
-            order_date = sale.completed_at or sale.created_at
-            net_revenue = (sale.total_amount or Decimal('0.00')) - (sale.amount_refunded or Decimal('0.00'))
-            
-            if cid not in customer_data:
-                customer_data[cid] = {
-                    'customer': sale.customer,
-                    'order_dates': [],
-                    'total_spend': Decimal('0.00'),
-                    'order_count': 0
+        live_ids = set(customer_ids)
+        if not storefront_id:
+            for row in CustomerMetrics.objects.filter(
+                customer_id__in=customer_ids
+            ).select_related('customer'):
+                customer_data[row.customer_id] = {
+                    'customer': row.customer,
+                    'last_order': row.last_order_at,
+                    'total_spend': row.net_revenue,
+                    'order_count': row.order_count
                 }
+            live_ids -= set(customer_data)
+        
+        if live_ids:
+            customer_sales_qs = Sale.objects.filter(
+                business_id=business_id,
+                customer_id__in=live_ids,
+                status__in=[Sale.STATUS_COMPLETED, Sale.STATUS_PARTIAL]
+            ).select_related('customer')
+            
+            if storefront_id:
+                customer_sales_qs = customer_sales_qs.filter(storefront_id=storefront_id)
             
-            customer_data[cid]['order_dates'].append(order_date)
-            customer_data[cid]['total_spend'] += net_revenue
-            customer_data[cid]['order_count'] += 1
+            for sale in customer_sales_qs:
+                cid = sale.customer_id
+                order_date = sale.completed_at or sale.created_at
+                net_revenue = (sale.total_amount or Decimal('0.00')) - (sale.amount_refunded or Decimal('0.00'))
+                
+                if cid not in customer_data:
+                    customer_data[cid] = {
+                        'customer': sale.customer,
+                        'last_order': order_date,
+                        'total_spend': Decimal('0.00'),
+                        'order_count': 0
+                    }
+                
+                customer_data[cid]['last_order'] = max(customer_data[cid]['last_order'], order_date)
+                customer_data[cid]['total_spend'] += net_revenue
+                customer_data[cid]['order_count'] += 1
         
         # Calculate RFM metrics
         today = timezone.now()
         rfm_scores = []
         
         for cid, data in customer_data.items():
-            if not data['order_dates']:
-                continue
-            
-            most_recent = max(data['order_dates'])
-            recency_days = (today - most_recent).days
-            frequency = data['order_count']
-            monetary = data['total_spend']
+            recency_days = (today - data['last_order']).days
             
             rfm_scores.append({
                 'customer_id': cid,
                 'customer': data['customer'],
                 'recency_days': recency_days,
-                'frequency': frequency,
-                'monetary': monetary,
-                'order_dates': data['order_dates']
+                'frequency': data['order_count'],
+                'monetary': data['total_spend']
             })
         
         if not rfm_scores:
@@ -1257,26 +1364,7 @@ class CustomerSegmentationReportView(BaseReportView):
             }
         
         # Calculate quintile scores
-        recency_values = sorted([item['recency_days'] for item in rfm_scores])
-        frequency_values = sorted([item['frequency'] for item in rfm_scores], reverse=True)
-        monetary_values = sorted([float(item['monetary']) for item in rfm_scores], reverse=True)
-        
-        for item in rfm_scores:
-            item['r_score'] = self._calculate_quintile_score(
-                item['recency_days'],
-                recency_values,
-                reverse=True
-            )
-            item['f_score'] = self._calculate_quintile_score(
-                item['frequency'],
-                frequency_values,
-                reverse=False
-            )
-            item['m_score'] = self._calculate_quintile_score(
-                float(item['monetary']),
-                monetary_values,
-                reverse=False
-            )
+        assign_rfm_scores(rfm_scores)
         
         # Classify into segments
         segments_data = defaultdict(lambda: {
@@ -1357,34 +1445,6 @@ class CustomerSegmentationReportView(BaseReportView):
             'segments': segments
         }
     
-    def _calculate_quintile_score(
-        self,
-        value: float,
-        sorted_values: List[float],
-        reverse: bool = False
-    ) -> int:
-        """Calculate quintile score (1-5) for a value."""
-        if not sorted_values or len(sorted_values) == 0:
-            return 3
-        
-        n = len(sorted_values)
-        
-        # Find position in sorted list
-        pos = 0
-        for i, v in enumerate(sorted_values):
-            if value <= v:
-                pos = i
-                break
-            pos = i + 1
-        
-        # Convert to quintile (1-5)
-        quintile = min(5, max(1, int((pos / n) * 5) + 1))
-        
-        if reverse:
-            quintile = 6 - quintile
-        
-        return quintile
-    
     def _classify_rfm_segment(self, r: int, f: int, m: int) -> str:
         """Classify customer into RFM segment based on scores."""
         for segment_name, config in self.RFM_SEGMENTS.items():
@@ -1457,7 +1517,7 @@ class CustomerSegmentationReportView(BaseReportView):
     ) -> str:
         """Build cache key for segmentation results."""
         return (
-            f'customer_segmentation:{business_id}:'
+            f'customer_segmentation:{business_id}:{report_data_version(business_id)}:'
             f'{start_date}:{end_date}:{method}:'
             f'{storefront_id or "all"}'
         )
@@ -1668,16 +1728,9 @@ class CustomerSegmentationReportView(BaseReportView):
                 'monetary': customer.total_revenue or Decimal('0.00')
             })
         
-        # Calculate quintiles for scoring
-        recency_values = sorted([c['recency_days'] for c in customer_scores])
-        frequency_values = sorted([c['frequency'] for c in customer_scores], reverse=True)
-        monetary_values = sorted([float(c['monetary']) for c in customer_scores], reverse=True)
-        
         # Score each customer
+        assign_rfm_scores(customer_scores)
         for score_data in customer_scores:
-            score_data['r_score'] = self._calculate_quintile_score(score_data['recency_days'], recency_values, reverse=True)
-            score_data['f_score'] = self._calculate_quintile_score(score_data['frequency'], frequency_values)
-            score_data['m_score'] = self._calculate_quintile_score(float(score_data['monetary']), monetary_values)
             score_data['segment'] = self._classify_rfm_segment(
                 score_data['r_score'],
                 score_data['f_score'],
@@ -1736,34 +1789,6 @@ class CustomerSegmentationReportView(BaseReportView):
         
         return segment_list
     
-    def _calculate_quintile_score(self, value, sorted_values, reverse=False) -> int:
-        """Calculate quintile score (1-5) for a value"""
-        if not sorted_values:
-            return 3
-        
-        n = len(sorted_values)
-        if n == 0:
-            return 3
-        
-        # Find position in sorted list
-        try:
-            pos = sorted_values.index(value)
-        except ValueError:
-            # Value not in list, find closest
-            pos = 0
-            for i, v in enumerate(sorted_values):
-                if value <= v:
-                    pos = i
-                    break
-        
-        # Convert to quintile (1-5)
-        quintile = min(5, max(1, int(pos / (n / 5)) + 1))
-        
-        if reverse:
-            quintile = 6 - quintile
-        
-        return quintile
-    
     def _classify_rfm_segment(self, r: int, f: int, m: int) -> str:
         """Classify customer into RFM segment"""
         # Champions: High R, F, M
@@ -2293,17 +2318,9 @@ class CreditUtilizationReportView(BaseReportView):
         if storefront_id:
             queryset = queryset.filter(sale__storefront_id=storefront_id)
 
-        date_filters = []
-        if start_date:
-            date_filters.append(Q(sale__created_at__date__gte=start_date))
-        if end_date:
-            date_filters.append(Q(sale__created_at__date__lte=end_date))
-
-        if date_filters:
-            combined = date_filters[0]
-            for extra in date_filters[1:]:
-                combined &= extra
-            queryset = queryset.filter(combined | Q(amount_outstanding__gt=Decimal('0.00')))
+        date_lookup = self.date_range_lookup('sale__created_at', start_date, end_date)
+        if date_lookup:
+            queryset = queryset.filter(Q(**date_lookup) | Q(amount_outstanding__gt=Decimal('0.00')))
 
         return queryset.select_related('sale', 'customer')
 
@@ -2321,10 +2338,7 @@ class CreditUtilizationReportView(BaseReportView):
         )
         if storefront_id:
             queryset = queryset.filter(accounts_receivable__sale__storefront_id=storefront_id)
-        if start_date:
-            queryset = queryset.filter(payment_date__date__gte=start_date)
-        if end_date:
-            queryset = queryset.filter(payment_date__date__lte=end_date)
+        queryset = self.filter_date_range(queryset, 'payment_date', start_date, end_date)
         return queryset.select_related('accounts_receivable__customer')
 
     def _compute_overdue_days(self, ar, customer: Customer, reference_date: date) -> int:
@@ -2503,7 +2517,7 @@ class CreditUtilizationReportView(BaseReportView):
         utilization_threshold: int
     ) -> str:
         return (
-            f'credit_utilization:{business_id}:'
+            f'credit_utilization:{business_id}:{report_data_version(business_id)}:'
             f'{start_date.isoformat() if start_date else "none"}:'
             f'{end_date.isoformat() if end_date else "none"}:'
             f'{segment}:'
@@ -2882,8 +2896,7 @@ class PurchasePatternAnalysisReportView(BaseReportView):
             order_date=Coalesce('completed_at', 'created_at', output_field=DateTimeField()),
             derived_channel=self._channel_case()
         ).filter(
-            order_date__date__gte=start_date,
-            order_date__date__lte=end_date
+            **self.date_range_lookup('order_date', start_date, end_date)
         )
 
         if storefront_id:
@@ -3458,7 +3471,7 @@ class PurchasePatternAnalysisReportView(BaseReportView):
             decimal_places = currency_config.get('decimalPlaces')
             currency_signature = f"{code}-{decimal_places if decimal_places is not None else 'na'}"
         return (
-            f'purchase_patterns:{business_id}:{start_date}:{end_date}:'
+            f'purchase_patterns:{business_id}:{report_data_version(business_id)}:{start_date}:{end_date}:'
             f'{segment_filter or "all"}:{storefront_id or "all"}:{channel or "all"}:{currency_signature}'
         )
 
@@ -3737,69 +3750,51 @@ class CustomerRetentionMetricsReportView(BaseReportView):
             'customer_type': customer_type
         })
     
+    def _metrics_rows(self, customer_qs):
+        """Lifetime purchase metrics (COMPLETED/PARTIAL sales) for the selected customers"""
+        return CustomerMetrics.objects.filter(customer__in=customer_qs)
+    
     def _build_summary(self, customer_qs, start_date, end_date) -> Dict[str, Any]:
         """Build summary retention metrics"""
         # Total customers
         total_customers = customer_qs.count()
         
-        # Active customers (purchased in last 90 days)
-        ninety_days_ago = timezone.now().date() - timedelta(days=90)
-        active_customers = customer_qs.filter(
-            sales__created_at__date__gte=ninety_days_ago,
-            sales__status__in=[Sale.STATUS_COMPLETED, Sale.STATUS_PARTIAL]
-        ).distinct().count()
-        
-        # Churned customers (no purchase in 90+ days but had purchases before)
-        churned_customers = customer_qs.filter(
-            sales__created_at__date__lt=ninety_days_ago
-        ).exclude(
-            sales__created_at__date__gte=ninety_days_ago
-        ).distinct().count()
+        metrics = self._metrics_rows(customer_qs)
+        active_since = day_start(timezone.now().date() - timedelta(days=90))
+        counts = metrics.aggregate(
+            # Active customers (purchased in last 90 days)
+            active=Count('id', filter=Q(last_purchase_at__gte=active_since)),
+            # Churned customers (no purchase in 90+ days but had purchases before)
+            churned=Count('id', filter=Q(last_purchase_at__lt=active_since)),
+            # Customers with repeat purchases
+            repeat=Count('id', filter=Q(order_count__gte=2))
+        )
+        active_customers = counts['active']
+        churned_customers = counts['churned']
+        customers_with_multiple = counts['repeat']
         
         # Calculate rates
         retention_rate = (active_customers / total_customers * 100) if total_customers > 0 else 0
         churn_rate = (churned_customers / total_customers * 100) if total_customers > 0 else 0
-        
-        # Repeat purchase rate
-        customers_with_multiple = customer_qs.annotate(
-            purchase_count=Count(
-                'sales',
-                filter=Q(
-                    sales__status__in=[
-                        Sale.STATUS_COMPLETED,
-                        Sale.STATUS_PARTIAL
-                    ]
-                )
-            )
-        ).filter(purchase_count__gte=2).count()
-        
         repeat_rate = (customers_with_multiple / total_customers * 100) if total_customers > 0 else 0
         
         # Average customer lifespan
-        customers_with_purchases = customer_qs.annotate(
-            first_purchase=Min('sales__created_at'),
-            last_purchase=Max('sales__created_at')
-        ).filter(first_purchase__isnull=False, last_purchase__isnull=False)
-        
-        lifespans = []
-        for customer in customers_with_purchases:
-            first = customer.first_purchase.date() if isinstance(customer.first_purchase, datetime) else customer.first_purchase
-            last = customer.last_purchase.date() if isinstance(customer.last_purchase, datetime) else customer.last_purchase
-            lifespans.append((last - first).days)
+        lifespans = [
+            (last.date() - first.date()).days
+            for first, last in metrics.values_list('first_purchase_at', 'last_purchase_at')
+        ]
         
         avg_lifespan = sum(lifespans) / len(lifespans) if lifespans else 0
         
         # New customers in period
         new_customers = customer_qs.filter(
-            created_at__date__gte=start_date,
-            created_at__date__lte=end_date
+            **self.date_range_lookup('created_at', start_date, end_date)
         ).count()
         
         # Returning customers (had purchase before period and during period)
         returning_customers = customer_qs.filter(
-            created_at__date__lt=start_date,
-            sales__created_at__date__gte=start_date,
-            sales__created_at__date__lte=end_date,
+            created_at__lt=day_start(start_date),
+            **self.date_range_lookup('sales__created_at', start_date, end_date),
             sales__status__in=[Sale.STATUS_COMPLETED, Sale.STATUS_PARTIAL]
         ).distinct().count()
         
@@ -3817,16 +3812,16 @@ class CustomerRetentionMetricsReportView(BaseReportView):
     
     def _build_cohort_analysis(self, customer_qs, start_date, end_date, period: str) -> List[Dict]:
         """Build cohort retention analysis"""
-        # Get customers with their first purchase month
-        customers_with_first = customer_qs.annotate(
-            first_purchase=Min('sales__created_at')
-        ).filter(first_purchase__isnull=False)
+        # A cohort member is still active with a purchase in the last 90 days
+        active_since = day_start(timezone.now().date() - timedelta(days=90))
         
-        # Group by cohort period
+        # Group customers by the period of their first purchase
         cohorts = {}
         
-        for customer in customers_with_first:
-            first_date = customer.first_purchase.date() if isinstance(customer.first_purchase, datetime) else customer.first_purchase
+        for first_purchase, last_purchase in self._metrics_rows(customer_qs).values_list(
+            'first_purchase_at', 'last_purchase_at'
+        ):
+            first_date = first_purchase.date()
             
             # Determine cohort key based on period
             if period == 'month':
@@ -3839,12 +3834,13 @@ class CustomerRetentionMetricsReportView(BaseReportView):
             
             if cohort_key not in cohorts:
                 cohorts[cohort_key] = {
-                    'customers': [],
+                    'current_active': 0,
                     'initial_count': 0
                 }
             
-            cohorts[cohort_key]['customers'].append(customer)
             cohorts[cohort_key]['initial_count'] += 1
+            if last_purchase >= active_since:
+                cohorts[cohort_key]['current_active'] += 1
         
         # Calculate retention for each cohort
         cohort_data = []
@@ -3852,16 +3848,7 @@ class CustomerRetentionMetricsReportView(BaseReportView):
         for cohort_key in sorted(cohorts.keys()):
             cohort = cohorts[cohort_key]
             initial_count = cohort['initial_count']
-            
-            # Check how many are still active
-            ninety_days_ago = timezone.now().date() - timedelta(days=90)
-            current_active = sum(
-                1 for c in cohort['customers']
-                if c.sales.filter(
-                    created_at__date__gte=ninety_days_ago,
-                    status__in=[Sale.STATUS_COMPLETED, Sale.STATUS_PARTIAL]
-                ).exists()
-            )
+            current_active = cohort['current_active']
             
             churned = initial_count - current_active
             
@@ -3889,21 +3876,19 @@ class CustomerRetentionMetricsReportView(BaseReportView):
             
             # Customers at start of month
             starting_customers = customer_qs.filter(
-                created_at__date__lt=current_date
+                created_at__lt=day_start(current_date)
             ).count()
             
             # New customers this month
             new_customers = customer_qs.filter(
-                created_at__date__gte=current_date,
-                created_at__date__lte=month_end
+                **self.date_range_lookup('created_at', current_date, month_end)
             ).count()
             
             # Active at end (made purchase in last 90 days from month end)
             active_threshold = month_end - timedelta(days=90)
             ending_customers = customer_qs.filter(
-                created_at__date__lte=month_end,
-                sales__created_at__date__gte=active_threshold,
-                sales__created_at__date__lte=month_end,
+                **self.date_range_lookup('created_at', end_date=month_end),
+                **self.date_range_lookup('sales__created_at', active_threshold, month_end),
                 sales__status__in=[Sale.STATUS_COMPLETED, Sale.STATUS_PARTIAL]
             ).distinct().count()
             
@@ -3934,28 +3919,18 @@ class CustomerRetentionMetricsReportView(BaseReportView):
     
     def _build_repeat_purchase_analysis(self, customer_qs) -> Dict[str, Any]:
         """Analyze repeat purchase behavior"""
-        # Annotate with purchase counts
-        customers_with_counts = customer_qs.annotate(
-            purchase_count=Count(
-                'sales',
-                filter=Q(
-                    sales__status__in=[
-                        Sale.STATUS_COMPLETED,
-                        Sale.STATUS_PARTIAL
-                    ]
-                )
-            )
+        counts = self._metrics_rows(customer_qs).aggregate(
+            one_time=Count('id', filter=Q(order_count=1)),
+            repeat=Count('id', filter=Q(order_count__gte=2)),
+            purchases=Sum('order_count')
         )
-        
-        one_time = customers_with_counts.filter(purchase_count=1).count()
-        repeat = customers_with_counts.filter(purchase_count__gte=2).count()
+        one_time = counts['one_time']
+        repeat = counts['repeat']
         
         total = customer_qs.count()
         
-        # Average purchases per customer
-        avg_purchases = customers_with_counts.aggregate(
-            avg=Avg('purchase_count')
-        )['avg'] or 0
+        # Average purchases per customer (customers without purchases count as zero)
+        avg_purchases = (counts['purchases'] or 0) / total if total > 0 else 0
         
         return {
             'one_time_buyers': one_time,
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 from copy import deepcopy
-from django.http import HttpResponse
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
 from django.utils import timezone
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
@@ -25,6 +26,14 @@ from reports.services.customers import CustomerExporter
 from reports.services.audit import AuditLogExporter
 
 
+# Formats whose exporters can write from lazily produced rows (``stream=true``)
+STREAMING_EXPORT_FORMATS = ('excel', 'csv')
+
+
+def _export_chunk_size() -> int:
+    return getattr(settings, 'EXPORT_STREAM_CHUNK_SIZE', 2000)
+
+
 class InventoryValuationReportView(APIView):
     """Generate printable/downloadable inventory valuation reports."""
 
@@ -72,7 +81,8 @@ class SalesExportView(APIView):
             "customer_id": "uuid" (optional),
             "sale_type": "RETAIL" or "WHOLESALE" (optional),
             "status": "COMPLETED" (optional),
-            "include_items": true
+            "include_items": true,
+            "stream": false  // excel/csv only: write rows as they are read
         }
         """
         serializer = SalesExportRequestSerializer(data=request.data)
@@ -80,12 +90,16 @@ class SalesExportView(APIView):
         
         validated = serializer.validated_data
         export_format = validated.pop('format', 'excel')
+        streaming = validated.pop('stream', False) and export_format in STREAMING_EXPORT_FORMATS
         
         # Build data using sales exporter
         exporter = SalesExporter(user=request.user)
         
         try:
-            data = exporter.export(validated)
+            if streaming:
+                data = exporter.stream_data(validated, chunk_size=_export_chunk_size())
+            else:
+                data = exporter.export(validated)
         except Exception as e:
             return Response(
                 {'error': f'Failed to generate export: {str(e)}'},
@@ -102,12 +116,12 @@ class SalesExportView(APIView):
         # Generate file based on format
         if export_format == 'excel':
             file_exporter = EXPORTER_MAP['sales_excel']()
-            file_bytes = file_exporter.export(data)
+            file_bytes = file_exporter.stream(data) if streaming else file_exporter.export(data)
             content_type = file_exporter.content_type
             extension = file_exporter.file_extension
         elif export_format == 'csv':
             file_exporter = EXPORTER_MAP['sales_csv']()
-            file_bytes = file_exporter.export(data)
+            file_bytes = file_exporter.stream(data) if streaming else file_exporter.export(data)
             content_type = file_exporter.content_type
             extension = file_exporter.file_extension
         elif export_format == 'pdf':
@@ -127,7 +141,8 @@ class SalesExportView(APIView):
         end_date = validated.get('end_date', '').strftime('%Y%m%d') if validated.get('end_date') else 'all'
         filename = f"sales_export_{start_date}_to_{end_date}_{timestamp}.{extension}"
         
-        response = HttpResponse(file_bytes, content_type=content_type)
+        response_class = StreamingHttpResponse if streaming else HttpResponse
+        response = response_class(file_bytes, content_type=content_type)
         response['Content-Disposition'] = f'attachment; filename="{filename}"'
         
         return response
@@ -148,7 +163,8 @@ class CustomerExportView(APIView):
             "customer_type": "RETAIL" or "WHOLESALE" (optional),
             "include_credit_history": true,
             "credit_status": "active|blocked|overdue" (optional),
-            "min_outstanding_balance": 0.00 (optional)
+            "min_outstanding_balance": 0.00 (optional),
+            "stream": false  // write rows as they are read
         }
         """
         serializer = CustomerExportRequestSerializer(data=request.data)
@@ -156,12 +172,16 @@ class CustomerExportView(APIView):
         
         validated = serializer.validated_data
         export_format = validated.pop('format', 'excel')
+        streaming = validated.pop('stream', False) and export_format in STREAMING_EXPORT_FORMATS
         
         # Build data using customer exporter
         exporter = CustomerExporter(user=request.user)
         
         try:
-            data = exporter.export(validated)
+            if streaming:
+                data = exporter.stream_data(validated, chunk_size=_export_chunk_size())
+            else:
+                data = exporter.export(validated)
         except Exception as e:
             return Response(
                 {'error': f'Failed to generate export: {str(e)}'},
@@ -178,12 +198,12 @@ class CustomerExportView(APIView):
         # Generate file based on format
         if export_format == 'excel':
             file_exporter = EXPORTER_MAP['customer_excel']()
-            file_bytes = file_exporter.export(data)
+            file_bytes = file_exporter.stream(data) if streaming else file_exporter.export(data)
             content_type = file_exporter.content_type
             extension = file_exporter.file_extension
         elif export_format == 'csv':
             file_exporter = EXPORTER_MAP['customer_csv']()
-            file_bytes = file_exporter.export(data)
+            file_bytes = file_exporter.stream(data) if streaming else file_exporter.export(data)
             content_type = file_exporter.content_type
             extension = file_exporter.file_extension
         elif export_format == 'pdf':
@@ -201,7 +221,8 @@ class CustomerExportView(APIView):
         timestamp = timezone.now().strftime('%Y%m%d_%H%M%S')
         filename = f"customers_export_{timestamp}.{extension}"
         
-        response = HttpResponse(file_bytes, content_type=content_type)
+        response_class = StreamingHttpResponse if streaming else HttpResponse
+        response = response_class(file_bytes, content_type=content_type)
         response['Content-Disposition'] = f'attachment; filename="{filename}"'
         
         return response
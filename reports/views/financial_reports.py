@@ -22,6 +22,7 @@ from sales.models import Sale, SaleItem, Payment, Customer
 from reports.services.report_base import BaseReportView
 from reports.utils.response import ReportResponse, ReportError
 from reports.utils.aggregation import AggregationHelper
+from reports.utils.date_utils import day_start
 from reports.utils.profit_calculator import ProfitCalculator
 
 
@@ -69,8 +70,7 @@ class RevenueProfitReportView(BaseReportView):
         queryset = Sale.objects.filter(
             business_id=business_id,
             status='COMPLETED',
-            created_at__date__gte=start_date,
-            created_at__date__lte=end_date
+            **self.date_range_lookup('created_at', start_date, end_date)
         )
         
         # Apply optional filters
@@ -260,7 +260,7 @@ class RevenueProfitReportView(BaseReportView):
             
             # Get sales for this period
             if grouping == 'daily':
-                period_sales = queryset.filter(created_at__date=period)
+                period_sales = self.filter_date_range(queryset, 'created_at', period, period)
             elif grouping == 'weekly':
                 period_sales = queryset.annotate(week=TruncWeek('created_at')).filter(week=period)
             else:  # monthly
@@ -987,8 +987,7 @@ class CollectionRatesReportView(BaseReportView):
 
         queryset = Sale.objects.filter(
             business_id=business_id,
-            created_at__date__gte=start_date,
-            created_at__date__lte=end_date,
+            **self.date_range_lookup('created_at', start_date, end_date),
             status__in=[
                 Sale.STATUS_COMPLETED,
                 Sale.STATUS_PARTIAL,
@@ -1294,8 +1293,8 @@ class CollectionRatesReportView(BaseReportView):
 
             # Get collected amount for this period's sales
             period_sales = queryset.filter(
-                created_at__date__gte=period_start,
-                created_at__date__lt=period_end
+                created_at__gte=day_start(period_start),
+                created_at__lt=day_start(period_end)
             )
 
             # Get collected amounts from payments for this period
@@ -1488,8 +1487,7 @@ class CashFlowReportView(BaseReportView):
 
         queryset = Payment.objects.filter(
             sale__business_id=business_id,
-            created_at__date__gte=start_date,
-            created_at__date__lte=end_date,
+            **self.date_range_lookup('created_at', start_date, end_date),
             status='SUCCESSFUL'
         )
 
@@ -1753,7 +1751,7 @@ class CashFlowReportView(BaseReportView):
             
             # Get retail inflows for this period
             if grouping == 'daily':
-                period_queryset = queryset.filter(created_at__date=period_date)
+                period_queryset = self.filter_date_range(queryset, 'created_at', period_date, period_date)
             elif grouping == 'weekly':
                 period_queryset = queryset.annotate(week=TruncWeek('created_at')).filter(week=period_date)
             else:  # monthly
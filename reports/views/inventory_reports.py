@@ -26,7 +26,7 @@ from inventory.models import Product, StockProduct, Warehouse, Category, Supplie
 from inventory.stock_adjustments import StockAdjustment
 from sales.models import Sale, SaleItem
 from reports.services.report_base import BaseReportView
-from reports.services import MovementTracker  # Phase 3: Use MovementTracker
+from reports.services import InvalidMovementCursor, MovementTracker  # Phase 3: Use MovementTracker
 from reports.utils.response import ReportResponse, ReportError
 from reports.utils.aggregation import AggregationHelper
 
@@ -595,7 +595,7 @@ class LowStockAlertsReportView(BaseReportView):
         
         # Calculate sales velocity per product
         sales_velocity = SaleItem.objects.filter(
-            sale__created_at__date__gte=thirty_days_ago,
+            **self.date_range_lookup('sale__created_at', thirty_days_ago),
             sale__status__in=['COMPLETED', 'PARTIAL']
         ).values('product').annotate(
             total_sold=Sum('quantity')
@@ -773,6 +773,9 @@ class StockMovementHistoryReportView(BaseReportView):
     - grouping: daily|weekly|monthly (default: daily)
     - page: int (pagination)
     - page_size: int (pagination, default: 50)
+    - cursor: String (optional - keyset pagination; send empty for the first
+      page, then meta.pagination.next_cursor. Only for date_desc/date_asc sorts)
+    - include_total: true|false|estimate (default: true for page, false for cursor)
     
     Response Format:
     {
@@ -817,6 +820,22 @@ class StockMovementHistoryReportView(BaseReportView):
         include_cancelled = request.GET.get('include_cancelled', 'false').lower() == 'true'
         sort_by = request.GET.get('sort_by', 'date_desc')  # date_desc|date_asc|quantity|product
         grouping = request.GET.get('grouping', 'daily')
+        cursor = request.GET.get('cursor')
+        if cursor:
+            try:
+                MovementTracker.decode_cursor(cursor, sort_by)
+            except InvalidMovementCursor as exc:
+                return ReportResponse.error(ReportError.create(
+                    ReportError.INVALID_FILTER,
+                    str(exc),
+                    {'parameter': 'cursor'}
+                ))
+        elif cursor is not None and sort_by not in MovementTracker.KEYSET_SORTS:
+            return ReportResponse.error(ReportError.create(
+                ReportError.INVALID_FILTER,
+                f"Cursor pagination is not supported for sort '{sort_by}'",
+                {'parameter': 'sort_by'}
+            ))
         
         # NEW: Resolve product filter (product_ids takes precedence)
         product_ids_filter = None
@@ -1103,53 +1122,76 @@ class StockMovementHistoryReportView(BaseReportView):
         sort_by: str = 'date_desc',
         include_cancelled: bool,
     ) -> tuple:
-        """Build paginated list of individual movements using MovementTracker."""
+        """
+        Build paginated list of individual movements using MovementTracker.
+
+        A ``cursor`` query param (empty for the first page) switches to keyset
+        pagination, where deep pages cost the same as the first and the total
+        is only computed when ``include_total`` asks for it.
+        """
         search_value = (search_term or '').strip() or None
         page, page_size = self.get_pagination_params(request)
         page_size = max(page_size, 1)
-        offset = max(0, (page - 1) * page_size)
         sort_option = sort_by or 'date_desc'
+        cursor = request.query_params.get('cursor')
 
-        total_count = MovementTracker.count_movements(
-            business_id=business_id,
-            warehouse_id=warehouse_id,
-            product_id=product_id,
-            product_ids=product_ids,  # NEW
-            category_id=category_id,
-            start_date=start_date,
-            end_date=end_date,
-            movement_types=movement_types,
-            adjustment_type=adjustment_type,
-            search=search_value,
-            include_cancelled=include_cancelled,
-        )
+        filters = {
+            'business_id': business_id,
+            'warehouse_id': warehouse_id,
+            'product_id': product_id,
+            'product_ids': product_ids,  # NEW
+            'category_id': category_id,
+            'start_date': start_date,
+            'end_date': end_date,
+            'movement_types': movement_types,
+            'adjustment_type': adjustment_type,
+            'search': search_value,
+            'include_cancelled': include_cancelled,
+        }
 
-        raw_movements = MovementTracker.get_paginated_movements(
-            business_id=business_id,
-            warehouse_id=warehouse_id,
-            product_id=product_id,
-            product_ids=product_ids,  # NEW
-            category_id=category_id,
-            start_date=start_date,
-            end_date=end_date,
-            movement_types=movement_types,
-            adjustment_type=adjustment_type,
-            search=search_value,
-            sort=sort_option,
-            limit=page_size,
-            offset=offset,
-            include_cancelled=include_cancelled,
-        )
+        include_total = request.query_params.get(
+            'include_total', 'false' if cursor is not None else 'true'
+        ).lower()
+        total_count = None
+        if include_total in ('true', 'estimate'):
+            total_count = MovementTracker.count_movements(
+                **filters,
+                estimate=include_total == 'estimate',
+            )
+
+        if cursor is not None:
+            movement_page = MovementTracker.get_movement_page(
+                **filters,
+                sort=sort_option,
+                limit=page_size,
+                cursor=cursor or None,
+            )
+            raw_movements = movement_page['results']
+            pagination = {
+                'page_size': page_size,
+                'next_cursor': movement_page['next_cursor'],
+                'has_more': movement_page['has_more'],
+            }
+        else:
+            raw_movements = MovementTracker.get_paginated_movements(
+                **filters,
+                sort=sort_option,
+                limit=page_size,
+                offset=max(0, (page - 1) * page_size),
+            )
+            pagination = {
+                'page': page,
+                'page_size': page_size,
+            }
 
         formatted = [self._format_movement_record(m) for m in raw_movements]
-        total_pages = math.ceil(total_count / page_size) if page_size else 1
 
-        pagination = {
-            'page': page,
-            'page_size': page_size,
-            'total_count': total_count,
-            'total_pages': total_pages
-        }
+        pagination['total_count'] = total_count
+        pagination['total_count_estimated'] = include_total == 'estimate'
+        if cursor is None:
+            pagination['total_pages'] = (
+                math.ceil(total_count / page_size) if total_count is not None else None
+            )
 
         return formatted, pagination
 
@@ -1317,6 +1359,7 @@ class StockMovementHistoryExportView(BaseReportView):
     """Stream stock movement history exports in CSV or XLSX formats."""
 
     permission_classes = [IsAuthenticated]
+    report_cache_timeout = 0
 
     CSV_HEADERS = [
         'Date',
@@ -1759,8 +1802,7 @@ class WarehouseAnalyticsReportView(BaseReportView):
         # Get sales for this product in the period
         sales_stats = SaleItem.objects.filter(
             product=stock_product.product,
-            sale__created_at__date__gte=start_date,
-            sale__created_at__date__lte=end_date,
+            **self.date_range_lookup('sale__created_at', start_date, end_date),
             sale__status__in=['COMPLETED', 'PARTIAL']
         ).aggregate(
             total_sold=Sum('quantity')
@@ -1792,8 +1834,7 @@ class WarehouseAnalyticsReportView(BaseReportView):
             # Check if product had any sales in period
             sales_count = SaleItem.objects.filter(
                 product=stock.product,
-                sale__created_at__date__gte=start_date,
-                sale__created_at__date__lte=end_date,
+                **self.date_range_lookup('sale__created_at', start_date, end_date),
                 sale__status__in=['COMPLETED', 'PARTIAL']
             ).count()
             
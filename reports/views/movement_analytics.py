@@ -17,11 +17,12 @@ from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django.db import connection
-from django.core.cache import cache
 from decimal import Decimal
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 
+from reports.services import movement_cache
+
 
 class MovementAnalyticsAPIView(APIView):
     """
@@ -128,26 +129,57 @@ class MovementAnalyticsAPIView(APIView):
                 'error': 'No business associated with user'
             }, status=400)
         
-        # Generate cache key
-        cache_key = self._generate_cache_key(
-            str(business.id), start_date, end_date, warehouse_id, category_id
+        # Cached per business and filters; the key includes the business's
+        # movement generation, so completed movements invalidate it
+        computed = []
+
+        def build():
+            computed.append(True)
+            return self._build_analytics(
+                business_id=str(business.id),
+                start_date=start_date,
+                end_date=end_date,
+                warehouse_id=warehouse_id,
+                category_id=category_id,
+                compare_previous=compare_previous
+            )
+
+        response_data = movement_cache.get_or_compute(
+            'analytics',
+            business.id,
+            {
+                'start_date': start_date,
+                'end_date': end_date,
+                'warehouse_id': warehouse_id,
+                'category_id': category_id,
+                'compare_previous': compare_previous,
+            },
+            build,
+            timeout=self.CACHE_DURATION
         )
-        
-        # Try to get from cache
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return Response({
-                'success': True,
-                'data': cached_data,
-                'cached': True
-            })
-        
+
+        return Response({
+            'success': True,
+            'data': response_data,
+            'cached': not computed
+        })
+
+    def _build_analytics(
+        self,
+        business_id: str,
+        start_date: str,
+        end_date: str,
+        warehouse_id: Optional[str],
+        category_id: Optional[str],
+        compare_previous: bool
+    ) -> Dict[str, Any]:
+        """Compute the full analytics payload"""
         # Calculate period info
         period_info = self._calculate_period_info(start_date, end_date)
         
         # Get KPIs
         kpis = self._get_kpis(
-            business_id=str(business.id),
+            business_id=business_id,
             start_date=start_date,
             end_date=end_date,
             warehouse_id=warehouse_id,
@@ -156,7 +188,7 @@ class MovementAnalyticsAPIView(APIView):
         
         # Get movement summary
         movement_summary = self._get_movement_summary(
-            business_id=str(business.id),
+            business_id=business_id,
             start_date=start_date,
             end_date=end_date,
             warehouse_id=warehouse_id,
@@ -165,7 +197,7 @@ class MovementAnalyticsAPIView(APIView):
         
         # Get trends
         trends = self._get_trends(
-            business_id=str(business.id),
+            business_id=business_id,
             start_date=start_date,
             end_date=end_date,
             warehouse_id=warehouse_id,
@@ -174,7 +206,7 @@ class MovementAnalyticsAPIView(APIView):
         
         # Get top movers
         top_movers = self._get_top_movers(
-            business_id=str(business.id),
+            business_id=business_id,
             start_date=start_date,
             end_date=end_date,
             warehouse_id=warehouse_id,
@@ -183,7 +215,7 @@ class MovementAnalyticsAPIView(APIView):
         
         # Get warehouse performance
         warehouse_performance = self._get_warehouse_performance(
-            business_id=str(business.id),
+            business_id=business_id,
             start_date=start_date,
             end_date=end_date,
             category_id=category_id
@@ -191,7 +223,7 @@ class MovementAnalyticsAPIView(APIView):
         
         # Get shrinkage analysis
         shrinkage_analysis = self._get_shrinkage_analysis(
-            business_id=str(business.id),
+            business_id=business_id,
             start_date=start_date,
             end_date=end_date,
             warehouse_id=warehouse_id,
@@ -212,7 +244,7 @@ class MovementAnalyticsAPIView(APIView):
         # Add comparison if requested
         if compare_previous:
             comparison = self._get_period_comparison(
-                business_id=str(business.id),
+                business_id=business_id,
                 start_date=start_date,
                 end_date=end_date,
                 current_kpis=kpis,
@@ -221,33 +253,7 @@ class MovementAnalyticsAPIView(APIView):
             )
             response_data['comparison'] = comparison
         
-        # Cache the result
-        cache.set(cache_key, response_data, self.CACHE_DURATION)
-        
-        return Response({
-            'success': True,
-            'data': response_data,
-            'cached': False
-        })
-    
-    def _generate_cache_key(
-        self,
-        business_id: str,
-        start_date: str,
-        end_date: str,
-        warehouse_id: Optional[str],
-        category_id: Optional[str]
-    ) -> str:
-        """Generate cache key for analytics data"""
-        key_parts = [
-            'movement_analytics',
-            business_id,
-            start_date,
-            end_date,
-            warehouse_id or 'all',
-            category_id or 'all'
-        ]
-        return ':'.join(key_parts)
+        return response_data
     
     def _calculate_period_info(self, start_date: str, end_date: str) -> Dict[str, Any]:
         """Calculate period information"""
@@ -18,6 +18,8 @@ from django.db import connection
 from decimal import Decimal
 from typing import Dict, Any, List, Optional
 
+from reports.services import movement_cache
+
 
 class ProductMovementSummaryAPIView(APIView):
     """
@@ -157,22 +159,22 @@ class ProductMovementSummaryAPIView(APIView):
                 'error': 'Product not found'
             }, status=404)
         
-        # Get movement breakdown
-        breakdown = self._get_movement_breakdown(
-            product_id=product_id,
-            business_id=str(business.id),
-            start_date=start_date,
-            end_date=end_date,
-            warehouse_id=warehouse_id
-        )
-        
-        # Get warehouse distribution
-        distribution = self._get_warehouse_distribution(
-            product_id=product_id,
-            business_id=str(business.id),
-            start_date=start_date,
-            end_date=end_date,
-            warehouse_id=warehouse_id
+        # Breakdown and distribution are cached per product and period until
+        # the business records another movement
+        filters = {
+            'product_id': product_id,
+            'start_date': start_date,
+            'end_date': end_date,
+            'warehouse_id': warehouse_id,
+        }
+        breakdown, distribution = movement_cache.get_or_compute(
+            'product_summary',
+            business.id,
+            filters,
+            lambda: (
+                self._get_movement_breakdown(business_id=str(business.id), **filters),
+                self._get_warehouse_distribution(business_id=str(business.id), **filters),
+            )
         )
         
         return Response({
@@ -12,12 +12,12 @@ allowing users to quickly find and filter products for drill-down analysis.
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from django.db.models import Q, F, Value, IntegerField, Case, When, Sum, Count
 from django.db import connection
 from decimal import Decimal
 from typing import List, Dict, Any
 
-from inventory.models import Product, StockProduct
+from inventory.models import Product
+from inventory.search import ProductSearch, annotate_current_stock
 from reports.services.movement_tracker import MovementTracker
 
 
@@ -66,59 +66,21 @@ class ProductSearchAPIView(APIView):
                 'error': 'No business associated with user'
             }, status=400)
         
-        # Search with relevance scoring
-        # Priority: Exact match > Starts with > Contains
-        products = Product.objects.filter(
-            business=business
-        ).filter(
-            Q(name__icontains=query) |
-            Q(sku__icontains=query) |
-            Q(description__icontains=query)
-        ).annotate(
-            # Relevance scoring for ranking
-            name_exact=Case(
-                When(name__iexact=query, then=Value(10)),
-                default=Value(0),
-                output_field=IntegerField()
-            ),
-            name_startswith=Case(
-                When(name__istartswith=query, then=Value(7)),
-                default=Value(0),
-                output_field=IntegerField()
-            ),
-            name_contains=Case(
-                When(name__icontains=query, then=Value(3)),
-                default=Value(0),
-                output_field=IntegerField()
-            ),
-            sku_exact=Case(
-                When(sku__iexact=query, then=Value(8)),
-                default=Value(0),
-                output_field=IntegerField()
-            ),
-            sku_startswith=Case(
-                When(sku__istartswith=query, then=Value(5)),
-                default=Value(0),
-                output_field=IntegerField()
-            ),
-            relevance=F('name_exact') + F('name_startswith') + F('name_contains') + 
-                      F('sku_exact') + F('sku_startswith')
-        ).order_by('-relevance', 'name')[:limit]
-        
-        # Calculate current stock for each product
-        results = []
-        for product in products:
-            current_stock = StockProduct.objects.filter(
-                product=product
-            ).aggregate(total=Sum('current_quantity'))['total'] or 0
-            
-            results.append({
+        # One ranked query: index-backed match, relevance and stock totals
+        products = annotate_current_stock(
+            ProductSearch(query).rank(Product.objects.filter(business=business))
+        ).select_related('category')[:limit]
+
+        results = [
+            {
                 'id': str(product.id),
                 'name': product.name,
                 'sku': product.sku,
                 'category': product.category.name if product.category else None,
-                'current_stock': float(current_stock)
-            })
+                'current_stock': float(product.current_stock)
+            }
+            for product in products
+        ]
         
         return Response({
             'success': True,
@@ -48,6 +48,7 @@ from reports.services.report_base import BaseReportView
 from reports.utils.response import ReportResponse, ReportError
 from reports.utils.aggregation import AggregationHelper, PercentageCalculator
 from reports.utils.profit_calculator import ProfitCalculator
+from reports.services.sales_rollup import SalesRollupReader
 
 
 class SalesSummaryReportView(BaseReportView):
@@ -105,10 +106,7 @@ class SalesSummaryReportView(BaseReportView):
         queryset = Sale.objects.filter(business_id=business_id)
         
         # Apply date filter
-        queryset = queryset.filter(
-            created_at__date__gte=start_date,
-            created_at__date__lte=end_date
-        )
+        queryset = self.filter_date_range(queryset, 'created_at', start_date, end_date)
         
         # Apply optional filters
         storefront_filters, error_response = self.get_storefront_filters(
@@ -131,6 +129,14 @@ class SalesSummaryReportView(BaseReportView):
         # Get period type
         period_type = request.query_params.get('period_type', 'daily')
         
+        # Daily totals: rollup table for closed days, raw sales for today
+        rollup_reader = SalesRollupReader(
+            business_id,
+            storefront_ids=storefront_ids,
+            sale_type=sale_type if sale_type in ['RETAIL', 'WHOLESALE'] else None,
+        )
+        daily_rows = rollup_reader.daily_rows(start_date, end_date)
+        
         # Build comparison data if requested
         compare_previous = request.query_params.get('compare_previous', 'true').lower() == 'true'
         comparison_data = None
@@ -142,29 +148,18 @@ class SalesSummaryReportView(BaseReportView):
             prev_end_date = start_date - timedelta(days=1)
             prev_start_date = prev_end_date - timedelta(days=days_diff - 1)
             
-            # Get previous period queryset
-            prev_queryset = Sale.objects.filter(
-                business_id=business_id,
-                status='COMPLETED',
-                created_at__date__gte=prev_start_date,
-                created_at__date__lte=prev_end_date
-            )
-            
-            # Apply same filters
-            if storefront_ids:
-                prev_queryset = prev_queryset.filter(storefront_id__in=storefront_ids)
-            if sale_type:
-                prev_queryset = prev_queryset.filter(type=sale_type)
-            
             comparison_data, growth_rate = self._build_comparison(
-                queryset, prev_queryset, prev_start_date, prev_end_date
+                daily_rows,
+                rollup_reader.daily_rows(prev_start_date, prev_end_date),
+                prev_start_date,
+                prev_end_date,
             )
         
         # Build summary (with growth rate from comparison)
-        summary = self._build_summary(queryset, start_date, end_date, period_type, growth_rate)
+        summary = self._build_summary(queryset, daily_rows, start_date, end_date, period_type, growth_rate)
         
         # Build breakdown (daily breakdown with frontend field names)
-        breakdown = self._build_period_breakdown(queryset, period_type)
+        breakdown = self._build_period_breakdown(queryset, daily_rows, period_type)
         
         # Build top selling hours
         top_selling_hours = self._build_hourly_analysis(queryset)
@@ -219,53 +214,44 @@ class SalesSummaryReportView(BaseReportView):
         
         return Response(response_data, status=http_status.HTTP_200_OK)
     
-    def _build_summary(self, queryset, start_date, end_date, period_type, growth_rate) -> Dict[str, Any]:
+    def _build_summary(self, queryset, daily_rows, start_date, end_date, period_type, growth_rate) -> Dict[str, Any]:
         """Build summary metrics matching frontend SalesSummary interface"""
         
+        totals = SalesRollupReader.totals(daily_rows)
+        
         # Total transactions (renamed from total_sales)
-        total_transactions = queryset.count()
+        total_transactions = totals['sale_count']
         
         # Total sales revenue
-        total_sales = AggregationHelper.sum_field(queryset, 'total_amount')
+        total_sales = totals['revenue']
         
         # Total discounts given
-        total_discounts_given = AggregationHelper.sum_field(queryset, 'discount_amount')
+        total_discounts_given = totals['discount_total']
         
         # Net sales (sales - discounts)
         net_sales = total_sales - total_discounts_given
         
         # Average transaction value (renamed from average_order_value)
-        average_transaction_value = AggregationHelper.avg_field(queryset, 'total_amount')
+        average_transaction_value = self._average(total_sales, total_transactions)
         
         # Total items sold
-        total_items_sold = SaleItem.objects.filter(
-            sale__in=queryset
-        ).aggregate(
-            total=Sum('quantity')
-        )['total'] or 0
+        total_items_sold = totals['items_sold'] or 0
         
-        # Total unique customers
+        # Total unique customers (distinct counts cannot be summed per day)
         total_customers = queryset.filter(
             customer__isnull=False
         ).values('customer').distinct().count()
         
         # Retail vs Wholesale breakdown
-        retail_sales = queryset.filter(type='RETAIL')
-        wholesale_sales = queryset.filter(type='WHOLESALE')
-        
-        retail_metrics = {
-            'transactions': retail_sales.count(),
-            'revenue': float(AggregationHelper.sum_field(retail_sales, 'total_amount')),
-            'average_value': float(AggregationHelper.avg_field(retail_sales, 'total_amount')),
-            'items_sold': SaleItem.objects.filter(sale__in=retail_sales).aggregate(total=Sum('quantity'))['total'] or 0,
-        }
-        
-        wholesale_metrics = {
-            'transactions': wholesale_sales.count(),
-            'revenue': float(AggregationHelper.sum_field(wholesale_sales, 'total_amount')),
-            'average_value': float(AggregationHelper.avg_field(wholesale_sales, 'total_amount')),
-            'items_sold': SaleItem.objects.filter(sale__in=wholesale_sales).aggregate(total=Sum('quantity'))['total'] or 0,
-        }
+        channel_metrics = {}
+        for channel in ('RETAIL', 'WHOLESALE'):
+            channel_totals = SalesRollupReader.totals(daily_rows, sale_type=channel)
+            channel_metrics[channel] = {
+                'transactions': channel_totals['sale_count'],
+                'revenue': float(channel_totals['revenue']),
+                'average_value': float(self._average(channel_totals['revenue'], channel_totals['sale_count'])),
+                'items_sold': channel_totals['items_sold'] or 0,
+            }
         
         return {
             'total_sales': float(total_sales),
@@ -276,8 +262,8 @@ class SalesSummaryReportView(BaseReportView):
             'total_discounts_given': float(total_discounts_given),
             'net_sales': float(net_sales),
             'growth_rate': float(growth_rate),
-            'retail': retail_metrics,
-            'wholesale': wholesale_metrics,
+            'retail': channel_metrics['RETAIL'],
+            'wholesale': channel_metrics['WHOLESALE'],
             'period': {
                 'start': str(start_date),
                 'end': str(end_date),
@@ -285,39 +271,40 @@ class SalesSummaryReportView(BaseReportView):
             }
         }
     
-    def _build_period_breakdown(self, queryset, period_type) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _average(total: Decimal, count: int) -> Decimal:
+        """Average value rounded like AggregationHelper.avg_field"""
+        if not count or not total:
+            return Decimal('0.00')
+        return round(total / count, 2)
+    
+    def _build_period_breakdown(self, queryset, daily_rows, period_type) -> List[Dict[str, Any]]:
         """Build period breakdown matching frontend SalesBreakdown interface"""
         
-        # Group by date
-        daily_data = queryset.annotate(
-            date=TruncDate('created_at')
-        ).values('date').annotate(
-            revenue=Sum('total_amount'),
-            transaction_count=Count('id')
-        ).order_by('date')
+        # Unique customers per day still come from the sale headers
+        customers_by_day = dict(
+            queryset.filter(customer__isnull=False)
+            .annotate(date=TruncDate('created_at'))
+            .values('date')
+            .annotate(customers=Count('customer', distinct=True))
+            .values_list('date', 'customers')
+        )
         
         breakdown = []
-        for item in daily_data:
-            day_date = item['date']
-            day_sales = queryset.filter(created_at__date=day_date)
-            
-            # Count items sold for this day
-            items_sold = SaleItem.objects.filter(
-                sale__in=day_sales
-            ).aggregate(total=Sum('quantity'))['total'] or 0
-            
-            # Count unique customers for this day
-            customers = day_sales.filter(
-                customer__isnull=False
-            ).values('customer').distinct().count()
+        for day_date, rows in SalesRollupReader.group(daily_rows, lambda day: day).items():
+            day_totals = SalesRollupReader.totals(rows)
+            transaction_count = day_totals['sale_count']
+            if not transaction_count:
+                continue
+            revenue = day_totals['revenue']
             
             breakdown.append({
                 'period': str(day_date),
-                'sales': float(item['revenue']),
-                'transactions': item['transaction_count'],
-                'avg_value': float(item['revenue'] / item['transaction_count']) if item['transaction_count'] > 0 else 0.0,
-                'items_sold': items_sold,
-                'customers': customers
+                'sales': float(revenue),
+                'transactions': transaction_count,
+                'avg_value': float(revenue / transaction_count) if transaction_count > 0 else 0.0,
+                'items_sold': day_totals['items_sold'] or 0,
+                'customers': customers_by_day.get(day_date, 0)
             })
         
         return breakdown
@@ -344,16 +331,16 @@ class SalesSummaryReportView(BaseReportView):
         
         return top_hours
     
-    def _build_comparison(self, current_queryset, previous_queryset, prev_start, prev_end):
+    def _build_comparison(self, current_rows, previous_rows, prev_start, prev_end):
         """Build previous period comparison matching frontend PeriodComparison interface"""
         
         # Current period metrics
-        current_sales = AggregationHelper.sum_field(current_queryset, 'total_amount')
-        current_transactions = current_queryset.count()
+        current_sales = SalesRollupReader.totals(current_rows)['revenue']
         
         # Previous period metrics
-        previous_sales = AggregationHelper.sum_field(previous_queryset, 'total_amount')
-        previous_transactions = previous_queryset.count()
+        previous_totals = SalesRollupReader.totals(previous_rows)
+        previous_sales = previous_totals['revenue']
+        previous_transactions = previous_totals['sale_count']
         
         # Calculate growth rate
         if previous_sales > 0:
@@ -440,7 +427,7 @@ class SalesSummaryReportView(BaseReportView):
         
         # Add count and average
         for item in daily_data:
-            date_sales = queryset.filter(created_at__date=item['date'])
+            date_sales = self.filter_date_range(queryset, 'created_at', item['date'], item['date'])
             item['count'] = date_sales.count()
             item['revenue'] = float(item.pop('value', 0))
             item['average'] = float(
@@ -472,10 +459,7 @@ class SalesSummaryReportView(BaseReportView):
         queryset = Sale.objects.filter(business_id=business_id)
         
         # Apply date filter
-        queryset = queryset.filter(
-            created_at__date__gte=start_date,
-            created_at__date__lte=end_date
-        )
+        queryset = self.filter_date_range(queryset, 'created_at', start_date, end_date)
         
         # Apply optional filters
         storefront_filters, error_response = self.get_storefront_filters(
@@ -499,8 +483,13 @@ class SalesSummaryReportView(BaseReportView):
         period_type = request.query_params.get('period_type', 'daily')
         
         # Build data
-        summary = self._build_summary(queryset, start_date, end_date, period_type, 0.0)
-        breakdown = self._build_period_breakdown(queryset, period_type)
+        daily_rows = SalesRollupReader(
+            business_id,
+            storefront_ids=storefront_ids,
+            sale_type=sale_type if sale_type in ['RETAIL', 'WHOLESALE'] else None,
+        ).daily_rows(start_date, end_date)
+        summary = self._build_summary(queryset, daily_rows, start_date, end_date, period_type, 0.0)
+        breakdown = self._build_period_breakdown(queryset, daily_rows, period_type)
         top_hours = self._build_hourly_analysis(queryset)
         
         # Export based on format
@@ -847,8 +836,8 @@ class ProductPerformanceReportView(BaseReportView):
             sale__business_id=business_id,
             sale__status='COMPLETED'
         ).filter(
-            Q(sale__completed_at__date__gte=start_date, sale__completed_at__date__lte=end_date) |
-            Q(sale__completed_at__isnull=True, sale__created_at__date__gte=start_date, sale__created_at__date__lte=end_date)
+            Q(**self.date_range_lookup('sale__completed_at', start_date, end_date)) |
+            Q(sale__completed_at__isnull=True, **self.date_range_lookup('sale__created_at', start_date, end_date))
         ).select_related('product', 'sale')
         
         # Apply filters
@@ -1067,8 +1056,8 @@ class ProductPerformanceReportView(BaseReportView):
             sale__business_id=business_id,
             sale__status='COMPLETED'
         ).filter(
-            Q(sale__completed_at__date__gte=start_date, sale__completed_at__date__lte=end_date) |
-            Q(sale__completed_at__isnull=True, sale__created_at__date__gte=start_date, sale__created_at__date__lte=end_date)
+            Q(**self.date_range_lookup('sale__completed_at', start_date, end_date)) |
+            Q(sale__completed_at__isnull=True, **self.date_range_lookup('sale__created_at', start_date, end_date))
         ).select_related('product', 'sale')
         
         # Apply filters
@@ -1423,8 +1412,7 @@ class CustomerAnalyticsReportView(BaseReportView):
             business_id=business_id,
             status='COMPLETED',
             customer__isnull=False,  # Only sales with customers
-            created_at__date__gte=start_date,
-            created_at__date__lte=end_date
+            **self.date_range_lookup('created_at', start_date, end_date)
         )
         
         # Apply optional filters
@@ -1746,7 +1734,6 @@ class RevenueTrendsReportView(BaseReportView):
     permission_classes = [IsAuthenticated]
     
     def get(self, request, *args, **kwargs):
-        from django.db.models.functions import TruncDate, TruncWeek, TruncMonth
         from datetime import timedelta
 
         export_format = request.query_params.get('export_format', '').lower()
@@ -1769,14 +1756,6 @@ class RevenueTrendsReportView(BaseReportView):
         # Get comparison flag
         compare = request.query_params.get('compare', '').lower() == 'true'
         
-        # Get base queryset
-        queryset = Sale.objects.filter(
-            business_id=business_id,
-            status='COMPLETED',
-            created_at__date__gte=start_date,
-            created_at__date__lte=end_date
-        )
-        
         # Apply optional filters
         storefront_filters, error_response = self.get_storefront_filters(
             request,
@@ -1785,8 +1764,10 @@ class RevenueTrendsReportView(BaseReportView):
         if error_response:
             return error_response
         storefront_ids = storefront_filters['ids']
-        if storefront_ids:
-            queryset = queryset.filter(storefront_id__in=storefront_ids)
+        
+        # Daily totals: rollup table for closed days, raw sales for today
+        rollup_reader = SalesRollupReader(business_id, storefront_ids=storefront_ids)
+        daily_rows = rollup_reader.daily_rows(start_date, end_date)
         
         # Get previous period data if comparison requested
         previous_data = None
@@ -1795,26 +1776,17 @@ class RevenueTrendsReportView(BaseReportView):
             prev_end = start_date - timedelta(days=1)
             prev_start = prev_end - timedelta(days=duration)
             
-            prev_queryset = Sale.objects.filter(
-                business_id=business_id,
-                status='COMPLETED',
-                created_at__date__gte=prev_start,
-                created_at__date__lte=prev_end
-            )
-            if storefront_ids:
-                prev_queryset = prev_queryset.filter(storefront_id__in=storefront_ids)
-            
             previous_data = {
                 'start_date': prev_start,
                 'end_date': prev_end,
-                'queryset': prev_queryset
+                'rows': rollup_reader.daily_rows(prev_start, prev_end)
             }
         
         # Build summary
-        summary = self._build_summary(queryset, start_date, end_date, previous_data)
+        summary = self._build_summary(daily_rows, start_date, end_date, previous_data)
         
         # Build results (time-series data)
-        trends = self._build_time_series(queryset, grouping, start_date, end_date)
+        trends = self._build_time_series(daily_rows, grouping, start_date, end_date)
         
         # Build patterns (analytics insights)
         patterns = self._build_patterns(trends, summary)
@@ -1853,13 +1825,14 @@ class RevenueTrendsReportView(BaseReportView):
             metadata=metadata
         )
     def _build_summary(
-        self, queryset, start_date, end_date, previous_data
+        self, daily_rows, start_date, end_date, previous_data
     ) -> Dict[str, Any]:
         """Build summary metrics"""
         
-        total_revenue = AggregationHelper.sum_field(queryset, 'total_amount')
-        total_orders = queryset.count()
-        total_profit = ProfitCalculator.calculate_total_profit(queryset)
+        totals = SalesRollupReader.totals(daily_rows)
+        total_revenue = totals['revenue']
+        total_orders = totals['sale_count']
+        total_profit = totals['profit']
         
         # Calculate averages
         days_in_period = (end_date - start_date).days + 1
@@ -1873,41 +1846,34 @@ class RevenueTrendsReportView(BaseReportView):
             Decimal(str(total_orders))
         ) if total_orders > 0 else Decimal('0.00')
         
-        # Build RETAIL metrics
-        retail_queryset = queryset.filter(type='RETAIL')
-        retail_revenue = AggregationHelper.sum_field(retail_queryset, 'total_amount')
-        retail_orders = retail_queryset.count()
-        retail_profit = ProfitCalculator.calculate_total_profit(retail_queryset)
-        retail_avg_order_value = AggregationHelper.safe_divide(
-            retail_revenue,
-            Decimal(str(retail_orders))
-        ) if retail_orders > 0 else Decimal('0.00')
-        retail_profit_margin = AggregationHelper.calculate_percentage(
-            retail_profit, retail_revenue
-        ) if retail_revenue > 0 else Decimal('0.00')
-        
-        # Build WHOLESALE metrics
-        wholesale_queryset = queryset.filter(type='WHOLESALE')
-        wholesale_revenue = AggregationHelper.sum_field(wholesale_queryset, 'total_amount')
-        wholesale_orders = wholesale_queryset.count()
-        wholesale_profit = ProfitCalculator.calculate_total_profit(wholesale_queryset)
-        wholesale_avg_order_value = AggregationHelper.safe_divide(
-            wholesale_revenue,
-            Decimal(str(wholesale_orders))
-        ) if wholesale_orders > 0 else Decimal('0.00')
-        wholesale_profit_margin = AggregationHelper.calculate_percentage(
-            wholesale_profit, wholesale_revenue
-        ) if wholesale_revenue > 0 else Decimal('0.00')
+        # Build RETAIL / WHOLESALE metrics
+        channels = {}
+        for channel in ('RETAIL', 'WHOLESALE'):
+            channel_totals = SalesRollupReader.totals(daily_rows, sale_type=channel)
+            revenue = channel_totals['revenue']
+            orders = channel_totals['sale_count']
+            profit = channel_totals['profit']
+            channels[channel] = {
+                'revenue': float(revenue),
+                'profit': float(profit),
+                'profit_margin': float(
+                    AggregationHelper.calculate_percentage(profit, revenue)
+                    if revenue > 0 else Decimal('0.00')
+                ),
+                'orders': orders,
+                'avg_order_value': float(
+                    AggregationHelper.safe_divide(revenue, Decimal(str(orders)))
+                    if orders > 0 else Decimal('0.00')
+                ),
+            }
         
         # Find peak day
-        daily_sales = queryset.extra(
-            select={'date': 'DATE(created_at)'}
-        ).values('date').annotate(
-            revenue=Sum('total_amount')
-        ).order_by('-revenue').first()
-        
-        peak_day = daily_sales['date'] if daily_sales else None
-        peak_revenue = Decimal(str(daily_sales['revenue'])) if daily_sales else Decimal('0.00')
+        daily_revenue = {
+            day: SalesRollupReader.totals(rows)['revenue']
+            for day, rows in SalesRollupReader.group(daily_rows, lambda day: day).items()
+        }
+        peak_day = max(daily_revenue, key=daily_revenue.get) if daily_revenue else None
+        peak_revenue = daily_revenue[peak_day] if peak_day else Decimal('0.00')
         
         # Calculate overall profit margin
         profit_margin = AggregationHelper.calculate_percentage(
@@ -1927,31 +1893,18 @@ class RevenueTrendsReportView(BaseReportView):
             'peak_revenue': float(peak_revenue),
             
             # Retail breakdown
-            'retail': {
-                'revenue': float(retail_revenue),
-                'profit': float(retail_profit),
-                'profit_margin': float(retail_profit_margin),
-                'orders': retail_orders,
-                'avg_order_value': float(retail_avg_order_value),
-            },
+            'retail': channels['RETAIL'],
             
             # Wholesale breakdown
-            'wholesale': {
-                'revenue': float(wholesale_revenue),
-                'profit': float(wholesale_profit),
-                'profit_margin': float(wholesale_profit_margin),
-                'orders': wholesale_orders,
-                'avg_order_value': float(wholesale_avg_order_value),
-            },
+            'wholesale': channels['WHOLESALE'],
         }
         
         # Add comparison if previous period data provided
         if previous_data:
-            prev_revenue = AggregationHelper.sum_field(
-                previous_data['queryset'], 'total_amount'
-            )
-            prev_orders = previous_data['queryset'].count()
-            prev_profit = ProfitCalculator.calculate_total_profit(previous_data['queryset'])
+            previous_totals = SalesRollupReader.totals(previous_data['rows'])
+            prev_revenue = previous_totals['revenue']
+            prev_orders = previous_totals['sale_count']
+            prev_profit = previous_totals['profit']
             
             revenue_growth = AggregationHelper.calculate_growth_rate(
                 total_revenue, prev_revenue
@@ -1981,106 +1934,44 @@ class RevenueTrendsReportView(BaseReportView):
         
         return summary
     
+    # Payment types reported under each payment_methods bucket
+    PAYMENT_METHOD_BUCKETS = {
+        'CASH': 'cash',
+        'CARD': 'card',
+        'CREDIT': 'credit',
+        'MOBILE': 'gcash',
+        'GCASH': 'gcash',
+    }
+    
     def _build_time_series(
-        self, queryset, grouping: str, start_date, end_date
+        self, daily_rows, grouping: str, start_date, end_date
     ) -> List[Dict[str, Any]]:
         """Build time-series data"""
         
-        from django.db.models.functions import TruncDate, TruncWeek, TruncMonth
-        
-        # Select truncation function based on grouping
-        trunc_func = {
-            'daily': TruncDate('created_at'),
-            'weekly': TruncWeek('created_at'),
-            'monthly': TruncMonth('created_at'),
+        # Map each day to the start of its period
+        period_of = {
+            'daily': lambda day: day,
+            'weekly': lambda day: day - timedelta(days=day.weekday()),
+            'monthly': lambda day: day.replace(day=1),
         }[grouping]
         
-        # Group by period - OVERALL
-        time_series = list(
-            queryset
-            .annotate(period=trunc_func)
-            .values('period')
-            .annotate(
-                revenue=Sum('total_amount'),
-                order_count=Count('id')
-            )
-            .order_by('period')
-        )
-        
-        # Group by period - RETAIL
-        retail_time_series = {}
-        retail_data = queryset.filter(type='RETAIL').annotate(period=trunc_func).values('period').annotate(
-            revenue=Sum('total_amount'),
-            order_count=Count('id')
-        )
-        for item in retail_data:
-            retail_time_series[str(item['period'])] = {
-                'revenue': Decimal(str(item['revenue'] or 0)),
-                'orders': item['order_count']
-            }
-        
-        # Group by period - WHOLESALE
-        wholesale_time_series = {}
-        wholesale_data = queryset.filter(type='WHOLESALE').annotate(period=trunc_func).values('period').annotate(
-            revenue=Sum('total_amount'),
-            order_count=Count('id')
-        )
-        for item in wholesale_data:
-            wholesale_time_series[str(item['period'])] = {
-                'revenue': Decimal(str(item['revenue'] or 0)),
-                'orders': item['order_count']
-            }
-        
-        # Calculate profit for each period
-        # Note: We need to calculate profit separately for each period since it's not a direct field
-        period_profits = {}
-        for item in time_series:
-            period = item['period']
-            
-            # Filter sales for this period based on grouping type
-            if grouping == 'daily':
-                # period is already a date object from TruncDate
-                period_sales = queryset.filter(created_at__date=period)
-            elif grouping == 'weekly':
-                # For weekly, filter by the week start date (period is a datetime)
-                period_sales = queryset.annotate(week=TruncWeek('created_at')).filter(week=period)
-            elif grouping == 'monthly':
-                # For monthly, filter by the month start date (period is a datetime)
-                period_sales = queryset.annotate(month=TruncMonth('created_at')).filter(month=period)
-            else:
-                # Default to daily filtering
-                period_sales = queryset.filter(created_at__date=period)
-            
-            period_profits[str(period)] = ProfitCalculator.calculate_total_profit(period_sales)
-        
         # Format results
         results = []
         prev_revenue = None
         
-        for idx, item in enumerate(time_series):
-            revenue = Decimal(str(item['revenue'] or 0))
-            profit = period_profits.get(str(item['period']), Decimal('0.00'))
-            order_count = item['order_count']
+        for period, rows in SalesRollupReader.group(daily_rows, period_of).items():
+            period_totals = SalesRollupReader.totals(rows)
+            order_count = period_totals['sale_count']
+            if not order_count:
+                continue
+            revenue = period_totals['revenue']
+            profit = period_totals['profit']
             
             # Get retail/wholesale data for this period
-            period_key = str(item['period'])
-            retail_data = retail_time_series.get(period_key, {'revenue': Decimal('0'), 'orders': 0})
-            wholesale_data = wholesale_time_series.get(period_key, {'revenue': Decimal('0'), 'orders': 0})
-            
-            # Get payment methods breakdown for this period
-            if grouping == 'daily':
-                period_sales = queryset.filter(created_at__date=item['period'])
-            elif grouping == 'weekly':
-                period_sales = queryset.annotate(week=TruncWeek('created_at')).filter(week=item['period'])
-            elif grouping == 'monthly':
-                period_sales = queryset.annotate(month=TruncMonth('created_at')).filter(month=item['period'])
-            else:
-                period_sales = queryset.filter(created_at__date=item['period'])
+            retail_totals = SalesRollupReader.totals(rows, sale_type='RETAIL')
+            wholesale_totals = SalesRollupReader.totals(rows, sale_type='WHOLESALE')
             
             # Get payment totals by method (using Sale.payment_type field)
-            payment_breakdown = period_sales.values('payment_type').annotate(
-                total=Sum('total_amount')
-            )
             payment_methods = {
                 'cash': Decimal('0'),
                 'card': Decimal('0'),
@@ -2088,21 +1979,9 @@ class RevenueTrendsReportView(BaseReportView):
                 'gcash': Decimal('0'),
                 'other': Decimal('0'),
             }
-            for payment in payment_breakdown:
-                method = payment['payment_type']
-                if method:
-                    method_lower = method.lower()
-                    # Map payment types to our standard categories
-                    if method_lower == 'cash':
-                        payment_methods['cash'] = Decimal(str(payment['total'] or 0))
-                    elif method_lower == 'card':
-                        payment_methods['card'] = Decimal(str(payment['total'] or 0))
-                    elif method_lower == 'credit':
-                        payment_methods['credit'] = Decimal(str(payment['total'] or 0))
-                    elif method_lower in ['mobile', 'gcash']:
-                        payment_methods['gcash'] += Decimal(str(payment['total'] or 0))
-                    else:
-                        payment_methods['other'] += Decimal(str(payment['total'] or 0))
+            for row in rows:
+                bucket = self.PAYMENT_METHOD_BUCKETS.get((row['payment_type'] or '').upper(), 'other')
+                payment_methods[bucket] += row['revenue']
             
             # Calculate profit margin
             profit_margin = AggregationHelper.calculate_percentage(
@@ -2124,19 +2003,8 @@ class RevenueTrendsReportView(BaseReportView):
                 elif growth_rate < -5:
                     trend = 'down'
             
-            # Convert period to ISO format string
-            period_value = item['period']
-            if period_value:
-                # Check if it's already a date or needs conversion from datetime
-                if hasattr(period_value, 'date') and not isinstance(period_value, date):
-                    period_str = period_value.date().isoformat()
-                else:
-                    period_str = period_value.isoformat()
-            else:
-                period_str = None
-            
             result = {
-                'period': period_str,
+                'period': period.isoformat(),
                 'revenue': float(revenue),
                 'profit': float(profit),
                 'profit_margin': float(profit_margin),
@@ -2147,19 +2015,19 @@ class RevenueTrendsReportView(BaseReportView):
                 
                 # Retail breakdown
                 'retail': {
-                    'revenue': float(retail_data['revenue']),
-                    'orders': retail_data['orders'],
+                    'revenue': float(retail_totals['revenue']),
+                    'orders': retail_totals['sale_count'],
                     'avg_order_value': float(
-                        retail_data['revenue'] / retail_data['orders'] if retail_data['orders'] > 0 else 0
+                        retail_totals['revenue'] / retail_totals['sale_count'] if retail_totals['sale_count'] > 0 else 0
                     ),
                 },
                 
                 # Wholesale breakdown
                 'wholesale': {
-                    'revenue': float(wholesale_data['revenue']),
-                    'orders': wholesale_data['orders'],
+                    'revenue': float(wholesale_totals['revenue']),
+                    'orders': wholesale_totals['sale_count'],
                     'avg_order_value': float(
-                        wholesale_data['revenue'] / wholesale_data['orders'] if wholesale_data['orders'] > 0 else 0
+                        wholesale_totals['revenue'] / wholesale_totals['sale_count'] if wholesale_totals['sale_count'] > 0 else 0
                     ),
                 },
                 
@@ -2397,6 +2265,8 @@ class ReportStorefrontListView(BaseReportView):
     """Return storefronts available to the current user for report filters."""
 
     permission_classes = [IsAuthenticated]
+    # Depends on the user's storefront access, not only on business data
+    report_cache_timeout = 0
 
     def get(self, request, *args, **kwargs):
         business_id, error = self.get_business_or_error(request)
@@ -40,6 +40,7 @@ from inventory.models import Warehouse, StockProduct, StoreFront, StoreFrontInve
 from inventory.transfer_models import Transfer
 from sales.models import Sale, SaleItem
 from accounts.models import Business
+from reports.utils.date_utils import date_range_lookup
 
 logger = logging.getLogger(__name__)
 
@@ -323,7 +324,7 @@ class WarehouseAnalyticsAPIView(APIView):
         if warehouse_type == 'storefront':
             cogs_data = SaleItem.objects.filter(
                 sale__storefront=warehouse,
-                sale__created_at__date__range=[start_date, end_date],
+                **date_range_lookup('sale__created_at', start_date, end_date),
                 sale__status__in=['COMPLETED', 'PARTIAL']
             ).annotate(
                 item_cost=ExpressionWrapper(
@@ -443,7 +444,7 @@ class WarehouseAnalyticsAPIView(APIView):
             # Get products that have recent sales
             products_with_recent_sales = SaleItem.objects.filter(
                 sale__storefront=warehouse,
-                sale__created_at__date__gte=threshold_date,
+                **date_range_lookup('sale__created_at', threshold_date),
                 sale__status__in=['COMPLETED', 'PARTIAL']
             ).values_list('product_id', flat=True).distinct()
             all_products = StoreFrontInventory.objects.filter(
@@ -477,7 +478,7 @@ class WarehouseAnalyticsAPIView(APIView):
             # Inbound: Sales (to this storefront)
             sales_count = SaleItem.objects.filter(
                 sale__storefront=warehouse,
-                sale__created_at__date__range=[start_date, end_date]
+                **date_range_lookup('sale__created_at', start_date, end_date)
             ).aggregate(count=Count('id'))['count'] or 0
             inbound = sales_count
             outbound = sales_count
@@ -485,7 +486,7 @@ class WarehouseAnalyticsAPIView(APIView):
             transfers_in = Transfer.objects.filter(
                 destination_storefront=warehouse,
                 status=Transfer.STATUS_COMPLETED,
-                completed_at__date__range=[start_date, end_date]
+                **date_range_lookup('completed_at', start_date, end_date)
             ).count()
             transfers_out = 0  # Storefronts do not initiate transfers in current workflow
             inbound += transfers_in
@@ -497,12 +498,12 @@ class WarehouseAnalyticsAPIView(APIView):
             transfers_in = Transfer.objects.filter(
                 destination_warehouse=warehouse,
                 status=Transfer.STATUS_COMPLETED,
-                completed_at__date__range=[start_date, end_date]
+                **date_range_lookup('completed_at', start_date, end_date)
             ).count()
             transfers_out = Transfer.objects.filter(
                 source_warehouse=warehouse,
                 status=Transfer.STATUS_COMPLETED,
-                completed_at__date__range=[start_date, end_date]
+                **date_range_lookup('completed_at', start_date, end_date)
             ).count()
             inbound += transfers_in
             outbound += transfers_out
@@ -537,7 +538,7 @@ class WarehouseAnalyticsAPIView(APIView):
 
         top_products = SaleItem.objects.filter(
             sale__storefront=warehouse,
-            sale__created_at__date__range=[start_date, end_date],
+            **date_range_lookup('sale__created_at', start_date, end_date),
             sale__status__in=['COMPLETED', 'PARTIAL']
         ).values(
             'product_id',
@@ -0,0 +1,347 @@
+"""
+Maintenance of CustomerMetrics.
+
+A customer's row summarises every COMPLETED or PARTIAL sale they have:
+order count, gross/refunded/net revenue, profit, first and last purchase,
+favourite category and the spacing between purchases.
+
+The Sale methods that move a sale into or out of a counted status (or change
+its amounts) run inside ``track_customer_metrics``, next to
+``track_sale_rollup``. It applies the difference between that one sale's
+contribution before and after the change with ``F()`` increments, so the cost
+of a checkout does not grow with the customer's history (sales without a
+customer go to the business's walk-in customer, which has a lot of it).
+Favourite category and purchase-interval stats need the whole history; they
+are set from the first sale when a row is created and otherwise kept by
+``rebuild_customer_metrics``, which recomputes whole businesses nightly.
+
+``build_customer_metrics`` is shared by the rebuild and by the report views'
+live fallback, so stored and live figures are computed the same way.
+"""
+
+from collections import defaultdict
+from contextlib import contextmanager
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, DateTimeField, F, Max, Min, Sum, Value
+from django.db.models.functions import Coalesce, Greatest, Least
+
+ZERO = Decimal('0.00')
+
+# Sale statuses that count as purchases
+COUNTED_STATUSES = ('COMPLETED', 'PARTIAL')
+
+# Row fields that are sums of per-sale contributions
+METRIC_TOTALS = ('order_count', 'gross_revenue', 'amount_refunded', 'net_revenue', 'profit')
+
+# Row fields a rebuild writes
+METRIC_FIELDS = (
+    'business_id',
+    *METRIC_TOTALS,
+    'first_purchase_at',
+    'last_purchase_at',
+    'last_order_at',
+    'favorite_category',
+    'avg_purchase_interval_days',
+    'max_purchase_interval_days',
+)
+
+
+def _interval_stats(purchase_dates) -> Tuple[Optional[Decimal], Optional[int]]:
+    """Mean and longest gap in days between consecutive purchase dates."""
+    if len(purchase_dates) < 2:
+        return None, None
+    gaps = [
+        (purchase_dates[idx] - purchase_dates[idx - 1]).days
+        for idx in range(1, len(purchase_dates))
+    ]
+    average = (Decimal(sum(gaps)) / Decimal(len(gaps))).quantize(Decimal('0.01'))
+    return average, max(gaps)
+
+
+def build_customer_metrics(sale_queryset) -> Dict[object, Dict]:
+    """
+    Aggregate counted sales into CustomerMetrics field values.
+
+    Returns:
+        dict: ``{customer_id: {field: value}}`` for customers with at least one purchase
+    """
+    from reports.utils.profit_calculator import ProfitCalculator
+    from .models import SaleItem
+
+    sales = sale_queryset.filter(
+        status__in=COUNTED_STATUSES,
+        customer__isnull=False,
+        customer__business__isnull=False,
+    ).order_by()
+
+    header_rows = list(
+        sales.values('customer_id', 'customer__business_id')
+        .annotate(
+            order_count=Count('id'),
+            gross_revenue=Coalesce(Sum('total_amount'), ZERO),
+            amount_refunded=Coalesce(Sum('amount_refunded'), ZERO),
+            first_purchase_at=Min('created_at'),
+            last_purchase_at=Max('created_at'),
+            last_order_at=Max(Coalesce('completed_at', 'created_at', output_field=DateTimeField())),
+        )
+    )
+    if not header_rows:
+        return {}
+
+    purchase_dates = defaultdict(list)
+    customer_by_sale = {}
+    for sale_id, customer_id, created_at in (
+        sales.values_list('id', 'customer_id', 'created_at').order_by('customer_id', 'created_at')
+    ):
+        customer_by_sale[sale_id] = customer_id
+        purchase_dates[customer_id].append(created_at.date())
+
+    profits = defaultdict(lambda: ZERO)
+    for sale_id, costs in ProfitCalculator.calculate_sale_costs(sales).items():
+        profits[customer_by_sale[sale_id]] += ProfitCalculator.to_decimal(costs.get('profit'))
+
+    favorites = {}
+    for row in (
+        SaleItem.objects.filter(sale__in=sales)
+        .values('sale__customer_id', 'product__category__name')
+        .annotate(total_revenue=Coalesce(Sum('total_price'), ZERO))
+        .order_by('sale__customer_id', '-total_revenue')
+    ):
+        favorites.setdefault(row['sale__customer_id'], row['product__category__name'] or '')
+
+    metrics = {}
+    for row in header_rows:
+        customer_id = row['customer_id']
+        average_interval, max_interval = _interval_stats(purchase_dates[customer_id])
+        metrics[customer_id] = {
+            'business_id': row['customer__business_id'],
+            'order_count': row['order_count'],
+            'gross_revenue': row['gross_revenue'],
+            'amount_refunded': row['amount_refunded'],
+            'net_revenue': row['gross_revenue'] - row['amount_refunded'],
+            'profit': profits[customer_id],
+            'first_purchase_at': row['first_purchase_at'],
+            'last_purchase_at': row['last_purchase_at'],
+            'last_order_at': row['last_order_at'],
+            'favorite_category': favorites.get(customer_id, ''),
+            'avg_purchase_interval_days': average_interval,
+            'max_purchase_interval_days': max_interval,
+        }
+    return metrics
+
+
+def _sale_contribution(sale_queryset) -> Optional[Dict]:
+    """What one sale adds to its customer's row (None if it does not count)."""
+    from reports.utils.profit_calculator import ProfitCalculator
+
+    row = (
+        sale_queryset.filter(
+            status__in=COUNTED_STATUSES,
+            customer__isnull=False,
+            customer__business__isnull=False,
+        )
+        .values('id', 'customer_id', 'customer__business_id', 'total_amount', 'amount_refunded',
+                'created_at', 'completed_at')
+        .first()
+    )
+    if row is None:
+        return None
+
+    costs = ProfitCalculator.calculate_sale_costs(sale_queryset.filter(pk=row['id'])).get(row['id'], {})
+    gross_revenue = row['total_amount'] or ZERO
+    amount_refunded = row['amount_refunded'] or ZERO
+    return {
+        'sale_id': row['id'],
+        'customer_id': row['customer_id'],
+        'business_id': row['customer__business_id'],
+        'order_count': 1,
+        'gross_revenue': gross_revenue,
+        'amount_refunded': amount_refunded,
+        'net_revenue': gross_revenue - amount_refunded,
+        'profit': ProfitCalculator.to_decimal(costs.get('profit')),
+        'created_at': row['created_at'],
+        'order_at': row['completed_at'] or row['created_at'],
+    }
+
+
+def _sale_top_category(sale_id) -> str:
+    from .models import SaleItem
+
+    row = (
+        SaleItem.objects.filter(sale_id=sale_id)
+        .values('product__category__name')
+        .annotate(total_revenue=Coalesce(Sum('total_price'), ZERO))
+        .order_by('-total_revenue')
+        .first()
+    )
+    return (row or {}).get('product__category__name') or ''
+
+
+def _add_sale(contribution: Dict, sign: int = 1) -> None:
+    """Add (or with ``sign=-1`` subtract) the totals of a sale that stays counted."""
+    from .models import CustomerMetrics
+
+    increments = {
+        field: F(field) + sign * contribution[field]
+        for field in METRIC_TOTALS
+        if contribution[field]
+    }
+    if increments:
+        CustomerMetrics.objects.filter(customer_id=contribution['customer_id']).update(**increments)
+
+
+def _count_sale(contribution: Dict) -> None:
+    """A sale became counted: add its totals and widen the purchase bounds."""
+    from .models import CustomerMetrics
+
+    rows = CustomerMetrics.objects.filter(customer_id=contribution['customer_id'])
+    changes = {field: F(field) + contribution[field] for field in METRIC_TOTALS}
+    changes.update(
+        first_purchase_at=Least(F('first_purchase_at'), Value(contribution['created_at'])),
+        last_purchase_at=Greatest(F('last_purchase_at'), Value(contribution['created_at'])),
+        last_order_at=Greatest(F('last_order_at'), Value(contribution['order_at'])),
+    )
+    if rows.update(**changes):
+        return
+    try:
+        with transaction.atomic():
+            CustomerMetrics.objects.create(
+                customer_id=contribution['customer_id'],
+                business_id=contribution['business_id'],
+                **{field: contribution[field] for field in METRIC_TOTALS},
+                first_purchase_at=contribution['created_at'],
+                last_purchase_at=contribution['created_at'],
+                last_order_at=contribution['order_at'],
+                favorite_category=_sale_top_category(contribution['sale_id']),
+            )
+    except IntegrityError:
+        # Another transaction created the row first
+        rows.update(**changes)
+
+
+def _uncount_sale(contribution: Dict) -> None:
+    """
+    A sale stopped counting (refunded in full or cancelled): subtract its totals.
+
+    Bounds cannot be decremented, so they are re-read from the customer's
+    counted sales only when the sale sat on one of them.
+    """
+    from .models import CustomerMetrics, Sale
+
+    _add_sale(contribution, sign=-1)
+    rows = CustomerMetrics.objects.filter(customer_id=contribution['customer_id'])
+    row = rows.values('order_count', 'first_purchase_at', 'last_purchase_at', 'last_order_at').first()
+    if row is None:
+        return
+    if row['order_count'] <= 0:
+        rows.delete()
+        return
+    if (
+        contribution['created_at'] in (row['first_purchase_at'], row['last_purchase_at'])
+        or contribution['order_at'] == row['last_order_at']
+    ):
+        bounds = Sale.objects.filter(
+            customer_id=contribution['customer_id'],
+            status__in=COUNTED_STATUSES,
+        ).aggregate(
+            first_purchase_at=Min('created_at'),
+            last_purchase_at=Max('created_at'),
+            last_order_at=Max(Coalesce('completed_at', 'created_at', output_field=DateTimeField())),
+        )
+        rows.update(**bounds)
+
+
+def apply_sale_change(before: Optional[Dict], after: Optional[Dict]) -> None:
+    """Apply the change in one sale's contribution to its customer's row."""
+    if before and after and before['customer_id'] == after['customer_id']:
+        _add_sale({
+            'customer_id': after['customer_id'],
+            **{field: after[field] - before[field] for field in METRIC_TOTALS},
+        })
+        return
+    if before:
+        _uncount_sale(before)
+    if after:
+        _count_sale(after)
+
+
+@contextmanager
+def track_customer_metrics(sale):
+    """
+    Keep the customer's metrics in step with whatever the wrapped block does to ``sale``.
+
+    Nested use on the same instance (cancel_sale calling process_refund) is
+    handled by the outermost block only.
+    """
+    from .models import Sale
+
+    if getattr(sale, '_metrics_tracking', False) or sale.pk is None:
+        yield
+        return
+
+    sale._metrics_tracking = True
+    try:
+        with transaction.atomic():
+            current = Sale.objects.filter(pk=sale.pk)
+            before = _sale_contribution(current)
+            yield
+            apply_sale_change(before, _sale_contribution(current))
+    finally:
+        sale._metrics_tracking = False
+
+
+def _store_metrics(customer_ids: List, metrics: Dict[object, Dict]) -> None:
+    """Upsert the computed rows by customer and drop rows of customers without purchases."""
+    from .models import CustomerMetrics
+
+    with transaction.atomic():
+        CustomerMetrics.objects.filter(customer_id__in=customer_ids).exclude(
+            customer_id__in=list(metrics)
+        ).delete()
+        CustomerMetrics.objects.bulk_create(
+            [
+                CustomerMetrics(customer_id=customer_id, **values)
+                for customer_id, values in metrics.items()
+            ],
+            update_conflicts=True,
+            unique_fields=['customer'],
+            update_fields=[*METRIC_FIELDS, 'updated_at'],
+        )
+
+
+def refresh_customer_metrics(customer_ids: Iterable) -> int:
+    """Recompute the rows for the given customers from their whole sales history."""
+    from .models import Sale
+
+    customer_ids = [customer_id for customer_id in set(customer_ids) if customer_id]
+    if not customer_ids:
+        return 0
+    metrics = build_customer_metrics(Sale.objects.filter(customer_id__in=customer_ids))
+    _store_metrics(customer_ids, metrics)
+    return len(metrics)
+
+
+def rebuild_customer_metrics(business_id=None, batch_size: int = 500) -> int:
+    """
+    Recompute every customer's row, ``batch_size`` customers per transaction.
+
+    Rows of customers that no longer have purchases are removed.
+    """
+    from .models import Customer
+
+    customers = Customer.objects.order_by('pk')
+    if business_id:
+        customers = customers.filter(business_id=business_id)
+
+    written = 0
+    last_pk = None
+    while True:
+        page = customers if last_pk is None else customers.filter(pk__gt=last_pk)
+        batch = list(page.values_list('pk', flat=True)[:batch_size])
+        if not batch:
+            return written
+        written += refresh_customer_metrics(batch)
+        last_pk = batch[-1]
@@ -0,0 +1,96 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from sales.models import DailySalesRollup, Sale
+from sales.rollups import build_rollup_rows, rebuild_rollup_day
+
+
+class Command(BaseCommand):
+    """Rebuild DailySalesRollup rows from completed sales."""
+
+    help = (
+        "Recompute the daily sales rollup from Sale and SaleItem rows, one day per "
+        "transaction. Existing rollup rows for each processed day are replaced."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--start-date",
+            help="First day to rebuild (YYYY-MM-DD). Defaults to the earliest sale.",
+        )
+        parser.add_argument(
+            "--end-date",
+            help="Last day to rebuild (YYYY-MM-DD). Defaults to today.",
+        )
+        parser.add_argument(
+            "--business",
+            dest="business_id",
+            help="Limit to a specific business UUID.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report how many rollup rows each day would have without writing.",
+        )
+
+    def _parse_date(self, value, label):
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            raise CommandError(f"Invalid {label}: {value}. Use YYYY-MM-DD.")
+
+    def handle(self, *args, **options):
+        business_id = options.get("business_id")
+        dry_run = options.get("dry_run")
+
+        sales = Sale.objects.all()
+        if business_id:
+            sales = sales.filter(business_id=business_id)
+
+        bounds = sales.aggregate(first=Min("created_at"), last=Max("created_at"))
+        if bounds["first"] is None:
+            self.stdout.write(self.style.WARNING("No sales found; nothing to backfill."))
+            return
+
+        start_date = (
+            self._parse_date(options["start_date"], "--start-date")
+            if options.get("start_date")
+            else timezone.localdate(bounds["first"])
+        )
+        end_date = (
+            self._parse_date(options["end_date"], "--end-date")
+            if options.get("end_date")
+            else timezone.localdate()
+        )
+        if start_date > end_date:
+            raise CommandError("--start-date must be on or before --end-date.")
+
+        days = 0
+        rows = 0
+        day = start_date
+        while day <= end_date:
+            if dry_run:
+                day_rows = len(build_rollup_rows(sales.filter(created_at__date=day)))
+                existing = DailySalesRollup.objects.filter(date=day)
+                if business_id:
+                    existing = existing.filter(business_id=business_id)
+                if day_rows or existing.exists():
+                    self.stdout.write(f"{day}: {day_rows} rollup rows (currently {existing.count()})")
+            else:
+                day_rows = rebuild_rollup_day(day, business_id=business_id)
+            if day_rows:
+                days += 1
+                rows += day_rows
+            day += timedelta(days=1)
+
+        if dry_run:
+            self.stdout.write(
+                self.style.SUCCESS(f"Dry run complete. {rows} rollup rows across {days} days would be written.")
+            )
+        else:
+            self.stdout.write(
+                self.style.SUCCESS(f"Backfill complete. Wrote {rows} rollup rows across {days} days.")
+            )
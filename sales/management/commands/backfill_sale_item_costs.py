@@ -0,0 +1,64 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from sales.models import SaleItem
+
+
+class Command(BaseCommand):
+    """Fill SaleItem.unit_cost/total_cost on rows created before the cost snapshot."""
+
+    help = (
+        "Snapshot the landed unit cost onto sale items that have no unit_cost yet, "
+        "in primary-key batches. Costs are resolved the same way as at sale time."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Sale items resolved and written per transaction (default: 1000).",
+        )
+        parser.add_argument(
+            "--business",
+            dest="business_id",
+            help="Limit to sales of a specific business UUID.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report how many sale items would be filled without writing.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options["batch_size"])
+
+        pending = SaleItem.objects.filter(unit_cost__isnull=True)
+        if options.get("business_id"):
+            pending = pending.filter(sale__business_id=options["business_id"])
+
+        if options.get("dry_run"):
+            self.stdout.write(
+                self.style.SUCCESS(f"Dry run complete. {pending.count()} sale items would be filled.")
+            )
+            return
+
+        filled = 0
+        last_pk = None
+        while True:
+            batch = pending.select_related("stock_product").order_by("pk")
+            if last_pk is not None:
+                batch = batch.filter(pk__gt=last_pk)
+            items = list(batch[:batch_size])
+            if not items:
+                break
+            with transaction.atomic():
+                filled += SaleItem.snapshot_costs(items)
+            last_pk = items[-1].pk
+            self.stdout.write(f"Filled {filled} sale items...")
+
+        self.stdout.write(self.style.SUCCESS(f"Backfill complete. Filled {filled} sale items."))
+        if filled:
+            self.stdout.write(
+                "Run backfill_daily_sales_rollups for the affected dates so rollup costs match."
+            )
@@ -0,0 +1,164 @@
+import time
+import uuid
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import Business
+from inventory.models import (
+    BusinessStoreFront,
+    Category,
+    Product,
+    Stock,
+    StockProduct,
+    StoreFront,
+    StoreFrontInventory,
+    Warehouse,
+)
+from sales.models import Sale, SaleItem
+
+
+User = get_user_model()
+
+
+class _Rollback(Exception):
+    """Raised to discard the synthetic benchmark data."""
+
+
+class Command(BaseCommand):
+    """Measure how long Sale.commit_stock holds inventory row locks."""
+
+    help = (
+        "Benchmark Sale.commit_stock for sales of different sizes using synthetic data. "
+        "All data is created inside a transaction that is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--lines",
+            nargs="+",
+            type=int,
+            default=[1, 10, 100],
+            help="Sale sizes (number of lines) to benchmark. Defaults to 1 10 100.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Number of sales to complete per size; the median is reported.",
+        )
+        parser.add_argument(
+            "--warehouse",
+            action="store_true",
+            help="Benchmark warehouse (StockProduct) deductions instead of storefront inventory.",
+        )
+
+    def handle(self, *args, **options):
+        sizes = sorted(set(options["lines"]))
+        repeat = max(1, options["repeat"])
+        warehouse_mode = options["warehouse"]
+
+        results = []
+        try:
+            with transaction.atomic():
+                fixture = self._build_fixture(max(sizes))
+                for size in sizes:
+                    timings = []
+                    queries = 0
+                    for _ in range(repeat):
+                        sale = self._build_sale(fixture, size, warehouse_mode)
+                        with CaptureQueriesContext(connection) as captured:
+                            started = time.perf_counter()
+                            with transaction.atomic():
+                                sale.commit_stock()
+                            timings.append(time.perf_counter() - started)
+                        queries = len(captured.captured_queries)
+                    timings.sort()
+                    results.append((size, timings[len(timings) // 2], queries))
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        mode = "warehouse" if warehouse_mode else "storefront"
+        self.stdout.write(f"Sale.commit_stock lock-hold time ({mode} inventory, median of {repeat}):")
+        self.stdout.write(f"{'lines':>8} {'ms':>10} {'ms/line':>10} {'queries':>8}")
+        for size, elapsed, queries in results:
+            millis = elapsed * 1000
+            self.stdout.write(f"{size:>8} {millis:>10.2f} {millis / size:>10.3f} {queries:>8}")
+        self.stdout.write(self.style.SUCCESS("Benchmark complete; synthetic data rolled back."))
+
+    def _build_fixture(self, product_count):
+        suffix = uuid.uuid4().hex[:8]
+        owner = User.objects.create_user(
+            email=f"bench-{suffix}@example.com",
+            password=uuid.uuid4().hex,
+            name="Benchmark Owner",
+        )
+        business = Business.objects.create(
+            owner=owner,
+            name=f"Benchmark {suffix}",
+            tin=f"TIN-BENCH-{suffix}",
+            email=f"bench-{suffix}@example.com",
+            address="Benchmark",
+        )
+        storefront = StoreFront.objects.create(user=owner, name=f"Bench Front {suffix}", location="Bench")
+        BusinessStoreFront.objects.create(business=business, storefront=storefront)
+        warehouse = Warehouse.objects.create(name=f"Bench Warehouse {suffix}", location="Bench")
+        category = Category.objects.create(name=f"Bench Category {suffix}")
+        stock = Stock.objects.create(business=business)
+
+        products = Product.objects.bulk_create([
+            Product(business=business, name=f"Bench Product {index}", sku=f"BENCH-{suffix}-{index}", category=category)
+            for index in range(product_count)
+        ])
+        stock_products = StockProduct.objects.bulk_create([
+            StockProduct(
+                stock=stock,
+                warehouse=warehouse,
+                product=product,
+                quantity=1_000_000,
+                calculated_quantity=1_000_000,
+                unit_cost=Decimal("1.00"),
+                retail_price=Decimal("2.00"),
+            )
+            for product in products
+        ])
+        StoreFrontInventory.objects.bulk_create([
+            StoreFrontInventory(storefront=storefront, product=product, quantity=1_000_000)
+            for product in products
+        ])
+        return {
+            "owner": owner,
+            "business": business,
+            "storefront": storefront,
+            "stock_products": stock_products,
+        }
+
+    def _build_sale(self, fixture, size, warehouse_mode):
+        sale = Sale.objects.create(
+            business=fixture["business"],
+            storefront=fixture["storefront"],
+            user=fixture["owner"],
+            status="DRAFT",
+        )
+        items = []
+        for stock_product in fixture["stock_products"][:size]:
+            item = SaleItem(
+                sale=sale,
+                product=stock_product.product,
+                stock_product=stock_product,
+                quantity=Decimal("1"),
+                unit_price=Decimal("2.00"),
+                product_name=stock_product.product.name,
+                product_sku=stock_product.product.sku,
+            )
+            item.calculate_totals()
+            items.append(item)
+        SaleItem.objects.bulk_create(items)
+        if warehouse_mode:
+            # Sale.storefront is required; clear it in memory only to exercise the warehouse path
+            sale.storefront_id = None
+        return sale
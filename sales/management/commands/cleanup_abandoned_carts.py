@@ -110,8 +110,7 @@ class Command(BaseCommand):
                         status='ACTIVE'
                     )
                     
-                    count = reservations.count()
-                    reservations.update(status='EXPIRED')
+                    count = StockReservation.release_many(reservations, status='EXPIRED')
                     released_reservations += count
                     
                     # Delete the sale
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+
+from sales.customer_metrics import rebuild_customer_metrics
+from sales.models import CustomerMetrics
+
+
+class Command(BaseCommand):
+    """Rebuild CustomerMetrics rows from completed sales."""
+
+    help = (
+        "Recompute lifetime purchase metrics for every customer from their COMPLETED "
+        "and PARTIAL sales, one batch of customers per transaction. Runs nightly via "
+        "the sales.tasks.rebuild_customer_metrics Celery task."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--business",
+            dest="business_id",
+            help="Limit to a specific business UUID.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Customers per transaction (default: 500).",
+        )
+
+    def handle(self, *args, **options):
+        business_id = options.get("business_id")
+        written = rebuild_customer_metrics(
+            business_id=business_id,
+            batch_size=max(1, options["batch_size"]),
+        )
+
+        rows = CustomerMetrics.objects.all()
+        if business_id:
+            rows = rows.filter(business_id=business_id)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuild complete. Wrote metrics for {written} customers ({rows.count()} rows stored)."
+            )
+        )
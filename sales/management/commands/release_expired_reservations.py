@@ -2,6 +2,7 @@ from django.core.management.base import BaseCommand
 from django.utils import timezone
 
 from sales.models import StockReservation
+from sales.reservation_expiry import release_expired_reservations
 
 
 class Command(BaseCommand):
@@ -23,18 +24,33 @@ class Command(BaseCommand):
             action="store_true",
             help="Print the reservations that are being released.",
         )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            help="Reservations released per transaction (defaults to RESERVATION_EXPIRY_BATCH_SIZE).",
+        )
+        parser.add_argument(
+            "--max-batches",
+            type=int,
+            help="Stop after this many batches (defaults to RESERVATION_EXPIRY_MAX_BATCHES; 0 = no limit).",
+        )
 
     def handle(self, *args, **options):
         dry_run: bool = options["dry_run"]
         verbose: bool = options["verbose"]
+        now = timezone.now()
 
         expired_qs = (
-            StockReservation.objects.filter(status="ACTIVE", expires_at__lt=timezone.now())
+            StockReservation.objects.filter(status="ACTIVE", expires_at__lt=now)
             .select_related("stock_product__product")
             .order_by("expires_at")
         )
-        expired = list(expired_qs)
-        count = len(expired)
+        if dry_run or verbose:
+            expired = list(expired_qs)
+            count = len(expired)
+        else:
+            expired = []
+            count = expired_qs.count()
 
         if count == 0:
             self.stdout.write(self.style.SUCCESS("No expired reservations found."))
@@ -45,8 +61,20 @@ class Command(BaseCommand):
                 self.style.WARNING(f"{count} expired reservations would be released (dry-run).")
             )
         else:
-            released = StockReservation.release_expired()
-            self.stdout.write(self.style.SUCCESS(f"Released {released} expired reservations."))
+            stats = release_expired_reservations(
+                now=now,
+                batch_size=options.get("batch_size"),
+                max_batches=options.get("max_batches"),
+            )
+            for number, batch in enumerate(stats.batches, start=1):
+                self.stdout.write(
+                    f"Batch {number}: released {batch.released} in {batch.seconds * 1000:.1f} ms"
+                )
+            self.stdout.write(self.style.SUCCESS(f"Released {stats.released} expired reservations."))
+            if not stats.exhausted:
+                self.stdout.write(
+                    self.style.WARNING("Batch limit reached; remaining reservations will be released on the next run.")
+                )
 
         if verbose:
             for reservation in expired:
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.6 on 2026-10-16 09:05
+
+from django.db import migrations
+from django.db.models import Sum
+
+
+def backfill_reserved_quantity(apps, schema_editor):
+    """Seed StockProduct.reserved_quantity from existing ACTIVE reservations."""
+    StockProduct = apps.get_model('inventory', 'StockProduct')
+    StockReservation = apps.get_model('sales', 'StockReservation')
+
+    totals = (
+        StockReservation.objects.filter(status='ACTIVE')
+        .values('stock_product')
+        .annotate(total=Sum('quantity'))
+    )
+    for row in totals:
+        StockProduct.objects.filter(pk=row['stock_product']).update(reserved_quantity=row['total'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0026_stockproduct_reserved_quantity'),
+        ('sales', '0009_create_walk_in_customers'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_reserved_quantity, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.6 on 2026-10-16 10:20
+
+import uuid
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_reservation_storefronts(apps, schema_editor):
+    """Copy the owning sale's storefront onto reservations keyed by sale ID."""
+    Sale = apps.get_model('sales', 'Sale')
+    StockReservation = apps.get_model('sales', 'StockReservation')
+
+    session_ids = set()
+    for cart_session_id in (
+        StockReservation.objects.filter(storefront__isnull=True)
+        .values_list('cart_session_id', flat=True)
+        .distinct()
+        .iterator()
+    ):
+        try:
+            session_ids.add(uuid.UUID(str(cart_session_id)))
+        except (TypeError, ValueError):
+            continue
+
+    session_ids = list(session_ids)
+    batch_size = 1000
+    for start in range(0, len(session_ids), batch_size):
+        batch = session_ids[start:start + batch_size]
+        sessions_by_storefront = {}
+        for sale_id, storefront_id in Sale.objects.filter(id__in=batch).values_list('id', 'storefront_id'):
+            sessions_by_storefront.setdefault(storefront_id, []).append(str(sale_id))
+        for storefront_id, sale_ids in sessions_by_storefront.items():
+            StockReservation.objects.filter(
+                cart_session_id__in=sale_ids,
+                storefront__isnull=True,
+            ).update(storefront_id=storefront_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0026_stockproduct_reserved_quantity'),
+        ('sales', '0010_backfill_stockproduct_reserved_quantity'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='stockreservation',
+            name='storefront',
+            field=models.ForeignKey(blank=True, help_text='Storefront of the cart sale holding this reservation', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='stock_reservations', to='inventory.storefront'),
+        ),
+        migrations.AddIndex(
+            model_name='stockreservation',
+            index=models.Index(fields=['storefront', 'status', 'stock_product'], name='stock_reser_storefr_a6910f_idx'),
+        ),
+        migrations.RunPython(backfill_reservation_storefronts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.6 on 2026-10-16 11:40
+
+import uuid
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0026_stockproduct_reserved_quantity'),
+        ('sales', '0011_stockreservation_storefront'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReceiptSequence',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('sequence_date', models.DateField()),
+                ('last_value', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('storefront', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='receipt_sequences', to='inventory.storefront')),
+            ],
+            options={
+                'db_table': 'receipt_sequences',
+                'constraints': [models.UniqueConstraint(fields=('storefront', 'sequence_date'), name='receipt_sequence_unique_storefront_date')],
+            },
+        ),
+    ]
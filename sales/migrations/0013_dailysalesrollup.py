@@ -0,0 +1,45 @@
+# Generated by Django 5.2.6 on 2026-10-16 13:05
+
+import uuid
+from decimal import Decimal
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0011_one_user_one_business'),
+        ('inventory', '0026_stockproduct_reserved_quantity'),
+        ('sales', '0012_receiptsequence'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailySalesRollup',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('date', models.DateField()),
+                ('sale_type', models.CharField(choices=[('RETAIL', 'Retail'), ('WHOLESALE', 'Wholesale')], max_length=20)),
+                ('payment_type', models.CharField(choices=[('CASH', 'Cash'), ('CARD', 'Card'), ('MOBILE', 'Mobile Money'), ('CREDIT', 'Credit'), ('MIXED', 'Mixed Payment')], max_length=20)),
+                ('sale_count', models.IntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('cost', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('profit', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('tax_total', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('discount_total', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('refund_total', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('items_sold', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('business', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_sales_rollups', to='accounts.business')),
+                ('storefront', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_sales_rollups', to='inventory.storefront')),
+            ],
+            options={
+                'db_table': 'daily_sales_rollups',
+                'ordering': ['date'],
+                'indexes': [models.Index(fields=['business', 'date'], name='daily_sales_busines_23fdc3_idx')],
+                'constraints': [models.UniqueConstraint(fields=('business', 'storefront', 'date', 'sale_type', 'payment_type'), name='daily_sales_rollup_unique_key')],
+            },
+        ),
+    ]
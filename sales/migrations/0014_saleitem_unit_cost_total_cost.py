@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-16 15:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sales', '0013_dailysalesrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='saleitem',
+            name='unit_cost',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=12, null=True),
+        ),
+        migrations.AddField(
+            model_name='saleitem',
+            name='total_cost',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=14, null=True),
+        ),
+    ]
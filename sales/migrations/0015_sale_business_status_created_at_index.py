@@ -0,0 +1,17 @@
+# Generated by Django 5.2.6 on 2026-10-16 16:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sales', '0014_saleitem_unit_cost_total_cost'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='sale',
+            index=models.Index(fields=['business', 'status', 'created_at'], name='sales_busines_cfe85d_idx'),
+        ),
+    ]
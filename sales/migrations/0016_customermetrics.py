@@ -0,0 +1,42 @@
+# Generated by Django 5.2.6 on 2026-10-16 22:10
+
+import django.db.models.deletion
+import uuid
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0011_one_user_one_business'),
+        ('sales', '0015_sale_business_status_created_at_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CustomerMetrics',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('order_count', models.IntegerField(default=0)),
+                ('gross_revenue', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('amount_refunded', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('net_revenue', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('profit', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('first_purchase_at', models.DateTimeField()),
+                ('last_purchase_at', models.DateTimeField()),
+                ('last_order_at', models.DateTimeField()),
+                ('favorite_category', models.CharField(blank=True, default='', max_length=255)),
+                ('avg_purchase_interval_days', models.DecimalField(blank=True, decimal_places=2, help_text='Mean days between consecutive purchases (null with a single purchase)', max_digits=10, null=True)),
+                ('max_purchase_interval_days', models.IntegerField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('business', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='customer_metrics', to='accounts.business')),
+                ('customer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='metrics', to='sales.customer')),
+            ],
+            options={
+                'verbose_name_plural': 'Customer metrics',
+                'db_table': 'customer_metrics',
+                'indexes': [models.Index(fields=['business', 'first_purchase_at'], name='customer_me_busines_593d6b_idx'), models.Index(fields=['business', 'last_purchase_at'], name='customer_me_busines_96b319_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.6 on 2026-10-16 23:40
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sales', '0016_customermetrics'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReceiptArtifact',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('format', models.CharField(choices=[('json', 'JSON'), ('html', 'HTML'), ('pdf', 'PDF')], max_length=10)),
+                ('digest', models.CharField(help_text='sha256 of content', max_length=64)),
+                ('content', models.BinaryField()),
+                ('content_type', models.CharField(max_length=100)),
+                ('source_updated_at', models.DateTimeField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('sale', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='receipt_artifacts', to='sales.sale')),
+            ],
+            options={
+                'db_table': 'receipt_artifacts',
+                'constraints': [models.UniqueConstraint(fields=('sale', 'format'), name='unique_receipt_artifact_format')],
+            },
+        ),
+    ]
@@ -1,6 +1,6 @@
 import uuid
 from django.db import models, transaction
-from django.db.models import Sum
+from django.db.models import Case, F, Sum, Value, When
 from django.contrib.auth import get_user_model
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.core.exceptions import ValidationError
@@ -8,8 +8,13 @@ from django.utils import timezone
 from decimal import Decimal
 from datetime import timedelta
 
+from inventory.catalog import invalidate_storefront_catalogs
 from inventory.models import StoreFront, Product, Stock, StockProduct, StoreFrontInventory
+from inventory.movement_ledger import record_refund_movements, record_sale_movements
 from accounts.models import Business
+from .receipt_artifacts import RECEIPT_STATUSES, schedule_receipt_render
+from .customer_metrics import track_customer_metrics
+from .rollups import track_sale_rollup
 
 
 User = get_user_model()
@@ -246,6 +251,14 @@ class StockReservation(models.Model):
         db_index=True,
         help_text="Sale ID or session ID for cart"
     )
+    storefront = models.ForeignKey(
+        StoreFront,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='stock_reservations',
+        help_text="Storefront of the cart sale holding this reservation"
+    )
     status = models.CharField(
         max_length=20,
         choices=STATUS_CHOICES,
@@ -265,6 +278,7 @@ class StockReservation(models.Model):
             models.Index(fields=['stock_product', 'status']),
             models.Index(fields=['cart_session_id', 'status']),
             models.Index(fields=['expires_at', 'status']),
+            models.Index(fields=['storefront', 'status', 'stock_product']),
         ]
     
     def __str__(self):
@@ -287,11 +301,25 @@ class StockReservation(models.Model):
         Raises:
             ValidationError: If insufficient stock available
         """
-        from django.utils import timezone
-        from datetime import timedelta
-        
+        with transaction.atomic():
+            # Lock the stock row so concurrent carts see a consistent reserved total
+            locked_stock_product = (
+                StockProduct.objects.select_for_update()
+                .only('id', 'calculated_quantity', 'reserved_quantity')
+                .get(pk=stock_product.pk)
+            )
+            reservation = cls._create_locked_reservation(
+                stock_product, locked_stock_product, quantity, cart_session_id, expiry_minutes
+            )
+            stock_product.reserved_quantity = locked_stock_product.reserved_quantity + Decimal(str(quantity))
+
+        return reservation
+
+    @classmethod
+    def _create_locked_reservation(cls, stock_product, locked_stock_product, quantity, cart_session_id, expiry_minutes):
+        """Validate availability and create the reservation while the stock row is locked."""
         # Check available stock (unreserved quantity)
-        available = stock_product.get_available_quantity()
+        available = locked_stock_product.get_available_quantity()
 
         sale_instance = None
         try:
@@ -310,30 +338,11 @@ class StockReservation(models.Model):
             )
 
             if storefront_inventory:
-                active_reservations = cls.objects.filter(
-                    stock_product__product=stock_product.product,
+                reserved_for_storefront = cls.objects.filter(
+                    storefront_id=sale_instance.storefront_id,
+                    stock_product__product_id=stock_product.product_id,
                     status='ACTIVE',
-                )
-
-                reservation_sale_ids = []
-                for reservation in active_reservations:
-                    try:
-                        reservation_sale_ids.append(uuid.UUID(str(reservation.cart_session_id)))
-                    except (TypeError, ValueError):
-                        continue
-
-                storefront_map = {}
-                if reservation_sale_ids:
-                    storefront_map = {
-                        str(sale.id): sale.storefront_id
-                        for sale in Sale.objects.filter(id__in=reservation_sale_ids).only('id', 'storefront_id')
-                    }
-
-                reserved_for_storefront = Decimal('0.00')
-                for reservation in active_reservations:
-                    storefront_id = storefront_map.get(reservation.cart_session_id)
-                    if storefront_id == sale_instance.storefront_id:
-                        reserved_for_storefront += Decimal(reservation.quantity)
+                ).aggregate(total=Sum('quantity'))['total'] or Decimal('0.00')
 
                 available_storefront = Decimal(str(storefront_inventory.quantity)) - reserved_for_storefront
                 if available_storefront < Decimal('0.00'):
@@ -357,41 +366,213 @@ class StockReservation(models.Model):
         expires_at = timezone.now() + timedelta(minutes=expiry_minutes)
         reservation = cls.objects.create(
             stock_product=stock_product,
+            storefront_id=sale_instance.storefront_id if sale_instance else None,
             quantity=quantity,
             cart_session_id=cart_session_id,
             expires_at=expires_at,
             status='ACTIVE'
         )
+        cls._apply_reserved_deltas({stock_product.pk: Decimal(str(quantity))})
         
         return reservation
-    
+
     @classmethod
-    def release_expired(cls):
-        """Release all expired reservations"""
-        from django.utils import timezone
-        
-        expired = cls.objects.filter(
-            status='ACTIVE',
-            expires_at__lt=timezone.now()
+    def create_reservations(cls, lines, cart_session_id, storefront=None, expiry_minutes=30):
+        """
+        Reserve stock for several cart lines in one all-or-nothing step.
+
+        Every StockProduct and StoreFrontInventory row involved is locked once,
+        in primary-key order, and availability is checked in memory so lines
+        drawing on the same stock see each other's quantities.
+
+        Args:
+            lines: Sequence of (stock_product, quantity) pairs
+            cart_session_id: Sale ID or session identifier
+            storefront: Storefront of the cart sale, if any
+            expiry_minutes: Minutes until reservations expire (default 30)
+
+        Returns:
+            list: StockReservation instances in line order
+
+        Raises:
+            ValidationError: With ``params['lines']`` listing every line that
+                cannot be reserved; nothing is written in that case.
+        """
+        if not lines:
+            return []
+
+        storefront_id = getattr(storefront, 'pk', storefront)
+        stock_product_ids = {stock_product.pk for stock_product, _ in lines}
+        product_ids = {stock_product.product_id for stock_product, _ in lines}
+
+        with transaction.atomic():
+            locked_stock = {
+                stock_product.pk: stock_product
+                for stock_product in StockProduct.objects.select_for_update()
+                .filter(pk__in=stock_product_ids)
+                .only('id', 'product_id', 'calculated_quantity', 'reserved_quantity')
+                .order_by('pk')
+            }
+
+            storefront_pools = {}
+            if storefront_id:
+                reserved_by_product = {
+                    row['stock_product__product_id']: row['total'] or Decimal('0.00')
+                    for row in cls.objects.filter(
+                        storefront_id=storefront_id,
+                        stock_product__product_id__in=product_ids,
+                        status='ACTIVE',
+                    ).values('stock_product__product_id').annotate(total=Sum('quantity'))
+                }
+                for entry in (
+                    StoreFrontInventory.objects.select_for_update()
+                    .filter(storefront_id=storefront_id, product_id__in=product_ids)
+                    .order_by('pk')
+                ):
+                    available_storefront = Decimal(str(entry.quantity)) - reserved_by_product.get(entry.product_id, Decimal('0.00'))
+                    storefront_pools[entry.product_id] = max(Decimal('0.00'), available_storefront)
+
+            stock_pools = {
+                stock_product_id: stock_product.get_available_quantity()
+                for stock_product_id, stock_product in locked_stock.items()
+            }
+
+            errors = []
+            for index, (stock_product, quantity) in enumerate(lines):
+                quantity = Decimal(str(quantity))
+                if stock_product.product_id in storefront_pools:
+                    pools, key = storefront_pools, stock_product.product_id
+                else:
+                    pools, key = stock_pools, stock_product.pk
+                available = pools.get(key, Decimal('0.00'))
+                if available < quantity:
+                    errors.append({
+                        'index': index,
+                        'message': f"Insufficient stock. Available: {available}, Requested: {quantity}",
+                        'available': str(available),
+                        'requested': str(quantity),
+                        'stock_product_id': str(stock_product.pk),
+                        'product_id': str(stock_product.product_id),
+                    })
+                    continue
+                pools[key] = available - quantity
+
+            if errors:
+                raise ValidationError(
+                    f"Insufficient stock for {len(errors)} of {len(lines)} lines.",
+                    code='insufficient_stock',
+                    params={'lines': errors},
+                )
+
+            expires_at = timezone.now() + timedelta(minutes=expiry_minutes)
+            reservations = cls.objects.bulk_create([
+                cls(
+                    stock_product=stock_product,
+                    storefront_id=storefront_id,
+                    quantity=quantity,
+                    cart_session_id=cart_session_id,
+                    expires_at=expires_at,
+                    status='ACTIVE',
+                )
+                for stock_product, quantity in lines
+            ])
+
+            deltas = {}
+            for stock_product, quantity in lines:
+                deltas[stock_product.pk] = deltas.get(stock_product.pk, Decimal('0.00')) + Decimal(str(quantity))
+            cls._apply_reserved_deltas(deltas)
+
+        return reservations
+
+    @staticmethod
+    def _apply_reserved_deltas(deltas):
+        """Add per-stock-product quantity deltas to StockProduct.reserved_quantity."""
+        deltas = {stock_product_id: delta for stock_product_id, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        # One UPDATE for the whole batch keeps lock acquisition to a single statement
+        StockProduct.objects.filter(pk__in=deltas.keys()).update(
+            reserved_quantity=F('reserved_quantity') + Case(
+                *[When(pk=stock_product_id, then=Value(delta)) for stock_product_id, delta in deltas.items()],
+                output_field=models.DecimalField(max_digits=12, decimal_places=2),
+            )
         )
-        count = expired.update(
-            status='RELEASED',
-            released_at=timezone.now()
+
+    @classmethod
+    def release_many(cls, queryset, *, status='RELEASED', released_at=None):
+        """
+        Move every ACTIVE reservation in ``queryset`` to ``status``.
+
+        The matching rows are locked first so the reserved totals on
+        StockProduct are decremented by exactly the quantities released.
+
+        Returns:
+            int: Number of reservations released
+        """
+        with transaction.atomic():
+            rows = list(
+                queryset.filter(status='ACTIVE')
+                .select_for_update()
+                .values_list('id', 'stock_product_id', 'quantity')
+            )
+            return cls._release_locked_rows(rows, status=status, released_at=released_at)
+
+    @classmethod
+    def _release_locked_rows(cls, rows, *, status, released_at=None):
+        """
+        Close already-locked ``(id, stock_product_id, quantity)`` rows.
+
+        Must run inside the transaction that locked the rows.
+        """
+        if not rows:
+            return 0
+
+        deltas = {}
+        for _, stock_product_id, quantity in rows:
+            deltas[stock_product_id] = deltas.get(stock_product_id, Decimal('0.00')) - quantity
+
+        cls.objects.filter(id__in=[row[0] for row in rows]).update(
+            status=status,
+            released_at=released_at or timezone.now()
         )
-        return count
+        cls._apply_reserved_deltas(deltas)
+        return len(rows)
+    
+    @classmethod
+    def release_expired(cls, batch_size=None):
+        """
+        Release expired reservations in batches of ``batch_size``, returning the count.
+
+        One call stops after ``RESERVATION_EXPIRY_MAX_BATCHES`` batches; any
+        expired rows beyond that are left for the next call (see
+        sales.reservation_expiry).
+        """
+        from .reservation_expiry import release_expired_reservations
+
+        return release_expired_reservations(batch_size=batch_size).released
     
     def release(self):
         """Release this reservation"""
         if self.status == 'ACTIVE':
-            self.status = 'RELEASED'
-            self.released_at = timezone.now()
-            self.save()
+            self._close('RELEASED', released_at=timezone.now())
     
     def commit(self):
         """Commit this reservation (stock has been sold)"""
         if self.status == 'ACTIVE':
-            self.status = 'COMMITTED'
-            self.save()
+            self._close('COMMITTED')
+
+    def _close(self, status, released_at=None):
+        """Transition this ACTIVE reservation and give its quantity back to the stock product."""
+        with transaction.atomic():
+            updated = StockReservation.objects.filter(pk=self.pk, status='ACTIVE').update(
+                status=status,
+                released_at=released_at if released_at is not None else self.released_at
+            )
+            self.status = status
+            if released_at is not None:
+                self.released_at = released_at
+            if updated:
+                self._apply_reserved_deltas({self.stock_product_id: -Decimal(str(self.quantity))})
 
 
 class Sale(models.Model):
@@ -540,6 +721,7 @@ class Sale(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['business', 'storefront', 'created_at']),
+            models.Index(fields=['business', 'status', 'created_at']),
             models.Index(fields=['storefront', 'created_at']),
             models.Index(fields=['user', 'created_at']),
             models.Index(fields=['customer', 'status']),
@@ -552,18 +734,13 @@ class Sale(models.Model):
         return f"Sale {self.receipt_number} - {self.status} - {self.total_amount}"
     
     def generate_receipt_number(self):
-        """Generate unique receipt number"""
-        from django.utils import timezone
-        date_str = timezone.now().strftime('%Y%m%d')
-        
-        # Get count of sales today
-        today_start = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        count = Sale.objects.filter(
-            storefront=self.storefront,
-            created_at__gte=today_start
-        ).count() + 1
+        """Generate unique receipt number from the storefront's daily receipt sequence"""
+        from .receipt_numbers import allocate_receipt_number
+
+        now = timezone.now()
+        count = allocate_receipt_number(self.storefront_id, now.date())
         
-        return f"{self.storefront.id}-{date_str}-{count:04d}"
+        return f"{self.storefront_id}-{now.strftime('%Y%m%d')}-{count:04d}"
     
     def calculate_totals(self):
         """Calculate all sale totals from line items"""
@@ -643,7 +820,7 @@ class Sale(models.Model):
         if not items:
             raise ValidationError({'items': 'At least one item is required for a refund.'})
 
-        with transaction.atomic():
+        with transaction.atomic(), track_sale_rollup(self), track_customer_metrics(self):
             refund = Refund.objects.create(
                 sale=self,
                 refund_type=refund_type,
@@ -703,6 +880,7 @@ class Sale(models.Model):
 
             refund.amount = total_refund
             refund.save(update_fields=['amount', 'updated_at'])
+            record_refund_movements(refund)
 
             self.amount_refunded += total_refund
             self.calculate_totals()
@@ -720,6 +898,7 @@ class Sale(models.Model):
             self._skip_validation = True
             self.save(update_fields=['amount_refunded', 'amount_due', 'status', 'updated_at'])
             self._skip_validation = False
+            schedule_receipt_render(self)
 
             if self.payment_type == 'CREDIT' and self.customer:
                 self.customer.update_balance(-total_refund, transaction_type='REFUND')
@@ -774,7 +953,7 @@ class Sale(models.Model):
         if self.status not in {'DRAFT', 'PENDING', 'COMPLETED', 'PARTIAL'}:
             raise ValidationError(f'Cannot cancel sale with status: {self.status}')
         
-        with transaction.atomic():
+        with transaction.atomic(), track_sale_rollup(self), track_customer_metrics(self):
             # Build list of all items to refund
             items_to_refund = []
             # Only process refunds for completed/in-progress sales
@@ -835,51 +1014,99 @@ class Sale(models.Model):
         """
         Commit stock quantities for all sale items
         Called when sale is completed
+
+        Every affected StoreFrontInventory/StockProduct row is locked with one
+        ordered query, quantities are validated in memory in line order, and
+        the decrements are written back with a single bulk update.
         """
         with transaction.atomic():
-            for item in self.sale_items.select_related('product', 'stock_product').all():
+            items = list(self.sale_items.select_related('product', 'stock_product').all())
+            # Fix each line's cost at the moment of sale
+            SaleItem.snapshot_costs(items)
+
+            required_by_item = []
+            for item in items:
                 quantity_decimal = Decimal(item.quantity)
                 if quantity_decimal != quantity_decimal.to_integral_value():
                     raise ValidationError(
                         f"Fractional quantity {quantity_decimal} for {item.product.name} is not supported for stock deduction."
                     )
-                quantity_required = int(quantity_decimal)
+                required_by_item.append((item, int(quantity_decimal)))
 
-                if item.stock_product and not self.storefront_id:
-                    # Reduce calculated quantity at the warehouse level (intake quantity stays immutable)
-                    stock_product = StockProduct.objects.select_for_update().get(id=item.stock_product.id)
-                    current_calc = int(stock_product.calculated_quantity if stock_product.calculated_quantity is not None else stock_product.quantity or 0)
-                    if current_calc < quantity_required:
-                        raise ValidationError(
-                            f"Insufficient stock for {item.product.name}. "
-                            f"Available: {current_calc}, Required: {quantity_required}"
-                        )
-                    new_calc = current_calc - quantity_required
-                    if new_calc < 0:
-                        raise ValidationError(f"Stock level for {item.product.name} would become negative.")
-                    stock_product.calculated_quantity = new_calc
-                    stock_product.save(update_fields=['calculated_quantity', 'updated_at'])
+            if self.storefront_id:
+                self._commit_storefront_stock(required_by_item)
+            else:
+                self._commit_warehouse_stock(required_by_item)
 
-                if self.storefront_id:
-                    storefront_inventory, _ = StoreFrontInventory.objects.select_for_update().get_or_create(
-                        storefront=self.storefront,
-                        product=item.product,
-                        defaults={'quantity': 0}
-                    )
+    def _commit_warehouse_stock(self, required_by_item):
+        """Decrement StockProduct.calculated_quantity for sales without a storefront."""
+        stock_product_ids = {item.stock_product_id for item, _ in required_by_item if item.stock_product_id}
+        if not stock_product_ids:
+            return
 
-                    current_qty = int(storefront_inventory.quantity)
-                    if current_qty < quantity_required:
-                        raise ValidationError(
-                            f"Insufficient storefront stock for {item.product.name}. "
-                            f"Available: {current_qty}, Required: {quantity_required}"
-                        )
+        # Reduce calculated quantity at the warehouse level (intake quantity stays immutable)
+        locked = {
+            stock_product.pk: stock_product
+            for stock_product in StockProduct.objects.select_for_update()
+            .filter(pk__in=stock_product_ids)
+            .only('id', 'quantity', 'calculated_quantity', 'updated_at')
+            .order_by('pk')
+        }
+
+        for item, quantity_required in required_by_item:
+            if not item.stock_product_id:
+                continue
+            stock_product = locked[item.stock_product_id]
+            current_calc = int(stock_product.calculated_quantity if stock_product.calculated_quantity is not None else stock_product.quantity or 0)
+            if current_calc < quantity_required:
+                raise ValidationError(
+                    f"Insufficient stock for {item.product.name}. "
+                    f"Available: {current_calc}, Required: {quantity_required}"
+                )
+            new_calc = current_calc - quantity_required
+            if new_calc < 0:
+                raise ValidationError(f"Stock level for {item.product.name} would become negative.")
+            stock_product.calculated_quantity = new_calc
+
+        now = timezone.now()
+        for stock_product in locked.values():
+            stock_product.updated_at = now
+        StockProduct.objects.bulk_update(locked.values(), ['calculated_quantity', 'updated_at'])
+
+    def _commit_storefront_stock(self, required_by_item):
+        """Decrement StoreFrontInventory.quantity for every product on the sale."""
+        product_ids = {item.product_id for item, _ in required_by_item}
+        if not product_ids:
+            return
 
-                    new_qty = current_qty - quantity_required
-                    if new_qty < 0:
-                        raise ValidationError(f"Storefront stock level for {item.product.name} would become negative.")
+        locked = {
+            entry.product_id: entry
+            for entry in StoreFrontInventory.objects.select_for_update()
+            .filter(storefront_id=self.storefront_id, product_id__in=product_ids)
+            .order_by('pk')
+        }
+
+        for item, quantity_required in required_by_item:
+            storefront_inventory = locked.get(item.product_id)
+            current_qty = int(storefront_inventory.quantity) if storefront_inventory else 0
+            if current_qty < quantity_required:
+                raise ValidationError(
+                    f"Insufficient storefront stock for {item.product.name}. "
+                    f"Available: {current_qty}, Required: {quantity_required}"
+                )
 
-                    storefront_inventory.quantity = new_qty
-                    storefront_inventory.save(update_fields=['quantity', 'updated_at'])
+            new_qty = current_qty - quantity_required
+            if new_qty < 0:
+                raise ValidationError(f"Storefront stock level for {item.product.name} would become negative.")
+
+            storefront_inventory.quantity = new_qty
+
+        now = timezone.now()
+        for entry in locked.values():
+            entry.updated_at = now
+        StoreFrontInventory.objects.bulk_update(locked.values(), ['quantity', 'updated_at'])
+        # bulk_update skips post_save, so invalidate cached catalog pages here
+        invalidate_storefront_catalogs([self.storefront_id])
     
     def release_reservations(self, *, delete: bool = False):
         """Release all stock reservations for this sale.
@@ -891,10 +1118,7 @@ class Sale(models.Model):
         reservations = StockReservation.objects.filter(cart_session_id=str(self.id))
 
         # Mark any outstanding holds as released before cleanup
-        reservations.filter(status='ACTIVE').update(
-            status='RELEASED',
-            released_at=timezone.now()
-        )
+        StockReservation.release_many(reservations)
 
         if delete:
             reservations.delete()
@@ -904,7 +1128,7 @@ class Sale(models.Model):
         Complete the sale - commit stock and update status
         Should be called in a transaction
         """
-        with transaction.atomic():
+        with transaction.atomic(), track_sale_rollup(self), track_customer_metrics(self):
             # Validate sale can be completed
             if self.status != 'DRAFT':
                 raise ValidationError(f"Cannot complete sale with status {self.status}")
@@ -933,6 +1157,9 @@ class Sale(models.Model):
             
             self.completed_at = timezone.now()
             self.save()
+            record_sale_movements(self)
+            if self.status in RECEIPT_STATUSES:
+                schedule_receipt_render(self)
             
             # Update customer credit if applicable
             if self.payment_type == 'CREDIT' and self.customer:
@@ -1013,6 +1240,149 @@ class Sale(models.Model):
             )
 
 
+class ReceiptSequence(models.Model):
+    """
+    Per-storefront, per-day receipt counter.
+    Incremented atomically on sale completion so receipt numbers are gap-free
+    without counting the day's sales.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    storefront = models.ForeignKey(StoreFront, on_delete=models.CASCADE, related_name='receipt_sequences')
+    sequence_date = models.DateField()
+    last_value = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'receipt_sequences'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['storefront', 'sequence_date'],
+                name='receipt_sequence_unique_storefront_date'
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.storefront_id} {self.sequence_date}: {self.last_value}"
+
+
+class DailySalesRollup(models.Model):
+    """
+    Completed-sale totals per business, storefront, day, sale type and payment type.
+    Maintained incrementally by sales.rollups when sales complete, are refunded
+    or cancelled; rebuild with the backfill_daily_sales_rollups command.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    business = models.ForeignKey(Business, on_delete=models.CASCADE, related_name='daily_sales_rollups')
+    storefront = models.ForeignKey(StoreFront, on_delete=models.CASCADE, related_name='daily_sales_rollups')
+    date = models.DateField()
+    sale_type = models.CharField(max_length=20, choices=Sale.TYPE_CHOICES)
+    payment_type = models.CharField(max_length=20, choices=Sale.PAYMENT_TYPE_CHOICES)
+
+    sale_count = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+    cost = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+    profit = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+    tax_total = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+    discount_total = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+    refund_total = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+    items_sold = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'daily_sales_rollups'
+        ordering = ['date']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['business', 'storefront', 'date', 'sale_type', 'payment_type'],
+                name='daily_sales_rollup_unique_key'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['business', 'date']),
+        ]
+
+    def __str__(self):
+        return f"{self.storefront_id} {self.date} {self.sale_type}/{self.payment_type}: {self.revenue}"
+
+
+class CustomerMetrics(models.Model):
+    """
+    Lifetime purchase metrics per customer over COMPLETED and PARTIAL sales.
+    Totals and purchase bounds are adjusted by sales.customer_metrics when one
+    of the customer's sales is completed, paid, refunded or cancelled; the
+    whole row (including favourite category and interval stats) is rebuilt
+    nightly by the rebuild_customer_metrics task (also a management command).
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    business = models.ForeignKey(Business, on_delete=models.CASCADE, related_name='customer_metrics')
+    customer = models.OneToOneField(Customer, on_delete=models.CASCADE, related_name='metrics')
+
+    order_count = models.IntegerField(default=0)
+    gross_revenue = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+    amount_refunded = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+    net_revenue = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+    profit = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+
+    # Sale created_at bounds (the column report date filters use)
+    first_purchase_at = models.DateTimeField()
+    last_purchase_at = models.DateTimeField()
+    # Latest completed_at (or created_at), used for recency
+    last_order_at = models.DateTimeField()
+
+    favorite_category = models.CharField(max_length=255, blank=True, default='')
+    avg_purchase_interval_days = models.DecimalField(
+        max_digits=10, decimal_places=2, null=True, blank=True,
+        help_text="Mean days between consecutive purchases (null with a single purchase)"
+    )
+    max_purchase_interval_days = models.IntegerField(null=True, blank=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'customer_metrics'
+        verbose_name_plural = 'Customer metrics'
+        indexes = [
+            models.Index(fields=['business', 'first_purchase_at']),
+            models.Index(fields=['business', 'last_purchase_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.customer_id}: {self.order_count} orders, {self.net_revenue}"
+
+
+class ReceiptArtifact(models.Model):
+    """
+    A rendered receipt (JSON, HTML or PDF) for a sale, stored once and served
+    as-is on reprint. Written by sales.receipt_artifacts when the sale is
+    completed or refunded; ``digest`` (sha256 of ``content``) is the ETag.
+    """
+    FORMAT_CHOICES = [
+        ('json', 'JSON'),
+        ('html', 'HTML'),
+        ('pdf', 'PDF'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    sale = models.ForeignKey(Sale, on_delete=models.CASCADE, related_name='receipt_artifacts')
+    format = models.CharField(max_length=10, choices=FORMAT_CHOICES)
+    digest = models.CharField(max_length=64, help_text="sha256 of content")
+    content = models.BinaryField()
+    content_type = models.CharField(max_length=100)
+    # Sale.updated_at the artifact was rendered from; a mismatch means it is stale
+    source_updated_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'receipt_artifacts'
+        constraints = [
+            models.UniqueConstraint(fields=['sale', 'format'], name='unique_receipt_artifact_format'),
+        ]
+
+    def __str__(self):
+        return f"{self.sale_id} {self.format} {self.digest[:12]}"
+
+
 class SaleItem(models.Model):
     """Individual items in a sale"""
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -1069,6 +1439,12 @@ class SaleItem(models.Model):
     # Product snapshot (for historical reference)
     product_name = models.CharField(max_length=255, blank=True)
     product_sku = models.CharField(max_length=100, blank=True)
+
+    # Cost snapshot: landed unit cost when the line was saved, refreshed when
+    # the sale completes. NULL only on rows predating the columns (see
+    # backfill_sale_item_costs).
+    unit_cost = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
+    total_cost = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True)
     
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
@@ -1096,33 +1472,106 @@ class SaleItem(models.Model):
         """Total amount including tax"""
         return self.base_amount + self.tax_amount
     
+    @classmethod
+    def resolve_unit_costs(cls, items):
+        """
+        Landed unit cost for each item, in order, with at most three queries.
+
+        Uses the item's StockProduct; failing that the StockProduct for its
+        stock batch and product; failing that the product's most recent
+        StockProduct.
+        """
+        items = list(items)
+        stock_products = {}
+
+        missing_ids = {
+            item.stock_product_id
+            for item in items
+            if item.stock_product_id and not SaleItem.stock_product.is_cached(item)
+        }
+        if missing_ids:
+            stock_products.update(StockProduct.objects.in_bulk(missing_ids))
+        for item in items:
+            if item.stock_product_id and SaleItem.stock_product.is_cached(item) and item.stock_product:
+                stock_products[item.stock_product_id] = item.stock_product
+
+        by_batch = {}
+        batch_keys = {
+            (item.stock_id, item.product_id)
+            for item in items
+            if item.stock_product_id not in stock_products and item.stock_id
+        }
+        if batch_keys:
+            for stock_product in StockProduct.objects.filter(
+                stock_id__in={stock_id for stock_id, _ in batch_keys},
+                product_id__in={product_id for _, product_id in batch_keys},
+            ).order_by('-created_at'):
+                by_batch.setdefault((stock_product.stock_id, stock_product.product_id), stock_product)
+
+        latest = {}
+        unresolved_products = {
+            item.product_id
+            for item in items
+            if item.stock_product_id not in stock_products and (item.stock_id, item.product_id) not in by_batch
+        }
+        if unresolved_products:
+            for stock_product in StockProduct.objects.filter(
+                product_id__in=unresolved_products
+            ).order_by('product_id', '-created_at'):
+                latest.setdefault(stock_product.product_id, stock_product)
+
+        costs = []
+        for item in items:
+            stock_product = (
+                stock_products.get(item.stock_product_id)
+                or by_batch.get((item.stock_id, item.product_id))
+                or latest.get(item.product_id)
+            )
+            costs.append(stock_product.landed_unit_cost if stock_product else Decimal('0.00'))
+        return costs
+
+    def _set_total_cost(self):
+        self.total_cost = (self.unit_cost * Decimal(str(self.quantity))).quantize(Decimal('0.01'))
+
+    @classmethod
+    def assign_costs(cls, items):
+        """Set ``unit_cost``/``total_cost`` in memory; returns the items whose values changed."""
+        items = list(items)
+        changed = []
+        for item, unit_cost in zip(items, cls.resolve_unit_costs(items)):
+            previous = (item.unit_cost, item.total_cost)
+            item.unit_cost = unit_cost
+            item._set_total_cost()
+            if (item.unit_cost, item.total_cost) != previous:
+                changed.append(item)
+        return changed
+
+    @classmethod
+    def snapshot_costs(cls, items):
+        """Re-snapshot costs for saved ``items``, writing only rows that changed."""
+        changed = cls.assign_costs(items)
+        if changed:
+            cls.objects.bulk_update(changed, ['unit_cost', 'total_cost'])
+        return len(changed)
+
     @property
-    def unit_cost(self):
-        """Get the cost per unit for this sale item"""
-        if self.stock_product:
-            # Use the specific StockProduct entry
-            return self.stock_product.landed_unit_cost
-        elif self.stock:
-            # Fallback: Get the StockProduct for this specific stock and product
-            try:
-                stock_product = StockProduct.objects.get(stock=self.stock, product=self.product)
-                return stock_product.landed_unit_cost
-            except StockProduct.DoesNotExist:
-                pass
-        # Final fallback to product's latest cost
-        return self.product.get_latest_cost() if hasattr(self.product, 'get_latest_cost') else Decimal('0.00')
+    def effective_unit_cost(self):
+        """Snapshotted unit cost, resolved from stock for unsaved lines"""
+        if self.unit_cost is not None:
+            return self.unit_cost
+        return self.resolve_unit_costs([self])[0]
     
     @property
     def profit_amount(self):
         """Calculate profit amount per unit (selling price - cost)"""
-        return self.unit_price - self.unit_cost
+        return self.unit_price - self.effective_unit_cost
     
     @property
     def profit_margin(self):
         """Calculate profit margin percentage ((selling_price - cost) / selling_price * 100)"""
         if self.unit_price <= Decimal('0.00'):
             return Decimal('0.00')
-        return ((self.unit_price - self.unit_cost) / self.unit_price * Decimal('100')).quantize(Decimal('0.01'))
+        return ((self.unit_price - self.effective_unit_cost) / self.unit_price * Decimal('100')).quantize(Decimal('0.01'))
     
     @property
     def total_profit_amount(self):
@@ -1160,6 +1609,10 @@ class SaleItem(models.Model):
         
         # Calculate totals
         self.calculate_totals()
+
+        if self.unit_cost is None:
+            self.unit_cost = self.resolve_unit_costs([self])[0]
+        self._set_total_cost()
         
         super().save(*args, **kwargs)
 
@@ -1584,15 +2037,16 @@ class ARPayment(models.Model):
             
             # Update sale amounts
             sale = ar.sale
-            sale.amount_paid = ar.amount_paid
-            sale.amount_due = ar.amount_outstanding
-            
-            if ar.status == 'PAID':
-                sale.status = 'COMPLETED'
-            elif ar.status == 'PARTIAL':
-                sale.status = 'PARTIAL'
-            
-            sale.save()
+            with track_sale_rollup(sale), track_customer_metrics(sale):
+                sale.amount_paid = ar.amount_paid
+                sale.amount_due = ar.amount_outstanding
+                
+                if ar.status == 'PAID':
+                    sale.status = 'COMPLETED'
+                elif ar.status == 'PARTIAL':
+                    sale.status = 'PARTIAL'
+                
+                sale.save()
 
 
 class AuditLog(models.Model):
@@ -0,0 +1,113 @@
+"""
+Pre-rendered receipts.
+
+A sale's receipt is rendered to JSON, HTML and PDF once, when the sale is
+completed or refunded, and stored as ReceiptArtifact rows. The receipt
+endpoint then serves the stored bytes with the artifact's sha256 digest as
+ETag, so reprints and customer lookups are a single row read, and clients
+that already hold the receipt get a 304 without the content being loaded.
+
+Each artifact records the ``Sale.updated_at`` it was rendered from. Any later
+change to the sale (a payment, a refund, a cancellation) moves that
+timestamp, and ``get_receipt_artifact`` re-renders the stale artifact (in the
+requested format only) on the next request, so stored receipts never
+disagree with the sale.
+"""
+
+import hashlib
+import logging
+from typing import Dict, Optional
+
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+# Sale statuses that have a receipt
+RECEIPT_STATUSES = ('COMPLETED', 'PARTIAL', 'REFUNDED')
+
+CONTENT_TYPES = {
+    'json': 'application/json',
+    'html': 'text/html; charset=utf-8',
+    'pdf': 'application/pdf',
+}
+
+
+def render_receipt(sale, formats=None) -> Dict[str, bytes]:
+    """Render the sale's receipt in ``formats`` (default: all), from one ReceiptSerializer pass."""
+    from rest_framework.renderers import JSONRenderer
+
+    from .receipt_generator import generate_receipt_html, generate_receipt_pdf
+    from .receipt_serializers import ReceiptSerializer
+
+    renderers = {
+        'json': lambda data: JSONRenderer().render(data),
+        'html': lambda data: generate_receipt_html(data).encode('utf-8'),
+        'pdf': generate_receipt_pdf,
+    }
+    receipt_data = ReceiptSerializer(sale).data
+    return {fmt: renderers[fmt](receipt_data) for fmt in formats or CONTENT_TYPES}
+
+
+def store_receipt_artifacts(sale, formats=None) -> Dict[str, object]:
+    """
+    Render and store the sale's receipt artifacts.
+
+    Args:
+        sale: Sale in one of ``RECEIPT_STATUSES``
+        formats: Formats to store (default: all)
+
+    Returns:
+        dict: ``{format: ReceiptArtifact}`` for the stored formats
+    """
+    from .models import ReceiptArtifact
+
+    artifacts = {}
+    for fmt, content in render_receipt(sale, formats).items():
+        artifacts[fmt], _ = ReceiptArtifact.objects.update_or_create(
+            sale=sale,
+            format=fmt,
+            defaults={
+                'digest': hashlib.sha256(content).hexdigest(),
+                'content': content,
+                'content_type': CONTENT_TYPES[fmt],
+                'source_updated_at': sale.updated_at,
+            },
+        )
+    return artifacts
+
+
+def get_receipt_artifact(sale, fmt: str, if_none_match: Optional[str] = None):
+    """
+    Return the stored artifact for ``fmt``, rendering it if missing or stale.
+
+    When ``if_none_match`` is given the content column is not loaded; callers
+    compare ``digest`` first and only touch ``content`` on a mismatch, which
+    reloads it.
+    """
+    from .models import ReceiptArtifact
+
+    queryset = ReceiptArtifact.objects.filter(sale=sale, format=fmt)
+    if if_none_match:
+        queryset = queryset.defer('content')
+    artifact = queryset.first()
+    if artifact is not None and artifact.source_updated_at == sale.updated_at:
+        return artifact
+    return store_receipt_artifacts(sale, formats=[fmt])[fmt]
+
+
+def _render_after_commit(sale_id) -> None:
+    from .models import Sale
+
+    try:
+        sale = Sale.objects.get(pk=sale_id)
+        if sale.status in RECEIPT_STATUSES:
+            store_receipt_artifacts(sale)
+    except Exception:
+        # The endpoint renders on demand, so a failure here only costs the first reprint
+        logger.exception("Failed to pre-render receipt for sale %s", sale_id)
+
+
+def schedule_receipt_render(sale) -> None:
+    """Pre-render the sale's receipt once the current transaction commits."""
+    sale_id = sale.pk
+    transaction.on_commit(lambda: _render_after_commit(sale_id))
@@ -136,6 +136,27 @@ def generate_receipt_html(receipt_data: Dict[str, Any]) -> str:
         </div>
         '''
     
+    # Discount and tax rows (only shown when non-zero)
+    discount_amount = receipt_data.get('discount_amount', 0)
+    discount_row = ''
+    if float(discount_amount) > 0:
+        discount_row = f'''
+        <tr>
+            <td colspan="3" class="text-right">Discount:</td>
+            <td class="amount">-{format_currency(discount_amount)}</td>
+        </tr>
+        '''
+    
+    tax_amount = receipt_data.get('tax_amount', 0)
+    tax_row = ''
+    if float(tax_amount) > 0:
+        tax_row = f'''
+        <tr>
+            <td colspan="3" class="text-right">Tax:</td>
+            <td class="amount">{format_currency(tax_amount)}</td>
+        </tr>
+        '''
+    
     # Payment details
     change_given = receipt_data.get('change_given', 0)
     change_row = ''
@@ -554,18 +575,8 @@ def generate_receipt_html(receipt_data: Dict[str, Any]) -> str:
                     <td colspan="3" class="text-right">Subtotal:</td>
                     <td class="amount">{format_currency(receipt_data.get('subtotal', 0))}</td>
                 </tr>
-                {'''
-                <tr>
-                    <td colspan="3" class="text-right">Discount:</td>
-                    <td class="amount">-''' + format_currency(receipt_data.get('discount_amount', 0)) + '''</td>
-                </tr>
-                ''' if float(receipt_data.get('discount_amount', 0)) > 0 else ''}
-                {'''
-                <tr>
-                    <td colspan="3" class="text-right">Tax:</td>
-                    <td class="amount">''' + format_currency(receipt_data.get('tax_amount', 0)) + '''</td>
-                </tr>
-                ''' if float(receipt_data.get('tax_amount', 0)) > 0 else ''}
+                {discount_row}
+                {tax_row}
                 <tr class="grand-total-row">
                     <td colspan="3" class="text-right"><strong>TOTAL:</strong></td>
                     <td class="amount"><strong>{format_currency(receipt_data.get('total_amount', 0))}</strong></td>
@@ -596,14 +607,28 @@ def generate_receipt_html(receipt_data: Dict[str, Any]) -> str:
     return html
 
 
+def _pdf_currency_label(receipt_data: Dict[str, Any]) -> str:
+    """Currency symbol for the PDF, or its code when the symbol is outside the built-in fonts."""
+    currency_info = {}
+    try:
+        currency_info = (receipt_data.get('business_settings') or {}).get('regional', {}).get('currency', {}) or {}
+    except (KeyError, TypeError, AttributeError):
+        pass
+    symbol = currency_info.get('symbol', '₵')
+    try:
+        symbol.encode('latin-1')
+        return symbol
+    except (UnicodeEncodeError, AttributeError):
+        return currency_info.get('code') or 'GHS'
+
+
 def generate_receipt_pdf(receipt_data: Dict[str, Any]) -> bytes:
     """
-    Generate PDF receipt from receipt data.
+    Generate an 80mm receipt PDF from receipt data with reportlab.
     
-    This is an optional feature that requires additional dependencies:
-    - weasyprint or pdfkit
-    
-    Install with: pip install weasyprint
+    Mirrors the layout of ``generate_receipt_html``: business header, sale
+    details, customer, line items, totals and footer. The page is as tall as
+    the receipt so it prints on roll paper without page breaks.
     
     Args:
         receipt_data: Dictionary containing receipt information from ReceiptSerializer
@@ -611,21 +636,139 @@ def generate_receipt_pdf(receipt_data: Dict[str, Any]) -> bytes:
     Returns:
         PDF file as bytes
     """
-    try:
-        from weasyprint import HTML
-        
-        # Generate HTML
-        html_content = generate_receipt_html(receipt_data)
-        
-        # Convert to PDF
-        pdf_bytes = HTML(string=html_content).write_pdf()
-        
-        return pdf_bytes
-        
-    except ImportError:
-        raise ImportError(
-            "WeasyPrint is not installed. "
-            "Install it with: pip install weasyprint"
-        )
-    except Exception as e:
-        raise Exception(f"Failed to generate PDF: {str(e)}")
+    from io import BytesIO
+    from xml.sax.saxutils import escape
+
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_CENTER
+    from reportlab.lib.styles import ParagraphStyle
+    from reportlab.lib.units import mm
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+    currency = _pdf_currency_label(receipt_data)
+
+    def money(amount) -> str:
+        try:
+            return f"{currency} {float(amount or 0):.2f}"
+        except (TypeError, ValueError):
+            return f"{currency} {amount}"
+
+    def text(value) -> str:
+        return escape(str(value)) if value not in (None, '') else ''
+
+    base = ParagraphStyle('ReceiptBase', fontName='Helvetica', fontSize=7.5, leading=9.5)
+    title = ParagraphStyle('ReceiptTitle', parent=base, fontName='Helvetica-Bold', fontSize=11, leading=14, alignment=TA_CENTER)
+    centered = ParagraphStyle('ReceiptCentered', parent=base, alignment=TA_CENTER)
+    heading = ParagraphStyle('ReceiptHeading', parent=base, fontName='Helvetica-Bold', spaceBefore=4)
+
+    story = [Paragraph(text(receipt_data.get('business_name') or 'Receipt'), title)]
+    header_lines = [
+        receipt_data.get('storefront_name'),
+        receipt_data.get('storefront_location') or receipt_data.get('business_address'),
+        ', '.join(receipt_data.get('business_phone_numbers') or []) or receipt_data.get('storefront_phone'),
+        f"TIN: {receipt_data['business_tin']}" if receipt_data.get('business_tin') else None,
+    ]
+    story.extend(Paragraph(text(line), centered) for line in header_lines if line)
+    sale_type = 'WHOLESALE SALE' if receipt_data.get('type') == 'WHOLESALE' else 'RETAIL SALE'
+    story += [Spacer(1, 2 * mm), Paragraph(f'<b>{sale_type}</b>', centered), Spacer(1, 2 * mm)]
+
+    details = [
+        ('Receipt #', receipt_data.get('receipt_number')),
+        ('Date', receipt_data.get('completed_at_formatted')),
+        ('Served by', receipt_data.get('served_by') or 'Staff'),
+        ('Payment', receipt_data.get('payment_type_display')),
+        ('Customer', receipt_data.get('customer_name')),
+        ('Phone', receipt_data.get('customer_phone')),
+    ]
+    story.append(Table(
+        [[Paragraph(label, base), Paragraph(text(value), base)] for label, value in details if value],
+        colWidths=[20 * mm, 50 * mm],
+        style=TableStyle([('VALIGN', (0, 0), (-1, -1), 'TOP'), ('LEFTPADDING', (0, 0), (-1, -1), 0)]),
+    ))
+
+    story.append(Paragraph('ITEMS', heading))
+    item_rows = [[Paragraph('<b>Product</b>', base), 'Qty', 'Price', 'Total']]
+    for item in receipt_data.get('line_items', []):
+        item_rows.append([
+            Paragraph(text(item.get('product_name')), base),
+            f"{float(item.get('quantity') or 0):g}",
+            money(item.get('unit_price')),
+            money(item.get('total_price')),
+        ])
+    items_table = Table(item_rows, colWidths=[30 * mm, 8 * mm, 16 * mm, 16 * mm], repeatRows=1)
+    items_table.setStyle(TableStyle([
+        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 7),
+        ('ALIGN', (1, 0), (-1, -1), 'RIGHT'),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ('LINEBELOW', (0, 0), (-1, 0), 0.5, colors.black),
+        ('LEFTPADDING', (0, 0), (-1, -1), 1),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 1),
+    ]))
+    story.append(items_table)
+
+    totals = [('Subtotal', receipt_data.get('subtotal'))]
+    if float(receipt_data.get('discount_amount') or 0) > 0:
+        totals.append(('Discount', f"-{money(receipt_data.get('discount_amount'))}"))
+    if float(receipt_data.get('tax_amount') or 0) > 0:
+        totals.append(('Tax', receipt_data.get('tax_amount')))
+    totals += [
+        ('TOTAL', receipt_data.get('total_amount')),
+        (f"Paid ({receipt_data.get('payment_type', 'CASH')})", receipt_data.get('amount_paid')),
+    ]
+    if float(receipt_data.get('change_given') or 0) > 0:
+        totals.append(('Change', receipt_data.get('change_given')))
+    if float(receipt_data.get('amount_due') or 0) > 0:
+        totals.append(('Amount due', receipt_data.get('amount_due')))
+
+    totals_table = Table(
+        [[label, value if isinstance(value, str) and value.startswith('-') else money(value)] for label, value in totals],
+        colWidths=[46 * mm, 24 * mm],
+    )
+    total_row = next(index for index, (label, _) in enumerate(totals) if label == 'TOTAL')
+    totals_table.setStyle(TableStyle([
+        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 7.5),
+        ('ALIGN', (0, 0), (-1, -1), 'RIGHT'),
+        ('FONTNAME', (0, total_row), (-1, total_row), 'Helvetica-Bold'),
+        ('LINEABOVE', (0, 0), (-1, 0), 0.5, colors.black),
+        ('LINEABOVE', (0, total_row), (-1, total_row), 0.5, colors.black),
+        ('LEFTPADDING', (0, 0), (-1, -1), 1),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 1),
+    ]))
+    story += [Spacer(1, 2 * mm), totals_table, Spacer(1, 3 * mm)]
+
+    story += [
+        Paragraph('<b>Thank you for your business!</b>', centered),
+        Paragraph(
+            f"Items: {receipt_data.get('total_items', 0)} | Qty: {receipt_data.get('total_quantity', 0)}",
+            centered,
+        ),
+    ]
+
+    page_width = 80 * mm
+    margin = 4 * mm
+    frame_width = page_width - 2 * margin
+    content_height = sum(
+        flowable.wrap(frame_width, 10000)[1] + flowable.getSpaceBefore() + flowable.getSpaceAfter()
+        for flowable in story
+    )
+    # Slack for frame padding so the receipt never spills onto a second page
+    page_height = max(content_height + 2 * margin + 12 * mm, 100 * mm)
+
+    buffer = BytesIO()
+    document = SimpleDocTemplate(
+        buffer,
+        pagesize=(page_width, page_height),
+        leftMargin=margin,
+        rightMargin=margin,
+        topMargin=margin,
+        bottomMargin=margin,
+        title=f"Receipt {receipt_data.get('receipt_number') or ''}".strip(),
+        # No creation date or random document ID, so the same receipt always
+        # renders to the same bytes (and the stored artifact's digest is stable)
+        invariant=1,
+    )
+    document.build(story)
+    return buffer.getvalue()
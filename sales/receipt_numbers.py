@@ -0,0 +1,124 @@
+"""
+Receipt number allocation.
+
+Receipt numbers are ``<storefront id>-<YYYYMMDD>-<NNNN>`` where ``NNNN`` comes
+from a per-storefront, per-day ReceiptSequence row. The row is incremented
+inside the completing transaction, so numbers are gap-free and concurrent
+completions never compute the same value.
+
+Two allocators are provided:
+
+- ``PostgresReceiptNumberAllocator`` increments with ``UPDATE ... RETURNING``
+  and creates the day's row with ``INSERT ... ON CONFLICT``.
+- ``LockingReceiptNumberAllocator`` uses portable ORM updates and works on any
+  backend, including single-node SQLite test setups.
+
+``RECEIPT_SEQUENCE_BACKEND`` selects one explicitly (``'postgresql'`` or
+``'locking'``); the default ``'auto'`` picks by database vendor.
+"""
+
+import uuid
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F
+from django.db.models.functions import Length
+
+
+class ReceiptNumberAllocator:
+    """Base allocator; subclasses return the next sequence value for a storefront day."""
+
+    def allocate(self, storefront_id, sequence_date) -> int:
+        raise NotImplementedError
+
+    @staticmethod
+    def seed_value(storefront_id, sequence_date) -> int:
+        """Highest receipt suffix already issued for the day, used when the day's row is first created."""
+        from .models import Sale
+
+        prefix = f"{storefront_id}-{sequence_date.strftime('%Y%m%d')}-"
+        latest = (
+            Sale.objects.filter(receipt_number__startswith=prefix)
+            .order_by(Length('receipt_number').desc(), '-receipt_number')
+            .values_list('receipt_number', flat=True)
+            .first()
+        )
+        if not latest:
+            return 0
+        try:
+            return int(latest[len(prefix):])
+        except ValueError:
+            return 0
+
+
+class PostgresReceiptNumberAllocator(ReceiptNumberAllocator):
+    """Single-statement increments using PostgreSQL ``RETURNING`` and ``ON CONFLICT``."""
+
+    def allocate(self, storefront_id, sequence_date) -> int:
+        from .models import ReceiptSequence
+
+        table = connection.ops.quote_name(ReceiptSequence._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {table} SET last_value = last_value + 1, updated_at = NOW() "
+                f"WHERE storefront_id = %s AND sequence_date = %s RETURNING last_value",
+                [storefront_id, sequence_date],
+            )
+            row = cursor.fetchone()
+            if row:
+                return row[0]
+
+            # First receipt of the day: concurrent creators fall through to the conflict branch
+            cursor.execute(
+                f"INSERT INTO {table} (id, storefront_id, sequence_date, last_value, updated_at) "
+                f"VALUES (%s, %s, %s, %s, NOW()) "
+                f"ON CONFLICT (storefront_id, sequence_date) "
+                f"DO UPDATE SET last_value = {table}.last_value + 1, updated_at = NOW() "
+                f"RETURNING last_value",
+                [uuid.uuid4(), storefront_id, sequence_date, self.seed_value(storefront_id, sequence_date) + 1],
+            )
+            return cursor.fetchone()[0]
+
+
+class LockingReceiptNumberAllocator(ReceiptNumberAllocator):
+    """Portable allocator: an UPDATE takes the row (or database) write lock before reading back."""
+
+    def allocate(self, storefront_id, sequence_date) -> int:
+        from .models import ReceiptSequence
+
+        sequences = ReceiptSequence.objects.filter(storefront_id=storefront_id, sequence_date=sequence_date)
+        with transaction.atomic():
+            if not sequences.update(last_value=F('last_value') + 1):
+                try:
+                    with transaction.atomic():
+                        sequence = ReceiptSequence.objects.create(
+                            storefront_id=storefront_id,
+                            sequence_date=sequence_date,
+                            last_value=self.seed_value(storefront_id, sequence_date) + 1,
+                        )
+                    return sequence.last_value
+                except IntegrityError:
+                    sequences.update(last_value=F('last_value') + 1)
+            return sequences.values_list('last_value', flat=True).get()
+
+
+_ALLOCATORS = {
+    'postgresql': PostgresReceiptNumberAllocator,
+    'locking': LockingReceiptNumberAllocator,
+}
+
+
+def get_receipt_number_allocator() -> ReceiptNumberAllocator:
+    """Return the allocator configured by RECEIPT_SEQUENCE_BACKEND (default: by database vendor)."""
+    backend = getattr(settings, 'RECEIPT_SEQUENCE_BACKEND', 'auto')
+    if backend == 'auto':
+        backend = 'postgresql' if connection.vendor == 'postgresql' else 'locking'
+    try:
+        return _ALLOCATORS[backend]()
+    except KeyError:
+        raise ValueError(f"Unknown RECEIPT_SEQUENCE_BACKEND: {backend}") from None
+
+
+def allocate_receipt_number(storefront_id, sequence_date) -> int:
+    """Allocate the next receipt sequence value for a storefront on a given day."""
+    return get_receipt_number_allocator().allocate(storefront_id, sequence_date)
@@ -0,0 +1,120 @@
+"""
+Expiry engine for stock reservations.
+
+Expired ACTIVE reservations are released in bounded batches, oldest
+``expires_at`` first. Each batch runs in its own short transaction and locks
+its rows with ``FOR UPDATE SKIP LOCKED``, so rows currently held by a checkout
+(commit, abandon, add item) are skipped and picked up by a later run instead
+of blocking the sweep or the till.
+
+Batch size and the per-run batch limit come from
+``RESERVATION_EXPIRY_BATCH_SIZE`` and ``RESERVATION_EXPIRY_MAX_BATCHES``.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_MAX_BATCHES = 200
+
+
+@dataclass
+class ExpiryBatch:
+    released: int
+    seconds: float
+
+
+@dataclass
+class ExpiryRunStats:
+    cutoff: datetime
+    batches: List[ExpiryBatch] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+    exhausted: bool = True
+
+    @property
+    def released(self) -> int:
+        return sum(batch.released for batch in self.batches)
+
+    def as_dict(self) -> dict:
+        return {
+            'cutoff': self.cutoff.isoformat(),
+            'released': self.released,
+            'batches': len(self.batches),
+            'batch_seconds': [round(batch.seconds, 4) for batch in self.batches],
+            'elapsed_seconds': round(self.elapsed_seconds, 4),
+            'exhausted': self.exhausted,
+        }
+
+
+def _lock_expired_batch(cutoff, batch_size):
+    from .models import StockReservation
+
+    queryset = StockReservation.objects.filter(status='ACTIVE', expires_at__lt=cutoff)
+    if connection.features.has_select_for_update_skip_locked:
+        queryset = queryset.select_for_update(skip_locked=True)
+    else:
+        queryset = queryset.select_for_update()
+    return list(
+        queryset.order_by('expires_at', 'id').values_list('id', 'stock_product_id', 'quantity')[:batch_size]
+    )
+
+
+def release_expired_reservations(
+    now=None,
+    batch_size: Optional[int] = None,
+    max_batches: Optional[int] = None,
+) -> ExpiryRunStats:
+    """
+    Release reservations that expired before ``now`` in chunks.
+
+    Returns:
+        ExpiryRunStats: Rows released and timing for every batch. ``exhausted``
+        is False when the run stopped at ``max_batches`` with work remaining.
+    """
+    from .models import StockReservation
+
+    cutoff = now or timezone.now()
+    batch_size = batch_size or getattr(settings, 'RESERVATION_EXPIRY_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+    if max_batches is None:
+        max_batches = getattr(settings, 'RESERVATION_EXPIRY_MAX_BATCHES', DEFAULT_MAX_BATCHES)
+
+    stats = ExpiryRunStats(cutoff=cutoff)
+    started = time.perf_counter()
+    while True:
+        if max_batches and len(stats.batches) >= max_batches:
+            stats.exhausted = False
+            break
+
+        batch_started = time.perf_counter()
+        with transaction.atomic():
+            rows = _lock_expired_batch(cutoff, batch_size)
+            released = StockReservation._release_locked_rows(rows, status='RELEASED')
+        if not rows:
+            break
+
+        batch = ExpiryBatch(released=released, seconds=time.perf_counter() - batch_started)
+        stats.batches.append(batch)
+        logger.debug(
+            "Reservation expiry batch %s: released %s rows in %.1f ms",
+            len(stats.batches), batch.released, batch.seconds * 1000,
+        )
+        if len(rows) < batch_size:
+            break
+
+    stats.elapsed_seconds = time.perf_counter() - started
+    if stats.released:
+        logger.info(
+            "Released %s expired stock reservations in %s batches (%.1f ms)%s",
+            stats.released, len(stats.batches), stats.elapsed_seconds * 1000,
+            '' if stats.exhausted else '; batch limit reached, remaining rows left for the next run',
+        )
+    return stats
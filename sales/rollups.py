@@ -0,0 +1,166 @@
+"""
+Maintenance of DailySalesRollup.
+
+A completed sale contributes one row's worth of totals to the rollup key
+``(business, storefront, local created date, sale type, payment type)``. The
+Sale methods that move a sale into or out of COMPLETED (or change its
+amounts) run inside ``track_sale_rollup``, which applies the difference
+between the sale's contribution before and after the change with ``F()``
+increments in the same transaction.
+
+``build_rollup_rows`` is shared with the backfill command and with the report
+reader, so live and materialized figures are computed the same way.
+"""
+
+from collections import defaultdict
+from contextlib import contextmanager
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+ROLLUP_KEY_FIELDS = ('business_id', 'storefront_id', 'date', 'sale_type', 'payment_type')
+
+ROLLUP_METRICS = (
+    'sale_count',
+    'revenue',
+    'cost',
+    'profit',
+    'tax_total',
+    'discount_total',
+    'refund_total',
+    'items_sold',
+)
+
+ZERO = Decimal('0.00')
+
+
+def _empty_metrics():
+    return {metric: (0 if metric == 'sale_count' else ZERO) for metric in ROLLUP_METRICS}
+
+
+def build_rollup_rows(sale_queryset):
+    """
+    Aggregate COMPLETED sales into rollup rows.
+
+    Returns:
+        dict: ``{(business_id, storefront_id, date, sale_type, payment_type): metrics}``
+    """
+    from reports.utils.profit_calculator import ProfitCalculator
+    from .models import SaleItem
+
+    sales = sale_queryset.filter(status='COMPLETED', business__isnull=False)
+    header_rows = list(sales.values(
+        'id', 'business_id', 'storefront_id', 'created_at', 'type', 'payment_type',
+        'total_amount', 'discount_amount', 'amount_refunded',
+    ))
+    if not header_rows:
+        return {}
+
+    sale_ids = [row['id'] for row in header_rows]
+    items_by_sale = dict(
+        SaleItem.objects.filter(sale_id__in=sale_ids)
+        .values('sale_id')
+        .annotate(total=Sum('quantity'))
+        .values_list('sale_id', 'total')
+    )
+    costs_by_sale = ProfitCalculator.calculate_sale_costs(sales.filter(id__in=sale_ids))
+
+    rows = defaultdict(_empty_metrics)
+    for row in header_rows:
+        key = (
+            row['business_id'],
+            row['storefront_id'],
+            timezone.localdate(row['created_at']),
+            row['type'],
+            row['payment_type'],
+        )
+        costs = costs_by_sale.get(row['id'], {})
+        metrics = rows[key]
+        metrics['sale_count'] += 1
+        metrics['revenue'] += row['total_amount'] or ZERO
+        metrics['cost'] += costs.get('cogs', ZERO)
+        metrics['profit'] += costs.get('profit', ZERO)
+        metrics['tax_total'] += costs.get('tax', ZERO)
+        metrics['discount_total'] += row['discount_amount'] or ZERO
+        metrics['refund_total'] += row['amount_refunded'] or ZERO
+        metrics['items_sold'] += items_by_sale.get(row['id']) or ZERO
+    return dict(rows)
+
+
+def apply_rollup_deltas(deltas):
+    """Add ``{key: metrics}`` deltas to the rollup, creating missing rows."""
+    from .models import DailySalesRollup
+
+    for key, metrics in deltas.items():
+        changes = {metric: value for metric, value in metrics.items() if value}
+        if not changes:
+            continue
+        key_fields = dict(zip(ROLLUP_KEY_FIELDS, key))
+        rollups = DailySalesRollup.objects.filter(**key_fields)
+        increments = {metric: F(metric) + value for metric, value in changes.items()}
+        if rollups.update(**increments):
+            continue
+        try:
+            with transaction.atomic():
+                DailySalesRollup.objects.create(**key_fields, **changes)
+        except IntegrityError:
+            # Another transaction created the row first
+            rollups.update(**increments)
+
+
+def _difference(before, after):
+    deltas = defaultdict(_empty_metrics)
+    for key, metrics in after.items():
+        for metric, value in metrics.items():
+            deltas[key][metric] += value
+    for key, metrics in before.items():
+        for metric, value in metrics.items():
+            deltas[key][metric] -= value
+    return deltas
+
+
+@contextmanager
+def track_sale_rollup(sale):
+    """
+    Keep the rollup in step with whatever the wrapped block does to ``sale``.
+
+    Nested use on the same instance (cancel_sale calling process_refund) is
+    handled by the outermost block only.
+    """
+    from .models import Sale
+
+    if getattr(sale, '_rollup_tracking', False) or sale.pk is None:
+        yield
+        return
+
+    sale._rollup_tracking = True
+    try:
+        with transaction.atomic():
+            current = Sale.objects.filter(pk=sale.pk)
+            before = build_rollup_rows(current)
+            yield
+            apply_rollup_deltas(_difference(before, build_rollup_rows(current)))
+    finally:
+        sale._rollup_tracking = False
+
+
+def rebuild_rollup_day(day, business_id=None):
+    """Replace the rollup rows for one day with totals computed from sales."""
+    from .models import DailySalesRollup, Sale
+
+    sales = Sale.objects.filter(created_at__date=day)
+    existing = DailySalesRollup.objects.filter(date=day)
+    if business_id:
+        sales = sales.filter(business_id=business_id)
+        existing = existing.filter(business_id=business_id)
+
+    with transaction.atomic():
+        rows = build_rollup_rows(sales)
+        existing.delete()
+        DailySalesRollup.objects.bulk_create([
+            DailySalesRollup(**dict(zip(ROLLUP_KEY_FIELDS, key)), **metrics)
+            for key, metrics in rows.items()
+        ])
+    return len(rows)
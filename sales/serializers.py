@@ -622,6 +622,11 @@ class AddSaleItemSerializer(serializers.Serializer):
         return data
 
 
+class BulkAddSaleItemsSerializer(serializers.Serializer):
+    """Serializer for adding several items to a sale in one request"""
+    items = AddSaleItemSerializer(many=True, allow_empty=False, max_length=200)
+
+
 class CompleteSaleSerializer(serializers.Serializer):
     """Serializer for completing a sale (checkout)"""
     payment_type = serializers.ChoiceField(choices=Sale.PAYMENT_TYPE_CHOICES)
@@ -2,17 +2,22 @@ import logging
 
 from celery import shared_task
 
-from sales.models import StockReservation
+from sales.customer_metrics import rebuild_customer_metrics as run_customer_metrics_rebuild
+from sales.reservation_expiry import release_expired_reservations as run_reservation_expiry
 
 logger = logging.getLogger(__name__)
 
 
 @shared_task(name="sales.tasks.release_expired_reservations", ignore_result=True)
 def release_expired_reservations():
-    """Celery task that releases all expired stock reservations."""
-    released = StockReservation.release_expired()
-    if released:
-        logger.info("Released %s expired stock reservations", released)
-    else:
+    """Celery task that releases expired stock reservations, up to RESERVATION_EXPIRY_MAX_BATCHES batches per run."""
+    stats = run_reservation_expiry()
+    if not stats.released:
         logger.debug("No expired reservations to release.")
-    return released
+
+
+@shared_task(name="sales.tasks.rebuild_customer_metrics", ignore_result=True)
+def rebuild_customer_metrics():
+    """Nightly full recompute of CustomerMetrics, catching any missed incremental update."""
+    written = run_customer_metrics_rebuild()
+    logger.info("Rebuilt customer metrics for %s customers.", written)
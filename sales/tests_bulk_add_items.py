@@ -0,0 +1,149 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import Business, BusinessMembership
+from inventory.models import (
+    BusinessStoreFront,
+    Category,
+    Product,
+    Stock,
+    StockProduct,
+    StoreFront,
+    StoreFrontInventory,
+    Warehouse,
+)
+from sales.models import AuditLog, Sale, StockReservation
+from tests.utils import ensure_active_subscription
+
+
+User = get_user_model()
+
+
+class BulkAddSaleItemsTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="bulk-owner@example.com",
+            password="testpass123",
+            name="Bulk Owner",
+        )
+        self.business = Business.objects.create(
+            owner=self.user,
+            name="Bulk Business",
+            tin="TIN-BULK-01",
+            email="bulk@example.com",
+            address="12 Scanner Road",
+        )
+        BusinessMembership.objects.update_or_create(
+            business=self.business,
+            user=self.user,
+            defaults={
+                "role": BusinessMembership.OWNER,
+                "is_admin": True,
+                "is_active": True,
+            },
+        )
+        ensure_active_subscription(self.business)
+
+        self.storefront = StoreFront.objects.create(user=self.user, name="Scanner Till", location="Accra")
+        BusinessStoreFront.objects.create(business=self.business, storefront=self.storefront)
+
+        self.category = Category.objects.create(name="Groceries")
+        self.warehouse = Warehouse.objects.create(name="Bulk Warehouse", location="Tema", manager=self.user)
+        stock = Stock.objects.create(business=self.business, arrival_date=timezone.now().date())
+
+        self.rice = Product.objects.create(business=self.business, name="Rice", sku="RICE-1", category=self.category)
+        self.oil = Product.objects.create(business=self.business, name="Oil", sku="OIL-1", category=self.category)
+        self.rice_stock = StockProduct.objects.create(
+            stock=stock,
+            warehouse=self.warehouse,
+            product=self.rice,
+            quantity=50,
+            unit_cost=Decimal("10.00"),
+            retail_price=Decimal("15.00"),
+        )
+        self.oil_stock = StockProduct.objects.create(
+            stock=stock,
+            warehouse=self.warehouse,
+            product=self.oil,
+            quantity=50,
+            unit_cost=Decimal("20.00"),
+            retail_price=Decimal("30.00"),
+        )
+        StoreFrontInventory.objects.create(storefront=self.storefront, product=self.rice, quantity=5)
+        StoreFrontInventory.objects.create(storefront=self.storefront, product=self.oil, quantity=10)
+
+        self.sale = Sale.objects.create(
+            business=self.business,
+            storefront=self.storefront,
+            user=self.user,
+            status="DRAFT",
+            type="RETAIL",
+        )
+        self.url = reverse("sale-add-items", kwargs={"pk": self.sale.pk})
+        self.client.force_authenticate(self.user)
+
+    def _line(self, stock_product, quantity):
+        return {
+            "product": str(stock_product.product_id),
+            "stock_product": str(stock_product.id),
+            "quantity": str(quantity),
+        }
+
+    def test_adds_all_lines_and_recalculates_totals_once(self):
+        payload = {"items": [
+            self._line(self.rice_stock, 2),
+            self._line(self.oil_stock, 1),
+            self._line(self.rice_stock, 3),
+        ]}
+
+        response = self.client.post(self.url, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["count"], 3)
+        self.sale.refresh_from_db()
+        self.assertEqual(self.sale.sale_items.count(), 3)
+        self.assertEqual(self.sale.subtotal, Decimal("105.00"))
+        self.assertEqual(
+            StockReservation.objects.filter(cart_session_id=str(self.sale.id), status="ACTIVE").count(),
+            3,
+        )
+        self.rice_stock.refresh_from_db()
+        self.assertEqual(self.rice_stock.reserved_quantity, Decimal("5.00"))
+        self.assertEqual(AuditLog.objects.filter(sale=self.sale, event_type="sale_item.added").count(), 3)
+
+    def test_insufficient_line_rejects_whole_batch(self):
+        payload = {"items": [
+            self._line(self.oil_stock, 1),
+            self._line(self.rice_stock, 4),
+            self._line(self.rice_stock, 2),
+        ]}
+
+        response = self.client.post(self.url, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["code"], "INSUFFICIENT_STOCK")
+        self.assertEqual([error["index"] for error in response.data["errors"]], [2])
+        self.assertEqual(Decimal(response.data["errors"][0]["available"]), Decimal("1"))
+        self.assertFalse(self.sale.sale_items.exists())
+        self.assertFalse(StockReservation.objects.filter(cart_session_id=str(self.sale.id)).exists())
+        self.oil_stock.refresh_from_db()
+        self.assertEqual(self.oil_stock.reserved_quantity, Decimal("0.00"))
+
+    def test_invalid_lines_are_reported_by_index(self):
+        payload = {"items": [
+            self._line(self.oil_stock, 1),
+            {"product": str(self.rice.id), "quantity": "0"},
+        ]}
+
+        response = self.client.post(self.url, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["code"], "INVALID_ITEMS")
+        self.assertEqual([error["index"] for error in response.data["errors"]], [1])
+        self.assertIn("quantity", response.data["errors"][0]["errors"])
+        self.assertFalse(self.sale.sale_items.exists())
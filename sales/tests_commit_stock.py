@@ -0,0 +1,123 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import Business
+from inventory.models import (
+    Category,
+    Product,
+    Stock,
+    StockProduct,
+    StoreFront,
+    StoreFrontInventory,
+    Warehouse,
+)
+from sales.models import Sale, SaleItem
+
+
+User = get_user_model()
+
+
+class CommitStockTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="commit-owner@example.com",
+            password="testpass123",
+            name="Owner"
+        )
+        self.business = Business.objects.create(
+            owner=self.user,
+            name="Commit Business",
+            tin="TIN-COMMIT-1",
+            email="commit@example.com",
+            address="1 Till Street"
+        )
+        self.storefront = StoreFront.objects.create(user=self.user, name="Till", location="Accra")
+        self.warehouse = Warehouse.objects.create(name="Commit Warehouse", location="Tema")
+        self.category = Category.objects.create(name="Commit Category")
+        self.stock = Stock.objects.create(business=self.business)
+        self.stock_products = []
+        for index in range(12):
+            product = Product.objects.create(
+                business=self.business,
+                name=f"Commit Product {index}",
+                sku=f"COMMIT-{index}",
+                category=self.category
+            )
+            self.stock_products.append(StockProduct.objects.create(
+                stock=self.stock,
+                warehouse=self.warehouse,
+                product=product,
+                quantity=20,
+                unit_cost=Decimal("1.00"),
+                retail_price=Decimal("2.00")
+            ))
+            StoreFrontInventory.objects.create(storefront=self.storefront, product=product, quantity=10)
+
+    def _sale(self, lines):
+        sale = Sale.objects.create(
+            business=self.business,
+            storefront=self.storefront,
+            user=self.user,
+            status="DRAFT"
+        )
+        for stock_product, quantity in lines:
+            SaleItem.objects.create(
+                sale=sale,
+                product=stock_product.product,
+                stock_product=stock_product,
+                quantity=Decimal(quantity),
+                unit_price=Decimal("2.00")
+            )
+        return sale
+
+    def _storefront_quantity(self, stock_product):
+        return StoreFrontInventory.objects.get(storefront=self.storefront, product=stock_product.product).quantity
+
+    def test_decrements_storefront_inventory_including_repeated_products(self):
+        first, second = self.stock_products[:2]
+        sale = self._sale([(first, 3), (second, 1), (first, 2)])
+
+        sale.commit_stock()
+
+        self.assertEqual(self._storefront_quantity(first), 5)
+        self.assertEqual(self._storefront_quantity(second), 9)
+
+    def test_query_count_does_not_grow_with_line_count(self):
+        small = self._sale([(self.stock_products[0], 1)])
+        large = self._sale([(stock_product, 1) for stock_product in self.stock_products])
+
+        with CaptureQueriesContext(connection) as small_queries:
+            small.commit_stock()
+        with CaptureQueriesContext(connection) as large_queries:
+            large.commit_stock()
+
+        self.assertEqual(len(small_queries), len(large_queries))
+        self.assertEqual(self._storefront_quantity(self.stock_products[-1]), 9)
+
+    def test_insufficient_line_keeps_message_and_writes_nothing(self):
+        first, second = self.stock_products[:2]
+        sale = self._sale([(second, 1), (first, 6), (first, 6)])
+
+        with self.assertRaisesMessage(
+            ValidationError,
+            "Insufficient storefront stock for Commit Product 0. Available: 4, Required: 6"
+        ):
+            sale.commit_stock()
+
+        self.assertEqual(self._storefront_quantity(first), 10)
+        self.assertEqual(self._storefront_quantity(second), 10)
+
+    def test_warehouse_sale_decrements_calculated_quantity(self):
+        stock_product = self.stock_products[0]
+        sale = self._sale([(stock_product, 4)])
+        sale.storefront_id = None
+
+        sale.commit_stock()
+
+        stock_product.refresh_from_db()
+        self.assertEqual(stock_product.calculated_quantity, 16)
@@ -0,0 +1,161 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import Business
+from inventory.models import Category, Product, StoreFront, StoreFrontInventory
+from sales.customer_metrics import build_customer_metrics, refresh_customer_metrics
+from sales.models import Customer, CustomerMetrics, Sale, SaleItem
+
+
+User = get_user_model()
+
+
+class CustomerMetricsTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="metrics-owner@example.com",
+            password="testpass123",
+            name="Metrics Owner"
+        )
+        self.business = Business.objects.create(
+            owner=self.user,
+            name="Metrics Business",
+            tin="TIN-METRICS-1",
+            email="metrics-biz@example.com",
+            address="1 Metrics Road"
+        )
+        self.storefront = StoreFront.objects.create(user=self.user, name="Metrics Till", location="Accra")
+        self.category = Category.objects.create(name="Metrics Category")
+        self.product = Product.objects.create(
+            business=self.business,
+            name="Metrics Product",
+            sku="METRICS-1",
+            category=self.category
+        )
+        StoreFrontInventory.objects.create(storefront=self.storefront, product=self.product, quantity=100)
+        self.customer = Customer.objects.create(
+            business=self.business,
+            name="Metrics Customer",
+            created_by=self.user
+        )
+
+    def _complete_sale(self, quantity="2", unit_price="10.00", customer=None):
+        sale = Sale.objects.create(
+            business=self.business,
+            storefront=self.storefront,
+            user=self.user,
+            customer=customer or self.customer,
+            status="DRAFT",
+            payment_type="CASH"
+        )
+        SaleItem.objects.create(
+            sale=sale,
+            product=self.product,
+            quantity=Decimal(quantity),
+            unit_price=Decimal(unit_price)
+        )
+        sale.calculate_totals()
+        sale.amount_paid = sale.total_amount
+        sale.calculate_totals()
+        sale.save()
+        sale.complete_sale()
+        return sale
+
+    def _backdate(self, sale, days):
+        moment = timezone.now() - timedelta(days=days)
+        Sale.objects.filter(pk=sale.pk).update(created_at=moment, completed_at=moment)
+
+    def test_completion_refund_and_cancellation_update_metrics(self):
+        self.assertFalse(CustomerMetrics.objects.exists())
+
+        first = self._complete_sale()
+        second = self._complete_sale(quantity="1", unit_price="5.00")
+
+        metrics = CustomerMetrics.objects.get(customer=self.customer)
+        self.assertEqual(metrics.business_id, self.business.id)
+        self.assertEqual(metrics.order_count, 2)
+        self.assertEqual(metrics.net_revenue, first.total_amount + second.total_amount)
+        self.assertEqual(metrics.favorite_category, self.category.name)
+        self.assertEqual(metrics.first_purchase_at, first.created_at)
+        self.assertEqual(metrics.last_purchase_at, second.created_at)
+
+        item = first.sale_items.get()
+        first.process_refund(
+            user=self.user,
+            items=[{"sale_item": item, "quantity": 1}],
+            reason="Damaged"
+        )
+        first.refresh_from_db()
+        metrics.refresh_from_db()
+        self.assertEqual(metrics.amount_refunded, first.amount_refunded)
+        self.assertEqual(metrics.net_revenue, first.total_amount + second.total_amount - first.amount_refunded)
+
+        second.cancel_sale(user=self.user, reason="Customer changed mind")
+        metrics.refresh_from_db()
+        self.assertEqual(metrics.order_count, 1)
+        self.assertEqual(metrics.last_purchase_at, first.created_at)
+
+        # The incremental row matches a full recompute, and keeps its identity
+        live = build_customer_metrics(Sale.objects.filter(customer=self.customer))[self.customer.id]
+        for field in ('order_count', 'gross_revenue', 'amount_refunded', 'net_revenue', 'profit',
+                      'first_purchase_at', 'last_purchase_at', 'last_order_at'):
+            self.assertEqual(getattr(metrics, field), live[field], field)
+        refresh_customer_metrics([self.customer.id])
+        self.assertTrue(CustomerMetrics.objects.filter(pk=metrics.pk).exists())
+
+        first.cancel_sale(user=self.user, reason="Returned")
+        self.assertFalse(CustomerMetrics.objects.filter(customer=self.customer).exists())
+
+    def test_rebuild_restores_rows_and_interval_stats(self):
+        older = self._complete_sale()
+        self._complete_sale()
+        self._backdate(older, 10)
+        CustomerMetrics.objects.all().delete()
+
+        out = StringIO()
+        call_command("rebuild_customer_metrics", business_id=str(self.business.id), stdout=out)
+
+        metrics = CustomerMetrics.objects.get(customer=self.customer)
+        self.assertEqual(metrics.order_count, 2)
+        self.assertEqual(metrics.max_purchase_interval_days, 10)
+        self.assertEqual(metrics.avg_purchase_interval_days, Decimal("10.00"))
+        self.assertIn("Wrote metrics for 1 customers", out.getvalue())
+
+    def test_reports_match_live_figures_for_inside_and_straddling_customers(self):
+        """Stored rows serve customers wholly inside the window; straddlers are aggregated live."""
+        straddler = Customer.objects.create(business=self.business, name="Straddler", created_by=self.user)
+        inside_sale = self._complete_sale(unit_price="40.00")
+        old_sale = self._complete_sale(unit_price="30.00", customer=straddler)
+        recent_sale = self._complete_sale(unit_price="20.00", customer=straddler)
+        self._backdate(old_sale, 60)
+        # Backdating bypasses the Sale methods; recompute as the nightly rebuild would
+        refresh_customer_metrics([straddler.id])
+
+        today = timezone.localdate()
+        params = {
+            'start_date': (today - timedelta(days=30)).isoformat(),
+            'end_date': today.isoformat(),
+        }
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+
+        response = client.get(reverse('customer-top-customers'), params)
+        self.assertEqual(response.status_code, 200)
+        revenue = {row['customer_name']: row['total_revenue'] for row in response.data['data']['customers']}
+        self.assertAlmostEqual(revenue["Metrics Customer"], float(inside_sale.total_amount), places=2)
+        self.assertAlmostEqual(revenue["Straddler"], float(recent_sale.total_amount), places=2)
+
+        response = client.get(reverse('customer-lifetime-value-report'), params)
+        self.assertEqual(response.status_code, 200)
+        orders = {row['customer_name']: row['total_orders'] for row in response.data['data']['results']}
+        # The business's walk-in customer is listed too, with no orders
+        self.assertEqual(orders["Metrics Customer"], 1)
+        self.assertEqual(orders["Straddler"], 1)
@@ -0,0 +1,115 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from accounts.models import Business
+from inventory.models import Category, Product, StoreFront, StoreFrontInventory
+from sales.models import DailySalesRollup, Sale, SaleItem
+
+
+User = get_user_model()
+
+
+class DailySalesRollupTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="rollup-owner@example.com",
+            password="testpass123",
+            name="Rollup Owner"
+        )
+        self.business = Business.objects.create(
+            owner=self.user,
+            name="Rollup Business",
+            tin="TIN-ROLLUP-1",
+            email="rollup-biz@example.com",
+            address="1 Rollup Road"
+        )
+        self.storefront = StoreFront.objects.create(user=self.user, name="Rollup Till", location="Accra")
+        self.category = Category.objects.create(name="Rollup Category")
+        self.product = Product.objects.create(
+            business=self.business,
+            name="Rollup Product",
+            sku="ROLLUP-1",
+            category=self.category
+        )
+        StoreFrontInventory.objects.create(storefront=self.storefront, product=self.product, quantity=100)
+
+    def _complete_sale(self, quantity="2", unit_price="10.00", payment_type="CASH"):
+        sale = Sale.objects.create(
+            business=self.business,
+            storefront=self.storefront,
+            user=self.user,
+            status="DRAFT",
+            payment_type=payment_type
+        )
+        SaleItem.objects.create(
+            sale=sale,
+            product=self.product,
+            quantity=Decimal(quantity),
+            unit_price=Decimal(unit_price)
+        )
+        sale.calculate_totals()
+        sale.amount_paid = sale.total_amount
+        sale.calculate_totals()
+        sale.save()
+        sale.complete_sale()
+        return sale
+
+    def _rollup(self, payment_type="CASH"):
+        return DailySalesRollup.objects.get(
+            business=self.business,
+            storefront=self.storefront,
+            date=timezone.localdate(),
+            sale_type="RETAIL",
+            payment_type=payment_type
+        )
+
+    def test_completion_adds_sale_to_rollup(self):
+        first = self._complete_sale()
+        second = self._complete_sale(quantity="1", unit_price="5.00")
+        self._complete_sale(payment_type="CARD")
+
+        rollup = self._rollup()
+        self.assertEqual(rollup.sale_count, 2)
+        self.assertEqual(rollup.revenue, first.total_amount + second.total_amount)
+        self.assertEqual(rollup.items_sold, Decimal("3.00"))
+        self.assertEqual(self._rollup("CARD").sale_count, 1)
+
+    def test_full_refund_and_cancellation_remove_sale_from_rollup(self):
+        refunded = self._complete_sale()
+        cancelled = self._complete_sale(quantity="1")
+        kept = self._complete_sale(quantity="3")
+
+        item = refunded.sale_items.get()
+        refunded.process_refund(
+            user=self.user,
+            items=[{"sale_item": item, "quantity": 2}],
+            reason="Damaged",
+            refund_type="FULL"
+        )
+        cancelled.cancel_sale(user=self.user, reason="Customer changed mind")
+
+        rollup = self._rollup()
+        self.assertEqual(rollup.sale_count, 1)
+        self.assertEqual(rollup.revenue, kept.total_amount)
+        self.assertEqual(rollup.items_sold, Decimal("3.00"))
+
+    def test_backfill_rebuilds_rows_from_sales(self):
+        sale = self._complete_sale()
+        yesterday = timezone.now() - timedelta(days=1)
+        Sale.objects.filter(pk=sale.pk).update(created_at=yesterday)
+        DailySalesRollup.objects.update(revenue=Decimal("999.00"))
+
+        out = StringIO()
+        call_command("backfill_daily_sales_rollups", stdout=out)
+
+        self.assertFalse(DailySalesRollup.objects.filter(date=timezone.localdate()).exists())
+        rollup = DailySalesRollup.objects.get(date=timezone.localdate(yesterday))
+        self.assertEqual(rollup.revenue, sale.total_amount)
+        self.assertEqual(rollup.sale_count, 1)
+        self.assertIn("Backfill complete. Wrote 1 rollup rows across 1 days.", out.getvalue())
@@ -0,0 +1,116 @@
+import hashlib
+import json
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from accounts.models import Business
+from inventory.models import Category, Product, StoreFront, StoreFrontInventory
+from sales.models import ReceiptArtifact, Sale, SaleItem
+from sales.receipt_artifacts import get_receipt_artifact, render_receipt
+
+
+User = get_user_model()
+
+
+class ReceiptArtifactTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="receipt-owner@example.com",
+            password="testpass123",
+            name="Receipt Owner"
+        )
+        self.business = Business.objects.create(
+            owner=self.user,
+            name="Receipt Business",
+            tin="TIN-RECEIPT-1",
+            email="receipt-biz@example.com",
+            address="1 Receipt Road"
+        )
+        self.storefront = StoreFront.objects.create(user=self.user, name="Receipt Till", location="Accra")
+        self.product = Product.objects.create(
+            business=self.business,
+            name="Receipt Product",
+            sku="RECEIPT-1",
+            category=Category.objects.create(name="Receipt Category")
+        )
+        StoreFrontInventory.objects.create(storefront=self.storefront, product=self.product, quantity=50)
+
+    def _complete_sale(self):
+        sale = Sale.objects.create(
+            business=self.business,
+            storefront=self.storefront,
+            user=self.user,
+            status="DRAFT",
+            payment_type="CASH"
+        )
+        SaleItem.objects.create(sale=sale, product=self.product, quantity=Decimal("2"), unit_price=Decimal("15.00"))
+        sale.calculate_totals()
+        sale.amount_paid = sale.total_amount
+        sale.calculate_totals()
+        sale.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            sale.complete_sale()
+        sale.refresh_from_db()
+        return sale
+
+    def test_completion_stores_every_format(self):
+        sale = self._complete_sale()
+
+        artifacts = {artifact.format: artifact for artifact in sale.receipt_artifacts.all()}
+        self.assertEqual(set(artifacts), {"json", "html", "pdf"})
+        for artifact in artifacts.values():
+            self.assertEqual(artifact.digest, hashlib.sha256(bytes(artifact.content)).hexdigest())
+            self.assertEqual(artifact.source_updated_at, sale.updated_at)
+
+        self.assertEqual(json.loads(bytes(artifacts["json"].content))["receipt_number"], sale.receipt_number)
+        self.assertIn(sale.receipt_number, bytes(artifacts["html"].content).decode("utf-8"))
+        self.assertTrue(bytes(artifacts["pdf"].content).startswith(b"%PDF"))
+
+    def test_reprint_reads_stored_artifact(self):
+        sale = self._complete_sale()
+        stored = ReceiptArtifact.objects.get(sale=sale, format="html")
+
+        with self.assertNumQueries(1):
+            artifact = get_receipt_artifact(sale, "html", if_none_match=f'"{stored.digest}"')
+        self.assertEqual(artifact.pk, stored.pk)
+        self.assertEqual(artifact.digest, stored.digest)
+
+    def test_refund_rerenders_receipt(self):
+        sale = self._complete_sale()
+        before = ReceiptArtifact.objects.get(sale=sale, format="json").digest
+
+        with self.captureOnCommitCallbacks(execute=True):
+            sale.process_refund(
+                user=self.user,
+                items=[{"sale_item": sale.sale_items.get(), "quantity": 1}],
+                reason="Damaged"
+            )
+        sale.refresh_from_db()
+
+        after = ReceiptArtifact.objects.get(sale=sale, format="json")
+        self.assertNotEqual(after.digest, before)
+        self.assertEqual(after.source_updated_at, sale.updated_at)
+
+    def test_stale_artifact_is_rerendered_on_read(self):
+        sale = self._complete_sale()
+        # A payment-style change that moves updated_at without a re-render
+        sale.notes = "Reprinted"
+        sale.save()
+
+        artifact = get_receipt_artifact(sale, "json")
+        self.assertEqual(artifact.source_updated_at, sale.updated_at)
+        self.assertEqual(ReceiptArtifact.objects.filter(sale=sale, format="json").count(), 1)
+        # Only the requested format is re-rendered; the others refresh on their own read
+        others = ReceiptArtifact.objects.filter(sale=sale).exclude(format="json")
+        self.assertEqual(others.count(), 2)
+        self.assertFalse(others.filter(source_updated_at=sale.updated_at).exists())
+
+    def test_rerendering_gives_the_same_digest(self):
+        sale = self._complete_sale()
+
+        first = render_receipt(sale)
+        second = render_receipt(sale)
+        for fmt in ("json", "html", "pdf"):
+            self.assertEqual(hashlib.sha256(first[fmt]).hexdigest(), hashlib.sha256(second[fmt]).hexdigest(), fmt)
@@ -0,0 +1,133 @@
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from unittest import skipIf
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+
+from accounts.models import Business
+from inventory.models import Category, Product, StoreFront, StoreFrontInventory
+from sales.models import ReceiptSequence, Sale, SaleItem
+
+
+User = get_user_model()
+
+
+class ReceiptSequenceFixtureMixin:
+    def _build_fixture(self):
+        self.user = User.objects.create_user(
+            email="receipts@example.com",
+            password="testpass123",
+            name="Receipts Owner"
+        )
+        self.business = Business.objects.create(
+            owner=self.user,
+            name="Receipts Business",
+            tin="TIN-RECEIPTS-1",
+            email="receipts-biz@example.com",
+            address="1 Receipt Road"
+        )
+        self.storefront = StoreFront.objects.create(user=self.user, name="Receipt Till", location="Accra")
+        self.category = Category.objects.create(name="Receipt Category")
+        self.product = Product.objects.create(
+            business=self.business,
+            name="Receipt Product",
+            sku="RECEIPT-1",
+            category=self.category
+        )
+        StoreFrontInventory.objects.create(storefront=self.storefront, product=self.product, quantity=10_000)
+
+    def _draft_sale(self, storefront=None):
+        sale = Sale.objects.create(
+            business=self.business,
+            storefront=storefront or self.storefront,
+            user=self.user,
+            status="DRAFT"
+        )
+        SaleItem.objects.create(sale=sale, product=self.product, quantity=Decimal("1"), unit_price=Decimal("0.00"))
+        return sale
+
+
+class ReceiptNumberAllocationTest(ReceiptSequenceFixtureMixin, TestCase):
+    def setUp(self):
+        self._build_fixture()
+        self.prefix = f"{self.storefront.id}-{timezone.now().strftime('%Y%m%d')}-"
+
+    def test_numbers_increment_per_storefront(self):
+        other = StoreFront.objects.create(user=self.user, name="Other Till", location="Tema")
+
+        numbers = [self._draft_sale().generate_receipt_number() for _ in range(3)]
+        other_number = self._draft_sale(other).generate_receipt_number()
+
+        self.assertEqual(numbers, [f"{self.prefix}0001", f"{self.prefix}0002", f"{self.prefix}0003"])
+        self.assertTrue(other_number.endswith("-0001"))
+        self.assertEqual(ReceiptSequence.objects.get(storefront=self.storefront).last_value, 3)
+
+    def test_drafts_do_not_consume_numbers(self):
+        for _ in range(5):
+            self._draft_sale()
+
+        self.assertEqual(self._draft_sale().generate_receipt_number(), f"{self.prefix}0001")
+
+    def test_new_day_row_continues_after_existing_receipts(self):
+        legacy = self._draft_sale()
+        Sale.objects.filter(pk=legacy.pk).update(receipt_number=f"{self.prefix}0007")
+
+        self.assertEqual(self._draft_sale().generate_receipt_number(), f"{self.prefix}0008")
+
+
+def _sqlite_deferred_transactions():
+    """SQLite only tolerates concurrent writers when transactions take the write lock up front."""
+    options = connection.settings_dict.get("OPTIONS", {})
+    return connection.vendor == "sqlite" and options.get("transaction_mode") != "IMMEDIATE"
+
+
+@skipIf(_sqlite_deferred_transactions(), "SQLite needs transaction_mode=IMMEDIATE for concurrent writers")
+class ConcurrentReceiptNumberTest(ReceiptSequenceFixtureMixin, TransactionTestCase):
+    # Declaring the apps makes the teardown flush TRUNCATE ... CASCADE, which
+    # PostgreSQL needs for tables that reference users (e.g. program_blueprints)
+    available_apps = [
+        'django.contrib.contenttypes',
+        'django.contrib.auth',
+        'rest_framework.authtoken',
+        'guardian',
+        'accounts',
+        'inventory',
+        'sales',
+        'bookkeeping',
+        'subscriptions',
+        'reports',
+        'settings',
+        'ai_features',
+        'programs',
+    ]
+    sale_count = 200
+
+    def setUp(self):
+        self._build_fixture()
+        self.sale_ids = [self._draft_sale().id for _ in range(self.sale_count)]
+
+    def _complete(self, sale_id):
+        try:
+            sale = Sale.objects.get(pk=sale_id)
+            sale.complete_sale()
+            return sale.receipt_number
+        finally:
+            connection.close()
+
+    def test_parallel_completions_get_unique_gap_free_numbers(self):
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            receipt_numbers = list(pool.map(self._complete, self.sale_ids))
+
+        suffixes = sorted(int(number.rsplit("-", 1)[1]) for number in receipt_numbers)
+        self.assertEqual(suffixes, list(range(1, self.sale_count + 1)))
+        self.assertEqual(
+            Sale.objects.filter(status="COMPLETED", storefront=self.storefront).count(),
+            self.sale_count
+        )
+        self.assertEqual(
+            StoreFrontInventory.objects.get(storefront=self.storefront, product=self.product).quantity,
+            10_000 - self.sale_count
+        )
@@ -0,0 +1,56 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+from django.utils import timezone
+
+from sales.models import StockReservation
+from sales.reservation_expiry import release_expired_reservations
+from sales.tests_reserved_quantity import ReservationFixtureMixin
+
+
+class ReservationExpiryEngineTest(ReservationFixtureMixin, TestCase):
+    def _reservation(self, minutes_ago):
+        reservation = StockReservation.create_reservation(self.stock_product, Decimal("1"), f"cart-{minutes_ago}")
+        StockReservation.objects.filter(pk=reservation.pk).update(
+            expires_at=timezone.now() - timedelta(minutes=minutes_ago)
+        )
+        return reservation
+
+    def test_releases_in_bounded_batches_and_reports_each_batch(self):
+        for minutes_ago in range(1, 6):
+            self._reservation(minutes_ago)
+        live = StockReservation.create_reservation(self.stock_product, Decimal("2"), "cart-live")
+
+        stats = release_expired_reservations(batch_size=2, max_batches=0)
+
+        self.assertEqual(stats.released, 5)
+        self.assertEqual([batch.released for batch in stats.batches], [2, 2, 1])
+        self.assertTrue(stats.exhausted)
+        self.assertEqual(stats.as_dict()["batches"], 3)
+        self.stock_product.refresh_from_db(fields=["reserved_quantity"])
+        self.assertEqual(self.stock_product.reserved_quantity, Decimal("2.00"))
+        live.refresh_from_db()
+        self.assertEqual(live.status, "ACTIVE")
+
+    def test_batch_limit_releases_oldest_first_and_leaves_the_rest(self):
+        oldest = self._reservation(30)
+        middle = self._reservation(20)
+        newest = self._reservation(10)
+
+        stats = release_expired_reservations(batch_size=1, max_batches=2)
+
+        self.assertEqual(stats.released, 2)
+        self.assertFalse(stats.exhausted)
+        statuses = dict(StockReservation.objects.values_list("id", "status"))
+        self.assertEqual(statuses[oldest.id], "RELEASED")
+        self.assertEqual(statuses[middle.id], "RELEASED")
+        self.assertEqual(statuses[newest.id], "ACTIVE")
+
+    def test_nothing_expired_runs_no_batches(self):
+        StockReservation.create_reservation(self.stock_product, Decimal("1"), "cart-live")
+
+        stats = release_expired_reservations()
+
+        self.assertEqual(stats.released, 0)
+        self.assertEqual(stats.batches, [])
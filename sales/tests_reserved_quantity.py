@@ -0,0 +1,168 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from accounts.models import Business
+from inventory.models import (
+    Category,
+    Product,
+    Stock,
+    StockProduct,
+    StoreFront,
+    StoreFrontInventory,
+    Warehouse,
+)
+from inventory.serializers import StockProductSerializer
+from sales.models import Sale, StockReservation
+
+
+User = get_user_model()
+
+
+class ReservationFixtureMixin:
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="counter-owner@example.com",
+            password="testpass123",
+            name="Owner"
+        )
+        self.business = Business.objects.create(
+            owner=self.user,
+            name="Counter Business",
+            tin="TIN-COUNTER-1",
+            email="counter@example.com",
+            address="1 Counter Street",
+            phone_numbers=["+1000000001"],
+            social_handles={}
+        )
+        self.category = Category.objects.create(name="Counter Category")
+        self.product = Product.objects.create(
+            business=self.business,
+            name="Counter Product",
+            sku="COUNTER-001",
+            category=self.category
+        )
+        self.warehouse = Warehouse.objects.create(name="Counter Warehouse", location="Uptown")
+        self.stock = Stock.objects.create(business=self.business)
+        self.stock_product = StockProduct.objects.create(
+            stock=self.stock,
+            warehouse=self.warehouse,
+            product=self.product,
+            quantity=10,
+            unit_cost=Decimal("5.00"),
+            retail_price=Decimal("7.50")
+        )
+
+
+class StockProductReservedQuantityTest(ReservationFixtureMixin, TestCase):
+    def _reserved(self) -> Decimal:
+        self.stock_product.refresh_from_db(fields=["reserved_quantity"])
+        return self.stock_product.reserved_quantity
+
+    def test_create_reservation_increments_counter(self):
+        StockReservation.create_reservation(self.stock_product, Decimal("3"), "cart-a")
+        StockReservation.create_reservation(self.stock_product, Decimal("2"), "cart-b")
+
+        self.assertEqual(self._reserved(), Decimal("5.00"))
+        self.assertEqual(self.stock_product.get_available_quantity(), Decimal("5.00"))
+
+    def test_create_reservation_rejects_quantity_above_counter_availability(self):
+        StockReservation.create_reservation(self.stock_product, Decimal("8"), "cart-a")
+
+        with self.assertRaises(ValidationError):
+            StockReservation.create_reservation(self.stock_product, Decimal("3"), "cart-b")
+        self.assertEqual(self._reserved(), Decimal("8.00"))
+
+    def test_release_and_commit_decrement_counter_once(self):
+        released = StockReservation.create_reservation(self.stock_product, Decimal("3"), "cart-a")
+        committed = StockReservation.create_reservation(self.stock_product, Decimal("2"), "cart-b")
+
+        released.release()
+        released.release()
+        committed.commit()
+
+        self.assertEqual(self._reserved(), Decimal("0.00"))
+        released.refresh_from_db()
+        committed.refresh_from_db()
+        self.assertEqual(released.status, "RELEASED")
+        self.assertIsNotNone(released.released_at)
+        self.assertEqual(committed.status, "COMMITTED")
+
+    def test_release_expired_only_decrements_expired_rows(self):
+        expired = StockReservation.create_reservation(self.stock_product, Decimal("4"), "cart-a")
+        StockReservation.create_reservation(self.stock_product, Decimal("1"), "cart-b")
+        StockReservation.objects.filter(pk=expired.pk).update(expires_at=timezone.now() - timedelta(minutes=1))
+
+        self.assertEqual(StockReservation.release_expired(), 1)
+        self.assertEqual(self._reserved(), Decimal("1.00"))
+
+    def test_serializer_update_does_not_overwrite_counter(self):
+        stale = StockProduct.objects.get(pk=self.stock_product.pk)
+        StockReservation.create_reservation(self.stock_product, Decimal("2"), "cart-a")
+
+        serializer = StockProductSerializer(stale, data={"retail_price": "8.00"}, partial=True)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        serializer.save()
+
+        self.assertEqual(self._reserved(), Decimal("2.00"))
+        self.stock_product.refresh_from_db(fields=["retail_price"])
+        self.assertEqual(self.stock_product.retail_price, Decimal("8.00"))
+
+    def test_rebuild_command_reconciles_drift(self):
+        StockReservation.create_reservation(self.stock_product, Decimal("3"), "cart-a")
+        StockProduct.objects.filter(pk=self.stock_product.pk).update(reserved_quantity=Decimal("9.00"))
+
+        out = StringIO()
+        call_command("rebuild_reserved_quantities", dry_run=True, stdout=out)
+        self.assertIn("1 stock products would change", out.getvalue())
+        self.assertEqual(self._reserved(), Decimal("9.00"))
+
+        call_command("rebuild_reserved_quantities", stdout=StringIO())
+        self.assertEqual(self._reserved(), Decimal("3.00"))
+
+
+class StoreFrontReservationScopeTest(ReservationFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        StockProduct.objects.filter(pk=self.stock_product.pk).update(calculated_quantity=100)
+        self.stock_product.refresh_from_db()
+        self.storefront = StoreFront.objects.create(user=self.user, name="Front A", location="Accra")
+        self.other_storefront = StoreFront.objects.create(user=self.user, name="Front B", location="Kumasi")
+        for storefront in (self.storefront, self.other_storefront):
+            StoreFrontInventory.objects.create(storefront=storefront, product=self.product, quantity=5)
+
+    def _sale(self, storefront):
+        return Sale.objects.create(
+            business=self.business,
+            storefront=storefront,
+            user=self.user,
+            status="DRAFT",
+        )
+
+    def test_reservation_records_sale_storefront(self):
+        sale = self._sale(self.storefront)
+        reservation = StockReservation.create_reservation(self.stock_product, Decimal("2"), str(sale.id))
+        self.assertEqual(reservation.storefront_id, self.storefront.id)
+
+        session_only = StockReservation.create_reservation(self.stock_product, Decimal("1"), "anonymous-cart")
+        self.assertIsNone(session_only.storefront_id)
+
+    def test_availability_only_counts_same_storefront_reservations(self):
+        StockReservation.create_reservation(
+            self.stock_product, Decimal("4"), str(self._sale(self.other_storefront).id)
+        )
+        StockReservation.create_reservation(
+            self.stock_product, Decimal("3"), str(self._sale(self.storefront).id)
+        )
+
+        with self.assertRaises(ValidationError) as ctx:
+            StockReservation.create_reservation(
+                self.stock_product, Decimal("3"), str(self._sale(self.storefront).id)
+            )
+        self.assertEqual(Decimal(ctx.exception.params["available"]), Decimal("2"))
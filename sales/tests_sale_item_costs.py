@@ -0,0 +1,131 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from accounts.models import Business
+from inventory.models import (
+    BusinessStoreFront,
+    Category,
+    Product,
+    Stock,
+    StockProduct,
+    StoreFront,
+    StoreFrontInventory,
+    Warehouse,
+)
+from reports.utils.profit_calculator import ProfitCalculator
+from sales.models import Sale, SaleItem
+
+
+User = get_user_model()
+
+
+class SaleItemCostSnapshotTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="costs@example.com",
+            password="testpass123",
+            name="Cost Owner"
+        )
+        self.business = Business.objects.create(
+            owner=self.user,
+            name="Cost Business",
+            tin="TIN-COST-1",
+            email="cost-biz@example.com",
+            address="1 Ledger Road"
+        )
+        self.product = Product.objects.create(
+            business=self.business,
+            name="Espresso Beans",
+            sku="BEAN-001",
+            category=Category.objects.create(name="Coffee")
+        )
+        warehouse = Warehouse.objects.create(
+            name="Roastery",
+            location="Back Room",
+            manager=self.user
+        )
+        self.stock = Stock.objects.create(business=self.business, description="Roast batch")
+        self.stock_product = StockProduct.objects.create(
+            stock=self.stock,
+            warehouse=warehouse,
+            product=self.product,
+            quantity=20,
+            unit_cost=Decimal("6.00"),
+            unit_tax_amount=Decimal("0.50"),
+            unit_additional_cost=Decimal("1.00"),
+            retail_price=Decimal("15.00")
+        )
+        storefront = StoreFront.objects.create(
+            user=self.user,
+            name="Coffee Bar",
+            location="Front"
+        )
+        BusinessStoreFront.objects.create(business=self.business, storefront=storefront)
+        StoreFrontInventory.objects.create(storefront=storefront, product=self.product, quantity=10)
+        self.sale = Sale.objects.create(
+            business=self.business,
+            storefront=storefront,
+            user=self.user,
+            status="DRAFT",
+            payment_type="CASH"
+        )
+        self.item = SaleItem.objects.create(
+            sale=self.sale,
+            product=self.product,
+            stock=self.stock,
+            stock_product=self.stock_product,
+            quantity=Decimal("3"),
+            unit_price=Decimal("15.00")
+        )
+        self.sale.calculate_totals()
+        self.sale.save()
+
+    def test_completion_snapshot_keeps_historical_cogs(self):
+        self.sale.complete_sale()
+        self.item.refresh_from_db()
+        self.assertEqual(self.item.unit_cost, Decimal("7.50"))
+        self.assertEqual(self.item.total_cost, Decimal("22.50"))
+
+        # A later cost correction on the batch does not rewrite past margins
+        StockProduct.objects.filter(pk=self.stock_product.pk).update(unit_cost=Decimal("9.00"))
+        costs = ProfitCalculator.calculate_sale_costs(Sale.objects.filter(pk=self.sale.pk))
+        self.assertEqual(costs[self.sale.pk]["cogs"], Decimal("22.50"))
+        self.assertEqual(self.item.profit_amount, Decimal("7.50"))
+
+    def test_sale_costs_are_one_aggregate_query(self):
+        for quantity in ("1", "2"):
+            SaleItem.objects.create(
+                sale=self.sale,
+                product=self.product,
+                stock_product=self.stock_product,
+                quantity=Decimal(quantity),
+                unit_price=Decimal("15.00")
+            )
+        sales = Sale.objects.filter(pk=self.sale.pk)
+
+        # One grouped SaleItem query plus the Sale rows themselves
+        with self.assertNumQueries(2):
+            costs = ProfitCalculator.calculate_sale_costs(sales)
+        self.assertEqual(costs[self.sale.pk]["cogs"], Decimal("45.00"))
+
+    def test_backfill_fills_rows_without_a_snapshot(self):
+        SaleItem.objects.filter(pk=self.item.pk).update(unit_cost=None, total_cost=None)
+
+        # Until backfilled, reports fall back to the linked StockProduct in SQL
+        costs = ProfitCalculator.calculate_sale_costs(Sale.objects.filter(pk=self.sale.pk))
+        self.assertEqual(costs[self.sale.pk]["cogs"], Decimal("22.50"))
+
+        out = StringIO()
+        call_command("backfill_sale_item_costs", "--dry-run", stdout=out)
+        self.assertIn("1 sale items would be filled", out.getvalue())
+        self.assertIsNone(SaleItem.objects.get(pk=self.item.pk).unit_cost)
+
+        out = StringIO()
+        call_command("backfill_sale_item_costs", "--batch-size", "1", stdout=out)
+        self.assertIn("Filled 1 sale items.", out.getvalue())
+        self.item.refresh_from_db()
+        self.assertEqual((self.item.unit_cost, self.item.total_cost), (Decimal("7.50"), Decimal("22.50")))
@@ -0,0 +1,242 @@
+from collections import defaultdict
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.contrib.auth import get_user_model
+from rest_framework.test import APITestCase
+
+from accounts.models import Business, BusinessMembership
+from inventory.models import (
+    BusinessStoreFront,
+    Category,
+    Product,
+    Stock,
+    StockProduct,
+    StoreFront,
+    Warehouse,
+)
+from sales.models import Customer, Sale, SaleItem
+from tests.utils import ensure_active_subscription
+
+
+User = get_user_model()
+
+SUMMARY_URL = '/sales/api/sales/summary/'
+ZERO = Decimal('0.00')
+
+
+def _money(value):
+    return float(value.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP))
+
+
+def legacy_summary_fields(sales):
+    """
+    The per-sale Python loop SaleViewSet.summary used before aggregating in
+    SQL, kept as the reference the new output must reproduce.
+    """
+    sales = list(sales.exclude(status='DRAFT'))
+    sale_costs = defaultdict(lambda: ZERO)
+    sale_line_tax = defaultdict(lambda: ZERO)
+    sale_line_discount = defaultdict(lambda: ZERO)
+    for item in SaleItem.objects.filter(sale__in=sales).select_related('product', 'stock_product'):
+        sale_costs[item.sale_id] += item.stock_product.landed_unit_cost * item.quantity
+        sale_line_tax[item.sale_id] += item.tax_amount
+        sale_line_discount[item.sale_id] += item.discount_amount
+
+    totals = defaultdict(lambda: ZERO)
+    for sale in sales:
+        sale_tax_total = sale_line_tax[sale.id] + sale.tax_amount
+        sale_discount_total = sale_line_discount[sale.id] + sale.discount_amount
+        cogs = sale_costs[sale.id]
+        profit = sale.total_amount - sale_tax_total - cogs
+        refunded = max(sale.amount_refunded, ZERO)
+        net_paid = max(sale.amount_paid - refunded, ZERO)
+
+        totals['total_sales_all'] += sale.total_amount
+        totals['total_tax_all'] += sale_tax_total
+        totals['total_cogs_all'] += cogs
+        totals['total_discounts_all'] += sale_discount_total
+        totals['gross_profit_all'] += profit
+        totals['refunds_processed'] += refunded
+
+        denominator = sale.total_amount if sale.total_amount > ZERO else (net_paid + sale.amount_due)
+        paid_ratio = min(net_paid / denominator, Decimal('1.00')) if denominator > ZERO else ZERO
+        realized_profit = profit * paid_ratio
+        outstanding_profit = max(profit - realized_profit, ZERO)
+        totals['realized_revenue'] += net_paid
+        totals['realized_profit'] += realized_profit
+        totals['outstanding_profit'] += outstanding_profit
+
+        if sale.is_credit_sale:
+            totals['outstanding_revenue'] += sale.amount_due
+            totals['credit_total_amount'] += sale.total_amount
+            totals['credit_amount_paid'] += net_paid
+            totals['credit_amount_due'] += sale.amount_due
+            totals['credit_realized_profit'] += realized_profit
+            totals['credit_outstanding_profit'] += outstanding_profit
+            if sale.status == 'COMPLETED':
+                totals['credit_total_completed'] += sale.total_amount
+                totals['credit_paid_completed'] += net_paid
+            elif sale.status == 'PARTIAL':
+                totals['credit_amount_due_partial'] += sale.amount_due
+            elif sale.status == 'PENDING':
+                totals['credit_amount_due_pending'] += sale.amount_due
+
+        if sale.status == 'COMPLETED':
+            totals['total_sales_completed'] += sale.total_amount
+            totals['total_cogs_completed'] += cogs
+            totals['total_tax_completed'] += sale_tax_total
+            totals['total_discounts_completed'] += sale_discount_total
+            totals['gross_profit_completed'] += profit
+
+    return {
+        'total_sales': _money(totals['total_sales_completed']),
+        'total_sales_all_statuses': _money(totals['total_sales_all']),
+        'total_cogs': _money(totals['total_cogs_completed']),
+        'total_cogs_all_statuses': _money(totals['total_cogs_all']),
+        'total_tax_collected': _money(totals['total_tax_completed']),
+        'total_tax_all_statuses': _money(totals['total_tax_all']),
+        'total_discounts': _money(totals['total_discounts_completed']),
+        'total_discounts_all_statuses': _money(totals['total_discounts_all']),
+        'total_profit': _money(totals['gross_profit_completed']),
+        'gross_profit_all_statuses': _money(totals['gross_profit_all']),
+        'realized_revenue': _money(totals['realized_revenue']),
+        'refunds_processed': _money(totals['refunds_processed']),
+        'outstanding_revenue': _money(totals['outstanding_revenue']),
+        'realized_profit': _money(totals['realized_profit']),
+        'outstanding_profit': _money(totals['outstanding_profit']),
+        'total_credit_sales': _money(totals['credit_total_amount']),
+        'cash_on_hand': _money(totals['realized_profit']),
+        'credit_health': {
+            'total_credit_sales': _money(totals['credit_total_amount']),
+            'completed_credit_sales': _money(totals['credit_total_completed']),
+            'amount_paid': _money(totals['credit_amount_paid']),
+            'amount_due': _money(totals['credit_amount_due']),
+            'unpaid_amount': _money(totals['credit_amount_due_pending']),
+            'partially_paid_amount': _money(totals['credit_amount_due_partial']),
+            'fully_paid_amount': _money(totals['credit_paid_completed']),
+            'realized_profit': _money(totals['credit_realized_profit']),
+            'outstanding_profit': _money(totals['credit_outstanding_profit']),
+        },
+    }
+
+
+class SaleSummaryAggregationTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="summary-owner@example.com",
+            password="testpass123",
+            name="Summary Owner",
+        )
+        self.business = Business.objects.create(
+            owner=self.user,
+            name="Summary Business",
+            tin="TIN-SUM-1",
+            email="summary-biz@example.com",
+            address="9 Ledger Lane",
+        )
+        BusinessMembership.objects.update_or_create(
+            business=self.business,
+            user=self.user,
+            defaults={'role': BusinessMembership.OWNER, 'is_admin': True, 'is_active': True},
+        )
+        ensure_active_subscription(self.business)
+
+        self.storefront = StoreFront.objects.create(user=self.user, name="Summary Store", location="Accra")
+        BusinessStoreFront.objects.create(business=self.business, storefront=self.storefront)
+        self.customer = Customer.objects.create(
+            business=self.business,
+            name="Account Customer",
+            created_by=self.user,
+            credit_limit=Decimal("5000.00"),
+            credit_terms_days=30,
+        )
+
+        category = Category.objects.create(name="Hardware")
+        warehouse = Warehouse.objects.create(name="Summary Warehouse", location="Tema", manager=self.user)
+        self.stock_products = []
+        for sku, unit_cost, tax, extra in [
+            ("SUM-001", "33.33", "1.67", "0.50"),
+            ("SUM-002", "12.40", "0.00", "0.00"),
+            ("SUM-003", "71.05", "3.55", "2.10"),
+        ]:
+            product = Product.objects.create(business=self.business, name=f"Item {sku}", sku=sku, category=category)
+            self.stock_products.append(StockProduct.objects.create(
+                stock=Stock.objects.create(business=self.business),
+                warehouse=warehouse,
+                product=product,
+                quantity=500,
+                unit_cost=Decimal(unit_cost),
+                unit_tax_amount=Decimal(tax),
+                unit_additional_cost=Decimal(extra),
+                retail_price=Decimal("100.00"),
+            ))
+
+        self._seed_sales()
+        self.client.force_authenticate(self.user)
+
+    def _sale(self, status, lines, *, credit=False, paid=None, refunded="0.00", discount="0.00", tax="0.00"):
+        sale = Sale.objects.create(
+            business=self.business,
+            storefront=self.storefront,
+            user=self.user,
+            customer=self.customer if credit else None,
+            payment_type="CREDIT" if credit else "CASH",
+            is_credit_sale=credit,
+            status="DRAFT",
+            discount_amount=Decimal(discount),
+            tax_amount=Decimal(tax),
+        )
+        for stock_product, quantity, unit_price, tax_rate, line_discount in lines:
+            SaleItem.objects.create(
+                sale=sale,
+                product=stock_product.product,
+                stock=stock_product.stock,
+                stock_product=stock_product,
+                quantity=Decimal(quantity),
+                unit_price=Decimal(unit_price),
+                tax_rate=Decimal(tax_rate),
+                discount_percentage=Decimal(line_discount),
+            )
+        sale.calculate_totals()
+        sale.amount_paid = sale.total_amount if paid is None else Decimal(paid)
+        sale.amount_refunded = Decimal(refunded)
+        sale.amount_due = ZERO if status in ("COMPLETED", "REFUNDED") else sale.total_amount - sale.amount_paid
+        sale.status = status
+        sale.save()
+        return sale
+
+    def _seed_sales(self):
+        cheap, mid, premium = self.stock_products
+        self._sale("COMPLETED", [(cheap, "3", "59.99", "12.50", "0"), (mid, "1", "19.95", "0", "5")])
+        self._sale("COMPLETED", [(premium, "2", "149.00", "0", "10")], discount="15.00", tax="7.77")
+        self._sale("COMPLETED", [(mid, "7", "18.00", "3.00", "0")], refunded="25.00")
+        self._sale("COMPLETED", [(cheap, "1", "65.00", "0", "0")], credit=True)
+        self._sale("PARTIAL", [(premium, "3", "139.99", "12.50", "0")], credit=True, paid="120.00")
+        self._sale("PENDING", [(cheap, "4", "55.55", "0", "0"), (premium, "1", "150.00", "0", "0")], credit=True, paid="0.00")
+        self._sale("REFUNDED", [(mid, "2", "20.00", "0", "0")], refunded="40.00")
+        # A partial refund on a part-paid sale and a zero-value sale exercise the ratio edges
+        self._sale("PARTIAL", [(cheap, "1", "80.00", "0", "0")], credit=True, paid="50.00", refunded="10.00")
+        self._sale("COMPLETED", [(mid, "1", "0.00", "0", "0")])
+        self._sale("DRAFT", [(premium, "5", "149.00", "0", "0")])
+
+    def test_summary_matches_legacy_per_sale_loop(self):
+        response = self.client.get(SUMMARY_URL)
+        self.assertEqual(response.status_code, 200)
+        summary = response.json()['summary']
+
+        expected = legacy_summary_fields(Sale.objects.filter(business=self.business))
+        for key, value in expected.items():
+            if key == 'credit_health':
+                for health_key, health_value in value.items():
+                    self.assertAlmostEqual(summary[key][health_key], health_value, places=2, msg=health_key)
+            else:
+                self.assertAlmostEqual(summary[key], value, places=2, msg=key)
+
+        self.assertGreater(expected['outstanding_profit'], 0)
+        self.assertGreater(expected['credit_health']['partially_paid_amount'], 0)
+
+    def test_profit_totals_are_a_single_query(self):
+        from sales.views import SaleViewSet
+
+        with self.assertNumQueries(1):
+            SaleViewSet._sale_profit_totals(Sale.objects.exclude(status='DRAFT'))
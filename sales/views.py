@@ -1,4 +1,3 @@
-from collections import defaultdict
 from datetime import datetime, time, timedelta
 from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
 
@@ -7,8 +6,10 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db import transaction
-from django.db.models import Sum, Q, Count, Avg
-from django.db.models.functions import TruncDate
+from django.db.models import (
+    Avg, Case, Count, DecimalField, ExpressionWrapper, F, FloatField, Q, Sum, Value, When,
+)
+from django.db.models.functions import Cast, Coalesce, Greatest, Least, TruncDate
 from django.http import HttpResponse
 from django.utils import timezone
 from django.utils.dateparse import parse_date
@@ -27,12 +28,16 @@ from .serializers import (
     CustomerSerializer, SaleSerializer, SaleItemSerializer,
     PaymentSerializer, RefundSerializer, RefundItemSerializer,
     CreditTransactionSerializer, AuditLogSerializer,
-    AddSaleItemSerializer, CompleteSaleSerializer,
+    AddSaleItemSerializer, BulkAddSaleItemsSerializer, CompleteSaleSerializer,
     StockAvailabilitySerializer, RecordPaymentSerializer,
     SaleRefundSerializer
 )
 from .filters import SaleFilter
+from .customer_metrics import track_customer_metrics
+from .rollups import track_sale_rollup
 from inventory.models import StockProduct, StoreFront
+from inventory.movement_ledger import record_sale_movements
+from reports.utils.profit_calculator import ProfitCalculator
 
 
 class CustomerViewSet(viewsets.ModelViewSet):
@@ -350,6 +355,140 @@ class SaleViewSet(viewsets.ModelViewSet):
             status=status.HTTP_201_CREATED
         )
 
+    @action(detail=True, methods=['post'])
+    def add_items(self, request, pk=None):
+        """
+        Add several items to a sale (cart) in one all-or-nothing request.
+
+        Reservations for every line are taken under a single ordered lock and
+        sale totals are recalculated once. If any line fails, nothing is added
+        and the response lists the failing lines by index.
+        """
+        sale = self.get_object()
+        
+        # Validate sale is in DRAFT status
+        if sale.status != 'DRAFT':
+            return Response(
+                {'error': 'Can only add items to draft sales'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        serializer = BulkAddSaleItemsSerializer(data=request.data, context={'sale': sale})
+        if not serializer.is_valid():
+            item_errors = serializer.errors.get('items')
+            if isinstance(item_errors, list):
+                return Response(
+                    {
+                        'error': 'One or more items are invalid.',
+                        'code': 'INVALID_ITEMS',
+                        'errors': [
+                            {'index': index, 'errors': line_errors}
+                            for index, line_errors in enumerate(item_errors)
+                            if line_errors
+                        ],
+                    },
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        lines = serializer.validated_data['items']
+        reserved_lines = [line for line in lines if line.get('stock_product')]
+        ip_address = request.META.get('REMOTE_ADDR')
+        user_agent = request.META.get('HTTP_USER_AGENT')
+        
+        with transaction.atomic():
+            try:
+                reservations = StockReservation.create_reservations(
+                    [(line['stock_product'], line['quantity']) for line in reserved_lines],
+                    cart_session_id=str(sale.id),
+                    storefront=sale.storefront_id,
+                    expiry_minutes=30
+                )
+            except ValidationError as exc:
+                params = getattr(exc, 'params', None) or {}
+                # Map reservation line positions back to request line positions
+                request_indexes = [index for index, line in enumerate(lines) if line.get('stock_product')]
+                failed_lines = [
+                    {**detail, 'index': request_indexes[detail['index']]}
+                    for detail in params.get('lines', [])
+                ]
+                return Response(
+                    {
+                        'error': 'Unable to add items due to stock restrictions.',
+                        'code': 'INSUFFICIENT_STOCK',
+                        'developer_message': getattr(exc, 'message', None) or str(exc),
+                        'errors': failed_lines,
+                    },
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            
+            sale_items = []
+            for line in lines:
+                product = line['product']
+                sale_item = SaleItem(
+                    sale=sale,
+                    product=product,
+                    stock_product=line.get('stock_product'),
+                    quantity=line['quantity'],
+                    unit_price=line['unit_price'],
+                    discount_percentage=line.get('discount_percentage', Decimal('0')),
+                    tax_rate=line.get('tax_rate', Decimal('0')),
+                    product_name=product.name,
+                    product_sku=product.sku,
+                )
+                sale_item.calculate_totals()
+                sale_items.append(sale_item)
+            # bulk_create skips SaleItem.save(), so snapshot costs here
+            SaleItem.assign_costs(sale_items)
+            SaleItem.objects.bulk_create(sale_items)
+            
+            # Recalculate sale totals once for the whole batch
+            sale.calculate_totals()
+            sale.save()
+            
+            audit_entries = [
+                AuditLog(
+                    event_type='stock.reserved',
+                    user=request.user,
+                    sale=sale,
+                    event_data={
+                        'stock_product_id': str(line['stock_product'].id),
+                        'quantity': str(line['quantity']),
+                        'reservation_id': str(reservation.id)
+                    },
+                    description=f'Reserved {line["quantity"]} units of {line["product"].name}',
+                    ip_address=ip_address,
+                    user_agent=user_agent
+                )
+                for line, reservation in zip(reserved_lines, reservations)
+            ]
+            audit_entries.extend(
+                AuditLog(
+                    event_type='sale_item.added',
+                    user=request.user,
+                    sale=sale,
+                    sale_item=sale_item,
+                    event_data={
+                        'product_id': str(sale_item.product_id),
+                        'quantity': str(sale_item.quantity),
+                        'unit_price': str(sale_item.unit_price)
+                    },
+                    description=f'Added {sale_item.quantity} x {sale_item.product_name} to sale',
+                    ip_address=ip_address,
+                    user_agent=user_agent
+                )
+                for sale_item in sale_items
+            )
+            AuditLog.objects.bulk_create(audit_entries)
+        
+        return Response(
+            {
+                'items': SaleItemSerializer(sale_items, many=True).data,
+                'count': len(sale_items),
+            },
+            status=status.HTTP_201_CREATED
+        )
+
     @action(detail=True, methods=['post'])
     def abandon(self, request, pk=None):
         """Cancel a draft sale and release any active stock reservations."""
@@ -389,8 +528,8 @@ class SaleViewSet(viewsets.ModelViewSet):
 
             if active_reservations:
                 reservation_ids = [reservation.id for reservation in active_reservations]
-                StockReservation.objects.filter(id__in=reservation_ids).update(
-                    status='RELEASED',
+                StockReservation.release_many(
+                    StockReservation.objects.filter(id__in=reservation_ids),
                     released_at=now
                 )
 
@@ -690,6 +829,7 @@ class SaleViewSet(viewsets.ModelViewSet):
                 sale.status = 'PENDING'
                 sale.completed_at = timezone.now()
                 sale.save()
+                record_sale_movements(sale)
                 
                 # Get customer's old balance for audit trail
                 old_balance = sale.customer.outstanding_balance if sale.customer else Decimal('0.00')
@@ -947,6 +1087,98 @@ class SaleViewSet(viewsets.ModelViewSet):
         }, status=status.HTTP_200_OK)
 
     
+    @staticmethod
+    def _sale_profit_totals(sales):
+        """
+        Profit, realization and credit totals for ``sales`` as one SQL query.
+
+        The inner query groups each sale with its line COGS/tax/discount and
+        derives the per-sale figures:
+
+        - profit = total_amount - (line tax + sale tax) - COGS
+        - net_paid = max(amount_paid - max(amount_refunded, 0), 0)
+        - paid_ratio = min(net_paid / (total_amount, or net_paid + amount_due
+          when the total is zero), 1)
+        - realized profit = profit * paid_ratio; outstanding profit is the
+          non-negative remainder
+
+        The outer query sums those per-sale columns with status and credit
+        filters, so Django selects from the grouped rows instead of inlining
+        each expression into every total.
+        """
+        amount = DecimalField(max_digits=18, decimal_places=2)
+        ratio = DecimalField(max_digits=20, decimal_places=10)
+        zero = Value(Decimal('0.00'), output_field=amount)
+
+        def money(expression):
+            return ExpressionWrapper(expression, output_field=amount)
+
+        per_sale = sales.order_by().annotate(
+            sale_cogs=Coalesce(Sum(ProfitCalculator.line_cost('sale_items__')), zero),
+            line_tax=Coalesce(Sum('sale_items__tax_amount'), zero),
+            line_discount=Coalesce(Sum('sale_items__discount_amount'), zero),
+            refunded=Greatest(Coalesce('amount_refunded', zero), zero),
+        ).annotate(
+            sale_tax_total=money(F('line_tax') + Coalesce('tax_amount', zero)),
+            sale_discount_total=money(F('line_discount') + Coalesce('discount_amount', zero)),
+            net_paid=Greatest(money(Coalesce('amount_paid', zero) - F('refunded')), zero),
+        ).annotate(
+            sale_profit=money(Coalesce('total_amount', zero) - F('sale_tax_total') - F('sale_cogs')),
+            ratio_base=Case(
+                When(total_amount__gt=0, then=F('total_amount')),
+                default=money(F('net_paid') + Coalesce('amount_due', zero)),
+                output_field=amount,
+            ),
+        ).annotate(
+            # Divide in floating point: SQLite stores whole-number decimals as
+            # integers and would otherwise truncate the ratio to 0
+            paid_ratio=Case(
+                When(
+                    ratio_base__gt=0,
+                    then=Least(
+                        Cast(
+                            ExpressionWrapper(Cast('net_paid', FloatField()) / F('ratio_base'), output_field=FloatField()),
+                            ratio,
+                        ),
+                        Value(Decimal('1.00'), output_field=ratio),
+                    ),
+                ),
+                default=Value(Decimal('0.00'), output_field=ratio),
+                output_field=ratio,
+            ),
+        )
+
+        realized = money(F('sale_profit') * F('paid_ratio'))
+        outstanding = Greatest(money(F('sale_profit') - F('sale_profit') * F('paid_ratio')), zero)
+        completed = Q(status='COMPLETED')
+        credit = Q(is_credit_sale=True)
+        return per_sale.aggregate(
+            total_sales_all=Sum('total_amount'),
+            total_tax_all=Sum('sale_tax_total'),
+            total_cogs_all=Sum('sale_cogs'),
+            total_discounts_all=Sum('sale_discount_total'),
+            gross_profit_all=Sum('sale_profit'),
+            total_sales_completed=Sum('total_amount', filter=completed),
+            total_tax_completed=Sum('sale_tax_total', filter=completed),
+            total_cogs_completed=Sum('sale_cogs', filter=completed),
+            total_discounts_completed=Sum('sale_discount_total', filter=completed),
+            gross_profit_completed=Sum('sale_profit', filter=completed),
+            refunds_processed=Sum('refunded'),
+            realized_revenue=Sum('net_paid'),
+            realized_profit=Sum(realized),
+            outstanding_profit=Sum(outstanding),
+            outstanding_revenue=Sum('amount_due', filter=credit),
+            credit_total_amount=Sum('total_amount', filter=credit),
+            credit_total_completed=Sum('total_amount', filter=credit & completed),
+            credit_amount_paid=Sum('net_paid', filter=credit),
+            credit_amount_due=Sum('amount_due', filter=credit),
+            credit_amount_due_partial=Sum('amount_due', filter=credit & Q(status='PARTIAL')),
+            credit_amount_due_pending=Sum('amount_due', filter=credit & Q(status='PENDING')),
+            credit_paid_completed=Sum('net_paid', filter=credit & completed),
+            credit_realized_profit=Sum(realized, filter=credit),
+            credit_outstanding_profit=Sum(outstanding, filter=credit),
+        )
+
     @action(detail=False, methods=['get'])
     def summary(self, request):
         """
@@ -1028,140 +1260,39 @@ class SaleViewSet(viewsets.ModelViewSet):
             )),
         )
         
-        # Prepare sale and sale-item level analytics for profitability and credit tracking
-        analysed_sales = queryset.exclude(status='DRAFT')
-        sale_ids = list(analysed_sales.values_list('id', flat=True))
-        sale_items = list(
-            SaleItem.objects.filter(sale_id__in=sale_ids)
-            .select_related('product', 'stock_product')
-        )
-        # Prefetch fallback stock products for items without a stock_product reference
-        missing_product_ids = {
-            item.product_id
-            for item in sale_items
-            if item.stock_product_id is None
+        # Profitability and credit tracking for every non-draft sale, in one query
+        totals = {
+            key: to_decimal(value)
+            for key, value in self._sale_profit_totals(queryset.exclude(status='DRAFT')).items()
         }
-        fallback_stock = {}
-        if missing_product_ids:
-            for stock_product in (
-                StockProduct.objects
-                .filter(product_id__in=missing_product_ids)
-                .order_by('product_id', '-created_at')
-            ):
-                if stock_product.product_id not in fallback_stock:
-                    fallback_stock[stock_product.product_id] = stock_product
-
-        sale_costs = defaultdict(lambda: Decimal('0.00'))
-        sale_line_tax = defaultdict(lambda: Decimal('0.00'))
-        sale_line_discount = defaultdict(lambda: Decimal('0.00'))
-
-        for item in sale_items:
-            quantity = to_decimal(item.quantity)
-            stock_product = item.stock_product or fallback_stock.get(item.product_id)
-            if stock_product:
-                unit_cost = (
-                    to_decimal(stock_product.unit_cost)
-                    + to_decimal(getattr(stock_product, 'unit_tax_amount', None))
-                    + to_decimal(getattr(stock_product, 'unit_additional_cost', None))
-                )
-            else:
-                unit_cost = to_decimal(item.product.get_latest_cost())
-
-            sale_costs[item.sale_id] += (unit_cost * quantity)
-            sale_line_tax[item.sale_id] += to_decimal(item.tax_amount)
-            sale_line_discount[item.sale_id] += to_decimal(item.discount_amount)
-
-        total_sales_completed = Decimal('0.00')
-        total_cogs_completed = Decimal('0.00')
-        total_tax_completed = Decimal('0.00')
-        total_discounts_completed = Decimal('0.00')
-        gross_profit_completed = Decimal('0.00')
-
-        total_sales_all = Decimal('0.00')
-        total_tax_all = Decimal('0.00')
-        total_cogs_all = Decimal('0.00')
-        total_discounts_all = Decimal('0.00')
-        gross_profit_all = Decimal('0.00')
-
-        realized_revenue_total = Decimal('0.00')
-        outstanding_revenue_total = Decimal('0.00')
-        realized_profit_total = Decimal('0.00')
-        outstanding_profit_total = Decimal('0.00')
-
-        refunds_processed_total = Decimal('0.00')
-
-        credit_total_amount = Decimal('0.00')
-        credit_total_completed = Decimal('0.00')
-        credit_amount_paid_total = Decimal('0.00')
-        credit_amount_due_total = Decimal('0.00')
-        credit_amount_due_partial = Decimal('0.00')
-        credit_amount_due_pending = Decimal('0.00')
-        credit_paid_completed = Decimal('0.00')
-        credit_realized_profit = Decimal('0.00')
-        credit_outstanding_profit = Decimal('0.00')
-
-        for sale in analysed_sales:
-            total_amount = to_decimal(sale.total_amount)
-            paid = to_decimal(sale.amount_paid)
-            refunded = to_decimal(sale.amount_refunded)
-            due = to_decimal(sale.amount_due)
-            sale_tax_total = sale_line_tax[sale.id] + to_decimal(sale.tax_amount)
-            sale_discount_total = sale_line_discount[sale.id] + to_decimal(sale.discount_amount)
-            cogs = sale_costs[sale.id]
-            net_revenue = total_amount - sale_tax_total
-            profit = net_revenue - cogs
-
-            if refunded < Decimal('0.00'):
-                refunded = Decimal('0.00')
-            refunds_processed_total += refunded
-
-            net_paid = paid - refunded
-            if net_paid < Decimal('0.00'):
-                net_paid = Decimal('0.00')
-
-            total_sales_all += total_amount
-            total_tax_all += sale_tax_total
-            total_cogs_all += cogs
-            total_discounts_all += sale_discount_total
-            gross_profit_all += profit
-
-            denominator = total_amount if total_amount > Decimal('0.00') else (net_paid + due)
-            paid_ratio = (net_paid / denominator) if denominator > Decimal('0.00') else Decimal('0.00')
-            if paid_ratio > Decimal('1.00'):
-                paid_ratio = Decimal('1.00')
-
-            realized_profit = (profit * paid_ratio)
-            outstanding_profit = profit - realized_profit
-            if outstanding_profit < Decimal('0.00'):
-                outstanding_profit = Decimal('0.00')
-
-            realized_revenue_total += net_paid
-            realized_profit_total += realized_profit
-            outstanding_profit_total += outstanding_profit
-
-            # Track credit sales using new is_credit_sale flag
-            if sale.is_credit_sale:
-                outstanding_revenue_total += due
-                credit_total_amount += total_amount
-                credit_amount_paid_total += net_paid
-                credit_amount_due_total += due
-                credit_realized_profit += realized_profit
-                credit_outstanding_profit += outstanding_profit
-
-                if sale.status == 'COMPLETED':
-                    credit_total_completed += total_amount
-                    credit_paid_completed += net_paid
-                elif sale.status == 'PARTIAL':
-                    credit_amount_due_partial += due
-                elif sale.status == 'PENDING':
-                    credit_amount_due_pending += due
-
-            if sale.status == 'COMPLETED':
-                total_sales_completed += total_amount
-                total_cogs_completed += cogs
-                total_tax_completed += sale_tax_total
-                total_discounts_completed += sale_discount_total
-                gross_profit_completed += profit
+        total_sales_completed = totals['total_sales_completed']
+        total_cogs_completed = totals['total_cogs_completed']
+        total_tax_completed = totals['total_tax_completed']
+        total_discounts_completed = totals['total_discounts_completed']
+        gross_profit_completed = totals['gross_profit_completed']
+
+        total_sales_all = totals['total_sales_all']
+        total_tax_all = totals['total_tax_all']
+        total_cogs_all = totals['total_cogs_all']
+        total_discounts_all = totals['total_discounts_all']
+        gross_profit_all = totals['gross_profit_all']
+
+        realized_revenue_total = totals['realized_revenue']
+        outstanding_revenue_total = totals['outstanding_revenue']
+        realized_profit_total = totals['realized_profit']
+        outstanding_profit_total = totals['outstanding_profit']
+
+        refunds_processed_total = totals['refunds_processed']
+
+        credit_total_amount = totals['credit_total_amount']
+        credit_total_completed = totals['credit_total_completed']
+        credit_amount_paid_total = totals['credit_amount_paid']
+        credit_amount_due_total = totals['credit_amount_due']
+        credit_amount_due_partial = totals['credit_amount_due_partial']
+        credit_amount_due_pending = totals['credit_amount_due_pending']
+        credit_paid_completed = totals['credit_paid_completed']
+        credit_realized_profit = totals['credit_realized_profit']
+        credit_outstanding_profit = totals['credit_outstanding_profit']
 
         net_sales_completed = total_sales_completed - total_tax_completed
         summary['net_sales'] = to_money(net_sales_completed)
@@ -1619,16 +1750,17 @@ class SaleViewSet(viewsets.ModelViewSet):
             )
             
             # Update sale amounts
-            sale.amount_paid += data['amount_paid']
-            sale.calculate_totals()
-            
-            # Update sale status based on payment
-            if sale.amount_due == Decimal('0.00'):
-                sale.status = 'COMPLETED'
-            elif sale.amount_paid > Decimal('0.00'):
-                sale.status = 'PARTIAL'
-            
-            sale.save()
+            with track_sale_rollup(sale), track_customer_metrics(sale):
+                sale.amount_paid += data['amount_paid']
+                sale.calculate_totals()
+                
+                # Update sale status based on payment
+                if sale.amount_due == Decimal('0.00'):
+                    sale.status = 'COMPLETED'
+                elif sale.amount_paid > Decimal('0.00'):
+                    sale.status = 'PARTIAL'
+                
+                sale.save()
             
             # Update customer balance
             sale.customer.outstanding_balance -= data['amount_paid']
@@ -1760,6 +1892,10 @@ class SaleViewSet(viewsets.ModelViewSet):
         Query parameters:
         - format: 'json' (default) or 'html' or 'pdf'
         
+        Receipts are pre-rendered when the sale is completed or refunded and
+        served from ReceiptArtifact. The ETag is the content's sha256, and a
+        matching If-None-Match returns 304 Not Modified.
+        
         Response includes:
         - Full business and storefront information
         - Customer details for personalized receipts
@@ -1768,61 +1904,49 @@ class SaleViewSet(viewsets.ModelViewSet):
         - Receipt number and timestamps
         - Sale type (RETAIL/WHOLESALE) for proper display
         """
-        from .receipt_serializers import ReceiptSerializer
-        from .receipt_generator import generate_receipt_html, generate_receipt_pdf
+        from .receipt_artifacts import CONTENT_TYPES, RECEIPT_STATUSES, get_receipt_artifact
         
         sale = self.get_object()
         
         # Only allow receipt generation for completed sales
-        if sale.status not in ['COMPLETED', 'PARTIAL', 'REFUNDED']:
+        if sale.status not in RECEIPT_STATUSES:
             return Response(
                 {
                     'error': 'Receipt can only be generated for completed sales',
                     'current_status': sale.status,
-                    'allowed_statuses': ['COMPLETED', 'PARTIAL', 'REFUNDED']
+                    'allowed_statuses': list(RECEIPT_STATUSES)
                 },
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Serialize receipt data
-        serializer = ReceiptSerializer(sale)
-        receipt_data = serializer.data
-        
         # Check requested format
         format_type = request.query_params.get('format', 'json').lower()
+        if format_type not in CONTENT_TYPES:
+            format_type = 'json'
         
-        if format_type == 'html':
-            # Return HTML for printing
-            html_content = generate_receipt_html(receipt_data)
-            return HttpResponse(html_content, content_type='text/html')
-        
-        elif format_type == 'pdf':
-            # Return PDF file (requires weasyprint)
-            try:
-                pdf_bytes = generate_receipt_pdf(receipt_data)
-                response = HttpResponse(pdf_bytes, content_type='application/pdf')
-                response['Content-Disposition'] = f'attachment; filename="receipt-{sale.receipt_number}.pdf"'
-                return response
-            except ImportError:
-                return Response(
-                    {
-                        'error': 'PDF generation not available',
-                        'message': 'WeasyPrint library is not installed. Install with: pip install weasyprint'
-                    },
-                    status=status.HTTP_501_NOT_IMPLEMENTED
-                )
-            except Exception as e:
-                return Response(
-                    {
-                        'error': 'Failed to generate PDF',
-                        'details': str(e)
-                    },
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
-                )
+        # Serve the stored rendering (re-rendered only if the sale changed since)
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        try:
+            artifact = get_receipt_artifact(sale, format_type, if_none_match=if_none_match)
+        except Exception as e:
+            return Response(
+                {
+                    'error': f'Failed to generate {format_type.upper()} receipt',
+                    'details': str(e)
+                },
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
         
+        etag = f'"{artifact.digest}"'
+        if if_none_match and (if_none_match.strip() == '*' or etag in [tag.strip() for tag in if_none_match.split(',')]):
+            response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
         else:
-            # Default: return JSON
-            return Response(receipt_data)
+            response = HttpResponse(bytes(artifact.content), content_type=artifact.content_type)
+            if format_type == 'pdf':
+                response['Content-Disposition'] = f'attachment; filename="receipt-{sale.receipt_number}.pdf"'
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
     
     @action(detail=True, methods=['post', 'patch'], url_path='update_customer')
     def update_customer(self, request, pk=None):
@@ -18,6 +18,7 @@ from .models import (
     TaxConfiguration,
     ServiceCharge
 )
+from .status_resolver import invalidate_subscription_status
 
 
 # SubscriptionPlan admin removed - use SubscriptionPricingTier instead
@@ -85,21 +86,28 @@ class SubscriptionAdmin(admin.ModelAdmin):
     
     actions = ['activate_subscriptions', 'suspend_subscriptions', 'cancel_subscriptions']
     
+    def _bulk_update(self, queryset, **fields):
+        """queryset.update() skips post_save, so drop the cached statuses here"""
+        business_ids = list(queryset.values_list('business_id', flat=True))
+        updated = queryset.update(**fields)
+        invalidate_subscription_status(business_ids)
+        return updated
+    
     def activate_subscriptions(self, request, queryset):
         """Bulk activate subscriptions"""
-        updated = queryset.update(status='ACTIVE', payment_status='PAID')
+        updated = self._bulk_update(queryset, status='ACTIVE', payment_status='PAID')
         self.message_user(request, f'{updated} subscriptions activated.')
     activate_subscriptions.short_description = 'Activate selected subscriptions'
     
     def suspend_subscriptions(self, request, queryset):
         """Bulk suspend subscriptions"""
-        updated = queryset.update(status='SUSPENDED')
+        updated = self._bulk_update(queryset, status='SUSPENDED')
         self.message_user(request, f'{updated} subscriptions suspended.')
     suspend_subscriptions.short_description = 'Suspend selected subscriptions'
     
     def cancel_subscriptions(self, request, queryset):
         """Bulk cancel subscriptions"""
-        updated = queryset.update(status='CANCELLED', cancelled_at=timezone.now())
+        updated = self._bulk_update(queryset, status='CANCELLED', cancelled_at=timezone.now())
         self.message_user(request, f'{updated} subscriptions cancelled.')
     cancel_subscriptions.short_description = 'Cancel selected subscriptions'
 
@@ -4,6 +4,7 @@ Permissions for subscription endpoints and subscription-based access control
 from rest_framework import permissions
 from rest_framework.permissions import BasePermission
 from django.core.exceptions import PermissionDenied as DjangoPermissionDenied
+from .status_resolver import get_request_business, get_request_subscription_status
 from .utils import SubscriptionChecker
 
 
@@ -69,26 +70,20 @@ class RequiresActiveSubscription(permissions.BasePermission):
         if not request.user or not request.user.is_authenticated:
             return False
         
-        # Get business from user's active membership
-        from accounts.models import BusinessMembership
+        # Get business from user's active membership (once per request)
+        business = get_request_business(request)
         
-        membership = BusinessMembership.objects.filter(
-            user=request.user,
-            is_active=True
-        ).first()
-        
-        if not membership:
+        if not business:
             self.message = "User must be associated with a business."
             return False
         
-        business = membership.business
-        
         # Check for active subscription
         try:
             result = SubscriptionChecker.check_subscription_required(
                 business=business,
                 feature_name="this feature",
-                raise_exception=False
+                raise_exception=False,
+                status=get_request_subscription_status(request)
             )
             
             # Only allow if subscription is active (not grace period)
@@ -146,26 +141,20 @@ class RequiresSubscriptionForReports(permissions.BasePermission):
         if not request.user or not request.user.is_authenticated:
             return False
         
-        # Get business from user's active membership
-        from accounts.models import BusinessMembership
-        
-        membership = BusinessMembership.objects.filter(
-            user=request.user,
-            is_active=True
-        ).first()
+        # Get business from user's active membership (once per request)
+        business = get_request_business(request)
         
-        if not membership:
+        if not business:
             self.message = "User must be associated with a business."
             return False
         
-        business = membership.business
-        
         # Check subscription status
         try:
             result = SubscriptionChecker.check_subscription_required(
                 business=business,
                 feature_name="reports",
-                raise_exception=False
+                raise_exception=False,
+                status=get_request_subscription_status(request)
             )
             
             # Active subscription - full access
@@ -220,26 +209,20 @@ class RequiresSubscriptionForExports(permissions.BasePermission):
         if not request.user or not request.user.is_authenticated:
             return False
         
-        # Get business from user's active membership
-        from accounts.models import BusinessMembership
-        
-        membership = BusinessMembership.objects.filter(
-            user=request.user,
-            is_active=True
-        ).first()
+        # Get business from user's active membership (once per request)
+        business = get_request_business(request)
         
-        if not membership:
+        if not business:
             self.message = "User must be associated with a business."
             return False
         
-        business = membership.business
-        
         # Check subscription status
         try:
             result = SubscriptionChecker.check_subscription_required(
                 business=business,
                 feature_name="data exports",
-                raise_exception=False
+                raise_exception=False,
+                status=get_request_subscription_status(request)
             )
             
             # Active subscription - full access
@@ -289,26 +272,20 @@ class RequiresSubscriptionForAutomation(permissions.BasePermission):
         if not request.user or not request.user.is_authenticated:
             return False
         
-        # Get business from user's active membership
-        from accounts.models import BusinessMembership
-        
-        membership = BusinessMembership.objects.filter(
-            user=request.user,
-            is_active=True
-        ).first()
+        # Get business from user's active membership (once per request)
+        business = get_request_business(request)
         
-        if not membership:
+        if not business:
             self.message = "User must be associated with a business."
             return False
         
-        business = membership.business
-        
         # Check subscription status
         try:
             result = SubscriptionChecker.check_subscription_required(
                 business=business,
                 feature_name="automation features",
-                raise_exception=False
+                raise_exception=False,
+                status=get_request_subscription_status(request)
             )
             
             # Only allow if subscription is active (not grace period)
@@ -356,20 +333,13 @@ class RequiresSubscriptionForInventoryModification(permissions.BasePermission):
         if not request.user or not request.user.is_authenticated:
             return False
         
-        # Get business from user's active membership
-        from accounts.models import BusinessMembership
+        # Get business from user's active membership (once per request)
+        business = get_request_business(request)
         
-        membership = BusinessMembership.objects.filter(
-            user=request.user,
-            is_active=True
-        ).first()
-        
-        if not membership:
+        if not business:
             self.message = "User must be associated with a business."
             return False
         
-        business = membership.business
-        
         # Allow read-only access without subscription
         if request.method in permissions.SAFE_METHODS:
             return True
@@ -379,7 +349,8 @@ class RequiresSubscriptionForInventoryModification(permissions.BasePermission):
             result = SubscriptionChecker.check_subscription_required(
                 business=business,
                 feature_name="inventory modifications",
-                raise_exception=False
+                raise_exception=False,
+                status=get_request_subscription_status(request)
             )
             
             # Only allow modifications with active subscription
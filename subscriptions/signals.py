@@ -0,0 +1,36 @@
+"""
+Subscription status cache invalidation.
+
+Every change to a subscription goes through ``Subscription.save`` (including
+``activate``, ``suspend``, ``cancel``, ``renew`` and the gateway webhooks) or
+``SubscriptionPayment.save``, so these receivers keep
+``subscriptions.status_resolver`` current. The cached status carries the
+subscription with its plan, so saving a SubscriptionPlan invalidates every
+business subscribed to it.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Subscription, SubscriptionPayment, SubscriptionPlan
+from .status_resolver import invalidate_subscription_status
+
+
+@receiver(post_save, sender=Subscription)
+@receiver(post_delete, sender=Subscription)
+def invalidate_subscription_status_on_subscription_change(sender, instance, **kwargs):
+    invalidate_subscription_status([instance.business_id])
+
+
+@receiver(post_save, sender=SubscriptionPayment)
+@receiver(post_delete, sender=SubscriptionPayment)
+def invalidate_subscription_status_on_payment_change(sender, instance, **kwargs):
+    business_id = Subscription.objects.filter(pk=instance.subscription_id).values_list('business_id', flat=True).first()
+    invalidate_subscription_status([business_id])
+
+
+@receiver(post_save, sender=SubscriptionPlan)
+def invalidate_subscription_status_on_plan_change(sender, instance, **kwargs):
+    # Plans are PROTECTed while subscribed, so only saves can leave a cached status stale
+    business_ids = Subscription.objects.filter(plan=instance).values_list('business_id', flat=True).distinct()
+    invalidate_subscription_status(business_ids)
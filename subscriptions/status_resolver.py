@@ -0,0 +1,115 @@
+"""
+Subscription status resolution.
+
+``SubscriptionChecker.compute_subscription_status`` costs one or two
+Subscription queries (the active subscription, then the grace-period
+fallback). Its result is cached per business under a versioned key:
+
+    subscriptions:status:<business_id>:<version>:<date>
+
+- ``subscriptions:business:<id>:version`` is bumped whenever one of the
+  business's Subscription or SubscriptionPayment rows is saved or deleted
+  (receivers in ``subscriptions/signals.py``), which covers ``activate``,
+  ``suspend``, ``cancel``, ``renew`` and the payment webhooks, all of which
+  save the subscription. Saving a SubscriptionPlan bumps the version of
+  every business subscribed to it, since the cached status holds the
+  subscription together with its plan.
+- The date is part of the key because expiry and the grace period are
+  evaluated against today's date.
+
+Permission classes additionally memoize the requesting user's business and
+its status on the request (``get_request_subscription_status``), so stacking
+several subscription permissions on one view costs a single lookup.
+"""
+
+import time
+from typing import Any, Dict, Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+_REQUEST_BUSINESS_ATTR = '_subscription_business'
+_REQUEST_STATUS_ATTR = '_subscription_status'
+
+
+def _version_key(business_id) -> str:
+    return f'subscriptions:business:{business_id}:version'
+
+
+def _version(business_id) -> int:
+    key = _version_key(business_id)
+    version = cache.get(key)
+    if version is None:
+        # Time-based so an evicted counter never restarts at a value that an
+        # older status entry was stored under
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def _bump(business_ids) -> None:
+    for business_id in business_ids:
+        key = _version_key(business_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), None)
+
+
+def invalidate_subscription_status(business_ids: Iterable) -> None:
+    """Drop cached subscription status for the given businesses."""
+    business_ids = {business_id for business_id in business_ids if business_id}
+    if not business_ids:
+        return
+    # Bump now for this connection's readers and again after commit, so a
+    # status computed by another request before the commit is not kept
+    _bump(business_ids)
+    transaction.on_commit(lambda: _bump(business_ids))
+
+
+def subscription_status(business) -> Dict[str, Any]:
+    """
+    Cached ``SubscriptionChecker.compute_subscription_status`` for a business.
+
+    Returns a fresh dict each call, so callers may add keys to it.
+    """
+    from .utils import SubscriptionChecker
+
+    if not business:
+        return SubscriptionChecker.compute_subscription_status(business)
+
+    key = f'subscriptions:status:{business.pk}:{_version(business.pk)}:{timezone.now().date().isoformat()}'
+    status = cache.get(key)
+    if status is None:
+        status = SubscriptionChecker.compute_subscription_status(business)
+        cache.set(key, status, getattr(settings, 'SUBSCRIPTION_STATUS_CACHE_TIMEOUT', 300))
+    return dict(status)
+
+
+def get_request_business(request):
+    """The requesting user's business (first active membership), memoized on the request."""
+    if not hasattr(request, _REQUEST_BUSINESS_ATTR):
+        from accounts.models import BusinessMembership
+
+        membership = BusinessMembership.objects.filter(
+            user=request.user,
+            is_active=True
+        ).select_related('business').first()
+        setattr(request, _REQUEST_BUSINESS_ATTR, membership.business if membership else None)
+    return getattr(request, _REQUEST_BUSINESS_ATTR)
+
+
+def get_request_subscription_status(request) -> Optional[Dict[str, Any]]:
+    """
+    Subscription status of the requesting user's business, memoized on the request.
+
+    ``None`` when the user has no business.
+    """
+    business = get_request_business(request)
+    if business is None:
+        return None
+    if not hasattr(request, _REQUEST_STATUS_ATTR):
+        setattr(request, _REQUEST_STATUS_ATTR, subscription_status(business))
+    return dict(getattr(request, _REQUEST_STATUS_ATTR))
@@ -0,0 +1,124 @@
+"""
+Tests for cached subscription status resolution
+"""
+from datetime import timedelta
+
+from django.contrib.admin.sites import AdminSite
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+
+from accounts.models import Business, BusinessMembership
+from subscriptions.admin import SubscriptionAdmin
+from subscriptions.models import Subscription, SubscriptionPlan
+from subscriptions.permissions import (
+    RequiresActiveSubscription,
+    RequiresSubscriptionForExports,
+    RequiresSubscriptionForReports,
+)
+from subscriptions.utils import SubscriptionChecker
+
+User = get_user_model()
+
+
+class SubscriptionStatusResolverTestCase(TestCase):
+    """Subscription status is computed once and invalidated on subscription changes"""
+
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(
+            email='status-owner@example.com',
+            password='testpass123',
+            name='Status Owner',
+        )
+        self.business = Business.objects.create(
+            owner=self.owner,
+            name='Status Business',
+            tin='TIN-STATUS-001',
+            email='status@example.com',
+            address='1 Status Street',
+        )
+        self.owner.add_business_membership(self.business, role=BusinessMembership.OWNER)
+
+        now = timezone.now()
+        self.subscription = Subscription.objects.create(
+            business=self.business,
+            created_by=self.owner,
+            amount='50.00',
+            payment_status='PAID',
+            status='ACTIVE',
+            start_date=now.date(),
+            end_date=(now + timedelta(days=30)).date(),
+        )
+
+    def _request(self, method='get'):
+        request = getattr(RequestFactory(), method)('/')
+        request.user = self.owner
+        return request
+
+    def test_status_is_cached_between_checks(self):
+        self.assertTrue(SubscriptionChecker.check_subscription_required(self.business)['is_active'])
+
+        with self.assertNumQueries(0):
+            result = SubscriptionChecker.check_subscription_required(self.business, feature_name='reports')
+        self.assertTrue(result['is_active'])
+        self.assertEqual(result['feature_name'], 'reports')
+
+    def test_suspend_and_activate_take_effect_immediately(self):
+        self.assertTrue(SubscriptionChecker.can_access_feature(self.business, 'sales'))
+
+        self.subscription.suspend(reason='Chargeback')
+        self.assertFalse(SubscriptionChecker.can_access_feature(self.business, 'sales'))
+
+        self.subscription.activate()
+        self.assertTrue(SubscriptionChecker.can_access_feature(self.business, 'sales'))
+
+    def test_admin_bulk_actions_take_effect_immediately(self):
+        admin = SubscriptionAdmin(Subscription, AdminSite())
+        admin.message_user = lambda *args, **kwargs: None
+        queryset = Subscription.objects.filter(pk=self.subscription.pk)
+        self.assertTrue(SubscriptionChecker.can_access_feature(self.business, 'sales'))
+
+        admin.suspend_subscriptions(self._request('post'), queryset)
+        self.assertFalse(SubscriptionChecker.can_access_feature(self.business, 'sales'))
+
+        admin.activate_subscriptions(self._request('post'), queryset)
+        self.assertTrue(SubscriptionChecker.can_access_feature(self.business, 'sales'))
+
+        admin.cancel_subscriptions(self._request('post'), queryset)
+        self.assertFalse(SubscriptionChecker.can_access_feature(self.business, 'sales'))
+
+    def test_plan_changes_take_effect_immediately(self):
+        plan = SubscriptionPlan.objects.create(
+            name='Starter', price='50.00', billing_cycle='MONTHLY', max_storefronts=1
+        )
+        self.subscription.plan = plan
+        self.subscription.save()
+        self.assertEqual(SubscriptionChecker.get_subscription_status(self.business)['max_storefronts'], 1)
+
+        plan.name = 'Growth'
+        plan.max_storefronts = 3
+        plan.save()
+
+        status = SubscriptionChecker.get_subscription_status(self.business)
+        self.assertEqual(status['tier_name'], 'Growth')
+        self.assertEqual(status['max_storefronts'], 3)
+
+    def test_stacked_permissions_share_one_lookup_per_request(self):
+        request = self._request()
+        view = None
+        self.assertTrue(RequiresActiveSubscription().has_permission(request, view))
+
+        with self.assertNumQueries(0):
+            self.assertTrue(RequiresSubscriptionForReports().has_permission(request, view))
+            self.assertTrue(RequiresSubscriptionForExports().has_permission(request, view))
+
+    def test_grace_period_is_read_only_for_reports(self):
+        self.subscription.status = 'EXPIRED'
+        self.subscription.end_date = timezone.now().date() - timedelta(days=2)
+        self.subscription.save()
+
+        self.assertTrue(RequiresSubscriptionForReports().has_permission(self._request(), None))
+        self.assertFalse(RequiresSubscriptionForReports().has_permission(self._request('post'), None))
+        self.assertFalse(RequiresActiveSubscription().has_permission(self._request(), None))
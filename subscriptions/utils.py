@@ -11,6 +11,7 @@ from django.utils import timezone
 from django.core.exceptions import PermissionDenied
 from rest_framework.exceptions import ValidationError
 from .models import Subscription
+from .status_resolver import subscription_status
 
 
 class SubscriptionChecker:
@@ -63,20 +64,23 @@ class SubscriptionChecker:
             return None
     
     @classmethod
-    def check_subscription_required(cls, business, feature_name=None, raise_exception=True):
+    def _active_subscription(cls, business):
+        """Active subscription for a business, served from the status cache."""
+        status = subscription_status(business)
+        return status['subscription'] if status['is_active'] else None
+    
+    @classmethod
+    def compute_subscription_status(cls, business):
         """
-        Check if a business has an active subscription for a specific feature.
+        Compute a business's subscription status from the database.
+        
+        Prefer ``check_subscription_required``, which serves this from the
+        per-business cache in ``subscriptions.status_resolver``.
         
-        Args:
-            business: The Business model instance
-            feature_name: Optional feature name for specific feature checks
-            raise_exception: If True, raise PermissionDenied if no active subscription
-            
         Returns:
-            dict with subscription status information
-            
-        Raises:
-            PermissionDenied: If raise_exception=True and no active subscription
+            dict with has_subscription, is_active, in_grace_period,
+            grace_period_end and subscription (the active subscription, or
+            the expired one whose grace period is running)
         """
         subscription = cls.get_active_subscription(business)
         
@@ -84,7 +88,7 @@ class SubscriptionChecker:
         in_grace_period = False
         grace_period_end = None
         
-        if not subscription:
+        if not subscription and business:
             # Check if there's a recently expired subscription
             recent_subscription = Subscription.objects.filter(
                 business=business,
@@ -97,16 +101,36 @@ class SubscriptionChecker:
                     in_grace_period = True
                     subscription = recent_subscription
         
-        result = {
+        return {
             'has_subscription': subscription is not None,
             'is_active': subscription is not None and subscription.status in ['ACTIVE', 'TRIAL'],
             'in_grace_period': in_grace_period,
             'grace_period_end': grace_period_end,
             'subscription': subscription,
-            'feature_name': feature_name
         }
+    
+    @classmethod
+    def check_subscription_required(cls, business, feature_name=None, raise_exception=True, status=None):
+        """
+        Check if a business has an active subscription for a specific feature.
         
-        if raise_exception and not result['is_active'] and not in_grace_period:
+        Args:
+            business: The Business model instance
+            feature_name: Optional feature name for specific feature checks
+            raise_exception: If True, raise PermissionDenied if no active subscription
+            status: Already-resolved status for the business (e.g. memoized on
+                the request); looked up in the status cache when omitted
+            
+        Returns:
+            dict with subscription status information
+            
+        Raises:
+            PermissionDenied: If raise_exception=True and no active subscription
+        """
+        result = dict(status) if status is not None else subscription_status(business)
+        result['feature_name'] = feature_name
+        
+        if raise_exception and not result['is_active'] and not result['in_grace_period']:
             if feature_name:
                 raise PermissionDenied(
                     f"Active subscription required to access {feature_name}. "
@@ -134,7 +158,7 @@ class SubscriptionChecker:
         Raises:
             ValidationError: If raise_exception=True and limit exceeded
         """
-        subscription = cls.get_active_subscription(business)
+        subscription = cls._active_subscription(business)
         
         if not subscription or not subscription.plan:
             # No subscription - only allow 1 storefront (free tier)
@@ -178,7 +202,8 @@ class SubscriptionChecker:
         Returns:
             dict with complete subscription status information
         """
-        subscription = cls.get_active_subscription(business)
+        resolved = subscription_status(business)
+        subscription = resolved['subscription'] if resolved['is_active'] else None
         
         status = {
             'business_id': business.id,
@@ -226,23 +251,14 @@ class SubscriptionChecker:
                     'sales', 'payments', 'inventory', 'reports', 
                     'exports', 'customer_management'
                 ]
-        else:
-            # Check for grace period
-            recent_subscription = Subscription.objects.filter(
-                business=business,
-                status__in=['EXPIRED', 'PAST_DUE', 'CANCELLED']
-            ).order_by('-end_date').first()
+        elif resolved['in_grace_period']:
+            status['in_grace_period'] = True
+            status['grace_period_end'] = resolved['grace_period_end']
+            status['subscription_status'] = 'grace_period'
             
-            if recent_subscription and recent_subscription.end_date:
-                grace_period_end = recent_subscription.end_date + timedelta(days=cls.GRACE_PERIOD_DAYS)
-                if timezone.now().date() <= grace_period_end:
-                    status['in_grace_period'] = True
-                    status['grace_period_end'] = grace_period_end
-                    status['subscription_status'] = 'grace_period'
-                    
-                    # Limited features during grace period
-                    status['can_view_reports'] = True  # Read-only
-                    status['features_available'] = ['view_data', 'reports_readonly']
+            # Limited features during grace period
+            status['can_view_reports'] = True  # Read-only
+            status['features_available'] = ['view_data', 'reports_readonly']
         
         # Get storefront limit info
         storefront_info = cls.check_storefront_limit(business, raise_exception=False)
@@ -277,25 +293,14 @@ class SubscriptionChecker:
         Returns:
             bool: True if feature is accessible, False otherwise
         """
-        subscription = cls.get_active_subscription(business)
+        status = subscription_status(business)
         
-        if not subscription:
-            # Check grace period for read-only features
-            recent_subscription = Subscription.objects.filter(
-                business=business,
-                status__in=['EXPIRED', 'PAST_DUE', 'CANCELLED']
-            ).order_by('-end_date').first()
-            
-            if recent_subscription and recent_subscription.end_date:
-                grace_period_end = recent_subscription.end_date + timedelta(days=cls.GRACE_PERIOD_DAYS)
-                if timezone.now().date() <= grace_period_end:
-                    # During grace period, only reports are accessible (read-only)
-                    return feature_type == 'reports'
-            
-            return False
+        if status['is_active']:
+            # Active subscription - all features available
+            return True
         
-        # Active subscription - all features available
-        return subscription is not None and subscription.status in ['ACTIVE', 'TRIAL']
+        # During grace period, only reports are accessible (read-only)
+        return status['in_grace_period'] and feature_type == 'reports'
 
 
 # Convenience functions for quick checks
@@ -306,8 +311,7 @@ def get_business_subscription(business):
 
 def has_active_subscription(business):
     """Check if business has an active subscription (boolean check)."""
-    subscription = SubscriptionChecker.get_active_subscription(business)
-    return subscription is not None and subscription.status in ['ACTIVE', 'TRIAL']
+    return subscription_status(business)['is_active']
 
 
 def enforce_subscription(business, feature_name=None):
@@ -0,0 +1,137 @@
+"""
+Tests for the pooled async OpenAI runner (against the local stub server)
+and for deferred completions collected by repeating the request.
+"""
+
+import threading
+from unittest import skipUnless
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from ai_features.services import AIResultPending, AsyncCompletionRunner, OpenAIService
+from ai_features.services import async_openai
+from ai_features.stub_openai import StubOpenAIServer
+from app.celery import app as celery_app
+
+REQUEST = {
+    'model': 'gpt-4o-mini',
+    'messages': [{'role': 'user', 'content': 'Summarise sales for March'}],
+    'temperature': 0.3,
+}
+
+
+@skipUnless(async_openai.ASYNC_OPENAI_AVAILABLE, 'openai is not installed')
+class AsyncCompletionRunnerTestCase(SimpleTestCase):
+    """Async completions share pooled connections, are bounded per business and retried."""
+
+    def _burst(self, runner, business_ids):
+        errors = []
+
+        def call(business_id):
+            try:
+                runner.run(REQUEST, business_id)
+            except Exception as exc:  # pragma: no cover - reported below
+                errors.append(exc)
+
+        threads = [threading.Thread(target=call, args=(business_id,)) for business_id in business_ids]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
+    def test_requests_are_bounded_per_business_over_pooled_connections(self):
+        with StubOpenAIServer(latency=0.1) as stub:
+            runner = AsyncCompletionRunner(api_key='stub', base_url=stub.base_url, max_concurrency=2)
+            self._burst(runner, ['business-a'] * 8)
+
+        self.assertEqual(stub.requests, 8)
+        self.assertEqual(stub.peak_concurrency, 2)
+        # Keep-alive connections are reused rather than opened per request
+        self.assertLessEqual(stub.connections, 2)
+
+    def test_transient_errors_are_retried_with_backoff(self):
+        from openai import InternalServerError
+
+        with StubOpenAIServer(latency=0, fail_first=2) as stub:
+            runner = AsyncCompletionRunner(api_key='stub', base_url=stub.base_url, max_retries=2, backoff_base=0.01)
+            response = runner.run(REQUEST, 'business-a')
+        self.assertEqual(response.choices[0].message.content, 'Stub completion.')
+        self.assertEqual(stub.requests, 3)
+
+        with StubOpenAIServer(latency=0, fail_first=5) as stub:
+            runner = AsyncCompletionRunner(api_key='stub', base_url=stub.base_url, max_retries=1, backoff_base=0.01)
+            with self.assertRaises(InternalServerError):
+                runner.run(REQUEST, 'business-a')
+        self.assertEqual(stub.requests, 2)
+
+    def test_service_calls_provider_through_runner_in_async_mode(self):
+        async_openai._async_runner = None
+        self.addCleanup(setattr, async_openai, '_async_runner', None)
+
+        with StubOpenAIServer(latency=0) as stub, override_settings(
+            OPENAI_USE_MOCK=False,
+            OPENAI_API_KEY='stub',
+            OPENAI_BASE_URL=stub.base_url,
+            OPENAI_EXECUTION_MODE='async',
+            OPENAI_RESPONSE_CACHE_TIMEOUT=0,
+        ):
+            service = OpenAIService()
+            result = service.generate_json(
+                prompt='Summarise sales for March',
+                system_prompt='You are a reporting assistant.',
+                feature='report_narrative',
+                business_id='business-a'
+            )
+
+        self.assertIs(service.async_runner, async_openai.get_async_runner())
+        self.assertEqual(result['data'], {'stub': True})
+        self.assertGreater(result['tokens']['total'], 0)
+        self.assertEqual(stub.requests, 1)
+
+
+@override_settings(OPENAI_USE_MOCK=True, OPENAI_RESPONSE_CACHE_TIMEOUT=3600, AI_DEFERRED_RETRY_AFTER=2)
+class DeferredCompletionTestCase(SimpleTestCase):
+    """Deferred completions run on the Celery queue and are collected by an identical request."""
+
+    def setUp(self):
+        cache.clear()
+        # Run queued tasks inline, standing in for the ai_features worker
+        eager = celery_app.conf.task_always_eager
+        celery_app.conf.task_always_eager = True
+        self.addCleanup(setattr, celery_app.conf, 'task_always_eager', eager)
+        self.service = OpenAIService()
+
+    def _generate(self, business_id=None):
+        return self.service.generate_text(
+            prompt='Summarise sales for March',
+            system_prompt='You are a reporting assistant.',
+            feature='report_narrative',
+            temperature=0.3,
+            business_id=business_id,
+            defer=True
+        )
+
+    def test_deferred_completion_is_collected_once_then_cached(self):
+        with self.assertRaises(AIResultPending) as pending:
+            self._generate()
+        self.assertEqual(pending.exception.retry_after, 2)
+
+        # The first identical request after the job finishes collects it as a fresh completion
+        collected = self._generate()
+        self.assertFalse(collected['cached'])
+        self.assertEqual(collected['content'], 'Local mock response generated without OpenAI access.')
+
+        # Later ones are ordinary cache hits
+        self.assertTrue(self._generate()['cached'])
+
+    def test_deferred_completion_is_only_collected_by_its_business(self):
+        with self.assertRaises(AIResultPending):
+            self._generate(business_id='business-a')
+        # Another business queues its own job instead of taking business-a's result
+        with self.assertRaises(AIResultPending):
+            self._generate(business_id='business-b')
+
+        self.assertFalse(self._generate(business_id='business-a')['cached'])
+        self.assertFalse(self._generate(business_id='business-b')['cached'])
@@ -499,3 +499,60 @@ class CatalogFilteringTestCase(TestCase):
         # Test mixed case
         response = self.client.get(url, {'search': 'SuGaR'})
         self.assertEqual(len(response.data['products']), 1)
+    
+    def test_catalog_uses_latest_stock_product_price(self):
+        """The newest batch's price wins and filters apply to it."""
+        sugar = self.products[0]['product']
+        StockProduct.objects.create(
+            product=sugar,
+            stock=self.stock,
+            warehouse=self.warehouse,
+            quantity=10,
+            unit_cost=Decimal('12.00'),
+            retail_price=Decimal('18.00'),
+        )
+        
+        url = f'/inventory/api/storefronts/{self.storefront1.id}/sale-catalog/'
+        response = self.client.get(url, {'min_price': '16', 'max_price': '20'})
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['products']), 1)
+        product = response.data['products'][0]
+        self.assertEqual(product['product_name'], 'Sugar 1kg')
+        self.assertEqual(Decimal(product['retail_price']), Decimal('18.00'))
+        self.assertIsNone(product['wholesale_price'])
+        self.assertEqual(len(product['stock_product_ids']), 2)
+    
+    def test_catalog_pages_are_ordered_by_name(self):
+        """Pages come back in name order with no product repeated."""
+        url = f'/inventory/api/storefronts/{self.storefront1.id}/sale-catalog/'
+        names = []
+        for page in (1, 2, 3):
+            response = self.client.get(url, {'page': page, 'page_size': 3})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            names.extend(product['product_name'] for product in response.data['products'])
+        
+        self.assertEqual(names, sorted((item['product'].name for item in self.products), key=str.lower))
+    
+    def test_cached_catalog_reflects_inventory_and_price_changes(self):
+        """Cached pages are replaced as soon as stock or prices change."""
+        url = f'/inventory/api/storefronts/{self.storefront1.id}/sale-catalog/'
+        params = {'search': 'sugar'}
+        response = self.client.get(url, params)
+        self.assertEqual(response.data['products'][0]['available_quantity'], 50)
+        
+        entry = StoreFrontInventory.objects.get(storefront=self.storefront1, product=self.products[0]['product'])
+        entry.quantity = 42
+        entry.save(update_fields=['quantity', 'updated_at'])
+        response = self.client.get(url, params)
+        self.assertEqual(response.data['products'][0]['available_quantity'], 42)
+        
+        stock_product = self.products[0]['stock_product']
+        stock_product.retail_price = Decimal('16.50')
+        stock_product.save(update_fields=['retail_price', 'updated_at'])
+        response = self.client.get(url, params)
+        self.assertEqual(Decimal(response.data['products'][0]['retail_price']), Decimal('16.50'))
+        
+        multi_response = self.client.get('/inventory/api/storefronts/multi-storefront-catalog/', params)
+        self.assertEqual(multi_response.data['products'][0]['total_available'], 42 + 30)
+        self.assertEqual(Decimal(multi_response.data['products'][0]['retail_price']), Decimal('16.50'))
@@ -0,0 +1,118 @@
+"""
+Tests for the deterministic inventory forecast engine.
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+
+from accounts.models import Business
+from ai_features.services import InventoryForecastEngine
+from inventory.models import Category, Product, Stock, StockProduct, StoreFront, Warehouse
+from sales.models import Sale, SaleItem
+
+User = get_user_model()
+
+
+class InventoryForecastEngineTestCase(TestCase):
+    """Forecasts come from grouped queries and cover every product that sold."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='forecast@test.com',
+            password='testpass123',
+            name='Forecast Owner'
+        )
+        self.business = Business.objects.create(name='Forecast Business', owner=self.user)
+        self.category = Category.objects.create(name='Forecast Category')
+        self.warehouse = Warehouse.objects.create(name='Forecast Warehouse')
+        self.storefront = StoreFront.objects.create(name='Forecast Store', user=self.user)
+        self.stock = Stock.objects.create(
+            business=self.business,
+            description='Forecast batch',
+            arrival_date='2025-10-01'
+        )
+
+        self.fast = self._product('Fast Mover', 'FAST-1', on_hand=7, unit_cost='2.00')
+        self.slow = self._product('Slow Mover', 'SLOW-1', on_hand=500, unit_cost='3.00')
+        self.idle = self._product('Idle Product', 'IDLE-1', on_hand=40, unit_cost='1.00')
+
+        # Fast mover: 12 units every week for twelve weeks; slow mover: one sale
+        for week in range(12):
+            self._sell(self.fast, quantity=12, days_ago=7 * week + 1)
+        self._sell(self.slow, quantity=2, days_ago=3)
+
+    def _product(self, name, sku, on_hand, unit_cost):
+        product = Product.objects.create(
+            business=self.business,
+            name=name,
+            sku=sku,
+            category=self.category
+        )
+        stock_product = StockProduct.objects.create(
+            product=product,
+            stock=self.stock,
+            warehouse=self.warehouse,
+            quantity=on_hand,
+            unit_cost=Decimal(unit_cost),
+            retail_price=Decimal(unit_cost) * 2
+        )
+        StockProduct.objects.filter(pk=stock_product.pk).update(calculated_quantity=on_hand)
+        return product
+
+    def _sell(self, product, quantity, days_ago):
+        sale = Sale.objects.create(
+            business=self.business,
+            storefront=self.storefront,
+            user=self.user,
+            status='DRAFT',
+            payment_type='CASH'
+        )
+        SaleItem.objects.create(
+            sale=sale,
+            product=product,
+            quantity=Decimal(quantity),
+            unit_price=Decimal('5.00')
+        )
+        Sale.objects.filter(pk=sale.pk).update(created_at=timezone.now() - timedelta(days=days_ago))
+
+    def test_forecasts_all_selling_products_in_fixed_queries(self):
+        engine = InventoryForecastEngine(str(self.business.id), forecast_days=30)
+
+        with self.assertNumQueries(3):
+            forecasts = engine.build()
+
+        by_sku = {item['sku']: item for item in forecasts}
+        self.assertEqual(set(by_sku), {'FAST-1', 'SLOW-1'})
+        # Most urgent first
+        self.assertEqual(forecasts[0]['sku'], 'FAST-1')
+
+        fast = by_sku['FAST-1']
+        self.assertEqual(fast['weekly_velocity'], 12.0)
+        self.assertEqual(fast['days_of_cover'], 4.1)
+        self.assertEqual(fast['risk_level'], 'critical')
+        self.assertEqual(fast['unit_cost'], 2.0)
+        # 30 + 7 days of demand plus one week of safety stock, less stock on hand
+        self.assertEqual(fast['recommended_reorder_quantity'], 68.0)
+        self.assertEqual(fast['recommended_reorder_date'], timezone.now().date().isoformat())
+
+        slow = by_sku['SLOW-1']
+        self.assertEqual(slow['risk_level'], 'low')
+        self.assertEqual(slow['recommended_reorder_quantity'], 0.0)
+        self.assertIsNone(slow['recommended_reorder_date'])
+
+    def test_category_and_warehouse_filters(self):
+        other_warehouse = Warehouse.objects.create(name='Other Warehouse')
+
+        self.assertEqual(
+            InventoryForecastEngine(str(self.business.id), warehouse=other_warehouse).build(),
+            []
+        )
+        other_category = Category.objects.create(name='Other Category')
+        self.assertEqual(
+            InventoryForecastEngine(str(self.business.id), category=other_category).build(),
+            []
+        )
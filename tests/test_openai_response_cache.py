@@ -0,0 +1,107 @@
+"""
+Tests for the content-hash AI response cache and cache-aware billing.
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from accounts.models import Business
+from ai_features.models import AITransaction, BusinessAICredits
+from ai_features.services import AIBillingService, OpenAIService
+
+User = get_user_model()
+
+
+@override_settings(OPENAI_USE_MOCK=True, OPENAI_RESPONSE_CACHE_TIMEOUT=3600)
+class OpenAIResponseCacheTestCase(TestCase):
+    """Identical completions are served once; cache hits are logged but not charged."""
+
+    def setUp(self):
+        cache.clear()
+        self.service = OpenAIService()
+        self.user = User.objects.create_user(
+            email='ai-cache@test.com',
+            password='testpass123',
+            name='AI Cache Owner'
+        )
+        self.business = Business.objects.create(name='AI Cache Business', owner=self.user)
+        BusinessAICredits.objects.create(
+            business=self.business,
+            balance=Decimal('10.00'),
+            expires_at=timezone.now() + timedelta(days=30)
+        )
+
+    def _generate(self, temperature=0.3, business_id=None):
+        return self.service.generate_text(
+            prompt='Summarise sales for March',
+            system_prompt='You are a reporting assistant.',
+            feature='report_narrative',
+            temperature=temperature,
+            business_id=business_id
+        )
+
+    def test_identical_requests_hit_the_cache(self):
+        first = self._generate()
+        second = self._generate()
+
+        self.assertFalse(first['cached'])
+        self.assertTrue(second['cached'])
+        self.assertEqual(second['content'], first['content'])
+        self.assertEqual(second['cost_ghs'], 0.0)
+
+        # Anything that changes the completion changes the key
+        self.assertFalse(self._generate(temperature=0.9)['cached'])
+        self.assertFalse(
+            self.service.generate_text(
+                prompt='Summarise sales for March',
+                system_prompt='You are a reporting assistant.',
+                feature='report_narrative',
+                temperature=0.3,
+                use_cache=False
+            )['cached']
+        )
+
+    def test_cache_is_not_shared_between_businesses(self):
+        self.assertFalse(self._generate(business_id='business-a')['cached'])
+        self.assertTrue(self._generate(business_id='business-a')['cached'])
+        self.assertFalse(self._generate(business_id='business-b')['cached'])
+
+    def test_cache_hits_are_logged_without_charging(self):
+        self._generate()
+        result = self._generate()
+
+        billing = AIBillingService.charge_credits(
+            business_id=str(self.business.id),
+            feature='report_narrative',
+            actual_openai_cost=Decimal(str(result['cost_ghs'])),
+            processing_time_ms=result['processing_time_ms'],
+            cache_hit=result['cached'],
+            latency_saved_ms=result['latency_saved_ms']
+        )
+
+        self.assertEqual(billing['credits_charged'], 0.0)
+        self.assertEqual(billing['new_balance'], 10.0)
+        transaction = AITransaction.objects.get(id=billing['transaction_id'])
+        self.assertTrue(transaction.cache_hit)
+        self.assertEqual(transaction.credits_used, Decimal('0.00'))
+
+        stats = AIBillingService.get_usage_stats(str(self.business.id))
+        self.assertEqual(stats['cache_hits'], 1)
+        self.assertEqual(stats['cache_hit_rate'], 1.0)
+
+    @override_settings(AI_CHARGE_CACHED_RESPONSES=True)
+    def test_cache_hits_can_be_charged_by_policy(self):
+        billing = AIBillingService.charge_credits(
+            business_id=str(self.business.id),
+            feature='report_narrative',
+            actual_openai_cost=Decimal('0'),
+            cache_hit=True
+        )
+
+        self.assertEqual(billing['credits_charged'], 0.2)
+        self.assertTrue(AITransaction.objects.get(id=billing['transaction_id']).cache_hit)